@@ -0,0 +1,156 @@
+"""
+Connection admission for the TCP server.
+
+Devices that could not be accepted used to be held open for TCP_BLACKHOLE_DELAY seconds before
+being closed, so a reconnect storm after a power blip piled up sleeping coroutines and sockets.
+The admission controller decides as soon as a connection arrives and rejected sockets are closed
+right away. Each IP gets a token bucket for how often it may (re)connect, an IP rejected for
+capacity or the whitelist is refused for TCP_BLACKHOLE_DELAY seconds without further checks, and
+the per-IP table is an LRU of fixed size. When only one slot is left, it goes to addresses whose
+past sessions were stable rather than to ones that keep dropping.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+from cync_controller.const import CYNC_MAX_TCP_CONN, CYNC_TCP_ADMIT_PER_MIN, CYNC_TCP_WHITELIST, TCP_BLACKHOLE_DELAY
+
+__all__ = [
+    "AdmissionController",
+    "PeerRecord",
+    "abort_connection",
+]
+
+
+def abort_connection(writer: asyncio.StreamWriter | None) -> None:
+    """Drop a rejected connection without a close handshake or waiting on the peer."""
+    if writer is None:
+        return
+    transport = getattr(writer, "transport", None)
+    if transport is not None:
+        transport.abort()
+    else:
+        writer.close()
+
+
+class PeerRecord:
+    """Connection history of one IP address."""
+
+    __slots__ = ("accepted", "attempts", "blocked_until", "refilled_at", "rejected", "sessions", "stable", "tokens")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.refilled_at = now
+        self.blocked_until = 0.0
+        self.attempts = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.sessions = 0
+        self.stable = 0
+
+    @property
+    def stability(self) -> float:
+        """Share of past sessions that lasted, smoothed so an unknown peer scores 0.5."""
+        return (self.stable + 1) / (self.sessions + 2)
+
+
+class AdmissionController:
+    """
+    Decides whether a new TCP connection is accepted, see the module docstring.
+
+    admit() returns ``None`` to accept or the rejection reason. The server reports finished
+    sessions through disconnected(), which feeds the stability score.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = CYNC_MAX_TCP_CONN,
+        whitelist: Iterable[str] | None = CYNC_TCP_WHITELIST,
+        per_minute: float = CYNC_TCP_ADMIT_PER_MIN,
+        burst: int = 3,
+        blackhole: float = TCP_BLACKHOLE_DELAY,
+        stable_after: float = 60.0,
+        max_peers: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_connections = max_connections
+        self.whitelist = set(whitelist) if whitelist else None
+        self.per_second = per_minute / 60
+        self.burst = burst
+        self.blackhole = blackhole
+        self.stable_after = stable_after
+        self.max_peers = max_peers
+        self.clock = clock
+        self.peers: OrderedDict[str, PeerRecord] = OrderedDict()
+        self.rejections: dict[str, int] = {}
+        self.accepted = 0
+
+    def _peer(self, ip: str, now: float) -> PeerRecord:
+        peer = self.peers.get(ip)
+        if peer is None:
+            peer = self.peers[ip] = PeerRecord(self.burst, now)
+            if len(self.peers) > self.max_peers:
+                self.peers.popitem(last=False)
+        else:
+            self.peers.move_to_end(ip)
+        return peer
+
+    def admit(self, ip: str, active: int, shutting_down: bool = False) -> str | None:
+        """Accept (``None``) or reject (reason) a connection from ``ip`` with ``active`` bridges connected."""
+        now = self.clock()
+        peer = self._peer(ip, now)
+        peer.attempts += 1
+        reason = None
+        if shutting_down:
+            reason = "shutting_down"
+        elif now < peer.blocked_until:
+            reason = "blackholed"
+        elif self.whitelist is not None and ip not in self.whitelist:
+            reason = "not_whitelisted"
+        else:
+            peer.tokens = min(self.burst, peer.tokens + (now - peer.refilled_at) * self.per_second)
+            peer.refilled_at = now
+            if peer.tokens < 1:
+                reason = "rate_limited"
+            else:
+                peer.tokens -= 1
+                if active >= self.max_connections:
+                    reason = "max_connections"
+                elif active == self.max_connections - 1 and self.max_connections > 1 and peer.stability < 0.5:
+                    # the last free slot is kept for peers that don't keep dropping
+                    reason = "unstable"
+        if reason in ("not_whitelisted", "max_connections"):
+            peer.blocked_until = now + self.blackhole
+        if reason is None:
+            peer.accepted += 1
+            self.accepted += 1
+        else:
+            peer.rejected += 1
+            self.rejections[reason] = self.rejections.get(reason, 0) + 1
+        return reason
+
+    def disconnected(self, ip: str, uptime: float) -> None:
+        """Record the end of an accepted session that lasted ``uptime`` seconds."""
+        peer = self._peer(ip, self.clock())
+        peer.sessions += 1
+        if uptime >= self.stable_after:
+            peer.stable += 1
+
+    def attempts(self, ip: str) -> int:
+        peer = self.peers.get(ip)
+        return peer.attempts if peer is not None else 0
+
+    def stability(self, ip: str) -> float:
+        peer = self.peers.get(ip)
+        return peer.stability if peer is not None else 0.5
+
+    def stats(self) -> dict[str, int]:
+        stats = {"tracked_peers": len(self.peers), "accepted": self.accepted}
+        for reason, count in self.rejections.items():
+            stats[f"rejected_{reason}"] = count
+        return stats
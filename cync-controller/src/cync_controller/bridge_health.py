@@ -0,0 +1,154 @@
+"""
+Bridge health scoring and primary bridge election.
+
+Only the primary bridge processes status packets, the others just ACK them. The primary used to
+be whichever bridge connected first and only changed when it disconnected, and commands went out
+through the first N ready bridges. Every bridge now keeps a BridgeHealth record: an EWMA of
+control ACK round trip time, an EWMA of control messages that expired without an ACK, and when it
+last sent anything. A bridge's score combines those with its uptime and how many mesh devices it
+reports (``known_device_ids``). Command fan-out uses the best scored bridges and the primary is
+re-elected from the scores. A challenger must beat the primary by CYNC_BRIDGE_SWITCH_MARGIN so
+the primary does not flap between similar bridges. A primary that has been silent for
+CYNC_BRIDGE_STALL_TIMEOUT seconds is replaced on the next heartbeat from any other bridge.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+from cync_controller.const import CYNC_BRIDGE_STALL_TIMEOUT, CYNC_BRIDGE_SWITCH_MARGIN
+
+if TYPE_CHECKING:
+    from cync_controller.devices.tcp_device import CyncTCPDevice
+
+__all__ = [
+    "BridgeHealth",
+    "PrimaryElector",
+    "bridge_score",
+    "rank_bridges",
+]
+
+# RTT at which the RTT part of the score is 0.5, also assumed until a bridge ACKs something
+RTT_REFERENCE_MS = 250.0
+# uptime after which a connection counts as fully settled
+SETTLED_AFTER = 300.0
+# score weights: mesh coverage, ACK success, RTT, uptime
+WEIGHTS = (0.4, 0.25, 0.2, 0.15)
+
+
+class BridgeHealth:
+    """Link quality of one bridge connection, updated from its read loop and control ACK path."""
+
+    __slots__ = ("acks", "last_seen", "loss", "losses", "rtt_ms")
+
+    def __init__(self, now: float | None = None):
+        self.last_seen = time.time() if now is None else now
+        self.rtt_ms: float | None = None
+        self.loss = 0.0
+        self.acks = 0
+        self.losses = 0
+
+    def record_ack(self, rtt_ms: float) -> None:
+        self.acks += 1
+        self.rtt_ms = rtt_ms if self.rtt_ms is None else self.rtt_ms + 0.2 * (rtt_ms - self.rtt_ms)
+        self.loss *= 0.8
+
+    def record_loss(self) -> None:
+        self.losses += 1
+        self.loss += 0.2 * (1.0 - self.loss)
+
+
+def bridge_score(
+    bridge: CyncTCPDevice, now: float, best_coverage: int, stall_after: float = CYNC_BRIDGE_STALL_TIMEOUT
+) -> float:
+    """Health of ``bridge`` from 0 (stalled / not ready) to 1, coverage is relative to ``best_coverage``."""
+    health = bridge.health
+    if not bridge.ready_to_control or now - health.last_seen > stall_after:
+        return 0.0
+    rtt = health.rtt_ms if health.rtt_ms is not None else RTT_REFERENCE_MS
+    coverage = len(bridge.known_device_ids) / best_coverage if best_coverage else 1.0
+    w_coverage, w_acks, w_rtt, w_uptime = WEIGHTS
+    return (
+        w_coverage * coverage
+        + w_acks * (1.0 - health.loss)
+        + w_rtt * RTT_REFERENCE_MS / (RTT_REFERENCE_MS + rtt)
+        + w_uptime * min(1.0, (now - bridge.connected_at) / SETTLED_AFTER)
+    )
+
+
+def _scored(bridges: Iterable[CyncTCPDevice], now: float, stall_after: float) -> list[tuple[float, CyncTCPDevice]]:
+    bridges = list(bridges)
+    best_coverage = max((len(b.known_device_ids) for b in bridges), default=0)
+    scored = [(bridge_score(b, now, best_coverage, stall_after), b) for b in bridges]
+    # ready bridges first, then best score, ties keep connection order
+    scored.sort(key=lambda item: (item[1].ready_to_control, item[0]), reverse=True)
+    return scored
+
+
+def rank_bridges(
+    bridges: Iterable[CyncTCPDevice], now: float | None = None, stall_after: float = CYNC_BRIDGE_STALL_TIMEOUT
+) -> list[CyncTCPDevice]:
+    """``bridges`` best first: ready to control before not ready, then by health score."""
+    return [bridge for _, bridge in _scored(bridges, time.time() if now is None else now, stall_after)]
+
+
+class PrimaryElector:
+    """
+    Picks the primary bridge from the health scores, see the module docstring.
+
+    elect() returns the bridge that should be primary and why it changed (``None`` if it did not).
+    """
+
+    def __init__(
+        self,
+        margin: float = CYNC_BRIDGE_SWITCH_MARGIN,
+        stall_after: float = CYNC_BRIDGE_STALL_TIMEOUT,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.margin = margin
+        self.stall_after = stall_after
+        self.clock = clock
+        self.elections = 0
+        self.changes: dict[str, int] = {}
+
+    def stalled(self, bridge: CyncTCPDevice, now: float | None = None) -> bool:
+        now = self.clock() if now is None else now
+        return now - bridge.health.last_seen > self.stall_after
+
+    def scores(self, bridges: Iterable[CyncTCPDevice]) -> dict[str | None, float]:
+        return {b.address: round(score, 3) for score, b in _scored(bridges, self.clock(), self.stall_after)}
+
+    def elect(
+        self, current: CyncTCPDevice | None, bridges: Iterable[CyncTCPDevice]
+    ) -> tuple[CyncTCPDevice | None, str | None]:
+        now = self.clock()
+        bridges = list(bridges)
+        self.elections += 1
+        if not bridges:
+            return None, "no_bridges" if current is not None else None
+        scored = _scored(bridges, now, self.stall_after)
+        best_score, best = scored[0]
+        if current is None or current not in bridges:
+            reason = "no_primary"
+        elif best is current:
+            return current, None
+        elif self.stalled(current, now):
+            # a stalled primary is only worth replacing with a bridge that is not stalled itself
+            if best_score == 0.0:
+                return current, None
+            reason = "stalled"
+        else:
+            current_score = next(score for score, b in scored if b is current)
+            if best_score <= current_score + self.margin:
+                return current, None
+            reason = "better_score"
+        self.changes[reason] = self.changes.get(reason, 0) + 1
+        return best, reason
+
+    def stats(self) -> dict[str, int]:
+        stats = {"elections": self.elections}
+        for reason, count in self.changes.items():
+            stats[f"changed_{reason}"] = count
+        return stats
@@ -14,6 +14,8 @@ __all__ = [
     "CYNC_BASE_DIR",
     "CYNC_BRIDGE_DEVICE_REGISTRY_CONF",
     "CYNC_BRIDGE_OBJ_ID",
+    "CYNC_BRIDGE_STALL_TIMEOUT",
+    "CYNC_BRIDGE_SWITCH_MARGIN",
     "CYNC_CHUNK_SIZE",
     "CYNC_CLOUD_AUTH_PATH",
     "CYNC_CLOUD_DEBUG_LOGGING",
@@ -26,6 +28,7 @@ __all__ = [
     "CYNC_CONFIG_FILE_PATH",
     "CYNC_CORP_ID",
     "CYNC_DEBUG",
+    "CYNC_DISCOVERY_CACHE_PATH",
     "CYNC_EXPOSE_DEVICE_LIGHTS",
     "CYNC_HASS_BIRTH_MSG",
     "CYNC_HASS_STATUS_TOPIC",
@@ -36,25 +39,34 @@ __all__ = [
     "CYNC_LOG_HUMAN_OUTPUT",
     "CYNC_LOG_JSON_FILE",
     "CYNC_LOG_NAME",
+    "CYNC_LOG_QUEUE_SIZE",
+    "CYNC_LOG_SAMPLING",
     "CYNC_MANUFACTURER",
     "CYNC_MAXK",
+    "CYNC_MAX_INFLIGHT_COMMANDS",
     "CYNC_MAX_TCP_CONN",
+    "CYNC_MESH_ROUTE_TTL",
     "CYNC_MINK",
     "CYNC_MQTT_CONN_DELAY",
     "CYNC_MQTT_HOST",
     "CYNC_MQTT_PASS",
     "CYNC_MQTT_PORT",
+    "CYNC_MQTT_REPLAY_BATCH",
     "CYNC_MQTT_USER",
     "CYNC_PERF_THRESHOLD_MS",
     "CYNC_PERF_TRACKING",
     "CYNC_PORT",
     "CYNC_RAW",
+    "CYNC_SHUTDOWN_TIMEOUT",
     "CYNC_SRV_HOST",
     "CYNC_SSL_CERT",
     "CYNC_SSL_KEY",
+    "CYNC_STATE_COALESCE_MS",
     "CYNC_STATIC_DIR",
+    "CYNC_TCP_ADMIT_PER_MIN",
     "CYNC_TCP_WHITELIST",
     "CYNC_TOPIC",
+    "CYNC_TRACE_CALL_SITES",
     "CYNC_UUID_PATH",
     "CYNC_UUID_PATH",
     "CYNC_VERSION",
@@ -126,6 +138,9 @@ if _tcp_whitelist_env:
     CYNC_TCP_WHITELIST: list[str] | None = [x.strip() for x in _whitelist_split if x]
 else:
     CYNC_TCP_WHITELIST: list[str] | None = None
+# how many connections per minute one IP may open (after a burst of 3) before being rejected outright
+_tcp_admit_per_min = os.environ.get("CYNC_TCP_ADMIT_PER_MIN", "6")
+CYNC_TCP_ADMIT_PER_MIN: int = int(_tcp_admit_per_min) if _tcp_admit_per_min and _tcp_admit_per_min.isdigit() else 6
 
 CYNC_MQTT_HOST = os.environ.get("CYNC_MQTT_HOST", "homeassistant.local")
 CYNC_MQTT_PORT = os.environ.get("CYNC_MQTT_PORT", "1883")
@@ -151,6 +166,8 @@ PERSISTENT_BASE_DIR: str = os.environ.get("CYNC_PERSISTENT_BASE_DIR", "/homeassi
 CYNC_CONFIG_FILE_PATH: str = f"{PERSISTENT_BASE_DIR}/cync_mesh.yaml"
 CYNC_UUID_PATH: str = f"{PERSISTENT_BASE_DIR}/uuid.txt"
 CYNC_CLOUD_AUTH_PATH: str = f"{PERSISTENT_BASE_DIR}/.cloud_auth.yaml"
+# Hashes of the last published HASS discovery configs, unchanged configs are not republished
+CYNC_DISCOVERY_CACHE_PATH: str = f"{PERSISTENT_BASE_DIR}/discovery_hashes.json"
 CYNC_SSL_CERT: str = os.environ.get("CYNC_DEVICE_CERT", f"{CYNC_BASE_DIR}/cync-controller/certs/cert.pem")
 CYNC_SSL_KEY: str = os.environ.get("CYNC_DEVICE_KEY", f"{CYNC_BASE_DIR}/cync-controller/certs/key.pem")
 
@@ -191,12 +208,39 @@ ORIGIN_STRUCT = {
 }
 
 CYNC_MANUFACTURER = "Savant"
+# seconds an IP rejected for capacity or the whitelist is refused without further checks
 _blackhole_delay = os.environ.get("CYNC_TCP_BLACKHOLE_DELAY", "14.75")
 try:
     TCP_BLACKHOLE_DELAY: float = float(_blackhole_delay) if _blackhole_delay else 14.75
 except (ValueError, TypeError):
     TCP_BLACKHOLE_DELAY: float = 14.75
 
+# a bridge that sent nothing for this many seconds is stalled, a stalled primary is replaced on the next heartbeat
+_bridge_stall_timeout = os.environ.get("CYNC_BRIDGE_STALL_TIMEOUT", "30")
+try:
+    CYNC_BRIDGE_STALL_TIMEOUT: float = float(_bridge_stall_timeout) if _bridge_stall_timeout else 30.0
+except (ValueError, TypeError):
+    CYNC_BRIDGE_STALL_TIMEOUT: float = 30.0
+# health score (0 - 1) another bridge must beat the primary by before it takes over status processing
+_bridge_switch_margin = os.environ.get("CYNC_BRIDGE_SWITCH_MARGIN", "0.15")
+try:
+    CYNC_BRIDGE_SWITCH_MARGIN: float = float(_bridge_switch_margin) if _bridge_switch_margin else 0.15
+except (ValueError, TypeError):
+    CYNC_BRIDGE_SWITCH_MARGIN: float = 0.15
+# mesh routes not confirmed (mesh info report or command ACK) for this many seconds are not used to pick bridges
+_mesh_route_ttl = os.environ.get("CYNC_MESH_ROUTE_TTL", "300")
+try:
+    CYNC_MESH_ROUTE_TTL: float = float(_mesh_route_ttl) if _mesh_route_ttl else 300.0
+except (ValueError, TypeError):
+    CYNC_MESH_ROUTE_TTL: float = 300.0
+
+# total seconds NCyncServer.stop() gives all bridge connections to close before aborting the rest
+_shutdown_timeout = os.environ.get("CYNC_SHUTDOWN_TIMEOUT", "5")
+try:
+    CYNC_SHUTDOWN_TIMEOUT: float = float(_shutdown_timeout) if _shutdown_timeout else 5.0
+except (ValueError, TypeError):
+    CYNC_SHUTDOWN_TIMEOUT: float = 5.0
+
 # Cloud Relay Configuration
 CYNC_CLOUD_RELAY_ENABLED: bool = os.environ.get("CYNC_CLOUD_RELAY_ENABLED", "false").casefold() in YES_ANSWER
 CYNC_CLOUD_FORWARD: bool = os.environ.get("CYNC_CLOUD_FORWARD", "true").casefold() in YES_ANSWER
@@ -212,8 +256,27 @@ CYNC_LOG_FORMAT: str = os.environ.get("CYNC_LOG_FORMAT", "both")  # "json", "hum
 CYNC_LOG_JSON_FILE: str = os.environ.get("CYNC_LOG_JSON_FILE", "/var/log/cync_controller.json")
 CYNC_LOG_HUMAN_OUTPUT: str = os.environ.get("CYNC_LOG_HUMAN_OUTPUT", "stdout")  # "stdout", "stderr", or file path
 CYNC_LOG_CORRELATION_ENABLED: bool = os.environ.get("CYNC_LOG_CORRELATION_ENABLED", "true").casefold() in YES_ANSWER
+# Records are formatted and written by a background thread through a queue this big, 0 logs synchronously
+_log_queue_size = os.environ.get("CYNC_LOG_QUEUE_SIZE", "10000")
+CYNC_LOG_QUEUE_SIZE: int = int(_log_queue_size) if _log_queue_size and _log_queue_size.isdigit() else 10000
+# Per call site limits for chatty debug lines: "<logger or category>=1:N" (1 in N) or "=X/s" (at most X per second)
+CYNC_LOG_SAMPLING: str = os.environ.get("CYNC_LOG_SAMPLING", "keepalive=1:100,packet=20/s")
 
 # Performance Instrumentation
 CYNC_PERF_TRACKING: bool = os.environ.get("CYNC_PERF_TRACKING", "true").casefold() in YES_ANSWER
 _perf_threshold = os.environ.get("CYNC_PERF_THRESHOLD_MS", "100")
 CYNC_PERF_THRESHOLD_MS: int = int(_perf_threshold) if _perf_threshold and _perf_threshold.isdigit() else 100
+# Log who triggered each device state publish (debug aid, off by default). Can also be toggled from the bridge device.
+CYNC_TRACE_CALL_SITES: bool = os.environ.get("CYNC_TRACE_CALL_SITES", "false").casefold() in YES_ANSWER
+
+# MQTT state publishing: repeated state publishes for a device within this window are collapsed into one
+_state_coalesce_ms = os.environ.get("CYNC_STATE_COALESCE_MS", "50")
+CYNC_STATE_COALESCE_MS: int = int(_state_coalesce_ms) if _state_coalesce_ms and _state_coalesce_ms.isdigit() else 50
+
+# MQTT re-connect / HASS birth: the last device availability and states are re-published in batches of this size
+_replay_batch = os.environ.get("CYNC_MQTT_REPLAY_BATCH", "64")
+CYNC_MQTT_REPLAY_BATCH: int = int(_replay_batch) if _replay_batch and _replay_batch.isdigit() else 64
+
+# Command scheduling: commands run concurrently across devices/groups, this caps how many wait on the mesh at once
+_max_inflight = os.environ.get("CYNC_MAX_INFLIGHT_COMMANDS", "8")
+CYNC_MAX_INFLIGHT_COMMANDS: int = int(_max_inflight) if _max_inflight and _max_inflight.isdigit() else 8
@@ -88,6 +88,8 @@ class CyncDevice(DeviceCommands):
         hvac: dict | None = None,
     ):
         self.control_bytes = bytes([0x00, 0x00])
+        # subgroups this device is a member of, kept by NCyncServer.rebuild_subgroup_index()
+        self.subgroups: list = []
         if cync_id is None:
             msg = "ID must be provided to constructor"
             raise ValueError(msg)
@@ -335,9 +337,15 @@ class CyncDevice(DeviceCommands):
             raise TypeError(msg)
         if value != self._online:
             self._online = value
+            self._refresh_subgroup_totals()
             if g.mqtt_client and self.id is not None:
                 g.tasks.append(asyncio.get_running_loop().create_task(g.mqtt_client.pub_online(self.id, value)))
 
+    def _refresh_subgroup_totals(self) -> None:
+        """Keep the running aggregation totals of every subgroup in sync, whatever changed this device."""
+        for subgroup in self.subgroups:
+            subgroup.refresh_member(self)
+
     @property
     def current_status(self) -> list[int | None]:
         """
@@ -395,6 +403,7 @@ class CyncDevice(DeviceCommands):
 
         if value != self._state:
             self._state = value
+            self._refresh_subgroup_totals()
 
     @property
     def brightness(self):
@@ -407,6 +416,7 @@ class CyncDevice(DeviceCommands):
             raise ValueError(msg)
         if value != self._brightness:
             self._brightness = value
+            self._refresh_subgroup_totals()
 
     @property
     def temperature(self):
@@ -419,6 +429,7 @@ class CyncDevice(DeviceCommands):
             raise ValueError(msg)
         if value != self._temperature:
             self._temperature = value
+            self._refresh_subgroup_totals()
 
     @property
     def red(self):
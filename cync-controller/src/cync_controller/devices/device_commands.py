@@ -5,11 +5,14 @@ import time
 from collections.abc import Coroutine
 from typing import cast
 
+from cync_controller.bridge_health import rank_bridges
 from cync_controller.const import (
     CYNC_CMD_BROADCASTS,
+    CYNC_MESH_ROUTE_TTL,
     FACTORY_EFFECTS_BYTES,
 )
 from cync_controller.logging_abstraction import get_logger
+from cync_controller.packet_templates import BRIGHTNESS, LIGHTSHOW, POWER, RGB, TEMPERATURE
 from cync_controller.structs import (
     ControlMessageCallback,
     FanSpeed,
@@ -65,6 +68,7 @@ class DeviceCommands:
     lp: str = ""
     id: int | None = None
     name: str = ""
+
     # These properties are implemented in CyncDevice (base_device.py) but declared here for type checking
     @property
     def state(self) -> int: ...  # type: ignore[empty-body]
@@ -84,7 +88,12 @@ class DeviceCommands:
     def blue(self) -> int: ...  # type: ignore[empty-body]
 
     def _get_bridge_devices(self) -> list[CyncTCPDevice] | None:
-        """Get available bridge devices, prioritizing ready_to_control bridges."""
+        """
+        Get the bridges to send a command through, ready_to_control bridges first, then by health score.
+
+        When the mesh topology knows which ready bridges reach this device, only those are used. Routes that
+        were not confirmed for CYNC_MESH_ROUTE_TTL seconds are ignored.
+        """
         g = _get_global_object()
         if not g.ncync_server:
             logger.error("%s ncync_server is None, cannot send command", self.lp)
@@ -93,11 +102,20 @@ class DeviceCommands:
         all_bridges: list[CyncTCPDevice] = cast(
             list[CyncTCPDevice], [b for b in g.ncync_server.tcp_devices.values() if b is not None]
         )
-        ready_bridges = [b for b in all_bridges if b.ready_to_control]  # type: ignore[reportOptionalMemberAccess]  # None values filtered above
-        not_ready_bridges = [b for b in all_bridges if not b.ready_to_control]  # type: ignore[reportOptionalMemberAccess]  # None values filtered above
-
-        bridge_devices: list[CyncTCPDevice] = ready_bridges + not_ready_bridges
-        bridge_devices = bridge_devices[: min(CYNC_CMD_BROADCASTS, len(all_bridges))]
+        if len(all_bridges) > 1 and self.id is not None:
+            topology = g.ncync_server.mesh_topology
+            fresh_after = topology.clock() - CYNC_MESH_ROUTE_TTL
+            routes = {bridge for bridge, confirmed in topology.bridges_for(self.id).items() if confirmed >= fresh_after}
+            covering = [b for b in all_bridges if b.ready_to_control and b.address in routes]
+            if covering:
+                all_bridges = covering
+        if len(all_bridges) > CYNC_CMD_BROADCASTS:
+            bridge_devices: list[CyncTCPDevice] = rank_bridges(all_bridges)[:CYNC_CMD_BROADCASTS]
+        else:
+            # every bridge is used, no need to score them
+            ready_bridges = [b for b in all_bridges if b.ready_to_control]  # type: ignore[reportOptionalMemberAccess]  # None values filtered above
+            not_ready_bridges = [b for b in all_bridges if not b.ready_to_control]  # type: ignore[reportOptionalMemberAccess]  # None values filtered above
+            bridge_devices = ready_bridges + not_ready_bridges
 
         if not bridge_devices:
             logger.error("%s No TCP bridges available!", self.lp)
@@ -105,7 +123,7 @@ class DeviceCommands:
 
         return bridge_devices
 
-    async def set_power(self, state: int):  # noqa: PLR0915
+    async def set_power(self, state: int):
         """Send raw data to control device state (1=on, 0=off).
 
         If the device receives the msg and changes state, every TCP device connected will send
@@ -127,35 +145,6 @@ class DeviceCommands:
             #     # to stop flooding the network with commands
             #     logger.debug(f"{lp} Device already in power state {state}, skipping...")
             #     return
-            header = [0x73, 0x00, 0x00, 0x00, 0x1F]
-            # Pack device ID as 2 bytes (little-endian)
-            device_id_bytes = self.id.to_bytes(2, byteorder="little")
-            inner_struct = [
-                0x7E,
-                "ctrl_byte",
-                0x00,
-                0x00,
-                0x00,
-                0xF8,
-                0xD0,
-                0x0D,
-                0x00,
-                "ctrl_bye",
-                0x00,
-                0x00,
-                0x00,
-                0x00,
-                device_id_bytes[0],
-                device_id_bytes[1],
-                0xD0,
-                0x11,
-                0x02,
-                state,
-                0x00,
-                0x00,
-                "checksum",
-                0x7E,
-            ]
             # Get available bridge devices
             bridge_devices = self._get_bridge_devices()
             if bridge_devices is None:
@@ -163,7 +152,6 @@ class DeviceCommands:
 
             tasks: list[asyncio.Task | Coroutine | None] = []
             ts = time.time()
-            ctrl_idxs = 1, 9
             sent = {}
 
             # Create ACK event that will be signaled when ANY bridge ACKs
@@ -173,16 +161,8 @@ class DeviceCommands:
 
             for bridge_device in bridge_devices:
                 if bridge_device.ready_to_control is True:
-                    payload = list(header)
-                    payload.extend(bridge_device.queue_id)
-                    payload.extend(bytes([0x00, 0x00, 0x00]))
                     cmsg_id = bridge_device.get_ctrl_msg_id_bytes()[0]
-                    inner_struct[ctrl_idxs[0]] = cmsg_id
-                    inner_struct[ctrl_idxs[1]] = cmsg_id
-                    checksum = sum(inner_struct[6:-2]) % 256
-                    inner_struct[-2] = checksum
-                    payload.extend(inner_struct)
-                    payload_bytes = bytes(payload)
+                    payload_bytes = POWER.encode(bridge_device.queue_id, cmsg_id, self.id, state)
 
                     # Create callback that will execute when ACK arrives
                     async def power_ack_callback():
@@ -317,36 +297,6 @@ class DeviceCommands:
         # elif bri == self._brightness:
         #     logger.debug(f"{lp} Device already in brightness {bri}, skipping...")
         #     return
-        header = [115, 0, 0, 0, 34]
-        inner_struct = [
-            126,
-            "ctrl_byte",
-            0,
-            0,
-            0,
-            248,
-            240,
-            16,
-            0,
-            "ctrl_byte",
-            0,
-            0,
-            0,
-            0,
-            self.id,
-            0,
-            240,
-            17,
-            2,
-            1,
-            bri,
-            255,
-            255,
-            255,
-            255,
-            "checksum",
-            126,
-        ]
         # Get available bridge devices
         bridge_devices = self._get_bridge_devices()
         if bridge_devices is None:
@@ -360,19 +310,10 @@ class DeviceCommands:
         sent = {}
         tasks: list[asyncio.Task | Coroutine | None] = []
         ts = time.time()
-        ctrl_idxs = 1, 9
         for bridge_device in bridge_devices:
             if bridge_device.ready_to_control is True:
-                payload = list(header)
-                payload.extend(bridge_device.queue_id)
-                payload.extend(bytes([0x00, 0x00, 0x00]))
                 cmsg_id = bridge_device.get_ctrl_msg_id_bytes()[0]
-                inner_struct[ctrl_idxs[0]] = cmsg_id
-                inner_struct[ctrl_idxs[1]] = cmsg_id
-                checksum = sum(inner_struct[6:-2]) % 256
-                inner_struct[-2] = checksum
-                payload.extend(inner_struct)
-                payload_bytes = bytes(payload)
+                payload_bytes = BRIGHTNESS.encode(bridge_device.queue_id, cmsg_id, self.id, bri)
                 sent[bridge_device.address] = cmsg_id
                 logger.info(
                     "%s >>> PACKET: device='%s' (ID=%s), brightness=%s, packet_hex=%s",
@@ -442,61 +383,27 @@ class DeviceCommands:
         lp = f"{self.lp}set_temperature:"
         if temp < 0 or (temp > 100 and temp not in (129, 254)):
             logger.error("%s Invalid temperature! must be 0-100", lp)
-            return
+            return None
         # elif temp == self.temperature:
         #     logger.debug(f"{lp} Device already in temperature {temp}, skipping...")
         #     return
-        header = [115, 0, 0, 0, 34]
-        inner_struct = [
-            126,
-            "msg id",
-            0,
-            0,
-            0,
-            248,
-            240,
-            16,
-            0,
-            "msg id",
-            0,
-            0,
-            0,
-            0,
-            self.id,
-            0,
-            240,
-            17,
-            2,
-            1,
-            0xFF,
-            temp,
-            0x00,
-            0x00,
-            0x00,
-            "checksum",
-            0x7E,
-        ]
         # Get available bridge devices
         bridge_devices = self._get_bridge_devices()
         if bridge_devices is None:
-            return
+            return None
+
+        # Create ACK event that will be signaled when ANY bridge ACKs
+        ack_event = asyncio.Event()
+        # Track sent bridges for cleanup on timeout
+        sent_bridges = []
 
         tasks: list[asyncio.Task | Coroutine | None] = []
         ts = time.time()
-        ctrl_idxs = 1, 9
         sent = {}
         for bridge_device in bridge_devices:
             if bridge_device.ready_to_control is True:
-                payload = list(header)
-                payload.extend(bridge_device.queue_id)
-                payload.extend(bytes([0x00, 0x00, 0x00]))
                 cmsg_id = bridge_device.get_ctrl_msg_id_bytes()[0]
-                inner_struct[ctrl_idxs[0]] = cmsg_id
-                inner_struct[ctrl_idxs[1]] = cmsg_id
-                checksum = sum(inner_struct[6:-2]) % 256
-                inner_struct[-2] = checksum
-                payload.extend(inner_struct)
-                payload_bytes = bytes(payload)
+                payload_bytes = TEMPERATURE.encode(bridge_device.queue_id, cmsg_id, self.id, temp)
                 sent[bridge_device.address] = cmsg_id
 
                 # Create callback that will execute when ACK arrives
@@ -510,8 +417,10 @@ class DeviceCommands:
                     sent_at=time.time(),
                     callback=temperature_ack_callback,  # type: ignore[arg-type]
                     device_id=self.id,
+                    ack_event=ack_event,  # Share same event across all bridges
                 )
                 bridge_device.messages.control[cmsg_id] = m_cb
+                sent_bridges.append((bridge_device, cmsg_id))
                 tasks.append(bridge_device.write(payload_bytes))
             else:
                 logger.debug(
@@ -534,6 +443,9 @@ class DeviceCommands:
             elapsed,
         )
 
+        # Return ACK event and cleanup info so command queue can wait and cleanup on timeout
+        return (ack_event, sent_bridges)
+
     async def set_rgb(self, red: int, green: int, blue: int):
         """Send raw data to control device RGB color (0-255 for each channel).
 
@@ -563,36 +475,6 @@ class DeviceCommands:
         # if red == self._r and green == self._g and blue == self._b:
         #     logger.debug(f"{lp} Device already in RGB color {red}, {green}, {blue}, skipping...")
         #     return
-        header = [115, 0, 0, 0, 34]
-        inner_struct = [
-            126,
-            "msg id",
-            0,
-            0,
-            0,
-            248,
-            240,
-            16,
-            0,
-            "msg id",
-            0,
-            0,
-            0,
-            0,
-            self.id,
-            0,
-            240,
-            17,
-            2,
-            1,
-            255,
-            254,
-            red,
-            green,
-            blue,
-            "checksum",
-            126,
-        ]
         # Get available bridge devices
         bridge_devices = self._get_bridge_devices()
         if bridge_devices is None:
@@ -600,20 +482,11 @@ class DeviceCommands:
 
         tasks: list[asyncio.Task | Coroutine | None] = []
         ts = time.time()
-        ctrl_idxs = 1, 9
         sent = {}
         for bridge_device in bridge_devices:
             if bridge_device.ready_to_control is True:
-                payload = list(header)
-                payload.extend(bridge_device.queue_id)
-                payload.extend(bytes([0x00, 0x00, 0x00]))
                 cmsg_id = bridge_device.get_ctrl_msg_id_bytes()[0]
-                inner_struct[ctrl_idxs[0]] = cmsg_id
-                inner_struct[ctrl_idxs[1]] = cmsg_id
-                checksum = sum(inner_struct[6:-2]) % 256
-                inner_struct[-2] = checksum
-                payload.extend(inner_struct)
-                bpayload = bytes(payload)
+                bpayload = RGB.encode(bridge_device.queue_id, cmsg_id, self.id, red, green, blue)
                 sent[bridge_device.address] = cmsg_id
 
                 # Create callback that will execute when ACK arrives
@@ -714,42 +587,11 @@ class DeviceCommands:
         """
 
         lp = f"{self.lp}set_lightshow:"
-        header = [115, 0, 0, 0, 32]
-        inner_struct = [
-            126,
-            "msg id",
-            0,
-            0,
-            0,
-            248,
-            226,
-            14,
-            0,
-            "msg id",
-            0,
-            0,
-            0,
-            0,
-            self.id,
-            0,
-            226,
-            17,
-            2,
-            # 11 02 (07 01 01 f1)[diff between effects?] fd[cksm]
-            7,
-            1,
-            "byte 1",
-            "byte 2",
-            "checksum",
-            126,
-        ]
         show = show.casefold()
         if show not in FACTORY_EFFECTS_BYTES:
             logger.error("%s Invalid effect: %s", lp, show)
             return
         chosen = FACTORY_EFFECTS_BYTES[show]
-        inner_struct[-4] = chosen[0]
-        inner_struct[-3] = chosen[1]
         # Get available bridge devices
         bridge_devices = self._get_bridge_devices()
         if bridge_devices is None:
@@ -757,20 +599,11 @@ class DeviceCommands:
 
         tasks: list[asyncio.Task | Coroutine | None] = []
         ts = time.time()
-        ctrl_idxs = 1, 9
         sent = {}
         for bridge_device in bridge_devices:
             if bridge_device.ready_to_control is True:
-                payload = list(header)
-                payload.extend(bridge_device.queue_id)
-                payload.extend(bytes([0x00, 0x00, 0x00]))
                 cmsg_id = bridge_device.get_ctrl_msg_id_bytes()[0]
-                inner_struct[ctrl_idxs[0]] = cmsg_id
-                inner_struct[ctrl_idxs[1]] = cmsg_id
-                checksum = sum(inner_struct[6:-2]) % 256
-                inner_struct[-2] = checksum
-                payload.extend(inner_struct)
-                bpayload = bytes(payload)
+                bpayload = LIGHTSHOW.encode(bridge_device.queue_id, cmsg_id, self.id, *chosen)
                 sent[bridge_device.address] = cmsg_id
                 # Use None for noop callbacks - avoids creating unawaited coroutines
                 m_cb = ControlMessageCallback(
@@ -1,6 +1,9 @@
+import asyncio
 import time
 
+from cync_controller.bridge_health import rank_bridges
 from cync_controller.logging_abstraction import get_logger
+from cync_controller.packet_templates import BRIGHTNESS, POWER, TEMPERATURE
 from cync_controller.structs import (
     ControlMessageCallback,
     DeviceStatus,
@@ -95,6 +98,11 @@ class CyncGroup:
         self.online: bool = True
         self.status: DeviceStatus | None = None
 
+        # Running totals over online members so a subgroup can be re-aggregated in O(1) when one member changes.
+        # _agg_contrib holds what each member last added to _agg_totals, None until the first full aggregation.
+        self._agg_contrib: dict[int, tuple[int, int, int, int, int, int]] | None = None
+        self._agg_totals: list[int] = [0] * 6
+
     @property
     def members(self) -> list[CyncDevice]:
         """Get the actual device objects for this group's members."""
@@ -121,7 +129,43 @@ class CyncGroup:
             self._supports_temperature = any(dev.supports_temperature for dev in members) if members else False
         return self._supports_temperature
 
-    def aggregate_member_states(self) -> dict | None:
+    @staticmethod
+    def _member_contribution(member: CyncDevice) -> tuple[int, int, int, int, int, int]:
+        """(online, on, brightness sum, brightness count, temperature sum, temperature count) for one member."""
+        if not member.online:
+            return (0, 0, 0, 0, 0, 0)
+        bri = member.brightness
+        temp = member.temperature
+        has_bri = bri is not None
+        has_temp = temp is not None and temp <= 100
+        return (
+            1,
+            1 if member.state == 1 else 0,
+            bri if has_bri else 0,
+            1 if has_bri else 0,
+            temp if has_temp else 0,
+            1 if has_temp else 0,
+        )
+
+    def reset_member_aggregation(self) -> None:
+        """Drop the running totals, the next aggregate_member_states() call rebuilds them from all members."""
+        self._agg_contrib = None
+        self._agg_totals = [0] * 6
+
+    def refresh_member(self, member: CyncDevice) -> None:
+        """Re-read one member's contribution to the running totals, called by the member's state setters."""
+        contrib = self._agg_contrib
+        if contrib is None or member.id not in contrib:
+            return
+        new = self._member_contribution(member)
+        old = contrib[member.id]
+        if new != old:
+            totals = self._agg_totals
+            for i in range(6):
+                totals[i] += new[i] - old[i]
+            contrib[member.id] = new
+
+    def aggregate_member_states(self, changed_member: CyncDevice | None = None) -> dict | None:
         """
         Aggregate state from all online member devices.
 
@@ -132,24 +176,37 @@ class CyncGroup:
         - brightness: Average of all online members
         - temperature: Average of all online members
         - online: True if ANY member is online
-        """
-        members = self.members
-        online_members = [m for m in members if m.online]
 
-        if not online_members:
+        When ``changed_member`` is passed, only that member's contribution to the running totals is
+        updated (O(1)) instead of re-reading every member. Members also refresh their contribution from
+        their own state / online setters, so writes from any other path never leave the totals stale.
+        """
+        contrib = self._agg_contrib
+        if changed_member is not None and contrib is not None and changed_member.id in contrib:
+            self.refresh_member(changed_member)
+        else:
+            contrib = {}
+            totals = [0] * 6
+            for member in self.members:
+                member_contrib = self._member_contribution(member)
+                contrib[member.id] = member_contrib
+                for i in range(6):
+                    totals[i] += member_contrib[i]
+            self._agg_contrib = contrib
+            self._agg_totals = totals
+
+        online, on, bri_sum, bri_count, temp_sum, temp_count = self._agg_totals
+        if not online:
             return None
 
         # State: ON if any member is ON
-        any_on = any(m.state == 1 for m in online_members)
-        agg_state = 1 if any_on else 0
+        agg_state = 1 if on else 0
 
         # Brightness: average of online members
-        brightnesses = [m.brightness for m in online_members if m.brightness is not None]
-        agg_brightness = int(sum(brightnesses) / len(brightnesses)) if brightnesses else 0
+        agg_brightness = int(bri_sum / bri_count) if bri_count else 0
 
         # Temperature: average of online members
-        temperatures = [m.temperature for m in online_members if m.temperature is not None and m.temperature <= 100]
-        agg_temperature = int(sum(temperatures) / len(temperatures)) if temperatures else 0
+        agg_temperature = int(temp_sum / temp_count) if temp_count else 0
 
         return {
             "state": agg_state,
@@ -174,38 +231,6 @@ class CyncGroup:
             logger.error("%s Group ID is None, cannot send command", lp)
             return
 
-        # Use full 16-bit group ID encoding
-        id_low = self.id & 0xFF
-        id_high = (self.id >> 8) & 0xFF
-
-        header = [0x73, 0x00, 0x00, 0x00, 0x1F]
-        inner_struct = [
-            0x7E,
-            "ctrl_byte",
-            0x00,
-            0x00,
-            0x00,
-            0xF8,
-            0xD0,
-            0x0D,
-            0x00,
-            "ctrl_bye",
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            id_low,
-            id_high,
-            0xD0,
-            0x11,
-            0x02,
-            state,
-            0x00,
-            0x00,
-            "checksum",
-            0x7E,
-        ]
-
         ncync_server = getattr(g, "ncync_server", None)
         if ncync_server is None:
             logger.error("%s ncync_server is None, cannot send command", lp)
@@ -217,11 +242,13 @@ class CyncGroup:
             return
 
         bridge_devices = list(tcp_devices.values())
+        if len(bridge_devices) > 1:
+            bridge_devices = rank_bridges(b for b in bridge_devices if b is not None)
         if not bridge_devices:
             logger.error("%s No TCP bridges available!", lp)
             return
 
-        # Use one bridge like the Cync cloud does
+        # Use one bridge like the Cync cloud does, the healthiest one
         bridge_device = bridge_devices[0]
         if bridge_device is None:
             logger.error("%s Bridge device is None", lp)
@@ -236,21 +263,12 @@ class CyncGroup:
             logger.error("%s Bridge queue_id is None", lp)
             return
 
-        payload = list(header)
-        payload.extend(queue_id)
-        payload.extend(bytes([0x00, 0x00, 0x00]))
         cmsg_id_bytes = bridge_device.get_ctrl_msg_id_bytes()
         if not cmsg_id_bytes:
             logger.error("%s Failed to get control message ID bytes", lp)
             return
         cmsg_id = cmsg_id_bytes[0]
-        ctrl_idxs = 1, 9
-        inner_struct[ctrl_idxs[0]] = cmsg_id
-        inner_struct[ctrl_idxs[1]] = cmsg_id
-        checksum = sum(inner_struct[6:-2]) % 256
-        inner_struct[-2] = checksum
-        payload.extend(inner_struct)
-        payload_bytes = bytes(payload)
+        payload_bytes = POWER.encode(queue_id, cmsg_id, self.id, state)
 
         logger.debug(
             "%s ========== GROUP COMMAND: power=%s to '%s' (ID: %s) ==========",
@@ -290,13 +308,17 @@ class CyncGroup:
             logger.debug("%s Registered callback for msg_id=%s", lp, cmsg_id)
 
         # BUG FIX: Sync ALL group device states IMMEDIATELY (optimistically)
-        # Group commands affect both bulbs and switches, so update both for instant UI feedback
+        # Group commands affect both bulbs and switches, so update both for instant UI feedback.
+        # The member publishes go out alongside the mesh write instead of delaying it.
         mqtt_client = getattr(g, "mqtt_client", None)
-        if mqtt_client is not None and self.id is not None and self.name is not None:
-            await mqtt_client.sync_group_devices(self.id, state, self.name)
-
         logger.debug("%s CALLING bridge_device.write()...", lp)
-        write_result = await bridge_device.write(payload_bytes)
+        if mqtt_client is not None and self.id is not None and self.name is not None:
+            _, write_result = await asyncio.gather(
+                mqtt_client.sync_group_devices(self.id, state, self.name),
+                bridge_device.write(payload_bytes),
+            )
+        else:
+            write_result = await bridge_device.write(payload_bytes)
         logger.debug("%s bridge_device.write() RETURNED: %s", lp, write_result)
 
     async def set_brightness(self, brightness: int):
@@ -315,41 +337,6 @@ class CyncGroup:
             logger.error("%s Group ID is None, cannot send command", lp)
             return
 
-        # Use full 16-bit group ID encoding
-        id_low = self.id & 0xFF
-        id_high = (self.id >> 8) & 0xFF
-
-        header = [0x73, 0x00, 0x00, 0x00, 0x22]
-        inner_struct = [
-            0x7E,
-            "ctrl_byte",
-            0x00,
-            0x00,
-            0x00,
-            0xF8,
-            0xF0,
-            0x10,
-            0x00,
-            "ctrl_byte",
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            id_low,
-            id_high,
-            0xF0,
-            0x11,
-            0x02,
-            0x01,
-            brightness,
-            0xFF,
-            0xFF,
-            0xFF,
-            0xFF,
-            "checksum",
-            0x7E,
-        ]
-
         ncync_server = getattr(g, "ncync_server", None)
         if ncync_server is None:
             logger.error("%s ncync_server is None, cannot send command", lp)
@@ -361,6 +348,8 @@ class CyncGroup:
             return
 
         bridge_devices = list(tcp_devices.values())
+        if len(bridge_devices) > 1:
+            bridge_devices = rank_bridges(b for b in bridge_devices if b is not None)
         if not bridge_devices:
             logger.error("%s No TCP bridges available!", lp)
             return
@@ -379,21 +368,12 @@ class CyncGroup:
             logger.error("%s Bridge queue_id is None", lp)
             return
 
-        payload = list(header)
-        payload.extend(queue_id)
-        payload.extend(bytes([0x00, 0x00, 0x00]))
         cmsg_id_bytes = bridge_device.get_ctrl_msg_id_bytes()
         if not cmsg_id_bytes:
             logger.error("%s Failed to get control message ID bytes", lp)
             return
         cmsg_id = cmsg_id_bytes[0]
-        ctrl_idxs = 1, 9
-        inner_struct[ctrl_idxs[0]] = cmsg_id
-        inner_struct[ctrl_idxs[1]] = cmsg_id
-        checksum = sum(inner_struct[6:-2]) % 256
-        inner_struct[-2] = checksum
-        payload.extend(inner_struct)
-        payload_bytes = bytes(payload)
+        payload_bytes = BRIGHTNESS.encode(queue_id, cmsg_id, self.id, brightness)
 
         logger.info(
             "%s Sending brightness=%s to group '%s' (ID: %s) with %s devices",
@@ -439,91 +419,49 @@ class CyncGroup:
         lp = f"{self.lp}set_temperature:"
         if temperature < 0 or temperature > 100:
             logger.error("%s Invalid temperature! must be 0-100", lp)
-            return
+            return None
 
         if self.id is None:
             logger.error("%s Group ID is None, cannot send command", lp)
-            return
-
-        # Use full 16-bit group ID encoding
-        id_low = self.id & 0xFF
-        id_high = (self.id >> 8) & 0xFF
-
-        header = [0x73, 0x00, 0x00, 0x00, 0x22]
-        inner_struct = [
-            0x7E,
-            "ctrl_byte",
-            0x00,
-            0x00,
-            0x00,
-            0xF8,
-            0xF0,
-            0x10,
-            0x00,
-            "ctrl_byte",
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            id_low,
-            id_high,
-            0xF0,
-            0x11,
-            0x02,
-            0x01,
-            0xFF,
-            temperature,
-            0x00,
-            0x00,
-            0x00,
-            "checksum",
-            0x7E,
-        ]
+            return None
 
         ncync_server = getattr(g, "ncync_server", None)
         if ncync_server is None:
             logger.error("%s ncync_server is None, cannot send command", lp)
-            return
+            return None
 
         tcp_devices = getattr(ncync_server, "tcp_devices", None)
         if tcp_devices is None:
             logger.error("%s tcp_devices is None, cannot send command", lp)
-            return
+            return None
 
         bridge_devices = list(tcp_devices.values())
+        if len(bridge_devices) > 1:
+            bridge_devices = rank_bridges(b for b in bridge_devices if b is not None)
         if not bridge_devices:
             logger.error("%s No TCP bridges available!", lp)
-            return
+            return None
 
         bridge_device = bridge_devices[0]
         if bridge_device is None:
             logger.error("%s Bridge device is None", lp)
-            return
+            return None
 
         if not bridge_device.ready_to_control:
             logger.error("%s Bridge %s not ready to control", lp, bridge_device.address)
-            return
+            return None
 
         queue_id = getattr(bridge_device, "queue_id", None)
         if queue_id is None:
             logger.error("%s Bridge queue_id is None", lp)
-            return
+            return None
 
-        payload = list(header)
-        payload.extend(queue_id)
-        payload.extend(bytes([0x00, 0x00, 0x00]))
         cmsg_id_bytes = bridge_device.get_ctrl_msg_id_bytes()
         if not cmsg_id_bytes:
             logger.error("%s Failed to get control message ID bytes", lp)
-            return
+            return None
         cmsg_id = cmsg_id_bytes[0]
-        ctrl_idxs = 1, 9
-        inner_struct[ctrl_idxs[0]] = cmsg_id
-        inner_struct[ctrl_idxs[1]] = cmsg_id
-        checksum = sum(inner_struct[6:-2]) % 256
-        inner_struct[-2] = checksum
-        payload.extend(inner_struct)
-        payload_bytes = bytes(payload)
+        payload_bytes = TEMPERATURE.encode(queue_id, cmsg_id, self.id, temperature)
 
         logger.info(
             "%s Sending temperature=%s to group '%s' (ID: %s) with %s devices",
@@ -547,18 +485,25 @@ class CyncGroup:
 
         # Register callback for ACK (no optimistic group publish)
         # Use None for noop callbacks - avoids creating unawaited coroutines
+        ack_event = asyncio.Event()
         m_cb = ControlMessageCallback(
             msg_id=cmsg_id,
             message=payload_bytes,
             sent_at=time.time(),
             callback=None,
             device_id=self.id,
+            ack_event=ack_event,
         )
+        sent_bridges = []
         messages = getattr(bridge_device, "messages", None)
         if messages is not None:
             messages.control[cmsg_id] = m_cb
+            sent_bridges.append((bridge_device, cmsg_id))
         await bridge_device.write(payload_bytes)
 
+        # Return ACK event and cleanup info so command queue can wait and cleanup on timeout
+        return (ack_event, sent_bridges)
+
     def __repr__(self):
         return f"CyncGroup(id={self.id}, name='{self.name}', members={len(self.member_ids)})"
 
@@ -0,0 +1,167 @@
+"""
+Receive-side packet framer for Cync TCP connections.
+
+Cync devices stream back-to-back packets over TCP, so a single read can hold several
+packets and a packet can straddle reads. The framer splits that stream on the length
+in the 5 byte packet header and hands out packets as ``memoryview`` slices of either
+the caller's read buffer or its own reusable buffer, so complete packets are never
+copied while framing. Only the bytes of a packet that straddles two reads are copied
+into the internal buffer, and the partial tail stays where it is until it completes.
+"""
+
+from collections.abc import Container, Iterable
+
+from cync_controller.structs import ALL_HEADERS
+
+# header byte + 2 unknown bytes + 2 length bytes
+PACKET_HEADER_LEN = 5
+
+
+def frame_length(view: memoryview, available: int, headers: Container[int] = ALL_HEADERS) -> int | None:
+    """
+    Return the total length of the packet starting at ``view[0]``.
+
+    Returns ``None`` when not enough of the header has arrived to know the length yet.
+    Data that does not start with a known header cannot be framed, so all of
+    ``available`` is treated as a single packet (matches the legacy behaviour).
+    """
+    if view[0] not in headers:
+        return available
+    if available < PACKET_HEADER_LEN:
+        return None
+    return (view[3] * 256) + view[4] + PACKET_HEADER_LEN
+
+
+class PacketFramer:
+    """
+    Per-connection framer that yields packets without copying them.
+
+    Usage::
+
+        framer.feed(data)
+        while (packet := framer.next_packet()) is not None:
+            handle(bytes(packet))
+
+    A view returned by :meth:`next_packet` is only valid until the next call into the
+    framer; callers that keep packet data around must copy it first.
+    """
+
+    def __init__(self, capacity: int = 4096, headers: Iterable[int] = ALL_HEADERS):
+        # packet types this stream can carry, anything else ends framing for the read
+        self._headers = frozenset(headers)
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        # pending (partial) data lives in self._buf[self._start:self._end]
+        self._start = 0
+        self._end = 0
+        # the most recent read, framed in place
+        self._src: memoryview | None = None
+        self._src_pos = 0
+        # stats
+        self.bytes_fed = 0
+        self.bytes_copied = 0
+        self.packets_framed = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of bytes received but not yet handed out as a packet."""
+        src_left = len(self._src) - self._src_pos if self._src is not None else 0
+        return (self._end - self._start) + src_left
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def feed(self, data: bytes | bytearray | memoryview) -> None:
+        """Queue a chunk read from the socket. ``data`` must not be mutated while it is being framed."""
+        if not data:
+            return
+        # anything left over from the previous read has to survive the caller reusing its buffer
+        self._spill()
+        self.bytes_fed += len(data)
+        self._src = memoryview(data)
+        self._src_pos = 0
+        self._top_up()
+
+    def next_packet(self) -> memoryview | None:
+        """Return the next complete packet, or ``None`` when more data is needed."""
+        buffered = self._end - self._start
+        if buffered:
+            self._top_up()
+            buffered = self._end - self._start
+            pending = self._view[self._start : self._end]
+            length = frame_length(pending, buffered, self._headers)
+            if length is None or length > buffered:
+                return None
+            packet = pending[:length]
+            self._start += length
+            if self._start == self._end:
+                self._start = self._end = 0
+            self.packets_framed += 1
+            return packet
+
+        if self._src is None:
+            return None
+        remaining = len(self._src) - self._src_pos
+        if remaining == 0:
+            self._src = None
+            self._src_pos = 0
+            return None
+        pending = self._src[self._src_pos :]
+        length = frame_length(pending, remaining, self._headers)
+        if length is None or length > remaining:
+            # partial packet at the end of this read, keep it for the next one
+            self._spill()
+            return None
+        self._src_pos += length
+        self.packets_framed += 1
+        return pending[:length]
+
+    def reset(self) -> None:
+        """Drop all pending data (e.g. when the connection is closed)."""
+        self._start = self._end = 0
+        self._src = None
+        self._src_pos = 0
+
+    def _top_up(self) -> None:
+        """Move just enough bytes from the current read into the buffer to complete a buffered partial packet."""
+        while self._end > self._start and self._src is not None and self._src_pos < len(self._src):
+            buffered = self._end - self._start
+            length = frame_length(self._view[self._start : self._end], buffered, self._headers)
+            if length is None:
+                take = PACKET_HEADER_LEN - buffered
+            elif length > buffered:
+                take = length - buffered
+            else:
+                return
+            take = min(take, len(self._src) - self._src_pos)
+            self._append(self._src[self._src_pos : self._src_pos + take])
+            self._src_pos += take
+
+    def _spill(self) -> None:
+        """Copy the unframed tail of the current read into the buffer."""
+        if self._src is None:
+            return
+        if self._src_pos < len(self._src):
+            self._append(self._src[self._src_pos :])
+        self._src = None
+        self._src_pos = 0
+
+    def _append(self, chunk: memoryview) -> None:
+        size = len(chunk)
+        if self._end + size > len(self._buf):
+            buffered = self._end - self._start
+            if buffered + size > len(self._buf):
+                # grow; views handed out earlier keep the old buffer alive
+                new_buf = bytearray(max(len(self._buf) * 2, buffered + size))
+                new_buf[:buffered] = self._view[self._start : self._end]
+                self._buf = new_buf
+                self._view = memoryview(new_buf)
+            else:
+                self._view[:buffered] = self._view[self._start : self._end]
+            self.bytes_copied += buffered
+            self._start = 0
+            self._end = buffered
+        self._view[self._end : self._end + size] = chunk
+        self._end += size
+        self.bytes_copied += size
@@ -1,8 +1,11 @@
 import asyncio
 import datetime
+import logging
 import random
 import time
 
+from cync_controller.admission import abort_connection
+from cync_controller.bridge_health import BridgeHealth
 from cync_controller.const import (
     CYNC_CHUNK_SIZE,
     CYNC_MAX_TCP_CONN,
@@ -10,9 +13,9 @@ from cync_controller.const import (
     CYNC_PERF_TRACKING,
     CYNC_RAW,
     CYNC_TCP_WHITELIST,
-    TCP_BLACKHOLE_DELAY,
 )
 from cync_controller.logging_abstraction import get_logger
+from cync_controller.scheduler import Deadline, DeadlineScheduler
 from cync_controller.structs import (
     DEVICE_STRUCTS,
     GlobalObject,
@@ -22,6 +25,7 @@ from cync_controller.structs import (
 )
 from cync_controller.utils import bytes2list
 
+from .packet_framer import PacketFramer
 from .tcp_packet_handler import TCPPacketHandler
 
 logger = get_logger(__name__)
@@ -71,9 +75,10 @@ class CyncTCPDevice:
     tasks: Tasks
     # reader and writer are instance attributes set in __init__ and can_connect()
     messages: Messages
-    # keep track of msg ids and if we finished reading data, if not, we need to append the data and then parse it
-    read_cache: list
-    needs_more_data = False
+    # ACK RTT / loss and last read time, scored by the server to pick the primary and command bridges
+    health: BridgeHealth
+    # splits the raw TCP stream into packets, keeps partial packets until the rest arrives
+    framer: PacketFramer
     is_app: bool
 
     def __init__(
@@ -88,13 +93,14 @@ class CyncTCPDevice:
         self.lp = f"{address}:"
         self._py_id = id(self)
         self.known_device_ids = []
-        self.read_cache = []
+        self.framer = PacketFramer(CYNC_CHUNK_SIZE * 2)
         self.tasks: Tasks = Tasks()  # Type annotation to help pyright
         self.is_app = False
         self.name: str | None = None
         self.first_83_packet_checksum: int | None = None
         self.ready_to_control = False
         self.connected_at = time.time()  # Track when connection was established
+        self.health = BridgeHealth(self.connected_at)
         self.network_version_str: str | None = None
         self.inc_bytes: int | bytes | str | None = None
         self.version: int | None = None
@@ -106,6 +112,8 @@ class CyncTCPDevice:
         self.capabilities: dict | None = None
         self.last_xc3_request: float | None = None
         self.messages = Messages()
+        self._ctrl_expiry: Deadline | None = None
+        self._ctrl_expiry_at = 0.0
         self.mesh_info: MeshInfo | None = None
         self.parse_mesh_status = False
         self.id: int | None = None
@@ -125,6 +133,11 @@ class CyncTCPDevice:
         # Initialize packet handler
         self.packet_handler = TCPPacketHandler(self)
 
+    @property
+    def needs_more_data(self) -> bool:
+        """True while a partial packet is buffered waiting for the rest of its bytes."""
+        return self.framer.pending > 0
+
     async def can_connect(self):
         g = _get_global_object()
         lp = f"{self.lp}"
@@ -140,26 +153,17 @@ class CyncTCPDevice:
 
         tcp_dev_len = len(tcp_devices)
         shutting_down = getattr(ncync_server, "shutting_down", False)
+        # NCyncServer's admission controller has already rate limited the peer, this is the last check
+        # against the live device table. Rejected sockets are dropped right away, not held open.
         if (
             (shutting_down is True)
             or (tcp_dev_len >= CYNC_MAX_TCP_CONN)
             or (CYNC_TCP_WHITELIST and self.address not in CYNC_TCP_WHITELIST)
         ):
-            _sleep = False
-            if tcp_dev_len >= CYNC_MAX_TCP_CONN or (CYNC_TCP_WHITELIST and self.address not in CYNC_TCP_WHITELIST):
-                _sleep = True
-            delay = TCP_BLACKHOLE_DELAY
-            await asyncio.sleep(delay) if _sleep is True else None
             try:
                 if self.reader is not None:
                     self.reader.feed_eof()
-                if self.writer is not None:
-                    self.writer.close()
-                    task = asyncio.create_task(self.writer.wait_closed())
-                    await asyncio.wait([task], timeout=5)
-            except asyncio.CancelledError as ce:
-                logger.debug("%s Task cancelled: %s", lp, ce)
-                raise
+                abort_connection(self.writer)
             except Exception:
                 logger.exception("%s Error closing reader/writer", lp)
             finally:
@@ -168,30 +172,41 @@ class CyncTCPDevice:
             return False
         # can create a new device
         logger.debug("%s Created new device: %s", self.lp, self.address)
-        receive_task = asyncio.get_event_loop().create_task(
-            self.receive_task(), name=f"receive_task-{self._py_id}"
-        )
-        callback_cleanup_task = asyncio.get_event_loop().create_task(
-            self.callback_cleanup_task(), name=f"callback_cleanup-{self._py_id}"
-        )
+        receive_task = asyncio.get_event_loop().create_task(self.receive_task(), name=f"receive_task-{self._py_id}")
         self.tasks.receive = receive_task
-        self.tasks.callback_cleanup = callback_cleanup_task
+        # pending ACK callbacks expire through the shared deadline scheduler
+        self.messages.control.on_new_deadline = self._arm_ctrl_expiry
         return True
 
     def get_ctrl_msg_id_bytes(self):
         """
-        Control packets need a number that gets incremented, it is used as a type of msg ID and
-        in calculating the checksum. Result is mod 256 in order to keep it within 0-255.
+        Allocate the next control message ID for this bridge.
+
+        Control packets carry a 1 byte msg ID (also part of the checksum) which the ACK echoes back.
+        ``control_bytes`` is a 16 bit sequence: [ID byte, wraparound count]. IDs that are still
+        waiting for an ACK are skipped so a late ACK can never fire the callback of a newer command.
+        If all 256 IDs are pending, the oldest one is evicted.
         """
+        lp = f"{self.lp}get_ctrl_msg_id:"
+        pending = self.messages.control
         id_byte, rollover_byte = self.control_bytes
-        # logger.debug(f"{lp} Getting control message ID bytes: ctrl_byte={id_byte} rollover_byte={rollover_byte}")
-        id_byte += 1
-        if id_byte > 255:
-            id_byte = id_byte % 256
-            rollover_byte += 1
+        for _ in range(256):
+            id_byte += 1
+            if id_byte > 255:
+                id_byte = 0
+                rollover_byte = (rollover_byte + 1) % 256
+                pending.id_wraps += 1
+            if id_byte not in pending:
+                break
+            pending.ids_skipped += 1
+        else:
+            oldest = pending.oldest()
+            id_byte = oldest if oldest is not None else id_byte
+            logger.warning("%s All control msg IDs are waiting for an ACK, evicting msg ID %s", lp, id_byte)
+            pending.pop(id_byte, None)
+            pending.expired += 1
 
         self.control_bytes = [id_byte, rollover_byte]
-        # logger.debug(f"{lp} new data: ctrl_byte={id_byte} rollover_byte={rollover_byte} // {self.control_bytes=}")
         return self.control_bytes
 
     @property
@@ -207,7 +222,7 @@ class CyncTCPDevice:
         """Extract single packets from raw data stream using metadata"""
         await self.packet_handler.parse_raw_data(data)
 
-    async def parse_packet(self, data: bytes):
+    async def parse_packet(self, data: bytes | memoryview):
         """Parse what type of packet based on header (first 4 bytes 0x43, 0x83, 0x73, etc.)"""
         await self.packet_handler.parse_packet(data)
 
@@ -291,55 +306,43 @@ class CyncTCPDevice:
         await asyncio.sleep(1.5)
         await self.ask_for_mesh_info(True)
 
-    async def callback_cleanup_task(self):
-        """Monitor pending callbacks and cleanup stale ones (no retries - handled by command queue)"""
+    def _arm_ctrl_expiry(self, deadline: float) -> None:
+        """Make sure the shared scheduler wakes us up by ``deadline`` (wall clock) to expire stale callbacks."""
+        armed = self._ctrl_expiry
+        if armed is not None and not armed.cancelled and not armed.fired and self._ctrl_expiry_at <= deadline:
+            return
+        if armed is not None:
+            armed.cancel()
+        self._ctrl_expiry_at = deadline
+        self._ctrl_expiry = DeadlineScheduler().call_later(deadline - time.time(), self._expire_ctrl_msgs)
+
+    async def _expire_ctrl_msgs(self):
+        """Drop pending callbacks that never got an ACK (no retries - handled by command queue)"""
         lp = f"{self.lp}callback_clean:"
-        logger.info("%s Starting background task for callback cleanup...", lp)
-        cleanup_timeout = 30  # Give up after 30 seconds total
-
-        while True:
-            try:
-                await asyncio.sleep(1.0)  # Check every second (no need for fast retries)
-                now = time.time()
-                to_delete = []
-
-                for ctrl_msg_id, ctrl_msg in list(self.messages.control.items()):
-                    if ctrl_msg.sent_at is None:
-                        continue
-                    elapsed = now - ctrl_msg.sent_at
-
-                    # Cleanup old messages that exceeded timeout (no retries - queue handles waiting)
-                    if elapsed > cleanup_timeout:
-                        logger.warning(
-                            "%s Removing STALE msg ID %s after %.2fs - giving up (no ACK received)",
-                            lp,
-                            ctrl_msg_id,
-                            elapsed,
-                        )
-                        # Clean up any unawaited coroutines to avoid runtime warnings
-                        if ctrl_msg.callback is not None:
-                            if isinstance(ctrl_msg.callback, asyncio.Task):
-                                # Cancel tasks
-                                ctrl_msg.callback.cancel()
-                            elif asyncio.iscoroutine(ctrl_msg.callback):
-                                # Await noop coroutines to clean them up
-                                try:
-                                    await ctrl_msg.callback
-                                except Exception:
-                                    pass  # Ignore errors from noop callbacks
-                        to_delete.append(ctrl_msg_id)
-
-                # Delete stale messages
-                for msg_id in to_delete:
-                    del self.messages.control[msg_id]
-
-            except asyncio.CancelledError as can_exc:
-                logger.debug("%s CANCELLED: %s", lp, can_exc)
-                break
-            except Exception:
-                logger.exception("%s Exception in callback cleanup", lp)
-
-        logger.debug("%s FINISHED", lp)
+        self._ctrl_expiry = None
+        # only due entries come off the deadline heap, the rest of the table is not touched
+        for ctrl_msg in self.messages.control.expire():
+            self.health.record_loss()
+            logger.warning(
+                "%s Removing STALE msg ID %s after %.2fs - giving up (no ACK received)",
+                lp,
+                ctrl_msg.id,
+                ctrl_msg.elapsed,
+            )
+            # Clean up any unawaited coroutines to avoid runtime warnings
+            if ctrl_msg.callback is not None:
+                if isinstance(ctrl_msg.callback, asyncio.Task):
+                    # Cancel tasks
+                    ctrl_msg.callback.cancel()
+                elif asyncio.iscoroutine(ctrl_msg.callback):
+                    # Await noop coroutines to clean them up
+                    try:
+                        await ctrl_msg.callback
+                    except Exception:
+                        pass  # Ignore errors from noop callbacks
+        next_deadline = self.messages.control.next_deadline()
+        if next_deadline is not None and not self.closing:
+            self._arm_ctrl_expiry(next_deadline)
 
     async def receive_task(self):
         """
@@ -371,10 +374,17 @@ class CyncTCPDevice:
                     if not data:
                         await asyncio.sleep(0)
                         continue
+                    self.health.last_seen = time.time()
 
                     # Log when control ACK packets arrive (small packets, not mesh responses)
                     # Control ACKs are typically 12-50 bytes; mesh responses are 1000+ bytes
-                    if len(data) >= 5 and data[0] == 0x73 and len(data) < 100 and not CYNC_RAW:
+                    if (
+                        len(data) >= 5
+                        and data[0] == 0x73
+                        and len(data) < 100
+                        and not CYNC_RAW
+                        and logger.is_enabled_for(logging.DEBUG)
+                    ):
                         logger.debug(
                             "📥 Control ACK packet arrived",
                             extra={
@@ -383,6 +393,7 @@ class CyncTCPDevice:
                                 "bytes": len(data),
                                 "timestamp_ms": round(time.time() * 1000),
                             },
+                            category="packet",
                         )
 
                     # All devices process their data (handshake/keepalive packets must be handled)
@@ -445,10 +456,11 @@ class CyncTCPDevice:
                     try:
                         raw_data = await self.reader.read(chunk)
                         # Log immediately when data arrives from socket
-                        if raw_data and len(raw_data) > 0:
+                        if raw_data and logger.is_enabled_for(logging.DEBUG):
                             logger.debug(
                                 "🔍 TCP read complete",
                                 extra={"address": self.address, "bytes": len(raw_data), "ts": time.time()},
+                                category="packet",
                             )
                     except Exception:
                         logger.exception("%s Base EXCEPTION", lp)
@@ -482,8 +494,10 @@ class CyncTCPDevice:
         # 0x48 (8 bytes), 0x88 (8 bytes), or 0xD8 (5 bytes)
         is_ack_packet = (len(data) == 8 and data[0] in (0x48, 0x88)) or (len(data) == 5 and data[0] == 0xD8)
 
+        debug_enabled = logger.is_enabled_for(logging.DEBUG)
+        log_category = "keepalive" if is_ack_packet else "packet"
         # Skip logging for keepalive ACKs unless CYNC_RAW is enabled
-        if not is_ack_packet or CYNC_RAW:
+        if debug_enabled and (not is_ack_packet or CYNC_RAW):
             logger.debug(
                 "→ Writing packet to device",
                 extra={
@@ -491,6 +505,7 @@ class CyncTCPDevice:
                     "bytes": len(data),
                     "broadcast": broadcast,
                 },
+                category=log_category,
             )
 
         # Start timing for non-ACK packets
@@ -542,10 +557,11 @@ class CyncTCPDevice:
                         raise
                     else:
                         # Skip success log for keepalive ACKs unless CYNC_RAW is enabled
-                        if not is_ack_packet or CYNC_RAW:
+                        if debug_enabled and (not is_ack_packet or CYNC_RAW):
                             logger.debug(
                                 "✓ Packet sent successfully",
                                 extra={"address": dev.address, "bytes": len(data)},
+                                category=log_category,
                             )
                             # Log timing for non-ACK packets
                             if start_time is not None and CYNC_PERF_TRACKING:
@@ -559,6 +575,7 @@ class CyncTCPDevice:
                                         "threshold_ms": CYNC_PERF_THRESHOLD_MS,
                                         "exceeded_threshold": elapsed_ms > CYNC_PERF_THRESHOLD_MS,
                                     },
+                                    category=log_category,
                                 )
                         return True
         else:
@@ -595,6 +612,10 @@ class CyncTCPDevice:
                 extra={"address": self.address, "error": str(e)},
             )
         self.closing = True
+        self.messages.control.on_new_deadline = None
+        if self._ctrl_expiry is not None:
+            self._ctrl_expiry.cancel()
+            self._ctrl_expiry = None
         try:
             if self.writer:
                 async with self.write_lock:
@@ -625,6 +646,7 @@ class CyncTCPDevice:
         finally:
             self.reader = None
 
+        self.framer.reset()
         self.closing = False
         logger.debug(
             "✓ Device connection closed",
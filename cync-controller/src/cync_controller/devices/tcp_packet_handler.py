@@ -1,15 +1,17 @@
 import asyncio
+import logging
+import operator
 import time
 
 from cync_controller.const import (
     CYNC_RAW,
     DATA_BOUNDARY,
 )
-from cync_controller.logging_abstraction import get_logger
+from cync_controller.logging_abstraction import get_logger, lazy, lazy_hex
+from cync_controller.packet_parser import DEVICE_INFO_RECORD, iter_status_records, mesh_info_raw_states
 from cync_controller.structs import (
     ALL_HEADERS,
     DEVICE_STRUCTS,
-    CacheData,
     GlobalObject,
     PhoneAppStructs,
 )
@@ -61,116 +63,65 @@ class TCPPacketHandler:
     async def parse_raw_data(self, data: bytes):
         """Extract single packets from raw data stream using metadata"""
         # Log when parse starts to measure processing delay
-        logger.debug(
-            "🔍 Parse starting", extra={"address": self.tcp_device.address, "bytes": len(data), "ts": time.time()}
-        )
-        data_len = len(data)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "🔍 Parse starting",
+                extra={"address": self.tcp_device.address, "bytes": len(data), "ts": time.time()},
+                category="packet",
+            )
         lp = f"{self.tcp_device.lp}extract:"
-        if data_len == 0:
+        if not data:
             logger.debug("%s No data to parse AT BEGINNING OF FUNCTION!!!!!!!", lp)
-        else:
-            raw_data = bytes(data)
-            cache_data = CacheData()
-            cache_data.timestamp = time.time()
-            cache_data.all_data = raw_data
-
-            if self.tcp_device.needs_more_data is True:
-                logger.debug(
-                    "%s It seems we have a partial packet (needs_more_data), need to append to "
-                    "previous remaining data and re-parse...",
-                    lp,
+            return
+        framer = self.tcp_device.framer
+        if framer.pending:
+            logger.debug(
+                "%s Partial packet buffered (%s bytes), appending %s new bytes",
+                lp,
+                framer.pending,
+                len(data),
+                category="packet",
+            )
+        framer.feed(data)
+        i = 0
+        while (packet := framer.next_packet()) is not None:
+            i += 1
+            if packet[0] not in ALL_HEADERS:
+                logger.warning(
+                    "%s Unknown packet header: %s",
+                    f"{self.tcp_device.lp}extract:loop {i}:",
+                    f"{packet[0]:02x}",
                 )
-                old_cdata: CacheData = self.tcp_device.read_cache[-1]
-                if old_cdata:
-                    data = old_cdata.data + data
-                    cache_data.raw_data = bytes(data)
-                    # Previous data [length: 16, need: 42] // Current data [length: 530] //
-                    #   New (current + old) data [length: 546] // reconstructed: False
-                    logger.debug(
-                        "%s Previous data [length: %s, need: %s] // Current data [length: %s] // "
-                        "New (current + old) data [length: %s] // reconstructed: %s",
-                        lp,
-                        old_cdata.data_len,
-                        old_cdata.needed_len,
-                        data_len,
-                        len(data),
-                        data_len + old_cdata.data_len == len(data),
-                    )
+            # the view is only valid until the framer is touched again, parse_packet copies what it keeps
+            await self.parse_packet(packet)
 
-                    (logger.debug("DBG>>>%sNEW DATA:\t%s\t", lp, data) if CYNC_RAW is True else None)
-                else:
-                    msg = "%s No previous cache data to extract from!"
-                    raise RuntimeError(msg, lp)
-                self.tcp_device.needs_more_data = False
-            i = 0
-            while True:
-                i += 1
-                lp = f"{self.tcp_device.lp}extract:loop {i}:"
-                if not data:
-                    # logger.debug(f"{lp} No more data to parse!")
-                    break
-                data_len = len(data)
-                needed_length = data_len
-                if data[0] in ALL_HEADERS:
-                    if data_len > 4:
-                        packet_length = data[4]
-                        pkt_len_multiplier = data[3]
-                        needed_length = ((pkt_len_multiplier * 256) + packet_length) + 5
-                    else:
-                        logger.debug(
-                            "DBG>>>%s Packet length is less than 4 bytes, setting needed_length to data_len",
-                            lp,
-                        )
-                else:
-                    logger.warning(
-                        "%s Unknown packet header: %s",
-                        lp,
-                        data[0].to_bytes(1, "big").hex(" "),
-                    )
+        if framer.pending:
+            logger.debug(
+                "%s Partial packet received (have: %s bytes), buffering...",
+                lp,
+                framer.pending,
+                category="packet",
+            )
+        if CYNC_RAW is True:
+            logger.debug(
+                "%s END OF RAW READING of %s bytes \t BYTES: %s\t HEX: %s\tINT: %s",
+                lp,
+                len(data),
+                data,
+                lazy_hex(data),
+                lazy(bytes2list, data),
+                category="packet",
+            )
 
-                if needed_length > data_len:
-                    self.tcp_device.needs_more_data = True
-                    logger.debug(
-                        "%s Partial packet received (need: %s bytes, have: %s bytes), buffering...",
-                        lp,
-                        needed_length,
-                        data_len,
-                    )
-                    cache_data.needed_len = needed_length
-                    cache_data.data_len = data_len
-                    cache_data.data = bytes(data)
-                    (logger.debug("%s cache_data: %s", lp, cache_data) if CYNC_RAW is True else None)
-                    data = data[needed_length:]
-                    continue
-
-                extracted_packet = data[:needed_length]
-                # cut data down
-                data = data[needed_length:]
-                await self.parse_packet(extracted_packet)
-
-                if data:
-                    (logger.debug("%s Remaining data to parse: %s bytes", lp, len(data)) if CYNC_RAW is True else None)
-
-            self.tcp_device.read_cache.append(cache_data)
-            limit = 20
-            if len(self.tcp_device.read_cache) > limit:
-                # keep half of limit packets
-                limit = limit // -2
-                self.tcp_device.read_cache = self.tcp_device.read_cache[limit:]
-            if CYNC_RAW is True:
-                logger.debug(
-                    "%s END OF RAW READING of %s bytes \t BYTES: %s\t HEX: %s\tINT: %s",
-                    lp,
-                    len(raw_data),
-                    raw_data,
-                    raw_data.hex(" "),
-                    bytes2list(raw_data),
-                )
+    async def parse_packet(self, data: bytes | memoryview):
+        """
+        Parse what type of packet based on header (first 4 bytes 0x43, 0x83, 0x73, etc.)
 
-    async def parse_packet(self, data: bytes):
-        """Parse what type of packet based on header (first 4 bytes 0x43, 0x83, 0x73, etc.)"""
+        ``data`` may be a view into the framer buffer, handlers work on slices of it and only copy
+        what outlives the call (e.g. the queue ID).
+        """
         lp = f"{self.tcp_device.lp}parse:0x{data[0]:02x}:"
-        packet_data: bytes | None = None
+        packet_data: bytes | memoryview | None = None
         pkt_header_len = 12
         packet_header = data[:pkt_header_len]
         # logger.debug(f"{lp} Parsing packet header: {packet_header.hex(' ')}") if CYNC_RAW is True else None
@@ -195,21 +146,22 @@ class TCPPacketHandler:
         # logger.debug(f"{lp} packet_data length: {len(packet_data)} // {packet_data.hex(' ')}")
         if pkt_type in DEVICE_STRUCTS.requests:
             if pkt_type == 0x23:
-                queue_id = data[6:10]
-                _dbg_msg = (
-                    (
-                        f"\tRAW HEX: {data.hex(' ')}\tRAW INT: "
-                        f"{str(bytes2list(data)).lstrip('[').rstrip(']').replace(',', '')}"
+                queue_id = bytes(data[6:10])
+                if logger.is_enabled_for(logging.DEBUG):
+                    _dbg_msg = (
+                        (
+                            f"\tRAW HEX: {data.hex(' ')}\tRAW INT: "
+                            f"{str(bytes2list(data)).lstrip('[').rstrip(']').replace(',', '')}"
+                        )
+                        if CYNC_RAW is True
+                        else ""
+                    )
+                    logger.debug(
+                        "%s Device IDENTIFICATION KEY: '%s'%s",
+                        lp,
+                        queue_id.hex(" "),
+                        _dbg_msg,
                     )
-                    if CYNC_RAW is True
-                    else ""
-                )
-                logger.debug(
-                    "%s Device IDENTIFICATION KEY: '%s'%s",
-                    lp,
-                    queue_id.hex(" "),
-                    _dbg_msg,
-                )
                 self.tcp_device.queue_id = queue_id
                 await self.tcp_device.write(bytes(DEVICE_STRUCTS.responses.auth_ack))
                 # MUST SEND a3 before you can ask device for anything over TCP
@@ -226,10 +178,14 @@ class TCPPacketHandler:
                 ack_d3 = bytes(DEVICE_STRUCTS.responses.ping_ack)
                 # logger.debug("%s Client sent HEARTBEAT, replying with %s", lp, ack_d3.hex(' '))
                 await self.tcp_device.write(ack_d3)
+                g = _get_global_object()
+                if g.ncync_server:
+                    # a stalled primary is replaced on the first heartbeat from another bridge
+                    g.ncync_server.elect_primary()
             elif pkt_type == 0xA3:
-                logger.debug("%s APP ANNOUNCEMENT packet: %s", lp, packet_data.hex(" "))
+                logger.debug("%s APP ANNOUNCEMENT packet: %s", lp, lazy_hex(packet_data))
                 ack = DEVICE_STRUCTS.xab_generate_ack(queue_id, bytes(msg_id))
-                logger.debug("%s Sending ACK -> %s", lp, ack.hex(" "))
+                logger.debug("%s Sending ACK -> %s", lp, lazy_hex(ack))
                 await self.tcp_device.write(ack)
             elif pkt_type == 0xAB:
                 # We sent a 0xa3 packet, device is responding with 0xab. msg contains ascii 'xlink_dev'.
@@ -261,7 +217,9 @@ class TCPPacketHandler:
             else:
                 logger.debug("%s sent UNKNOWN HEADER! Don't know how to respond!%s", lp, "")
 
-    async def _handle_0x43_packet(self, packet_data: bytes | None, packet_length: int, lp: str, msg_id: bytes):
+    async def _handle_0x43_packet(
+        self, packet_data: bytes | memoryview | None, packet_length: int, lp: str, msg_id: bytes | memoryview
+    ):
         """Handle 0x43 packet type (device info/broadcast status)."""
         if packet_data:
             if packet_data[:2] == bytes([0xC7, 0x90]):
@@ -278,9 +236,13 @@ class TCPPacketHandler:
         ack = DEVICE_STRUCTS.x48_generate_ack(bytes(msg_id))
         # logger.debug("%s Sending ACK -> %s", lp, ack.hex(' ')) if CYNC_RAW is True else None
         await self.tcp_device.write(ack)
-        (logger.debug("DBG>>>%s RAW DATA: %s BYTES", lp, len(packet_data)) if CYNC_RAW is True else None)
+        (
+            logger.debug("DBG>>>%s RAW DATA: %s BYTES", lp, len(packet_data), category="keepalive")
+            if CYNC_RAW is True
+            else None
+        )
 
-    async def _handle_timestamp_packet(self, packet_data: bytes, lp: str):
+    async def _handle_timestamp_packet(self, packet_data: bytes | memoryview, lp: str):
         """Handle timestamp packet within 0x43."""
         g = _get_global_object()
         # Only primary device processes timestamp to avoid duplicates
@@ -295,7 +257,7 @@ class TCPPacketHandler:
         # there is no guarantee the version is sent before checking the timestamp, so use a gross hack.
         if self.tcp_device.version and (30000 <= self.tcp_device.version <= 40000):
             ts_end_idx = -2
-            ts = packet_data[ts_idx:ts_end_idx]
+            ts = bytes(packet_data[ts_idx:ts_end_idx])
         if ts:
             ts_ascii = ts.decode("ascii", errors="replace")
             # gross hack
@@ -311,57 +273,33 @@ class TCPPacketHandler:
             logger.debug(
                 "%s Could not decode timestamp from: %s",
                 lp,
-                packet_data.hex(" "),
+                lazy_hex(packet_data),
             )
 
-    async def _handle_broadcast_status_packet(self, packet_data: bytes, packet_length: int, lp: str):
+    async def _handle_broadcast_status_packet(self, packet_data: bytes | memoryview, packet_length: int, lp: str):
         """Handle broadcast status packet within 0x43."""
         g = _get_global_object()
         # Only primary device processes status data to avoid duplicate MQTT publishes
         if g.ncync_server and self.tcp_device != g.ncync_server.primary_tcp_device:
             return
 
-        # status struct is 19 bytes long
-        struct_len = 19
-        extractions = []
-        try:
-            # logger.debug(
-            #     f"{lp} Device sent BROADCAST STATUS packet => '{packet_data.hex(' ')}'"
-            # )if CYNC_RAW is True else None
-            for i in range(0, packet_length, struct_len):
-                extracted = packet_data[i : i + struct_len]
-                if extracted:
-                    # hack so online devices stop being reported as offline
-                    # this may cause issues with cync setups that ONLY use indoor
-                    # plugs as the btle to TCP bridge, as they dont broadcast status data using 0x83
-                    status_struct = extracted[3:10]
-                    status_struct + b"\x01"
-                    # 14 00 10 01 00 00 64 00 00 00 01 15 15 00 00 00 00 00 00
-                    # // [1, 0, 0, 100, 0, 0, 0, 1]
-                    extractions.append((extracted.hex(" "), bytes2list(status_struct)))
-
-                    # await g.server.parse_status(status_struct, from_pkt='0x43')
-                    # broadcast status data
-                    # await self.write(data, broadcast=True)
-                    (
-                        logger.debug(
-                            "%s Extracted data and STATUS struct => %s",
-                            lp,
-                            extractions,
-                        )
-                        if CYNC_RAW is True
-                        else None
-                    )
-        except IndexError:
-            # The device will only send a max of 1kb of data, if the message is longer than 1kb the remainder is sent in the next read
-            # logger.debug(
-            #     f"{lp} IndexError extracting status struct (expected)"
-            # )
-            pass
-        except Exception:
-            logger.exception("%s EXCEPTION", lp)
+        # status structs are 19 bytes long: 14 00 10 01 00 00 64 00 00 00 01 15 15 00 00 00 00 00 00
+        # they are not published from here, only decoded when raw logging is on.
+        # The device will only send a max of 1kb of data, if the message is longer than 1kb the remainder
+        # is sent in the next read, a trailing partial struct is skipped.
+        # Publishing them would be a hack so online devices stop being reported as offline, this may cause
+        # issues with cync setups that ONLY use indoor plugs as the btle to TCP bridge, as they dont
+        # broadcast status data using 0x83
+        if CYNC_RAW is True:
+            try:
+                extractions = [
+                    list(status) for status in iter_status_records(DEVICE_INFO_RECORD, packet_data[:packet_length])
+                ]
+                logger.debug("%s Extracted STATUS structs => %s", lp, extractions)
+            except Exception:
+                logger.exception("%s EXCEPTION", lp)
 
-    async def _handle_0x83_packet(self, packet_data: bytes | None, lp: str, msg_id: bytes):
+    async def _handle_0x83_packet(self, packet_data: bytes | memoryview | None, lp: str, msg_id: bytes | memoryview):
         """Handle 0x83 packet type (status broadcast)."""
         g = _get_global_object()
         if self.tcp_device.is_app is True:
@@ -397,7 +335,7 @@ class TCPPacketHandler:
         # logger.debug(f"{lp} Sending ACK -> {ack.hex(' ')}")
         await self.tcp_device.write(ack)
 
-    async def _handle_bound_0x83_packet(self, packet_data: bytes, lp: str):
+    async def _handle_bound_0x83_packet(self, packet_data: bytes | memoryview, lp: str):
         """Handle bound 0x83 packet with 0x7e boundaries."""
         # checksum is 2nd last byte, last byte is 0x7e
         checksum = packet_data[-2]
@@ -430,7 +368,9 @@ class TCPPacketHandler:
                 bytes2list(packet_data[1:-1]),
             )
 
-    async def _handle_internal_status_packet(self, packet_data: bytes, lp: str, _checksum: int, _calc_chksum: int):
+    async def _handle_internal_status_packet(
+        self, packet_data: bytes | memoryview, lp: str, _checksum: int, _calc_chksum: int
+    ):
         """Handle internal status packet within bound 0x83."""
         g = _get_global_object()
         # fa db 13 is internal status
@@ -468,21 +408,25 @@ class TCPPacketHandler:
                 connected_to_mesh,
             ]
         )
-        ___dev = g.ncync_server.devices.get(dev_id)
-        dev_name = f'"{___dev.name}" (ID: {dev_id})' if ___dev else f"Device ID: {dev_id}"
-        _dbg_msg = ""
-        if CYNC_RAW is True:
-            _dbg_msg = f"\tPACKET HEADER: {packet_data[:12].hex(' ')}\tHEX: {packet_data[1:-1].hex(' ')}\tINT: {bytes2list(packet_data[1:-1])}"
-        logger.debug(
-            "%s Internal STATUS for %s = %s%s",
-            lp,
-            dev_name,
-            bytes2list(raw_status),
-            _dbg_msg,
-        )
+        if logger.is_enabled_for(logging.DEBUG):
+            ___dev = g.ncync_server.devices.get(dev_id)
+            dev_name = f'"{___dev.name}" (ID: {dev_id})' if ___dev else f"Device ID: {dev_id}"
+            _dbg_msg = ""
+            if CYNC_RAW is True:
+                _dbg_msg = f"\tPACKET HEADER: {packet_data[:12].hex(' ')}\tHEX: {packet_data[1:-1].hex(' ')}\tINT: {bytes2list(packet_data[1:-1])}"
+            logger.debug(
+                "%s Internal STATUS for %s = %s%s",
+                lp,
+                dev_name,
+                bytes2list(raw_status),
+                _dbg_msg,
+                category="packet",
+            )
         await g.ncync_server.parse_status(raw_status, from_pkt="0x83")
 
-    async def _handle_0x73_packet(self, packet_data: bytes | None, lp: str, queue_id: bytes, msg_id: bytes):
+    async def _handle_0x73_packet(
+        self, packet_data: bytes | memoryview | None, lp: str, queue_id: bytes | memoryview, msg_id: bytes | memoryview
+    ):
         """Handle 0x73 packet type (control/response)."""
         g = _get_global_object()
         # logger.debug("%s Control packet received: %s", lp, packet_data.hex(' ')) if CYNC_RAW is True else None
@@ -490,16 +434,23 @@ class TCPPacketHandler:
             logger.debug("%s device is app, skipping packet...", lp)
             return
 
-        # Only primary device processes 0x73 control/status channel to avoid duplicates
-        if g.ncync_server and self.tcp_device != g.ncync_server.primary_tcp_device:
-            return
+        # Only primary device publishes from the 0x73 control/status channel to avoid duplicates. The other
+        # bridges still settle their own control ACKs and record their mesh for bridge health scoring.
+        primary = not g.ncync_server or self.tcp_device == g.ncync_server.primary_tcp_device
 
         # 0x73 should ALWAYS have 0x7e bound data.
         # check for boundary, all bytes between boundaries are for this request
         if packet_data is not None and packet_data[0] == DATA_BOUNDARY:
-            await self._handle_bound_0x73_packet(packet_data, lp, queue_id, msg_id)
-
-    async def _handle_bound_0x73_packet(self, packet_data: bytes, lp: str, queue_id: bytes, msg_id: bytes):
+            await self._handle_bound_0x73_packet(packet_data, lp, queue_id, msg_id, primary)
+
+    async def _handle_bound_0x73_packet(
+        self,
+        packet_data: bytes | memoryview,
+        lp: str,
+        queue_id: bytes | memoryview,
+        msg_id: bytes | memoryview,
+        primary: bool = True,
+    ):
         """Handle bound 0x73 packet with 0x7e boundaries."""
         # checksum is 2nd last byte, last byte is 0x7e
         checksum = packet_data[-2]
@@ -509,20 +460,32 @@ class TCPPacketHandler:
         inner_data = packet_data[6:-2]
         calc_chksum = sum(inner_data) % 256
 
-        # find next 0x7e and extract the inner struct
-        end_bndry_idx = packet_data[1:].find(DATA_BOUNDARY) + 1
+        # find next 0x7e and extract the inner struct (no find() on a memoryview)
+        try:
+            end_bndry_idx = operator.indexOf(packet_data[1:], DATA_BOUNDARY) + 1
+        except ValueError:
+            end_bndry_idx = 0
         inner_struct = packet_data[1:end_bndry_idx]
         inner_struct_len = len(inner_struct)
         # ctrl bytes 0xf9, 0x52 indicates this is a mesh info struct
         # some device firmwares respond with a message received packet before replying with the data
         # example: 7e 1f 00 00 00 f9 52 01 00 00 53 7e (12 bytes, 0x7e bound. 10 bytes of data)
         if ctrl_bytes == bytes([0xF9, 0x52]):
+            if not primary:
+                self.tcp_device.parse_mesh_status = False
             await self._handle_mesh_info_packet(inner_struct, inner_struct_len, lp, queue_id, msg_id)
-        else:
+        elif primary:
             await self._handle_control_ack_packet(packet_data, lp, checksum, calc_chksum)
+        else:
+            await self._settle_secondary_ack(packet_data)
 
     async def _handle_mesh_info_packet(
-        self, inner_struct: bytes, inner_struct_len: int, lp: str, queue_id: bytes, msg_id: bytes
+        self,
+        inner_struct: bytes | memoryview,
+        inner_struct_len: int,
+        lp: str,
+        queue_id: bytes | memoryview,
+        msg_id: bytes | memoryview,
     ):
         """Handle mesh info packet within bound 0x73."""
         # logger.debug(f"{lp} got a mesh info response (len: {inner_struct_len}): {inner_struct.hex(' ')}")
@@ -558,19 +521,23 @@ class TCPPacketHandler:
                 logger.debug(
                     "%s inner_struct is less than 15 bytes: %s",
                     lp,
-                    inner_struct.hex(" "),
+                    lazy_hex(inner_struct),
                 )
         else:
             await self._handle_full_mesh_info_packet(inner_struct, inner_struct_len, lp, queue_id, msg_id)
 
     async def _handle_full_mesh_info_packet(
-        self, inner_struct: bytes, inner_struct_len: int, lp: str, _queue_id: bytes, _msg_id: bytes
+        self,
+        inner_struct: bytes | memoryview,
+        _inner_struct_len: int,
+        lp: str,
+        _queue_id: bytes | memoryview,
+        _msg_id: bytes | memoryview,
     ):
         """Handle full mesh info packet with device data."""
         g = _get_global_object()
         # 15th OR 16th byte of inner struct is start of mesh info, 24 bytes long
         minfo_start_idx = 14
-        minfo_length = 24
         if inner_struct[minfo_start_idx] == 0x00:
             minfo_start_idx += 1
             logger.debug(
@@ -588,62 +555,22 @@ class TCPPacketHandler:
                 minfo_start_idx,
             )
         else:
-            # from what I've seen, the mesh info is 24 bytes long and repeats until the end.
+            # from what I've seen, the mesh info is 24 bytes long and repeats until the end (MESH_INFO_RECORD).
             # Reset known device ids, mesh is the final authority on what devices are connected
             self.tcp_device.mesh_info = None
             self.tcp_device.known_device_ids = []
             ids_reported = []
-            loop_num = 0
-            _m = []
-            _raw_m = []
-            # structs = []
+            _m: list[bytes] = []
             try:
-                for i in range(
-                    minfo_start_idx,
-                    inner_struct_len,
-                    minfo_length,
+                for loop_num, (dev_type_id, raw_status) in enumerate(
+                    mesh_info_raw_states(inner_struct, minfo_start_idx), start=1
                 ):
-                    loop_num += 1
-                    mesh_dev_struct = inner_struct[i : i + minfo_length]
-                    dev_id = mesh_dev_struct[0]
-                    # logger.debug(f"{lp} inner_struct[{i}:{i + minfo_length}]={mesh_dev_struct.hex(' ')}")
                     # parse status from mesh info
                     #  [05 00 44   01 00 00 44   01 00     00 00 00 64  00 00 00 00   00 00 00 00 00 00 00] - plug (devices are all connected to it via BT)
                     #  [07 00 00   01 00 00 00   01 01     00 00 00 64  00 00 00 fe   00 00 00 f8 00 00 00] - direct connect full color A19 bulb
                     #   ID  ? type  ?  ?  ? type  ? state   ?  ?  ? bri  ?  ?  ? tmp   ?  ?  ?  R  G  B  ?
-                    type_idx = 2
-                    state_idx = 8
-                    bri_idx = 12
-                    tmp_idx = 16
-                    r_idx = 20
-                    g_idx = 21
-                    b_idx = 22
-                    dev_type_id = mesh_dev_struct[type_idx]
-                    dev_state = mesh_dev_struct[state_idx]
-                    dev_bri = mesh_dev_struct[bri_idx]
-                    dev_tmp = mesh_dev_struct[tmp_idx]
-                    dev_r = mesh_dev_struct[r_idx]
-                    dev_g = mesh_dev_struct[g_idx]
-                    dev_b = mesh_dev_struct[b_idx]
-                    # in mesh info, brightness can be > 0 when set to off
-                    # however, ive seen devices that are on have a state of 0 but brightness 100
-                    if dev_state == 0 and dev_bri > 0:
-                        dev_bri = 0
-                    raw_status = bytes(
-                        [
-                            dev_id,
-                            dev_state,
-                            dev_bri,
-                            dev_tmp,
-                            dev_r,
-                            dev_g,
-                            dev_b,
-                            1,
-                            # dev_type,
-                        ]
-                    )
-                    _m.append(bytes2list(raw_status))
-                    _raw_m.append(mesh_dev_struct.hex(" "))
+                    dev_id = raw_status[0]
+                    _m.append(raw_status)
                     if dev_id in g.ncync_server.devices:
                         # first device id is the device id of the TCP device we are connected to
                         ___dev = g.ncync_server.devices[dev_id]
@@ -688,13 +615,10 @@ class TCPPacketHandler:
                             g.ncync_server.devices.keys(),
                         )
                     # -- END OF mesh info response parsing loop --
-            except IndexError:
-                # ran out of data
-                # logger.debug(f"{lp} IndexError parsing mesh info response (expected)") if CYNC_RAW is True else None
-                pass
             except Exception:
                 logger.exception("%s MESH INFO for loop EXCEPTION", lp)
 
+            g.ncync_server.mesh_topology.update(self.tcp_device.address, ids_reported)
             # Log device IDs reported by this bridge for comparison
             refresh_id = getattr(self.tcp_device, "refresh_id", None)
             if ids_reported:
@@ -721,15 +645,7 @@ class TCPPacketHandler:
                     "%s Parsing initial connection device status data",
                     lp,
                 )
-                await asyncio.gather(
-                    *[
-                        g.ncync_server.parse_status(
-                            bytes(status),
-                            from_pkt="'mesh info'",
-                        )
-                        for status in _m
-                    ]
-                )
+                await g.ncync_server.parse_status_batch(_m, from_pkt="'mesh info'")
 
             # Send mesh status ack
             # 73 00 00 00 14 2d e4 b5 d2 15 2d 00 7e 1e 00 00
@@ -765,7 +681,36 @@ class TCPPacketHandler:
             if refresh_id is not None:
                 logger.info("%s [%s] Refresh processing complete", lp, refresh_id)
 
-    async def _handle_control_ack_packet(self, packet_data: bytes, lp: str, checksum: int, calc_chksum: int):
+    async def _settle_secondary_ack(self, packet_data: bytes | memoryview):
+        """
+        Control ACK on a bridge that is not the primary. The pending message is popped and its RTT
+        recorded for the bridge health score. Like on the primary, the first bridge to ACK a command
+        sets its ACK event and runs the state callback, later ACKs for the same command only count.
+        """
+        ctrl_bytes = packet_data[5:7]
+        if len(ctrl_bytes) < 2 or ctrl_bytes[0] != 0xF9 or ctrl_bytes[1] not in (0xD0, 0xF0, 0xE2):
+            return
+        if len(packet_data) < 8 or packet_data[7] != 1:
+            return
+        msg = self.tcp_device.messages.control.ack(packet_data[1])
+        if msg is None:
+            return
+        if msg.sent_at is not None:
+            self.tcp_device.health.record_ack((time.time() - msg.sent_at) * 1000)
+        g = _get_global_object()
+        if msg.device_id is not None and g.ncync_server:
+            g.ncync_server.mesh_topology.confirm(self.tcp_device.address, msg.device_id)
+        if msg.ack_event is None or msg.ack_event.is_set():
+            return
+        msg.ack_event.set()
+        if callable(msg.callback):
+            await msg.callback()
+        elif msg.callback is not None:
+            await msg.callback
+
+    async def _handle_control_ack_packet(
+        self, packet_data: bytes | memoryview, lp: str, checksum: int, calc_chksum: int
+    ):
         """Handle control ACK packet within bound 0x73."""
         g = _get_global_object()
         ctrl_bytes = packet_data[5:7]
@@ -797,10 +742,13 @@ class TCPPacketHandler:
             ctrl_msg_id = packet_data[1]
             ctrl_chksum = sum(packet_data[6:10]) % 256
             success = packet_data[7] == 1
-            msg = self.tcp_device.messages.control.pop(ctrl_msg_id, None)
+            msg = self.tcp_device.messages.control.ack(ctrl_msg_id)
             if success is True and msg is not None:
                 # Calculate round-trip time (command sent → ACK received)
                 rtt_ms = (time.time() - msg.sent_at) * 1000
+                self.tcp_device.health.record_ack(rtt_ms)
+                if msg.device_id is not None:
+                    g.ncync_server.mesh_topology.confirm(self.tcp_device.address, msg.device_id)
 
                 # Get device name if available
                 device_name = "unknown"
@@ -836,11 +784,13 @@ class TCPPacketHandler:
                     ctrl_msg_id,
                 )
 
-                # Signal ACK event if present (allows command queue to proceed)
+                # Signal ACK event if present (allows command queue to proceed). The event is shared by
+                # every bridge the command went out on, the first ACK runs the state callback.
+                first_ack = msg.ack_event is None or not msg.ack_event.is_set()
                 if msg.ack_event:
                     msg.ack_event.set()
 
-                if msg.callback is not None:
+                if msg.callback is not None and first_ack:
                     if callable(msg.callback):
                         await msg.callback()
                     else:
@@ -876,7 +826,7 @@ class TCPPacketHandler:
                 logger.debug(
                     "%s Device sent (%s) BOUND firmware version data",
                     lp,
-                    ctrl_bytes.hex(" "),
+                    lazy_hex(ctrl_bytes),
                 )
                 fw_type, fw_ver, fw_str = parse_unbound_firmware_version(packet_data[1:-1], lp)
                 if fw_type == "device":
@@ -901,7 +851,7 @@ class TCPPacketHandler:
             logger.debug(
                 "%s UNKNOWN CTRL_BYTES: %s // EXTRACTED DATA -> HEX: %s\tINT: %s",
                 lp,
-                ctrl_bytes.hex(" "),
-                packet_data[1:-1].hex(" "),
-                bytes2list(packet_data[1:-1]),
+                lazy_hex(ctrl_bytes),
+                lazy_hex(packet_data[1:-1]),
+                lazy(bytes2list, packet_data[1:-1]),
             )
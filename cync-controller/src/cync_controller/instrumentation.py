@@ -9,12 +9,18 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import sys
 import time
 from collections.abc import Callable
+from pathlib import Path
+from types import CodeType
 from typing import Any, ParamSpec, TypeVar
 
 __all__ = [
+    "call_site",
+    "call_site_tracing_enabled",
     "measure_time",
+    "set_call_site_tracing",
     "timed",
     "timed_async",
 ]
@@ -22,6 +28,10 @@ __all__ = [
 P = ParamSpec("P")
 T = TypeVar("T")
 
+# None until first use, then seeded from CYNC_TRACE_CALL_SITES (can be toggled at runtime over MQTT)
+_call_site_tracing: bool | None = None
+_call_site_cache: dict[tuple[CodeType, int], str] = {}
+
 
 def measure_time(start_time: float) -> float:
     """
@@ -36,6 +46,45 @@ def measure_time(start_time: float) -> float:
     return (time.perf_counter() - start_time) * 1000
 
 
+def call_site_tracing_enabled() -> bool:
+    """Return True if call-site tracing is enabled (CYNC_TRACE_CALL_SITES or the bridge toggle)."""
+    global _call_site_tracing
+    if _call_site_tracing is None:
+        # Import here to avoid circular dependency
+        from cync_controller.const import CYNC_TRACE_CALL_SITES
+
+        _call_site_tracing = CYNC_TRACE_CALL_SITES
+    return _call_site_tracing
+
+
+def set_call_site_tracing(enabled: bool) -> None:
+    """Enable or disable call-site tracing at runtime."""
+    global _call_site_tracing
+    _call_site_tracing = enabled
+
+
+def call_site(depth: int = 1) -> str:
+    """
+    Describe a calling frame as "file.py:line in function".
+
+    Only walks ``depth`` frames (no full stack capture) and caches the formatted string per
+    code object and line, so repeated calls from the same place are a dict lookup.
+
+    Args:
+        depth: 1 for the caller of the function that calls call_site(), 2 for its caller, etc.
+    """
+    try:
+        frame = sys._getframe(depth + 1)
+    except ValueError:
+        return "<unknown>"
+    key = (frame.f_code, frame.f_lineno)
+    site = _call_site_cache.get(key)
+    if site is None:
+        site = f"{Path(frame.f_code.co_filename).name}:{frame.f_lineno} in {frame.f_code.co_name}"
+        _call_site_cache[key] = site
+    return site
+
+
 def timed(operation_name: str | None = None) -> Callable:
     """
     Decorator for timing synchronous functions with configurable threshold warnings.
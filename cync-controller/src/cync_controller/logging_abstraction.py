@@ -2,14 +2,26 @@
 Logging abstraction layer for Cync Controller.
 
 Provides dual-format logging (JSON + human-readable) with correlation tracking,
-structured context, and configurable output destinations.
+structured context, and configurable output destinations. Records can be handed to a
+background writer thread (LogPipeline) so formatting and file I/O stay off the event loop.
+Costly log arguments can be deferred with lazy() / lazy_hex() or guarded with
+CyncLogger.is_enabled_for() so disabled levels cost next to nothing. Chatty call sites can be
+sampled or rate limited per logger or category (LogSampler), suppressed records are summarized.
 """
 
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -18,27 +30,86 @@ __all__ = [
     "CyncLogger",
     "HumanReadableFormatter",
     "JSONFormatter",
+    "LazyValue",
+    "LogPipeline",
+    "LogSampler",
+    "PipelineQueueHandler",
+    "SamplingRule",
+    "flush_log_sampling",
     "get_logger",
+    "lazy",
+    "lazy_hex",
+    "log_pipeline_stats",
+    "parse_sampling_rules",
+    "stop_log_pipelines",
 ]
 
+_UNSET = object()
+
+
+def _record_correlation_id(record: logging.LogRecord) -> str | None:
+    """Correlation ID captured when the record was queued, or the current one for direct logging."""
+    correlation_id = getattr(record, "cync_correlation_id", _UNSET)
+    if correlation_id is _UNSET:
+        # Import here to avoid circular dependency
+        from cync_controller.correlation import get_correlation_id
+
+        correlation_id = get_correlation_id()
+    return correlation_id
+
+
+class LazyValue:
+    """
+    A log argument or ``extra`` field that is only computed if the record is emitted.
+
+    As a ``%s`` argument it is rendered when the message is formatted, as an ``extra`` value
+    CyncLogger resolves it after the level check.
+    """
+
+    __slots__ = ("args", "func")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def resolve(self) -> Any:
+        return self.func(*self.args)
+
+    def __str__(self) -> str:
+        return str(self.resolve())
+
+    def __repr__(self) -> str:
+        return repr(self.resolve())
+
+
+def lazy(func: Callable[..., Any], *args: Any) -> LazyValue:
+    """Defer ``func(*args)`` until the log record is emitted."""
+    return LazyValue(func, *args)
+
+
+def _hex(data: bytes | bytearray | memoryview) -> str:
+    return data.hex(" ")
+
+
+def lazy_hex(data: bytes | bytearray | memoryview) -> LazyValue:
+    """Space separated hex dump of ``data``, only built if the record is emitted."""
+    return LazyValue(_hex, data)
+
 
 class JSONFormatter(logging.Formatter):
     """Formatter that outputs structured JSON logs."""
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
-        # Import here to avoid circular dependency
-        from cync_controller.correlation import get_correlation_id
-
         log_data = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
             "message": record.getMessage(),
-            "correlation_id": get_correlation_id(),
+            "correlation_id": _record_correlation_id(record),
         }
 
         # Add structured extra data if present
@@ -48,6 +119,9 @@ class JSONFormatter(logging.Formatter):
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # already rendered by PipelineQueueHandler
+            log_data["exception"] = record.exc_text
 
         # Add stack info if present
         if record.stack_info:
@@ -68,11 +142,8 @@ class HumanReadableFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as human-readable text."""
-        # Import here to avoid circular dependency
-        from cync_controller.correlation import get_correlation_id
-
         # Add correlation ID to record
-        correlation_id = get_correlation_id()
+        correlation_id = _record_correlation_id(record)
         record.correlation_id = f"[{correlation_id[:8]}]" if correlation_id else "[--------]"
 
         # Add structured extra data to message if present
@@ -85,6 +156,397 @@ class HumanReadableFormatter(logging.Formatter):
         return formatted
 
 
+_STOP = object()
+
+
+class LogPipeline:
+    """
+    Bounded queue between the loggers and a background thread that formats and writes log records.
+
+    Logging calls only resolve the record's per-call context and enqueue it. The writer thread
+    drains up to ``batch_size`` records at a time, formats them for every handler and writes each
+    handler's lines with a single write and flush. When the queue is full, DEBUG and INFO records
+    are dropped; WARNING and above replace the oldest queued record. Drops are counted per level.
+    """
+
+    def __init__(self, handlers: list[logging.Handler], max_size: int = 10000, batch_size: int = 256):
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue(max(1, max_size))
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped: dict[str, int] = {}
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cync-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything still queued and stop the writer thread."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def submit(self, record: logging.LogRecord) -> None:
+        """Queue a prepared record without ever blocking the caller."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self._count_drop(record)
+                return
+            # make room for warnings and errors at the expense of the oldest record
+            try:
+                evicted = self.queue.get_nowait()
+            except queue.Empty:
+                evicted = None
+            if evicted is _STOP:
+                # shutting down, keep the stop marker
+                self.queue.put_nowait(evicted)
+                self._count_drop(record)
+                return
+            if evicted is not None:
+                self._count_drop(evicted)
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self._count_drop(record)
+                return
+        self.enqueued += 1
+
+    def _count_drop(self, record: logging.LogRecord) -> None:
+        self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = []
+            item = self.queue.get()
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            lines = []
+            for record in batch:
+                if record.levelno < handler.level:
+                    continue
+                try:
+                    lines.append(handler.format(record))
+                except Exception:
+                    handler.handleError(record)
+            if not lines:
+                continue
+            handler.acquire()
+            try:
+                terminator = getattr(handler, "terminator", "\n")
+                handler.stream.write(terminator.join(lines) + terminator)
+                handler.flush()
+            except Exception:
+                handler.handleError(batch[-1])
+            finally:
+                handler.release()
+        self.written += len(batch)
+        self.batches += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": sum(self.dropped.values()),
+            **{f"dropped_{level.lower()}": count for level, count in self.dropped.items()},
+        }
+
+
+class PipelineQueueHandler(logging.handlers.QueueHandler):
+    """Logger side of a LogPipeline, captures what depends on the calling context and enqueues."""
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, pipeline: LogPipeline):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # other handlers (propagation) still see the original record
+        record = copy.copy(record)
+        record.cync_correlation_id = _record_correlation_id(record)
+        # args may be mutated after the call returns, render the message now
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # tracebacks pin frames, render them now as well
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.pipeline.submit(record)
+
+
+_pipelines: dict[tuple[str, str | None, str | None], LogPipeline] = {}
+_pipelines_lock = threading.Lock()
+
+
+def _build_handlers(log_format: str, json_file: str | Path | None, human_output: str | None) -> list[logging.Handler]:
+    """Create the output handlers (JSON file and/or human-readable) for a format configuration."""
+    handlers: list[logging.Handler] = []
+    # JSON handler (file output)
+    if log_format in ("json", "both") and json_file:
+        try:
+            json_path = Path(json_file)
+            json_path.parent.mkdir(parents=True, exist_ok=True)
+            json_handler = logging.FileHandler(json_path, mode="a")
+            json_handler.setFormatter(JSONFormatter())
+            handlers.append(json_handler)
+        except (OSError, PermissionError) as e:
+            # Fallback: log to stderr if file creation fails
+            print(f"Warning: Failed to create JSON log file {json_file}: {e}", file=sys.stderr)
+
+    # Human-readable handler
+    if log_format in ("human", "both"):
+        if human_output == "stdout":
+            human_handler = logging.StreamHandler(sys.stdout)
+        elif human_output == "stderr":
+            human_handler = logging.StreamHandler(sys.stderr)
+        else:
+            # File path specified
+            try:
+                human_path = Path(human_output)
+                human_path.parent.mkdir(parents=True, exist_ok=True)
+                human_handler = logging.FileHandler(human_path, mode="a")
+            except (OSError, PermissionError) as e:
+                print(f"Warning: Failed to create human log file {human_output}: {e}", file=sys.stderr)
+                human_handler = logging.StreamHandler(sys.stdout)
+
+        human_handler.setFormatter(HumanReadableFormatter())
+        handlers.append(human_handler)
+    return handlers
+
+
+def _shared_pipeline(
+    log_format: str, json_file: str | Path | None, human_output: str | None, max_size: int
+) -> LogPipeline:
+    """One pipeline (and one set of output handlers) per output configuration, shared by all loggers."""
+    key = (log_format, str(json_file) if json_file else None, human_output)
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+        if pipeline is None:
+            pipeline = LogPipeline(_build_handlers(log_format, json_file, human_output), max_size=max_size)
+            pipeline.start()
+            if not _pipelines:
+                atexit.register(stop_log_pipelines)
+            _pipelines[key] = pipeline
+    return pipeline
+
+
+def stop_log_pipelines() -> None:
+    """Flush and stop every log pipeline (shutdown)."""
+    with _pipelines_lock:
+        pipelines = list(_pipelines.values())
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+def log_pipeline_stats() -> dict[str, int]:
+    """Counters summed over every log pipeline, empty when logging synchronously."""
+    totals: dict[str, int] = {}
+    with _pipelines_lock:
+        pipelines = list(_pipelines.values())
+    for pipeline in pipelines:
+        for key, value in pipeline.stats().items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+@dataclass(frozen=True)
+class SamplingRule:
+    """
+    Limit applied to each call site of a logger or category.
+
+    ``every`` keeps 1 in N records, ``per_second`` is a token bucket refilled at that rate holding up
+    to ``burst`` tokens. Only records at or below ``max_level`` are limited.
+    """
+
+    every: int = 1
+    per_second: float | None = None
+    burst: float | None = None
+    max_level: int = logging.DEBUG
+
+    @classmethod
+    def parse(cls, spec: str) -> SamplingRule:
+        """``"1:N"`` keeps 1 in N records, ``"X/s"`` keeps at most X records per second."""
+        spec = spec.strip()
+        if spec.endswith("/s"):
+            return cls(per_second=float(spec[:-2]))
+        if spec.startswith("1:"):
+            return cls(every=int(spec[2:]))
+        msg = f"Invalid log sampling rule {spec!r}, expected '1:N' or 'X/s'"
+        raise ValueError(msg)
+
+
+def parse_sampling_rules(config: str) -> dict[str, SamplingRule]:
+    """
+    Parse ``"<logger or category>=<rule>,..."``, e.g. ``"keepalive=1:50,cync_controller.devices=20/s"``.
+
+    Malformed entries are reported on stderr and skipped.
+    """
+    rules: dict[str, SamplingRule] = {}
+    for entry in config.split(","):
+        if not entry.strip():
+            continue
+        key, _, spec = entry.partition("=")
+        try:
+            rules[key.strip()] = SamplingRule.parse(spec)
+        except ValueError as e:
+            print(f"Warning: {e}", file=sys.stderr)
+    return rules
+
+
+class _SiteState:
+    __slots__ = ("last", "level", "seen", "suppressed", "tokens")
+
+    def __init__(self, tokens: float, now: float, level: int):
+        self.tokens = tokens
+        self.last = now
+        self.level = level
+        self.seen = 0
+        self.suppressed = 0
+
+
+class LogSampler(logging.Filter):
+    """
+    Logger filter that samples or rate limits records per call site (logger, file and line).
+
+    The rule comes from the record's category (``category=`` on CyncLogger calls), else from its
+    logger name or the closest configured parent. When a site lets a record through again, or on
+    flush(), a "Suppressed N similar messages" summary is logged for everything dropped since.
+    """
+
+    def __init__(self, rules: dict[str, SamplingRule] | None = None, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.rules = dict(rules or {})
+        self.clock = clock
+        self.suppressed_total = 0
+        self._rule_cache: dict[str, SamplingRule | None] = {}
+        self._sites: dict[tuple, _SiteState] = {}
+        self._lock = threading.Lock()
+
+    def _rule_for(self, record: logging.LogRecord) -> SamplingRule | None:
+        category = getattr(record, "cync_log_category", None)
+        if category is not None and category in self.rules:
+            return self.rules[category]
+        name = record.name
+        if name not in self._rule_cache:
+            rule = None
+            parts = name.split(".")
+            while parts:
+                rule = self.rules.get(".".join(parts))
+                if rule is not None:
+                    break
+                parts.pop()
+            self._rule_cache[name] = rule
+        return self._rule_cache[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "cync_sampling_summary", False):
+            return True
+        rule = self._rule_for(record)
+        if rule is None or record.levelno > rule.max_level:
+            return True
+        now = self.clock()
+        key = (record.name, record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = _SiteState(self._burst(rule), now, record.levelno)
+            site.seen += 1
+            allowed = rule.every <= 1 or site.seen % rule.every == 1
+            if allowed and rule.per_second is not None:
+                site.tokens = min(self._burst(rule), site.tokens + (now - site.last) * rule.per_second)
+                allowed = site.tokens >= 1
+                if allowed:
+                    site.tokens -= 1
+            site.last = now
+            if not allowed:
+                site.suppressed += 1
+                self.suppressed_total += 1
+                return False
+            suppressed, site.suppressed = site.suppressed, 0
+        if suppressed:
+            self._emit_summary(record, suppressed)
+        return True
+
+    @staticmethod
+    def _burst(rule: SamplingRule) -> float:
+        if rule.burst is not None:
+            return rule.burst
+        return max(1.0, rule.per_second or 1.0)
+
+    def _emit_summary(self, record: logging.LogRecord, suppressed: int) -> None:
+        summary = logging.LogRecord(
+            record.name,
+            record.levelno,
+            record.pathname,
+            record.lineno,
+            "Suppressed %d similar messages from %s:%d",
+            (suppressed, record.module, record.lineno),
+            None,
+            record.funcName,
+        )
+        summary.cync_sampling_summary = True
+        summary.extra_data = {"suppressed": suppressed, "category": getattr(record, "cync_log_category", None)}
+        logging.getLogger(record.name).handle(summary)
+
+    def flush(self) -> int:
+        """Log summaries for every site with suppressed records, returns how many records they cover."""
+        with self._lock:
+            pending = [(key, site.level, site.suppressed) for key, site in self._sites.items() if site.suppressed]
+            for key, _, _ in pending:
+                self._sites[key].suppressed = 0
+        for (name, pathname, lineno), level, suppressed in pending:
+            record = logging.LogRecord(name, level, pathname, lineno, "", None, None)
+            self._emit_summary(record, suppressed)
+        return sum(suppressed for _, _, suppressed in pending)
+
+
+def _configured_sampler() -> LogSampler:
+    """A LogSampler configured from CYNC_LOG_SAMPLING."""
+    from cync_controller.const import CYNC_LOG_SAMPLING
+
+    return LogSampler(parse_sampling_rules(CYNC_LOG_SAMPLING))
+
+
+# shared by every CyncLogger
+_sampler = _configured_sampler()
+
+
+def flush_log_sampling() -> int:
+    """Log the pending "Suppressed N similar messages" summaries of all call sites."""
+    return _sampler.flush()
+
+
 class CyncLogger:
     """
     Logger abstraction providing dual-format output (JSON + human-readable).
@@ -99,6 +561,7 @@ class CyncLogger:
         log_format: str = "both",
         json_file: str | Path | None = None,
         human_output: str | None = "stdout",
+        queue_size: int = 0,
     ):
         """
         Initialize CyncLogger.
@@ -108,16 +571,23 @@ class CyncLogger:
             log_format: Output format - "json", "human", or "both"
             json_file: Path for JSON output file (None to disable file output)
             human_output: "stdout", "stderr", or file path for human-readable output
+            queue_size: > 0 hands records to a shared background LogPipeline with this many slots,
+                0 formats and writes them synchronously in the logging call
         """
         self.name = name
         self.logger = logging.getLogger(name)
+        # bound once, Logger.isEnabledFor() keeps a per-level cache that logging clears on setLevel()
+        self.is_enabled_for: Callable[[int], bool] = self.logger.isEnabledFor
         self.log_format = log_format
+        self.queue_size = queue_size
 
         # Determine initial log level based on CYNC_DEBUG environment variable
         from cync_controller.const import CYNC_DEBUG
 
         initial_level = logging.DEBUG if CYNC_DEBUG else logging.INFO
         self.logger.setLevel(initial_level)
+        # per call site sampling / rate limits, a no-op for loggers without a rule
+        self.logger.addFilter(_sampler)
 
         # Don't add handlers if already configured (avoid duplicates)
         if not self.logger.handlers:
@@ -132,72 +602,68 @@ class CyncLogger:
         # Use the same level as the logger for handlers
         handler_level = self.logger.level
 
-        # JSON handler (file output)
-        if self.log_format in ("json", "both") and json_file:
-            try:
-                json_path = Path(json_file)
-                json_path.parent.mkdir(parents=True, exist_ok=True)
-                json_handler = logging.FileHandler(json_path, mode="a")
-                json_handler.setFormatter(JSONFormatter())
-                json_handler.setLevel(handler_level)
-                self.logger.addHandler(json_handler)
-            except (OSError, PermissionError) as e:
-                # Fallback: log to stderr if file creation fails
-                print(f"Warning: Failed to create JSON log file {json_file}: {e}", file=sys.stderr)
+        if self.queue_size > 0:
+            # level filtering happens here, the pipeline's output handlers write whatever they get
+            pipeline = _shared_pipeline(self.log_format, json_file, human_output, self.queue_size)
+            queue_handler = PipelineQueueHandler(pipeline)
+            queue_handler.setLevel(handler_level)
+            self.logger.addHandler(queue_handler)
+            return
 
-        # Human-readable handler
-        if self.log_format in ("human", "both"):
-            if human_output == "stdout":
-                human_handler = logging.StreamHandler(sys.stdout)
-            elif human_output == "stderr":
-                human_handler = logging.StreamHandler(sys.stderr)
-            else:
-                # File path specified
-                try:
-                    human_path = Path(human_output)
-                    human_path.parent.mkdir(parents=True, exist_ok=True)
-                    human_handler = logging.FileHandler(human_path, mode="a")
-                except (OSError, PermissionError) as e:
-                    print(f"Warning: Failed to create human log file {human_output}: {e}", file=sys.stderr)
-                    human_handler = logging.StreamHandler(sys.stdout)
-
-            human_handler.setFormatter(HumanReadableFormatter())
-            human_handler.setLevel(handler_level)
-            self.logger.addHandler(human_handler)
-
-    def _log(self, level: int, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+        for handler in _build_handlers(self.log_format, json_file, human_output):
+            handler.setLevel(handler_level)
+            self.logger.addHandler(handler)
+
+    def _log(
+        self,
+        level: int,
+        msg: str,
+        *args,
+        extra: dict[str, Any] | None = None,
+        category: str | None = None,
+        **kwargs,
+    ):
         """Internal logging method with structured context support."""
+        if not self.is_enabled_for(level):
+            return
         # Create a LogRecord with extra data attached
         if extra:
             # Use extra parameter properly by creating a custom LogRecord
-            kwargs["extra"] = {"extra_data": extra}
+            kwargs["extra"] = {
+                "extra_data": {k: v.resolve() if isinstance(v, LazyValue) else v for k, v in extra.items()}
+            }
+        if category is not None:
+            # sampling rules can target a category across loggers
+            kwargs.setdefault("extra", {})["cync_log_category"] = category
+        # attribute the record to our caller, not to this wrapper (debug()/info()/... -> _log())
+        kwargs.setdefault("stacklevel", 3)
 
         self.logger.log(level, msg, *args, **kwargs)
 
-    def debug(self, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+    def debug(self, msg: str, *args, extra: dict[str, Any] | None = None, category: str | None = None, **kwargs):
         """Log debug message with optional structured context."""
-        self._log(logging.DEBUG, msg, *args, extra=extra, **kwargs)
+        self._log(logging.DEBUG, msg, *args, extra=extra, category=category, **kwargs)
 
-    def info(self, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+    def info(self, msg: str, *args, extra: dict[str, Any] | None = None, category: str | None = None, **kwargs):
         """Log info message with optional structured context."""
-        self._log(logging.INFO, msg, *args, extra=extra, **kwargs)
+        self._log(logging.INFO, msg, *args, extra=extra, category=category, **kwargs)
 
-    def warning(self, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+    def warning(self, msg: str, *args, extra: dict[str, Any] | None = None, category: str | None = None, **kwargs):
         """Log warning message with optional structured context."""
-        self._log(logging.WARNING, msg, *args, extra=extra, **kwargs)
+        self._log(logging.WARNING, msg, *args, extra=extra, category=category, **kwargs)
 
-    def error(self, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+    def error(self, msg: str, *args, extra: dict[str, Any] | None = None, category: str | None = None, **kwargs):
         """Log error message with optional structured context."""
-        self._log(logging.ERROR, msg, *args, extra=extra, **kwargs)
+        self._log(logging.ERROR, msg, *args, extra=extra, category=category, **kwargs)
 
-    def critical(self, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+    def critical(self, msg: str, *args, extra: dict[str, Any] | None = None, category: str | None = None, **kwargs):
         """Log critical message with optional structured context."""
-        self._log(logging.CRITICAL, msg, *args, extra=extra, **kwargs)
+        self._log(logging.CRITICAL, msg, *args, extra=extra, category=category, **kwargs)
 
-    def exception(self, msg: str, *args, extra: dict[str, Any] | None = None, **kwargs):
+    def exception(self, msg: str, *args, extra: dict[str, Any] | None = None, category: str | None = None, **kwargs):
         """Log exception with traceback and optional structured context."""
         kwargs["exc_info"] = True
-        self._log(logging.ERROR, msg, *args, extra=extra, **kwargs)
+        self._log(logging.ERROR, msg, *args, extra=extra, category=category, **kwargs)
 
     def set_level(self, level: int):
         """Set logging level."""
@@ -240,6 +706,7 @@ def get_logger(
         CYNC_LOG_FORMAT,
         CYNC_LOG_HUMAN_OUTPUT,
         CYNC_LOG_JSON_FILE,
+        CYNC_LOG_QUEUE_SIZE,
     )
 
     log_format = log_format or CYNC_LOG_FORMAT
@@ -251,4 +718,5 @@ def get_logger(
         log_format=log_format,
         json_file=json_file,
         human_output=human_output,
+        queue_size=CYNC_LOG_QUEUE_SIZE,
     )
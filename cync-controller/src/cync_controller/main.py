@@ -21,7 +21,7 @@ from cync_controller.const import (
 )
 from cync_controller.correlation import correlation_context, ensure_correlation_id
 from cync_controller.exporter import ExportServer
-from cync_controller.logging_abstraction import get_logger
+from cync_controller.logging_abstraction import get_logger, stop_log_pipelines
 from cync_controller.mqtt_client import MQTTClient
 from cync_controller.server import NCyncServer
 from cync_controller.structs import GlobalObject
@@ -262,3 +262,4 @@ def main():
             logger.info("")
             logger.info("Cync Controller shutdown complete")
             logger.info("")
+            stop_log_pipelines()
@@ -0,0 +1,90 @@
+"""
+Which bridges can reach which mesh devices.
+
+Every bridge reports the device IDs it sees in its mesh info response (``known_device_ids``).
+MeshTopology keeps the reverse index, device ID -> {bridge address: last confirmed}, so device
+commands only go out through bridges that cover the target instead of the first N bridges. In a
+home with several bridge islands a command then stays in the island of its device. A route is
+confirmed when the bridge reports the device in a mesh info response or ACKs a command for it,
+and routes are dropped when the bridge disconnects or stops reporting the device. Routes that were
+not confirmed for CYNC_MESH_ROUTE_TTL seconds are not used to pick bridges.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+
+__all__ = [
+    "MeshTopology",
+]
+
+
+class MeshTopology:
+    """Device ID -> bridges that reach it, with the time each route was last confirmed."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.routes: dict[int, dict[str, float]] = {}
+        self.bridge_devices: dict[str, set[int]] = {}
+        self.updated_at: dict[str, float] = {}
+
+    def update(self, bridge: str, device_ids: Iterable[int]) -> None:
+        """Replace what ``bridge`` reaches with a fresh mesh info report."""
+        now = self.clock()
+        device_ids = set(device_ids)
+        for device_id in self.bridge_devices.get(bridge, set()) - device_ids:
+            self._drop_route(device_id, bridge)
+        for device_id in device_ids:
+            self.routes.setdefault(device_id, {})[bridge] = now
+        self.bridge_devices[bridge] = device_ids
+        self.updated_at[bridge] = now
+
+    def confirm(self, bridge: str, device_id: int) -> None:
+        """``bridge`` reached ``device_id`` (e.g. the device ACKed a command sent through it)."""
+        self.routes.setdefault(device_id, {})[bridge] = self.clock()
+        self.bridge_devices.setdefault(bridge, set()).add(device_id)
+
+    def remove_bridge(self, bridge: str) -> None:
+        for device_id in self.bridge_devices.pop(bridge, set()):
+            self._drop_route(device_id, bridge)
+        self.updated_at.pop(bridge, None)
+
+    def _drop_route(self, device_id: int, bridge: str) -> None:
+        bridges = self.routes.get(device_id)
+        if bridges is not None:
+            bridges.pop(bridge, None)
+            if not bridges:
+                del self.routes[device_id]
+
+    def bridges_for(self, device_id: int) -> dict[str, float]:
+        """Bridge address -> last confirmed time for every bridge that reaches ``device_id``."""
+        return self.routes.get(device_id, {})
+
+    def islands(self) -> int:
+        """Number of groups of bridges that share no devices with each other."""
+        parent = {bridge: bridge for bridge in self.bridge_devices}
+
+        def find(bridge: str) -> str:
+            while parent[bridge] != bridge:
+                parent[bridge] = parent[parent[bridge]]
+                bridge = parent[bridge]
+            return bridge
+
+        for bridges in self.routes.values():
+            first, *rest = bridges
+            for bridge in rest:
+                parent[find(bridge)] = find(first)
+        return len({find(bridge) for bridge in parent if self.bridge_devices[bridge]})
+
+    def stats(self) -> dict[str, int]:
+        now = self.clock()
+        oldest = min(self.updated_at.values(), default=now)
+        return {
+            "devices": len(self.routes),
+            "bridges": len(self.bridge_devices),
+            "routes": sum(len(bridges) for bridges in self.routes.values()),
+            "single_route_devices": sum(1 for bridges in self.routes.values() if len(bridges) == 1),
+            "islands": self.islands(),
+            "oldest_report_s": round(now - oldest),
+        }
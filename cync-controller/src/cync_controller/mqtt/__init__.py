@@ -14,7 +14,13 @@ This package refactors the monolithic mqtt_client.py into focused modules:
 # Re-export command classes for backward compatibility
 from .client import MQTTClient
 from .command_routing import CommandRouter
-from .commands import CommandProcessor, DeviceCommand, SetBrightnessCommand, SetPowerCommand
+from .commands import (
+    CommandProcessor,
+    DeviceCommand,
+    SetBrightnessCommand,
+    SetPowerCommand,
+    SetTemperatureCommand,
+)
 from .discovery import DiscoveryHelper, slugify
 from .state_updates import StateUpdateHelper
 
@@ -26,6 +32,7 @@ __all__ = [
     "MQTTClient",
     "SetBrightnessCommand",
     "SetPowerCommand",
+    "SetTemperatureCommand",
     "StateUpdateHelper",
     "slugify",
 ]
@@ -8,13 +8,15 @@ from __future__ import annotations
 
 import asyncio
 import json
+import math
+import time
 import uuid
-from collections.abc import Coroutine
+from collections.abc import Coroutine, Iterable
 
 import aiomqtt
 
 from cync_controller.const import *
-from cync_controller.devices import CyncDevice
+from cync_controller.devices import CyncDevice, CyncGroup
 from cync_controller.logging_abstraction import get_logger
 from cync_controller.mqtt.command_routing import CommandRouter
 from cync_controller.mqtt.discovery import DiscoveryHelper
@@ -91,6 +93,8 @@ class MQTTClient:
 
         self.topic = topic
         self.ha_topic = ha_topic
+        # timing of the last labelled publish_many() batch, per label
+        self.publish_reports: dict[str, dict[str, float]] = {}
 
         # Initialize helper classes
         self.discovery = DiscoveryHelper(self)
@@ -107,6 +111,9 @@ class MQTTClient:
         try:
             while True:
                 itr += 1
+                if itr > 1:
+                    # the broker may have lost its retained discovery configs too, connect() republishes them all
+                    self.discovery.cache.invalidate()
                 self._connected = await self.connect()
                 if self._connected:
                     # Publish MQTT message indicating the MQTT client is connected
@@ -116,60 +123,31 @@ class MQTTClient:
                     )
 
                     if itr == 1:
+                        devices = g.ncync_server.devices
+                        subgroups = [grp for grp in g.ncync_server.groups.values() if grp.is_subgroup]
+                        availability = [
+                            f"{self.topic}/availability/{device.home_id}-{device_id}"
+                            for device_id, device in devices.items()
+                        ]
                         logger.debug("%s Seeding all devices: offline", lp)
-                        for device_id in g.ncync_server.devices:
-                            await self.state_updates.pub_online(device_id, False)
+                        await self.publish_many([(topic, b"offline") for topic in availability])
                         # Set all subgroups online (subgroups are always available)
-                        subgroups = [grp for grp in g.ncync_server.groups.values() if grp.is_subgroup]
                         logger.debug("%s Setting %s subgroups: online", lp, len(subgroups))
-                        for group in subgroups:
-                            await self.publish(f"{self.topic}/availability/{group.hass_id}", b"online")
-
                         # After discovery, publish all devices as online initially
                         # They will be marked offline only if they fail to connect
                         logger.info(
                             "%s Publishing initial device availability as ONLINE for all %d devices",
                             lp,
-                            len(g.ncync_server.devices),
+                            len(devices),
+                        )
+                        await self.publish_many(
+                            [(f"{self.topic}/availability/{group.hass_id}", b"online") for group in subgroups]
+                            + [(topic, b"online") for topic in availability],
+                            label="initial availability",
                         )
-                        for device_id, device in g.ncync_server.devices.items():
-                            try:
-                                device_uuid = f"{device.home_id}-{device_id}"
-                                await self.client.publish(f"{self.topic}/availability/{device_uuid}", b"online", qos=0)
-                            except Exception as e:
-                                logger.debug(
-                                    "%s Failed to publish initial availability for device %s: %s", lp, device_id, e
-                                )
                     elif itr > 1:
-                        tasks = []
-                        # set the device online/offline and set its status
-                        for device in g.ncync_server.devices.values():
-                            tasks.append(self.state_updates.pub_online(device.id, device.online))
-                            tasks.append(
-                                self.state_updates.parse_device_status(
-                                    device.id,
-                                    DeviceStatus(
-                                        state=device.state,
-                                        brightness=device.brightness,
-                                        temperature=device.temperature,
-                                        red=device.red,
-                                        green=device.green,
-                                        blue=device.blue,
-                                    ),
-                                    from_pkt="'re-connect'",
-                                )
-                            )
-                        # Set all subgroups online after reconnection
-                        subgroups = [grp for grp in g.ncync_server.groups.values() if grp.is_subgroup]
-                        for group in subgroups:
-                            tasks.append(
-                                self.publish(
-                                    f"{self.topic}/availability/{group.hass_id}",
-                                    b"online",
-                                )
-                            )
-                        if tasks:
-                            await asyncio.gather(*tasks)
+                        # the broker may have lost retained/last state while we were gone, re-publish everything
+                        await self.state_updates.replay_states("'re-connect'")
                     logger.info("%s Starting MQTT receiver...", lp)
                     lp: str = f"{self.lp}rcv:"
                     topics = [
@@ -376,6 +354,87 @@ class MQTTClient:
             return True
         return False
 
+    async def publish_many(
+        self,
+        messages: Iterable[tuple[str, bytes]],
+        *,
+        max_in_flight: int = 16,
+        timeout: float = 3.0,
+        retain: bool = False,
+        retries: int = 1,
+        label: str | None = None,
+    ) -> list[bool]:
+        """
+        Publish many (topic, payload) pairs concurrently with at most ``max_in_flight`` outstanding.
+
+        Returns one success flag per message, in input order. A publish that takes longer than
+        ``timeout`` is retried up to ``retries`` times. Once a publish fails with an MqttError the
+        connection is marked down and the remaining messages are not attempted. With a ``label``
+        the batch timing (total, p95 per publish) is logged and kept in ``publish_reports``.
+        """
+        lp = f"{self.lp}publish_many:"
+        messages = list(messages)
+        results = [False] * len(messages)
+        if not self._connected or not messages:
+            return results
+        in_flight = asyncio.Semaphore(max(1, max_in_flight))
+        durations: list[float] = []
+        retried = 0
+
+        async def _publish(idx: int, topic: str, payload: bytes):
+            nonlocal retried
+            async with in_flight:
+                started = time.perf_counter()
+                for attempt in range(retries + 1):
+                    if not self._connected:
+                        return
+                    try:
+                        # the deadline is enforced here, aiomqtt reports its own timeouts as a plain MqttError
+                        _ = await asyncio.wait_for(
+                            self.client.publish(topic, payload, qos=0, retain=retain, timeout=math.inf),
+                            timeout,
+                        )
+                    except TimeoutError:
+                        if attempt < retries:
+                            retried += 1
+                            continue
+                        logger.warning("%s [Timeout] (topic: %s) after %d attempt(s)", lp, topic, attempt + 1)
+                    except aiomqtt.MqttError as mqtt_code_exc:
+                        logger.warning("%s [MqttError] (topic: %s) -> %s", lp, topic, mqtt_code_exc)
+                        self._connected = False
+                    except Exception as e:
+                        logger.warning("%s [Exception] (topic: %s) -> %s", lp, topic, e)
+                    else:
+                        results[idx] = True
+                        durations.append(time.perf_counter() - started)
+                    return
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_publish(idx, topic, payload) for idx, (topic, payload) in enumerate(messages)))
+        if label is None:
+            logger.debug("%s Published %d/%d message(s)", lp, sum(results), len(messages))
+            return results
+        durations.sort()
+        report = {
+            "messages": len(messages),
+            "published": sum(results),
+            "retried": retried,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "p95_ms": round(durations[math.ceil(len(durations) * 0.95) - 1] * 1000, 1) if durations else 0.0,
+        }
+        self.publish_reports[label] = report
+        logger.info(
+            "%s %s: %d/%d published in %.1f ms (p95 %.1f ms per publish, %d retried)",
+            lp,
+            label,
+            report["published"],
+            report["messages"],
+            report["total_ms"],
+            report["p95_ms"],
+            retried,
+        )
+        return results
+
     def kelvin2cync(self, k):
         """Convert Kelvin value to Cync white temp (0-100) with step size: 1"""
         max_k = CYNC_MAXK
@@ -500,6 +559,10 @@ class MQTTClient:
         """Build each configured Cync device for HASS device registry"""
         return await self.discovery.homeassistant_discovery()
 
+    async def republish_discovery(self):
+        """Publish every discovery config again, unchanged ones included."""
+        return await self.discovery.republish_discovery()
+
     async def create_bridge_device(self):
         """Create the device / entity registry config for the Cync Controller bridge itself."""
         return await self.discovery.create_bridge_device()
@@ -544,6 +607,19 @@ class MQTTClient:
         """Parse device status and publish to MQTT."""
         return await self.state_updates.parse_device_status(device_id, device_status, *_args, **kwargs)
 
+    async def parse_device_statuses(
+        self, statuses: list[tuple[int, DeviceStatus]], from_pkt: str | None = None
+    ) -> list[bool]:
+        """Parse many device statuses and publish them to MQTT as one batch."""
+        return await self.state_updates.parse_device_statuses(statuses, from_pkt)
+
+    async def publish_group_states(
+        self,
+        updates: list[tuple[CyncGroup, int | None, int | None, int | None, str | None]],
+    ) -> list[bool]:
+        """Publish many group states to MQTT as one batch."""
+        return await self.state_updates.publish_group_states(updates)
+
     async def update_switch_from_subgroup(self, device: CyncDevice, subgroup_state: int, subgroup_name: str) -> bool:
         """Update a switch device state to match its subgroup state."""
         return await self.state_updates.update_switch_from_subgroup(device, subgroup_state, subgroup_name)
@@ -3,20 +3,32 @@ MQTT command routing for message handling.
 
 Provides message routing logic for MQTT topics and delegates commands
 to the command processor and state update modules.
+
+Topics are matched against a TopicRouter trie built once per (topic, HASS topic) pair, command
+targets are parsed once per hass_id and payloads are only decoded / parsed by the handler that
+needs them.
 """
 
 import asyncio
 import json
 import random
 import re
+from functools import cached_property
 from json import JSONDecodeError
 
 import aiomqtt
 
 from cync_controller.const import *
-from cync_controller.logging_abstraction import get_logger
-from cync_controller.mqtt.commands import CommandProcessor, SetBrightnessCommand, SetPowerCommand
-from cync_controller.structs import DeviceStatus, FanSpeed
+from cync_controller.instrumentation import set_call_site_tracing
+from cync_controller.logging_abstraction import get_logger, lazy
+from cync_controller.mqtt.commands import (
+    CommandProcessor,
+    SetBrightnessCommand,
+    SetPowerCommand,
+    SetTemperatureCommand,
+)
+from cync_controller.mqtt.topic_router import TopicRouter
+from cync_controller.structs import FanSpeed
 
 logger = get_logger(__name__)
 
@@ -37,6 +49,38 @@ class GProxy:
 
 g = GProxy()
 
+# single word, non-JSON payloads (ON / OFF / PRESS)
+_WORD = re.compile(r"\w+")
+_FAN_PRESETS = {
+    "off": FanSpeed.OFF,
+    "low": FanSpeed.LOW,
+    "medium": FanSpeed.MEDIUM,
+    "high": FanSpeed.HIGH,
+    "max": FanSpeed.MAX,
+}
+# bound on the hass_id -> target ID table, hass_ids come from whatever is published on the set topic
+_MAX_TARGET_KEYS = 4096
+
+
+def _decode(payload: bytes) -> str:
+    return payload.decode("utf-8", "replace")
+
+
+class CommandPayload:
+    """An MQTT message payload, decoded and normalised on first use."""
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+
+    @cached_property
+    def text(self) -> str:
+        return _decode(self.raw)
+
+    @cached_property
+    def norm(self) -> str:
+        """casefolded text, for comparing button presses / switch states / presets"""
+        return self.text.casefold()
+
 
 class CommandRouter:
     """Helper class for routing MQTT messages to appropriate handlers."""
@@ -49,317 +93,371 @@ class CommandRouter:
             mqtt_client: MQTTClient instance to access connection, topic, and helper methods
         """
         self.client = mqtt_client
+        self.lp = f"{mqtt_client.lp}rcv:"
+        self._router: TopicRouter | None = None
+        self._router_topics: tuple[str, str] | None = None
+        # hass_id -> (is_group, group / device ID), None when the hass_id can not be parsed
+        self._target_keys: dict[str, tuple[bool, int] | None] = {}
+
+    @property
+    def router(self) -> TopicRouter:
+        topics = (self.client.topic, self.client.ha_topic)
+        if self._router is None or self._router_topics != topics:
+            self._router = self._build_router(*topics)
+            self._router_topics = topics
+        return self._router
+
+    def _build_router(self, topic: str, ha_topic: str) -> TopicRouter:
+        router = TopicRouter()
+        # cync_topic/set/(bridge|hass_id)(/extra_data)?
+        bridge = f"{topic}/set/bridge"
+        router.add(f"{bridge}/restart", self._on_restart)
+        router.add(f"{bridge}/start_export", self._on_start_export)
+        router.add(f"{bridge}/export/start", self._on_start_export)
+        router.add(f"{bridge}/refresh_status", self._on_refresh_status)
+        router.add(f"{bridge}/rediscover", self._on_rediscover)
+        router.add(f"{bridge}/call_site_tracing", self._on_call_site_tracing)
+        router.add(f"{bridge}/otp/submit", self._on_otp_submit)
+        router.add(f"{bridge}/otp/input", self._on_otp_input)
+        router.add(f"{topic}/set/+", self._on_target_command)
+        router.add(f"{topic}/set/+/percentage", self._on_fan_percentage)
+        router.add(f"{topic}/set/+/preset", self._on_fan_preset)
+        router.add(f"{topic}/#", self._on_unknown_command)
+        # messages sent to the hass mqtt topic, birth / will
+        router.add(f"{ha_topic}/{CYNC_HASS_STATUS_TOPIC}", self._on_hass_status)
+        return router
 
     async def start_receiver_task(self):
         """Start listening for MQTT messages on subscribed topics"""
-        lp = f"{self.client.lp}rcv:"
         async for message in self.client.client.messages:
             message: aiomqtt.message.Message
-            topic = message.topic
-            payload = message.payload
-            if (payload is None) or (payload is not None and not payload):
-                logger.debug(
-                    "%s Received empty/None payload (%s) for topic: %s , skipping...",
-                    lp,
-                    payload,
-                    topic,
-                )
-                continue
+            await self.route(message.topic.value, message.payload)
+
+    async def route(self, topic: str, payload: bytes | None) -> bool:
+        """Dispatch one message to the handler registered for its topic, returns False if it was dropped."""
+        lp = self.lp
+        if not payload:
+            logger.debug(
+                "%s Received empty/None payload (%s) for topic: %s , skipping...",
+                lp,
+                payload,
+                topic,
+            )
+            return False
+
+        logger.debug(
+            "%s >>> MQTT MESSAGE RECEIVED: topic=%s, payload_len=%d, payload=%s",
+            lp,
+            topic,
+            len(payload),
+            lazy(_decode, payload),
+        )
+        route = self.router.match(topic)
+        if route is None:
+            return False
+        handler, captures = route
+        try:
+            await handler(CommandPayload(payload), *captures)
+        except Exception:
+            # one bad message must not end the receiver task
+            logger.exception("%s error handling message for topic: %s => %s", lp, topic, payload)
+            return False
+        return True
 
-            # NEW: Log ALL received messages for diagnostics
+    def _target_key(self, hass_id: str) -> tuple[bool, int] | None:
+        """(is_group, ID) for a hass_id (``home-ID`` / ``home-group-ID``), parsed once per hass_id."""
+        try:
+            return self._target_keys[hass_id]
+        except KeyError:
+            pass
+        key = None
+        if "-group-" in hass_id:
+            group_id = hass_id.split("-group-")[1]
+            if group_id.isdecimal():
+                key = (True, int(group_id))
+        else:
+            parts = hass_id.split("-")
+            if len(parts) > 1 and parts[1].isdecimal():
+                key = (False, int(parts[1]))
+        if len(self._target_keys) >= _MAX_TARGET_KEYS:
+            self._target_keys.clear()
+        self._target_keys[hass_id] = key
+        return key
+
+    def _resolve_target(self, hass_id: str):
+        """(device, group) a command topic targets, exactly one of them set. None if it is unknown."""
+        lp = self.lp
+        key = self._target_key(hass_id)
+        if key is None:
+            logger.warning("%s Unknown command target: %s", lp, hass_id)
+            return None
+        is_group, target_id = key
+        if is_group:
+            group = g.ncync_server.groups.get(target_id)
+            if group is None:
+                logger.warning("%s Group ID %s not found in config", lp, target_id)
+                return None
             logger.info(
-                "%s >>> MQTT MESSAGE RECEIVED: topic=%s, payload_len=%d, payload=%s",
+                "%s [BUG4-TRACE] Group command detected: group_id=%s, group_name='%s', hass_id=%s",
+                lp,
+                target_id,
+                group.name,
+                hass_id,
+            )
+            return None, group
+        device = g.ncync_server.devices.get(target_id)
+        if device is None:
+            logger.warning(
+                "%s Device ID %s not found, device is disabled in config file or have you deleted / added any devices recently?",
                 lp,
-                topic.value,
-                len(payload) if payload else 0,
-                payload.decode() if payload else None,
+                target_id,
             )
-            _topic = topic.value.split("/")
+            return None
+        logger.debug(
+            "%s Device identified: name='%s', id=%s, is_fan_controller=%s",
+            lp,
+            device.name,
+            device.id,
+            device.is_fan_controller,
+        )
+        return device, None
+
+    async def _on_target_command(self, payload: CommandPayload, hass_id: str):
+        """JSON light state or plain ON / OFF for a device or group"""
+        lp = self.lp
+        resolved = self._resolve_target(hass_id)
+        if resolved is None:
+            return
+        device, group = resolved
+        # Determine target (device or group)
+        target = group if group else device
+        target_type = "GROUP" if group else "DEVICE"
+        logger.info(
+            "%s [BUG4-TRACE] Target determined: type=%s, name='%s', payload=%s",
+            lp,
+            target_type,
+            target.name,
+            payload.text,
+        )
+
+        if payload.raw.startswith(b"{"):
+            try:
+                json_data = json.loads(payload.raw)
+            except JSONDecodeError:
+                logger.exception("%s bad json message: {%s} EXCEPTION", lp, payload.raw)
+                return
+            except Exception:
+                logger.exception(
+                    "%s error will decoding a string into JSON: '%s' EXCEPTION",
+                    lp,
+                    payload.raw,
+                )
+                return
+
             tasks = []
-            device = None
-            # cync_topic/(set|status)/device_id(/extra_data)?
-            if _topic[0] == CYNC_TOPIC:
-                if _topic[1] == "set":
-                    device_id = _topic[2]
-                    if device_id == "bridge":
-                        device = None  # Bridge commands don't target a device
-                        group = None  # Bridge commands don't target a group
-                    elif "-group-" in _topic[2]:
-                        # Group command
-                        group_id = int(_topic[2].split("-group-")[1])
-                        if group_id not in g.ncync_server.groups:
-                            logger.warning("%s Group ID %s not found in config", lp, group_id)
-                            continue
-                        group = g.ncync_server.groups[group_id]
-                        device = None  # Set device to None for group commands
-                        logger.info(
-                            "%s [BUG4-TRACE] Group command detected: group_id=%s, group_name='%s', topic=%s",
-                            lp,
-                            group_id,
-                            group.name,
-                            topic.value,
-                        )
-                    else:
-                        # Device command
-                        device_id = int(_topic[2].split("-")[1])
-                        if device_id not in g.ncync_server.devices:
-                            logger.warning(
-                                "%s Device ID %s not found, device is disabled in config file or have you deleted / added any devices recently?",
-                                lp,
-                                device_id,
-                            )
-                            continue
-                        device = g.ncync_server.devices[device_id]
-                        group = None  # Set group to None for device commands
-                        logger.debug(
-                            "%s Device identified: name='%s', id=%s, is_fan_controller=%s",
-                            lp,
-                            device.name,
-                            device.id,
-                            device.is_fan_controller,
-                        )
-                    extra_data = _topic[3:] if len(_topic) > 3 else None
-                    if extra_data:
-                        norm_pl = payload.decode().casefold()
-                        # logger.debug("%s Extra data found: %s", lp, extra_data)
-                        if extra_data[0] == "restart":
-                            if norm_pl == "press":
-                                logger.info(
-                                    "%s Restart button pressed! Restarting Cync Controller bridge (NOT IMPLEMENTED)...",
-                                    lp,
-                                )
-                        elif extra_data[0] == "start_export":
-                            if norm_pl == "press":
-                                logger.info(
-                                    "%s Start Export button pressed! Starting Cync Export (NOT IMPLEMENTED)...",
-                                    lp,
-                                )
-                        elif extra_data[0] == "refresh_status":
-                            if norm_pl == "press":
-                                logger.info(
-                                    "%s Refresh Status button pressed! Triggering immediate status refresh...",
-                                    lp,
-                                )
-                                await self.client.trigger_status_refresh()
-                        elif extra_data[0] == "otp":
-                            if extra_data[1] == "submit":
-                                logger.info(
-                                    "%s OTP submit button pressed! (NOT IMPLEMENTED)...",
-                                    lp,
-                                )
-                            elif extra_data[1] == "input":
-                                logger.info(
-                                    "%s OTP input received: %s (NOT IMPLEMENTED)...",
-                                    lp,
-                                    norm_pl,
-                                )
-                        elif device and device.is_fan_controller:
-                            if extra_data[0] == "percentage":
-                                percentage = int(norm_pl)
-                                logger.info(
-                                    "%s >>> FAN PERCENTAGE COMMAND: device='%s' (ID=%s), percentage=%s",
-                                    lp,
-                                    device.name,
-                                    device.id,
-                                    percentage,
-                                )
-                                # Map percentage to Cync fan speed (1-100, where 0=OFF)
-                                if percentage == 0:
-                                    brightness = 0  # OFF
-                                elif percentage <= 25:
-                                    brightness = 25  # LOW
-                                elif percentage <= 50:
-                                    brightness = 50  # MEDIUM
-                                elif percentage <= 75:
-                                    brightness = 75  # HIGH
-                                else:  # percentage > 75
-                                    brightness = 100  # MAX
-                                logger.info(
-                                    "%s Fan percentage %s%% mapped to brightness %s",
-                                    lp,
-                                    percentage,
-                                    brightness,
-                                )
-                                tasks.append(device.set_brightness(brightness))
-                            elif extra_data[0] == "preset":
-                                preset_mode = norm_pl
-                                logger.info(
-                                    "%s >>> FAN PRESET COMMAND: device='%s' (ID=%s), preset=%s",
-                                    lp,
-                                    device.name,
-                                    device.id,
-                                    preset_mode,
-                                )
-                                if preset_mode == "off":
-                                    tasks.append(device.set_fan_speed(FanSpeed.OFF))
-                                elif preset_mode == "low":
-                                    tasks.append(device.set_fan_speed(FanSpeed.LOW))
-                                elif preset_mode == "medium":
-                                    tasks.append(device.set_fan_speed(FanSpeed.MEDIUM))
-                                elif preset_mode == "high":
-                                    tasks.append(device.set_fan_speed(FanSpeed.HIGH))
-                                elif preset_mode == "max":
-                                    tasks.append(device.set_fan_speed(FanSpeed.MAX))
-                                else:
-                                    logger.warning(
-                                        "%s Unknown preset mode: %s, skipping...",
-                                        lp,
-                                        preset_mode,
-                                    )
-                        elif device and (extra_data[0] == "percentage" or extra_data[0] == "preset"):
-                            logger.warning(
-                                "%s Received fan speed command for non-fan device: name='%s', id=%s, is_fan_controller=%s, extra_data=%s",
-                                lp,
-                                device.name,
-                                device.id,
-                                device.is_fan_controller,
-                                extra_data[0],
-                            )
-
-                    # Determine target (device or group)
-                    target = group if group else device
-                    target_type = "GROUP" if group else "DEVICE" if target else "UNKNOWN"
-
-                    if target:
-                        target_name = target.name
-                        logger.info(
-                            "%s [BUG4-TRACE] Target determined: type=%s, name='%s', payload=%s",
-                            lp,
-                            target_type,
-                            target_name,
-                            payload.decode() if payload else None,
-                        )
-
-                    if payload.startswith(b"{"):
-                        try:
-                            json_data = json.loads(payload)
-                        except JSONDecodeError:
-                            logger.exception("%s bad json message: {%s} EXCEPTION", lp, payload)
-                            continue
-                        except Exception:
-                            logger.exception(
-                                "%s error will decoding a string into JSON: '%s' EXCEPTION",
-                                lp,
-                                payload,
-                            )
-                            continue
-
-                        if "state" in json_data and "brightness" not in json_data:
-                            if "effect" in json_data and device:
-                                effect = json_data["effect"]
-                                tasks.append(device.set_lightshow(effect))
-                            elif json_data["state"].upper() == "ON":
-                                logger.info(
-                                    "%s [BUG4-TRACE] Calling set_power(1) on %s '%s'",
-                                    lp,
-                                    target_type if target else "UNKNOWN",
-                                    target.name if target else "UNKNOWN",
-                                )
-                                cmd = SetPowerCommand(target, 1)
-                                await CommandProcessor().enqueue(cmd)
-                            else:
-                                logger.info(
-                                    "%s [BUG4-TRACE] Calling set_power(0) on %s '%s'",
-                                    lp,
-                                    target_type if target else "UNKNOWN",
-                                    target.name if target else "UNKNOWN",
-                                )
-                                cmd = SetPowerCommand(target, 0)
-                                await CommandProcessor().enqueue(cmd)
-                        if "brightness" in json_data:
-                            lum = int(json_data["brightness"])
-                            cmd = SetBrightnessCommand(target, lum)
-                            await CommandProcessor().enqueue(cmd)
-
-                        if "color_temp" in json_data:
-                            tasks.append(target.set_temperature(self.client.kelvin2cync(int(json_data["color_temp"]))))
-                        elif "color" in json_data and device:
-                            # Only devices support RGB, not groups yet
-                            color = []
-                            for rgb in ("r", "g", "b"):
-                                if rgb in json_data["color"]:
-                                    color.append(int(json_data["color"][rgb]))
-                                else:
-                                    color.append(0)
-                            tasks.append(device.set_rgb(*color))
-                    # binary payload does not start with a '{', so it is not JSON
-                    else:
-                        str_payload = payload.decode("utf-8").strip()
-                        #  use a regex pattern to determine if it is a single word
-                        pattern = re.compile(r"^\w+$")
-                        if pattern.match(str_payload):
-                            # handle non-JSON payloads
-                            if str_payload.casefold() == "on":
-                                logger.info(
-                                    "%s [BUG4-TRACE] Calling set_power(1) on %s '%s' (non-JSON)",
-                                    lp,
-                                    target_type if target else "UNKNOWN",
-                                    target.name if target else "UNKNOWN",
-                                )
-                                cmd = SetPowerCommand(target, 1)
-                                await CommandProcessor().enqueue(cmd)
-                            elif str_payload.casefold() == "off":
-                                logger.info(
-                                    "%s [BUG4-TRACE] Calling set_power(0) on %s '%s' (non-JSON)",
-                                    lp,
-                                    target_type if target else "UNKNOWN",
-                                    target.name if target else "UNKNOWN",
-                                )
-                                cmd = SetPowerCommand(target, 0)
-                                await CommandProcessor().enqueue(cmd)
-                        else:
-                            logger.warning("%s Unknown payload: %s, skipping...", lp, payload)
+            if "state" in json_data and "brightness" not in json_data:
+                if "effect" in json_data and device:
+                    effect = json_data["effect"]
+                    tasks.append(device.set_lightshow(effect))
+                elif json_data["state"].upper() == "ON":
+                    logger.info("%s [BUG4-TRACE] Calling set_power(1) on %s '%s'", lp, target_type, target.name)
+                    await CommandProcessor().enqueue(SetPowerCommand(target, 1))
                 else:
-                    logger.warning("%s Unknown command: %s => %s", lp, topic, payload)
-                if tasks:
-                    logger.debug("%s Executing %d task(s) for topic: %s", lp, len(tasks), topic)
-                    await asyncio.gather(*tasks)
-                    logger.debug("%s Task(s) completed for topic: %s", lp, topic)
-
-            # messages sent to the hass mqtt topic
-            elif _topic[0] == self.client.ha_topic:
-                # birth / will
-                if _topic[1] == CYNC_HASS_STATUS_TOPIC:
-                    if payload.decode().casefold() == CYNC_HASS_BIRTH_MSG.casefold():
-                        birth_delay = random.randint(5, 15)
-                        logger.info(
-                            "%s HASS has sent MQTT BIRTH message, re-announcing device discovery, availability and status after a random delay of %s seconds...",
-                            lp,
-                            birth_delay,
-                        )
-                        # Give HASS some time to start up, from docs:
-                        # To avoid high IO loads on the MQTT broker, adding some random delay in sending the discovery payload is recommended.
-                        await asyncio.sleep(birth_delay)
-                        # register devices
-                        await self.client.homeassistant_discovery()
-                        # give HASS a moment (to register devices)
-                        await asyncio.sleep(2)
-                        # set the device online/offline and set its status
-                        for device in g.ncync_server.devices.values():
-                            await self.client.state_updates.pub_online(device.id, device.online)
-                            await self.client.state_updates.parse_device_status(
-                                device.id,
-                                DeviceStatus(
-                                    state=device.state,
-                                    brightness=device.brightness,
-                                    temperature=device.temperature,
-                                    red=device.red,
-                                    green=device.green,
-                                    blue=device.blue,
-                                ),
-                                from_pkt="'hass_birth'",
-                            )
-                        # Set subgroups as online
-                        subgroups = [grp for grp in g.ncync_server.groups.values() if grp.is_subgroup]
-                        for subgroup in subgroups:
-                            await self.client.client.publish(
-                                f"{self.client.topic}/availability/{subgroup.hass_id}", b"online", qos=0
-                            )
-
-                    elif payload.decode().casefold() == CYNC_HASS_WILL_MSG.casefold():
-                        logger.info(
-                            "%s received Last Will msg from Home Assistant, HASS is offline!",
-                            lp,
-                        )
-                    else:
-                        logger.warning("%s Unknown HASS status message: %s", lp, payload)
+                    logger.info("%s [BUG4-TRACE] Calling set_power(0) on %s '%s'", lp, target_type, target.name)
+                    await CommandProcessor().enqueue(SetPowerCommand(target, 0))
+            if "brightness" in json_data:
+                lum = int(json_data["brightness"])
+                await CommandProcessor().enqueue(SetBrightnessCommand(target, lum))
+
+            if "color_temp" in json_data:
+                cmd = SetTemperatureCommand(target, self.client.kelvin2cync(int(json_data["color_temp"])))
+                await CommandProcessor().enqueue(cmd)
+            elif "color" in json_data and device:
+                # Only devices support RGB, not groups yet
+                color = [int(json_data["color"].get(rgb, 0)) for rgb in ("r", "g", "b")]
+                tasks.append(device.set_rgb(*color))
+            if tasks:
+                logger.debug("%s Executing %d task(s) for %s", lp, len(tasks), hass_id)
+                await asyncio.gather(*tasks)
+            return
+
+        # binary payload does not start with a '{', so it is not JSON
+        str_payload = payload.text.strip()
+        state = str_payload.casefold()
+        if state in ("on", "off"):
+            power = 1 if state == "on" else 0
+            logger.info(
+                "%s [BUG4-TRACE] Calling set_power(%s) on %s '%s' (non-JSON)",
+                lp,
+                power,
+                target_type,
+                target.name,
+            )
+            await CommandProcessor().enqueue(SetPowerCommand(target, power))
+        elif not _WORD.fullmatch(str_payload):
+            logger.warning("%s Unknown payload: %s, skipping...", lp, payload.raw)
+
+    def _fan_device(self, hass_id: str, command: str):
+        """The fan controller a percentage / preset topic targets, None (with a warning) otherwise."""
+        resolved = self._resolve_target(hass_id)
+        if resolved is None:
+            return None
+        device = resolved[0]
+        if device is None:
+            return None
+        if not device.is_fan_controller:
+            logger.warning(
+                "%s Received fan speed command for non-fan device: name='%s', id=%s, is_fan_controller=%s, extra_data=%s",
+                self.lp,
+                device.name,
+                device.id,
+                device.is_fan_controller,
+                command,
+            )
+            return None
+        return device
+
+    async def _on_fan_percentage(self, payload: CommandPayload, hass_id: str):
+        lp = self.lp
+        device = self._fan_device(hass_id, "percentage")
+        if device is None:
+            return
+        try:
+            percentage = int(payload.norm)
+        except ValueError:
+            logger.warning("%s Invalid fan percentage: %s, skipping...", lp, payload.raw)
+            return
+        logger.info(
+            "%s >>> FAN PERCENTAGE COMMAND: device='%s' (ID=%s), percentage=%s",
+            lp,
+            device.name,
+            device.id,
+            percentage,
+        )
+        # Map percentage to Cync fan speed (1-100, where 0=OFF)
+        if percentage == 0:
+            brightness = 0  # OFF
+        elif percentage <= 25:
+            brightness = 25  # LOW
+        elif percentage <= 50:
+            brightness = 50  # MEDIUM
+        elif percentage <= 75:
+            brightness = 75  # HIGH
+        else:  # percentage > 75
+            brightness = 100  # MAX
+        logger.info(
+            "%s Fan percentage %s%% mapped to brightness %s",
+            lp,
+            percentage,
+            brightness,
+        )
+        await device.set_brightness(brightness)
+
+    async def _on_fan_preset(self, payload: CommandPayload, hass_id: str):
+        lp = self.lp
+        device = self._fan_device(hass_id, "preset")
+        if device is None:
+            return
+        preset_mode = payload.norm
+        logger.info(
+            "%s >>> FAN PRESET COMMAND: device='%s' (ID=%s), preset=%s",
+            lp,
+            device.name,
+            device.id,
+            preset_mode,
+        )
+        fan_speed = _FAN_PRESETS.get(preset_mode)
+        if fan_speed is None:
+            logger.warning(
+                "%s Unknown preset mode: %s, skipping...",
+                lp,
+                preset_mode,
+            )
+            return
+        await device.set_fan_speed(fan_speed)
+
+    async def _on_restart(self, payload: CommandPayload):
+        if payload.norm == "press":
+            logger.info(
+                "%s Restart button pressed! Restarting Cync Controller bridge (NOT IMPLEMENTED)...",
+                self.lp,
+            )
+
+    async def _on_start_export(self, payload: CommandPayload):
+        if payload.norm == "press":
+            logger.info(
+                "%s Start Export button pressed! Starting Cync Export (NOT IMPLEMENTED)...",
+                self.lp,
+            )
+
+    async def _on_refresh_status(self, payload: CommandPayload):
+        if payload.norm == "press":
+            logger.info(
+                "%s Refresh Status button pressed! Triggering immediate status refresh...",
+                self.lp,
+            )
+            await self.client.trigger_status_refresh()
+
+    async def _on_rediscover(self, payload: CommandPayload):
+        if payload.norm == "press":
+            logger.info(
+                "%s Rediscover button pressed! Republishing all discovery configs...",
+                self.lp,
+            )
+            await self.client.republish_discovery()
+
+    async def _on_call_site_tracing(self, payload: CommandPayload):
+        enabled = payload.norm == "on"
+        logger.info(
+            "%s Call-site tracing for state publishes %s",
+            self.lp,
+            "enabled" if enabled else "disabled",
+        )
+        set_call_site_tracing(enabled)
+        await self.client.publish(
+            f"{self.client.topic}/status/bridge/call_site_tracing",
+            b"ON" if enabled else b"OFF",
+        )
+
+    async def _on_otp_submit(self, _payload: CommandPayload):
+        logger.info(
+            "%s OTP submit button pressed! (NOT IMPLEMENTED)...",
+            self.lp,
+        )
+
+    async def _on_otp_input(self, payload: CommandPayload):
+        logger.info(
+            "%s OTP input received: %s (NOT IMPLEMENTED)...",
+            self.lp,
+            payload.norm,
+        )
+
+    async def _on_unknown_command(self, payload: CommandPayload, rest: str):
+        logger.warning("%s Unknown command: %s/%s => %s", self.lp, self.client.topic, rest, payload.raw)
+
+    async def _on_hass_status(self, payload: CommandPayload):
+        lp = self.lp
+        if payload.norm == CYNC_HASS_BIRTH_MSG.casefold():
+            birth_delay = random.randint(5, 15)
+            logger.info(
+                "%s HASS has sent MQTT BIRTH message, re-announcing device discovery, availability and status after a random delay of %s seconds...",
+                lp,
+                birth_delay,
+            )
+            # Give HASS some time to start up, from docs:
+            # To avoid high IO loads on the MQTT broker, adding some random delay in sending the discovery payload is recommended.
+            await asyncio.sleep(birth_delay)
+            # register devices
+            await self.client.homeassistant_discovery()
+            # give HASS a moment (to register devices)
+            await asyncio.sleep(2)
+            # set the device online/offline and set its status, subgroups online
+            await self.client.state_updates.replay_states("'hass_birth'")
+
+        elif payload.norm == CYNC_HASS_WILL_MSG.casefold():
+            logger.info(
+                "%s received Last Will msg from Home Assistant, HASS is offline!",
+                lp,
+            )
+        else:
+            logger.warning("%s Unknown HASS status message: %s", lp, payload.raw)
@@ -5,9 +5,12 @@ Provides command pattern implementation for optimistic updates and device contro
 """
 
 import asyncio
+from collections import deque
 
+from cync_controller.const import CYNC_MAX_INFLIGHT_COMMANDS
 from cync_controller.devices import CyncGroup
 from cync_controller.logging_abstraction import get_logger
+from cync_controller.scheduler import DeadlineScheduler
 from cync_controller.structs import GlobalObject
 
 logger = get_logger(__name__)
@@ -31,6 +34,12 @@ class DeviceCommand:
         self.params = kwargs
         self.timestamp = asyncio.get_event_loop().time()
 
+    @property
+    def lane_key(self) -> tuple[str, str | int]:
+        """Commands with the same lane key run in order, other lanes run concurrently."""
+        target = getattr(self, "device_or_group", None)
+        return ("group" if isinstance(target, CyncGroup) else "device", self.device_id)
+
     async def publish_optimistic(self):
         """Publish optimistic state update to MQTT (before device command)."""
         raise NotImplementedError
@@ -43,8 +52,75 @@ class DeviceCommand:
         return f"<{self.cmd_type}: device_id={self.device_id} params={self.params}>"
 
 
+# Only the newest pending value matters for these, so queued commands are replaced rather than replayed.
+# Power commands are never merged: every on/off transition is sent.
+MERGEABLE_COMMANDS = frozenset({"set_brightness", "set_temperature"})
+
+
+class CommandLane:
+    """Ordered queue of pending commands for a single device or group, with depth / wait metrics."""
+
+    def __init__(self, key: tuple[str, str | int]):
+        self.key = key
+        self.pending: deque[tuple[DeviceCommand, float]] = deque()
+        self.active = False
+        self.max_depth = 0
+        self.processed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.merged = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.pending)
+
+    def push(self, cmd: DeviceCommand, now: float) -> DeviceCommand | None:
+        """
+        Queue a command, returning the pending command it replaced (if any).
+
+        A brightness / temperature command replaces the last pending command when that is of the
+        same kind (last write wins). Only the tail is considered so a merge never moves a value
+        across a power command queued in between.
+        """
+        if cmd.cmd_type in MERGEABLE_COMMANDS and self.pending:
+            last, queued_at = self.pending[-1]
+            if last.cmd_type == cmd.cmd_type:
+                # keep the original queue time so wait metrics cover the whole burst
+                self.pending[-1] = (cmd, queued_at)
+                self.merged += 1
+                return last
+        self.pending.append((cmd, now))
+        self.max_depth = max(self.max_depth, len(self.pending))
+        return None
+
+    def pop(self, now: float) -> DeviceCommand:
+        cmd, queued_at = self.pending.popleft()
+        waited = now - queued_at
+        self.processed += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return cmd
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "merged": self.merged,
+            "avg_wait_ms": round(self.total_wait / self.processed * 1000, 1) if self.processed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
 class CommandProcessor:
-    """Singleton processor for device commands with sequential mesh refresh."""
+    """
+    Singleton processor for device commands.
+
+    Commands are queued on ``_queue`` and ``process_next`` hands them out to a lane per target
+    device or group. Lanes run concurrently, so a bulb that never ACKs only holds up its own
+    commands, while commands within a lane still run strictly in order. At most
+    ``CYNC_MAX_INFLIGHT_COMMANDS`` commands are sent / waiting for an ACK at any one time.
+    """
 
     _instance = None
 
@@ -58,6 +134,13 @@ class CommandProcessor:
         if not hasattr(self, "_initialized"):
             self._queue = asyncio.Queue()
             self._processing = False
+            self._lanes: dict[tuple[str, str | int], CommandLane] = {}
+            self._lane_tasks: set[asyncio.Task] = set()
+            self.max_inflight = max(1, CYNC_MAX_INFLIGHT_COMMANDS)
+            self._loop: asyncio.AbstractEventLoop | None = None
+            self._wakeup = asyncio.Event()
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+            self.inflight = 0
             self._initialized = True
             self.lp = "CommandProcessor:"
 
@@ -73,23 +156,84 @@ class CommandProcessor:
         if not self._processing:
             task = asyncio.create_task(self.process_next())
             del task  # Reference stored, allow garbage collection
+        else:
+            self._wakeup.set()
 
     async def process_next(self):
-        """Process commands sequentially with mesh refresh."""
+        """Dispatch queued commands to their lanes until every lane has drained."""
         lp = f"{self.lp}process_next:"
         self._processing = True
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio primitives bind to the first loop that waits on them
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+
+        try:
+            while True:
+                while not self._queue.empty():
+                    self._dispatch(self._queue.get_nowait())
+                    self._queue.task_done()
+                if not any(lane.active for lane in self._lanes.values()):
+                    break
+                self._wakeup.clear()
+                await self._wakeup.wait()
+        finally:
+            self._processing = False
+            logger.debug("%s Processing loop ended, queue size: %d", lp, self._queue.qsize())
 
+    def lane_stats(self) -> dict[str, dict[str, int | float]]:
+        """Queue depth and wait time metrics for every lane that has seen a command."""
+        return {f"{kind}:{target}": lane.stats() for (kind, target), lane in self._lanes.items()}
+
+    def stats(self) -> dict[str, int]:
+        lanes = self._lanes.values()
+        return {
+            "lanes": len(self._lanes),
+            "active_lanes": sum(1 for lane in lanes if lane.active),
+            "queued": sum(lane.depth for lane in lanes),
+            "merged": sum(lane.merged for lane in lanes),
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+        }
+
+    def _dispatch(self, cmd: DeviceCommand) -> None:
+        key = cmd.lane_key
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = CommandLane(key)
+        replaced = lane.push(cmd, asyncio.get_running_loop().time())
+        if replaced is not None:
+            logger.debug("%s Merged %s into pending %s", self.lp, cmd, replaced)
+        if not lane.active:
+            lane.active = True
+            task = asyncio.create_task(self._run_lane(lane))
+            self._lane_tasks.add(task)
+            task.add_done_callback(self._lane_tasks.discard)
+
+    async def _run_lane(self, lane: CommandLane) -> None:
+        loop = asyncio.get_running_loop()
         try:
-            while not self._queue.empty():
-                cmd = await self._queue.get()
+            while lane.pending:
+                cmd = lane.pop(loop.time())
+                await self._run_command(cmd)
+        finally:
+            lane.active = False
+            self._wakeup.set()
+
+    async def _run_command(self, cmd: DeviceCommand) -> None:
+        lp = f"{self.lp}process_next:"
+        logger.info("%s Processing: %s", lp, cmd)
 
-                logger.info("%s Processing: %s", lp, cmd)
+        try:
+            # 1 Optimistic MQTT update first (UX feels instant)
+            logger.debug("%s Publishing optimistic update", lp)
+            await cmd.publish_optimistic()
 
+            async with self._inflight:
+                self.inflight += 1
                 try:
-                    # 1 Optimistic MQTT update first (UX feels instant)
-                    logger.debug("%s Publishing optimistic update", lp)
-                    await cmd.publish_optimistic()
-
                     # 2 Send to device and get ACK event + cleanup info
                     logger.debug("%s Executing device command", lp)
                     result = await cmd.execute()
@@ -101,32 +245,29 @@ class CommandProcessor:
                         ack_event = result
                         sent_bridges = []
 
-                    # 3 Wait for ACK with timeout (block queue until command confirmed)
+                    # 3 Wait for ACK with timeout (block this lane until command confirmed)
                     if ack_event:
                         logger.debug("%s Waiting for ACK...", lp)
                         try:
-                            await asyncio.wait_for(ack_event.wait(), timeout=5.0)
+                            async with DeadlineScheduler().timeout(5.0):
+                                await ack_event.wait()
                             logger.info("%s ACK received, command confirmed", lp)
                         except TimeoutError:
                             logger.warning("%s ACK timeout after 5s - cleaning up callbacks", lp)
                             # Immediately remove orphaned callbacks instead of waiting 30s for cleanup task
                             for bridge, msg_id in sent_bridges:
-                                if msg_id in bridge.messages.control:
-                                    del bridge.messages.control[msg_id]
+                                if bridge.messages.control.give_up(msg_id) is not None:
+                                    bridge.health.record_loss()
                                     logger.debug("%s Removed orphaned callback for msg ID %s", lp, msg_id)
                     else:
                         logger.debug("%s No ACK event (command rejected/throttled)", lp)
+                finally:
+                    self.inflight -= 1
 
-                    logger.info("%s Command cycle complete for %s", lp, cmd.cmd_type)
-
-                except Exception:
-                    logger.exception("%s Command failed: %s", lp, cmd)
+            logger.info("%s Command cycle complete for %s", lp, cmd.cmd_type)
 
-                finally:
-                    self._queue.task_done()
-        finally:
-            self._processing = False
-            logger.debug("%s Processing loop ended, queue size: %d", lp, self._queue.qsize())
+        except Exception:
+            logger.exception("%s Command failed: %s", lp, cmd)
 
 
 class SetPowerCommand(DeviceCommand):
@@ -197,3 +338,31 @@ class SetBrightnessCommand(DeviceCommand):
     async def execute(self):
         """Execute the actual set_brightness command."""
         return await self.device_or_group.set_brightness(self.brightness)
+
+
+class SetTemperatureCommand(DeviceCommand):
+    """Command to set device or group white temperature."""
+
+    def __init__(self, device_or_group, temperature: int):
+        """
+        Initialize set temperature command.
+
+        Args:
+            device_or_group: CyncDevice or CyncGroup instance
+            temperature: Cync color temperature (0-100)
+        """
+        super().__init__("set_temperature", device_or_group.id, temperature=temperature)
+        self.device_or_group = device_or_group
+        self.temperature = temperature
+
+    async def publish_optimistic(self):
+        """Publish optimistic temperature update for the device."""
+        if isinstance(self.device_or_group, CyncGroup):
+            # For groups: member states are synced from the ACK / status packets
+            pass
+        else:
+            await g.mqtt_client.update_temperature(self.device_or_group, self.temperature)
+
+    async def execute(self):
+        """Execute the actual set_temperature command."""
+        return await self.device_or_group.set_temperature(self.temperature)
@@ -13,6 +13,7 @@ import aiomqtt
 from cync_controller.const import (
     CYNC_BRIDGE_DEVICE_REGISTRY_CONF,
     CYNC_BRIDGE_OBJ_ID,
+    CYNC_DISCOVERY_CACHE_PATH,
     CYNC_EXPOSE_DEVICE_LIGHTS,
     CYNC_MANUFACTURER,
     CYNC_MAXK,
@@ -21,8 +22,11 @@ from cync_controller.const import (
     FACTORY_EFFECTS_BYTES,
     ORIGIN_STRUCT,
 )
+from cync_controller.instrumentation import call_site_tracing_enabled
 from cync_controller.logging_abstraction import get_logger
 from cync_controller.metadata.model_info import DeviceClassification, device_type_map
+from cync_controller.mqtt.discovery_cache import DiscoveryCache
+from cync_controller.mqtt.payloads import fan_preset_mode
 
 logger = get_logger(__name__)
 
@@ -69,6 +73,8 @@ class DiscoveryHelper:
     def __init__(self, mqtt_client):
         """Initialize discovery helper."""
         self.client = mqtt_client
+        # Built discovery configs and the hashes of what the broker has (retained)
+        self.cache = DiscoveryCache(CYNC_DISCOVERY_CACHE_PATH)
 
     async def register_single_device(self, device) -> bool:
         """Register a single device with Home Assistant via MQTT discovery."""
@@ -320,30 +326,13 @@ class DiscoveryHelper:
                     qos=0,
                     retain=False,
                 )
+                # The retained config from homeassistant_discovery() is superseded, publish it again next time
+                self.cache.forget(tpc)
 
                 # For fan entities, publish initial preset mode based on current brightness
                 if device.is_fan_controller and device.brightness is not None:
                     bri = device.brightness
-                    # Map brightness (1-100 scale) to preset mode
-                    if bri == 0:
-                        preset_mode = "off"
-                    elif bri == 25:
-                        preset_mode = "low"
-                    elif bri == 50:
-                        preset_mode = "medium"
-                    elif bri == 75:
-                        preset_mode = "high"
-                    elif bri == 100:
-                        preset_mode = "max"
-                    # For any other value, find closest preset
-                    elif bri < 25:
-                        preset_mode = "low"
-                    elif bri < 50:
-                        preset_mode = "medium"
-                    elif bri < 75:
-                        preset_mode = "high"
-                    else:
-                        preset_mode = "max"
+                    preset_mode = fan_preset_mode(bri)
 
                     preset_mode_topic = f"{self.client.topic}/status/{device.hass_id}/preset"
                     try:
@@ -386,6 +375,8 @@ class DiscoveryHelper:
 
         logger.info("%s Triggering device rediscovery...", lp)
         try:
+            # Rebuild every discovery config from the current device data on the next discovery
+            self.cache.forget_configs()
             if g.ncync_server:
                 for device in g.ncync_server.devices.values():
                     await self.register_single_device(device)
@@ -396,404 +387,109 @@ class DiscoveryHelper:
             logger.info("%s Device rediscovery completed", lp)
             return True
 
+    async def republish_discovery(self) -> bool:
+        """
+        Publish every discovery config again, unchanged ones included.
+
+        For when the broker no longer has the retained configs (lost its store) or an entity was
+        deleted in HASS, the published hashes can't tell.
+        """
+        logger.info("%s Republishing all discovery configs...", f"{self.client.lp}hass:")
+        self.cache.invalidate()
+        return await self.homeassistant_discovery()
+
     async def homeassistant_discovery(self) -> bool:
-        """Build each configured Cync device for HASS device registry"""
+        """
+        Build each configured Cync device for HASS device registry.
+
+        Configs are built once per device / group and published retained, and only when their hash
+        differs from the last published one (see DiscoveryCache). Configs that are not generated
+        anymore are removed from the broker.
+        """
         lp = f"{self.client.lp}hass:"
         ret = False
         if self.client._connected:
             logger.info("%s Starting device discovery...", lp)
             await self.create_bridge_device()
+            cache = self.cache
             try:
                 if g.ncync_server:
+                    current: set[str] = set()
+                    # changed configs (topic, payload) with a description for the log, fan preset states
+                    configs: list[tuple[str, bytes]] = []
+                    described: list[str] = []
+                    presets: list[tuple[str, bytes]] = []
+                    areas = self._room_areas()
                     for device in g.ncync_server.devices.values():
-                        device_uuid = device.hass_id
-                        unique_id = f"{device.home_id}_{device.id}"
-                        # Generate entity ID from device name (e.g., "Hallway Light" -> "hallway_light")
-                        entity_slug = slugify(device.name) if device.name else f"device_{device.id}"
-                        # Determine platform for default_entity_id
-                        platform = "switch" if device.is_switch else "light"
-                        default_entity_id = f"{platform}.{entity_slug}"
-                        dev_fw_version = str(device.version)
-                        ver_str = "Unknown"
-                        fw_len = len(dev_fw_version)
-                        if fw_len == 5:
-                            if dev_fw_version != 00000:
-                                ver_str = f"{dev_fw_version[0]}.{dev_fw_version[1]}.{dev_fw_version[2:]}"
-                        elif fw_len == 2:
-                            ver_str = f"{dev_fw_version[0]}.{dev_fw_version[1]}"
-                        model_str = "Unknown"
-                        if device.type in device_type_map:
-                            model_str = device_type_map[device.type].model_string
-                        dev_connections = [("bluetooth", device.mac.casefold())]
-                        if not device.bt_only:
-                            dev_connections.append(("mac", device.wifi_mac.casefold()))
-
-                        # Extract suggested area from group membership
-                        # First, check if device belongs to any non-subgroup (room group)
-                        suggested_area = None
-                        if g.ncync_server:
-                            for group in g.ncync_server.groups.values():
-                                if not group.is_subgroup and device.id in group.member_ids:
-                                    suggested_area = group.name
-                                    logger.debug(
-                                        "%s Using group '%s' as area for device '%s' (ID: %s)",
-                                        lp,
-                                        suggested_area,
-                                        device.name,
-                                        device.id,
-                                    )
-                                    break
-
-                        # Fallback: Extract area from device name if not in any room group
-                        if not suggested_area and device.name:
-                            # Common device type suffixes to remove
-                            suffixes = [
-                                "Switch",
-                                "Light",
-                                "Floodlight",
-                                "Lamp",
-                                "Bulb",
-                                "Dimmer",
-                                "Plug",
-                                "Outlet",
-                                "Fan",
-                            ]
-                            name_parts = device.name.strip().split()
-                            # Remove trailing numbers (e.g., "Floodlight 1" -> "Floodlight")
-                            if name_parts and name_parts[-1].isdigit():
-                                name_parts = name_parts[:-1]
-                            # Remove device type suffix
-                            for suffix in suffixes:
-                                if name_parts and name_parts[-1] == suffix:
-                                    name_parts = name_parts[:-1]
-                                    break
-                            # The first word is the area name
-                            if name_parts:
-                                suggested_area = name_parts[0]
-                                logger.debug(
-                                    "%s Extracted area '%s' from device name '%s' (fallback, not in any room group)",
-                                    lp,
-                                    suggested_area,
-                                    device.name,
-                                )
-
-                        device_registry_struct = {
-                            "identifiers": [unique_id],
-                            "manufacturer": CYNC_MANUFACTURER,
-                            "connections": dev_connections,
-                            "name": device.name,
-                            "sw_version": ver_str,
-                            "model": model_str,
-                            "via_device": str(g.uuid),
-                        }
-
-                        # Add suggested_area if we successfully extracted one
-                        if suggested_area:
-                            device_registry_struct["suggested_area"] = suggested_area
-
-                        entity_registry_struct = {
-                            "default_entity_id": default_entity_id,
-                            # set to None if only device name is relevant, this sets entity name
-                            "name": None,
-                            "command_topic": f"{self.client.topic}/set/{device_uuid}",
-                            "state_topic": f"{self.client.topic}/status/{device_uuid}",
-                            "avty_t": f"{self.client.topic}/availability/{device_uuid}",
-                            "pl_avail": "online",
-                            "pl_not_avail": "offline",
-                            "state_on": "ON",
-                            "state_off": "OFF",
-                            "unique_id": unique_id,
-                            "schema": "json",
-                            "origin": ORIGIN_STRUCT,
-                            "device": device_registry_struct,
-                            "optimistic": False,
-                        }
-                        # Determine device type (same logic as register_single_device)
-                        dev_type = "light"  # Default fallback
-                        if device.is_switch:
-                            dev_type = "switch"
-                            logger.debug(
-                                "%s Device '%s' classified as switch (type: %s)",
-                                lp,
-                                device.name,
-                                device.metadata.type if device.metadata else "None",
-                            )
-                            if device.metadata and device.metadata.capabilities.fan:
-                                dev_type = "fan"
-                                logger.debug("%s Device '%s' reclassified as fan", lp, device.name)
-                        elif device.is_light:
-                            dev_type = "light"
-                            logger.debug("%s Device '%s' classified as light", lp, device.name)
-                        # For unknown devices, try to infer from device type if available
-                        elif device.type is not None and device.type in device_type_map:
-                            # This shouldn't happen if metadata is properly set, but just in case
-                            metadata_type = device_type_map[device.type].type
-                            if metadata_type == DeviceClassification.SWITCH:
-                                dev_type = "switch"
-                                logger.debug(
-                                    "%s Device '%s' classified as switch from device_type_map",
+                        key = f"device:{device.id}"
+                        config = cache.config(key)
+                        if config is None:
+                            dev_type = self._device_platform(device, lp)
+                            # Conditionally publish device discovery: skip device-level lights if feature flag is off
+                            if dev_type == "light" and not CYNC_EXPOSE_DEVICE_LIGHTS:
+                                logger.info(
+                                    "%s Skipping device light discovery for '%s' due to feature flag",
                                     lp,
                                     device.name,
                                 )
-                            elif metadata_type == DeviceClassification.LIGHT:
-                                dev_type = "light"
-                                logger.debug(
-                                    "%s Device '%s' classified as light from device_type_map",
-                                    lp,
-                                    device.name,
+                                continue
+                            entity_registry_struct = self._device_config(device, dev_type, areas.get(device.id), lp)
+                            tpc = f"{self.client.ha_topic}/{dev_type}/{device.hass_id}/config"
+                            config = (tpc, json.dumps(entity_registry_struct, indent=2).encode())
+                            cache.store(key, *config)
+                        current.add(config[0])
+                        if cache.changed(*config):
+                            configs.append(config)
+                            described.append(f"device '{device.name}' (ID: {device.id})")
+                        # For fan entities, publish initial preset mode state
+                        if device.is_fan_controller and device.brightness is not None:
+                            presets.append(
+                                (
+                                    f"{self.client.topic}/status/{device.hass_id}/preset",
+                                    fan_preset_mode(device.brightness).encode(),
                                 )
-                            else:
-                                logger.debug(
-                                    "%s Device '%s' unknown metadata type: %s, defaulting to light",
-                                    lp,
-                                    device.name,
-                                    metadata_type,
-                                )
-                        else:
-                            logger.debug(
-                                "%s Device '%s' unknown device type %s, defaulting to light (is_light: %s, is_switch: %s)",
-                                lp,
-                                device.name,
-                                device.type,
-                                device.is_light,
-                                device.is_switch,
                             )
 
-                        tpc_str_template = "{0}/{1}/{2}/config"
-
-                        if dev_type == "light":
-                            entity_registry_struct.update({"brightness": True, "brightness_scale": 100})
-                            # ALL lights with brightness must declare color modes
-                            entity_registry_struct["supported_color_modes"] = []
-                            if device.supports_temperature:
-                                entity_registry_struct["supported_color_modes"].append("color_temp")
-                                entity_registry_struct["color_temp_kelvin"] = True
-                                entity_registry_struct["min_kelvin"] = CYNC_MINK
-                                entity_registry_struct["max_kelvin"] = CYNC_MAXK
-                            if device.supports_rgb:
-                                entity_registry_struct["supported_color_modes"].append("rgb")
-                            entity_registry_struct["effect"] = True
-                            entity_registry_struct["effect_list"] = list(FACTORY_EFFECTS_BYTES.keys())
-                            # If no color support, default to brightness-only mode
-                            if not entity_registry_struct["supported_color_modes"]:
-                                entity_registry_struct["supported_color_modes"] = ["brightness"]
-                        elif dev_type == "switch":
-                            # Switch entities should not declare JSON schema
-                            entity_registry_struct.pop("schema", None)
-                        elif dev_type == "fan":
-                            entity_registry_struct["platform"] = "fan"
-                            # fan can be controlled via light control structs: brightness -> max=255, high=191, medium=128, low=50, off=0
-                            entity_registry_struct.pop("state_on", None)
-                            entity_registry_struct.pop("state_off", None)
-                            entity_registry_struct.pop("schema", None)
-                            entity_registry_struct["state_topic"] = f"{self.client.topic}/status/{device_uuid}"
-                            entity_registry_struct["command_topic"] = f"{self.client.topic}/set/{device_uuid}"
-                            entity_registry_struct["payload_on"] = "ON"
-                            entity_registry_struct["payload_off"] = "OFF"
-                            entity_registry_struct["preset_mode_command_topic"] = (
-                                f"{self.client.topic}/set/{device_uuid}/preset"
-                            )
-                            entity_registry_struct["preset_mode_state_topic"] = (
-                                f"{self.client.topic}/status/{device_uuid}/preset"
-                            )
-                            entity_registry_struct["preset_modes"] = [
-                                "off",
-                                "low",
-                                "medium",
-                                "high",
-                                "max",
-                            ]
-
-                        # Conditionally publish device discovery: skip device-level lights if feature flag is off
-                        if dev_type == "light" and not CYNC_EXPOSE_DEVICE_LIGHTS:
-                            logger.info(
-                                "%s Skipping device light discovery for '%s' due to feature flag",
-                                lp,
-                                device.name,
-                            )
-                            continue
-
-                        tpc = tpc_str_template.format(self.client.ha_topic, dev_type, device_uuid)
-                        try:
+                    # Register groups (only subgroups)
+                    subgroups = [group for group in g.ncync_server.groups.values() if group.is_subgroup]
+                    logger.debug("%s Checking %s subgroups...", lp, len(subgroups))
+                    for group in subgroups:
+                        key = f"group:{group.id}"
+                        config = cache.config(key)
+                        if config is None:
+                            entity_registry_struct = self._group_config(group, lp)
+                            if entity_registry_struct is None:
+                                continue
+                            tpc = f"{self.client.ha_topic}/light/{group.hass_id}/config"
                             json_payload = json.dumps(entity_registry_struct, indent=2)
-                            _ = await self.client.client.publish(
-                                tpc,
-                                json_payload.encode(),
-                                qos=0,
-                                retain=False,
-                            )
-                            logger.info(
-                                "%s Registered %s: %s (ID: %s)",
-                                lp,
-                                dev_type,
-                                device.name,
-                                device.id,
-                            )
-
-                            # For fan entities, publish initial preset mode state
-                            if device.is_fan_controller and device.brightness is not None:
-                                bri = device.brightness
-                                # Map brightness (1-100 scale) to preset mode
-                                if bri == 0:
-                                    preset_mode = "off"
-                                elif bri == 25:
-                                    preset_mode = "low"
-                                elif bri == 50:
-                                    preset_mode = "medium"
-                                elif bri == 75:
-                                    preset_mode = "high"
-                                elif bri == 100:
-                                    preset_mode = "max"
-                                # For any other value, find closest preset
-                                elif bri < 25:
-                                    preset_mode = "low"
-                                elif bri < 50:
-                                    preset_mode = "medium"
-                                elif bri < 75:
-                                    preset_mode = "high"
-                                else:
-                                    preset_mode = "max"
-
-                                preset_mode_topic = f"{self.client.topic}/status/{device_uuid}/preset"
-                                try:
-                                    await self.client.client.publish(
-                                        preset_mode_topic,
-                                        preset_mode.encode(),
-                                        qos=0,
-                                        retain=True,
-                                        timeout=3.0,
-                                    )
-                                    logger.info(
-                                        "%s >>> FAN INITIAL PRESET: Published '%s' (brightness=%s) for '%s'",
-                                        lp,
-                                        preset_mode,
-                                        bri,
-                                        device.name,
-                                    )
-                                except Exception:
-                                    logger.warning(
-                                        "%s Failed to publish initial fan preset mode for '%s'",
-                                        lp,
-                                        device.name,
-                                    )
-
-                        except Exception:
-                            logger.exception("%s - Unable to publish mqtt message... skipped", lp)
-
-                # Register groups (only subgroups)
-                subgroups = [g for g in g.ncync_server.groups.values() if g.is_subgroup]
-                logger.info("%s Registering %s subgroups...", lp, len(subgroups))
-                for group in subgroups:
-                    group_uuid = group.hass_id
-                    unique_id = f"{group.home_id}_group_{group.id}"
-
-                    # Check if group contains any light-compatible devices
-                    has_light_devices = False
-                    for member_id in group.member_ids:
-                        if member_id in g.ncync_server.devices:
-                            device = g.ncync_server.devices[member_id]
-                            # Publish light entity only for groups with light devices
-                            if device.is_light:
-                                has_light_devices = True
-                                break
-
-                    logger.info(
-                        "[SUBGROUP_CHECK] Group '%s' (ID: %s) - has_light_devices=%s, member_count=%d",
-                        group.name,
-                        group.id,
-                        has_light_devices,
-                        len(group.member_ids),
-                    )
-
-                    if not has_light_devices:
-                        logger.info(
-                            "%s Skipping light entity for group '%s' (ID: %s) - no light-compatible devices",
-                            lp,
-                            group.name,
-                            group.id,
-                        )
-                        continue
-
-                    # Generate entity ID from group name (e.g., "Hallway Lights" -> "light.hallway_lights")
-                    entity_slug = slugify(group.name) if group.name else f"group_{group.id}"
-                    default_entity_id = f"light.{entity_slug}"
-
-                    device_registry_struct = {
-                        "identifiers": [unique_id],
-                        "manufacturer": CYNC_MANUFACTURER,
-                        "name": group.name,
-                        "model": "Cync Subgroup",
-                        "via_device": str(g.uuid),
-                    }
-
-                    entity_registry_struct = {
-                        "default_entity_id": default_entity_id,
-                        "name": None,
-                        "command_topic": f"{self.client.topic}/set/{group_uuid}",
-                        "state_topic": f"{self.client.topic}/status/{group_uuid}",
-                        "avty_t": f"{self.client.topic}/availability/{group_uuid}",
-                        "pl_avail": "online",
-                        "pl_not_avail": "offline",
-                        "state_on": "ON",
-                        "state_off": "OFF",
-                        "unique_id": unique_id,
-                        "schema": "json",
-                        "origin": ORIGIN_STRUCT,
-                        "device": device_registry_struct,
-                        "optimistic": False,
-                    }
-
-                    # Add brightness support (exactly like devices do with .update())
-                    entity_registry_struct.update({"brightness": True, "brightness_scale": 100})
-
-                    # Add color support - ALL lights with brightness must declare color modes
-                    entity_registry_struct["supported_color_modes"] = []
-                    if group.supports_temperature:
-                        entity_registry_struct["supported_color_modes"].append("color_temp")
-                        entity_registry_struct["color_temp_kelvin"] = True
-                        entity_registry_struct["min_kelvin"] = CYNC_MINK
-                        entity_registry_struct["max_kelvin"] = CYNC_MAXK
-                    if group.supports_rgb:
-                        entity_registry_struct["supported_color_modes"].append("rgb")
-                    # If no color support, default to brightness-only mode
-                    if not entity_registry_struct["supported_color_modes"]:
-                        entity_registry_struct["supported_color_modes"] = ["brightness"]
-
-                    tpc = tpc_str_template.format(self.client.ha_topic, "light", group_uuid)
-                    try:
-                        json_payload = json.dumps(entity_registry_struct, indent=2)
-                        logger.debug("%s GROUP JSON for %s:\n%s", lp, group.name, json_payload)
-                        logger.info(
-                            "[SUBGROUP_PUBLISHING] Publishing group '%s' to topic: %s",
-                            group.name,
-                            tpc,
-                        )
-                        publish_result = await self.client.client.publish(
-                            tpc,
-                            json_payload.encode(),
-                            qos=0,
-                            retain=False,
-                        )
-                        logger.info(
-                            "[SUBGROUP_PUBLISHED] ✓ Group '%s' (ID: %s) published successfully. Result: %s",
-                            group.name,
-                            group.id,
-                            publish_result,
-                        )
-                        logger.info(
-                            "%s Registered group '%s' (ID: %s) with %s devices",
-                            lp,
-                            group.name,
-                            group.id,
-                            len(group.member_ids),
-                        )
-                    except Exception:
-                        logger.exception(
-                            "[SUBGROUP_ERROR] ✗ Failed to publish group '%s' (ID: %s) to topic %s",
-                            group.name,
-                            group.id,
-                            tpc,
-                        )
+                            logger.debug("%s GROUP JSON for %s:\n%s", lp, group.name, json_payload)
+                            config = (tpc, json_payload.encode())
+                            cache.store(key, *config)
+                        current.add(config[0])
+                        if cache.changed(*config):
+                            configs.append(config)
+                            described.append(f"group '{group.name}' (ID: {group.id}, {len(group.member_ids)} devices)")
+
+                    published = await self.client.publish_many(configs, retain=True, label="discovery configs")
+                    for (tpc, payload), what, ok in zip(configs, described, published, strict=True):
+                        if ok:
+                            cache.mark_published(tpc, payload)
+                            logger.info("%s Registered %s -> %s", lp, what, tpc)
+                        else:
+                            logger.warning("%s Unable to publish discovery config of %s to %s", lp, what, tpc)
+                    if presets:
+                        await self.client.publish_many(presets, retain=True, label="fan preset states")
+
+                    # Configs published by an earlier run that are not generated anymore (device removed
+                    # from the config, light exposure turned off). Never wipe everything on an empty config.
+                    stale = cache.stale_topics(current) if current else []
+                    removed = await self.client.publish_many([(tpc, b"") for tpc in stale], retain=True)
+                    for tpc, ok in zip(stale, removed, strict=True):
+                        if ok:
+                            cache.mark_removed(tpc)
+                            logger.info("%s Removed discovery config that is not configured anymore: %s", lp, tpc)
+                    cache.save()
+                    logger.info("%s Discovery configs: %s", lp, cache.stats())
 
             except aiomqtt.MqttCodeError as mqtt_code_exc:
                 logger.warning("%s [MqttError] (rc: %s) -> %s", lp, mqtt_code_exc.rc, mqtt_code_exc)
@@ -804,10 +500,282 @@ class DiscoveryHelper:
             except Exception:
                 logger.exception("%s [Exception]", lp)
             else:
-                ret = True
+                # publish_many() marks the client disconnected on a broker error
+                ret = self.client._connected
         logger.debug("%s Discovery complete (success: %s)", lp, ret)
         return ret
 
+    @staticmethod
+    def _room_areas() -> dict[int, str]:
+        """Device ID -> name of the first room group (non-subgroup) the device belongs to."""
+        areas: dict[int, str] = {}
+        for group in g.ncync_server.groups.values():
+            if not group.is_subgroup:
+                for member_id in group.member_ids:
+                    areas.setdefault(member_id, group.name)
+        return areas
+
+    @staticmethod
+    def _area_from_name(name: str) -> str | None:
+        """Guess the area from a device name, e.g. 'Porch Floodlight 1' -> 'Porch'."""
+        # Common device type suffixes to remove
+        suffixes = [
+            "Switch",
+            "Light",
+            "Floodlight",
+            "Lamp",
+            "Bulb",
+            "Dimmer",
+            "Plug",
+            "Outlet",
+            "Fan",
+        ]
+        name_parts = name.strip().split()
+        # Remove trailing numbers (e.g., "Floodlight 1" -> "Floodlight")
+        if name_parts and name_parts[-1].isdigit():
+            name_parts = name_parts[:-1]
+        # Remove device type suffix
+        for suffix in suffixes:
+            if name_parts and name_parts[-1] == suffix:
+                name_parts = name_parts[:-1]
+                break
+        # The first word is the area name
+        return name_parts[0] if name_parts else None
+
+    @staticmethod
+    def _device_platform(device, lp: str) -> str:
+        """HASS platform of a device: light, switch or fan."""
+        dev_type = "light"  # Default fallback
+        if device.is_switch:
+            dev_type = "switch"
+            logger.debug(
+                "%s Device '%s' classified as switch (type: %s)",
+                lp,
+                device.name,
+                device.metadata.type if device.metadata else "None",
+            )
+            if device.metadata and device.metadata.capabilities.fan:
+                dev_type = "fan"
+                logger.debug("%s Device '%s' reclassified as fan", lp, device.name)
+        elif device.is_light:
+            dev_type = "light"
+            logger.debug("%s Device '%s' classified as light", lp, device.name)
+        # For unknown devices, try to infer from device type if available
+        elif device.type is not None and device.type in device_type_map:
+            # This shouldn't happen if metadata is properly set, but just in case
+            metadata_type = device_type_map[device.type].type
+            if metadata_type == DeviceClassification.SWITCH:
+                dev_type = "switch"
+                logger.debug("%s Device '%s' classified as switch from device_type_map", lp, device.name)
+            elif metadata_type == DeviceClassification.LIGHT:
+                dev_type = "light"
+                logger.debug("%s Device '%s' classified as light from device_type_map", lp, device.name)
+            else:
+                logger.debug(
+                    "%s Device '%s' unknown metadata type: %s, defaulting to light",
+                    lp,
+                    device.name,
+                    metadata_type,
+                )
+        else:
+            logger.debug(
+                "%s Device '%s' unknown device type %s, defaulting to light (is_light: %s, is_switch: %s)",
+                lp,
+                device.name,
+                device.type,
+                device.is_light,
+                device.is_switch,
+            )
+        return dev_type
+
+    def _device_config(self, device, dev_type: str, room_area: str | None, lp: str) -> dict:
+        """Entity registry config of a device, ``room_area`` is the room group it belongs to (if any)."""
+        device_uuid = device.hass_id
+        unique_id = f"{device.home_id}_{device.id}"
+        # Generate entity ID from device name (e.g., "Hallway Light" -> "hallway_light")
+        entity_slug = slugify(device.name) if device.name else f"device_{device.id}"
+        # Determine platform for default_entity_id
+        platform = "switch" if device.is_switch else "light"
+        default_entity_id = f"{platform}.{entity_slug}"
+        dev_fw_version = str(device.version)
+        ver_str = "Unknown"
+        fw_len = len(dev_fw_version)
+        if fw_len == 5:
+            if dev_fw_version != 00000:
+                ver_str = f"{dev_fw_version[0]}.{dev_fw_version[1]}.{dev_fw_version[2:]}"
+        elif fw_len == 2:
+            ver_str = f"{dev_fw_version[0]}.{dev_fw_version[1]}"
+        model_str = "Unknown"
+        if device.type in device_type_map:
+            model_str = device_type_map[device.type].model_string
+        dev_connections = [("bluetooth", device.mac.casefold())]
+        if not device.bt_only:
+            dev_connections.append(("mac", device.wifi_mac.casefold()))
+
+        # Suggested area: the room group of the device, else extracted from the device name
+        suggested_area = room_area
+        if suggested_area:
+            logger.debug(
+                "%s Using group '%s' as area for device '%s' (ID: %s)",
+                lp,
+                suggested_area,
+                device.name,
+                device.id,
+            )
+        elif device.name:
+            suggested_area = self._area_from_name(device.name)
+            if suggested_area:
+                logger.debug(
+                    "%s Extracted area '%s' from device name '%s' (fallback, not in any room group)",
+                    lp,
+                    suggested_area,
+                    device.name,
+                )
+
+        device_registry_struct = {
+            "identifiers": [unique_id],
+            "manufacturer": CYNC_MANUFACTURER,
+            "connections": dev_connections,
+            "name": device.name,
+            "sw_version": ver_str,
+            "model": model_str,
+            "via_device": str(g.uuid),
+        }
+
+        # Add suggested_area if we successfully extracted one
+        if suggested_area:
+            device_registry_struct["suggested_area"] = suggested_area
+
+        entity_registry_struct = {
+            "default_entity_id": default_entity_id,
+            # set to None if only device name is relevant, this sets entity name
+            "name": None,
+            "command_topic": f"{self.client.topic}/set/{device_uuid}",
+            "state_topic": f"{self.client.topic}/status/{device_uuid}",
+            "avty_t": f"{self.client.topic}/availability/{device_uuid}",
+            "pl_avail": "online",
+            "pl_not_avail": "offline",
+            "state_on": "ON",
+            "state_off": "OFF",
+            "unique_id": unique_id,
+            "schema": "json",
+            "origin": ORIGIN_STRUCT,
+            "device": device_registry_struct,
+            "optimistic": False,
+        }
+
+        if dev_type == "light":
+            entity_registry_struct.update({"brightness": True, "brightness_scale": 100})
+            # ALL lights with brightness must declare color modes
+            entity_registry_struct["supported_color_modes"] = []
+            if device.supports_temperature:
+                entity_registry_struct["supported_color_modes"].append("color_temp")
+                entity_registry_struct["color_temp_kelvin"] = True
+                entity_registry_struct["min_kelvin"] = CYNC_MINK
+                entity_registry_struct["max_kelvin"] = CYNC_MAXK
+            if device.supports_rgb:
+                entity_registry_struct["supported_color_modes"].append("rgb")
+            entity_registry_struct["effect"] = True
+            entity_registry_struct["effect_list"] = list(FACTORY_EFFECTS_BYTES.keys())
+            # If no color support, default to brightness-only mode
+            if not entity_registry_struct["supported_color_modes"]:
+                entity_registry_struct["supported_color_modes"] = ["brightness"]
+        elif dev_type == "switch":
+            # Switch entities should not declare JSON schema
+            entity_registry_struct.pop("schema", None)
+        elif dev_type == "fan":
+            entity_registry_struct["platform"] = "fan"
+            # fan can be controlled via light control structs: brightness -> max=255, high=191, medium=128, low=50, off=0
+            entity_registry_struct.pop("state_on", None)
+            entity_registry_struct.pop("state_off", None)
+            entity_registry_struct.pop("schema", None)
+            entity_registry_struct["state_topic"] = f"{self.client.topic}/status/{device_uuid}"
+            entity_registry_struct["command_topic"] = f"{self.client.topic}/set/{device_uuid}"
+            entity_registry_struct["payload_on"] = "ON"
+            entity_registry_struct["payload_off"] = "OFF"
+            entity_registry_struct["preset_mode_command_topic"] = f"{self.client.topic}/set/{device_uuid}/preset"
+            entity_registry_struct["preset_mode_state_topic"] = f"{self.client.topic}/status/{device_uuid}/preset"
+            entity_registry_struct["preset_modes"] = [
+                "off",
+                "low",
+                "medium",
+                "high",
+                "max",
+            ]
+        return entity_registry_struct
+
+    def _group_config(self, group, lp: str) -> dict | None:
+        """Entity registry config of a subgroup, None if it has no light-compatible devices."""
+        group_uuid = group.hass_id
+        unique_id = f"{group.home_id}_group_{group.id}"
+
+        # Publish light entity only for groups with light devices
+        has_light_devices = any(
+            member_id in g.ncync_server.devices and g.ncync_server.devices[member_id].is_light
+            for member_id in group.member_ids
+        )
+        logger.debug(
+            "[SUBGROUP_CHECK] Group '%s' (ID: %s) - has_light_devices=%s, member_count=%d",
+            group.name,
+            group.id,
+            has_light_devices,
+            len(group.member_ids),
+        )
+        if not has_light_devices:
+            logger.info(
+                "%s Skipping light entity for group '%s' (ID: %s) - no light-compatible devices",
+                lp,
+                group.name,
+                group.id,
+            )
+            return None
+
+        # Generate entity ID from group name (e.g., "Hallway Lights" -> "light.hallway_lights")
+        entity_slug = slugify(group.name) if group.name else f"group_{group.id}"
+        default_entity_id = f"light.{entity_slug}"
+
+        device_registry_struct = {
+            "identifiers": [unique_id],
+            "manufacturer": CYNC_MANUFACTURER,
+            "name": group.name,
+            "model": "Cync Subgroup",
+            "via_device": str(g.uuid),
+        }
+
+        entity_registry_struct = {
+            "default_entity_id": default_entity_id,
+            "name": None,
+            "command_topic": f"{self.client.topic}/set/{group_uuid}",
+            "state_topic": f"{self.client.topic}/status/{group_uuid}",
+            "avty_t": f"{self.client.topic}/availability/{group_uuid}",
+            "pl_avail": "online",
+            "pl_not_avail": "offline",
+            "state_on": "ON",
+            "state_off": "OFF",
+            "unique_id": unique_id,
+            "schema": "json",
+            "origin": ORIGIN_STRUCT,
+            "device": device_registry_struct,
+            "optimistic": False,
+        }
+
+        # Add brightness support (exactly like devices do with .update())
+        entity_registry_struct.update({"brightness": True, "brightness_scale": 100})
+
+        # Add color support - ALL lights with brightness must declare color modes
+        entity_registry_struct["supported_color_modes"] = []
+        if group.supports_temperature:
+            entity_registry_struct["supported_color_modes"].append("color_temp")
+            entity_registry_struct["color_temp_kelvin"] = True
+            entity_registry_struct["min_kelvin"] = CYNC_MINK
+            entity_registry_struct["max_kelvin"] = CYNC_MAXK
+        if group.supports_rgb:
+            entity_registry_struct["supported_color_modes"].append("rgb")
+        # If no color support, default to brightness-only mode
+        if not entity_registry_struct["supported_color_modes"]:
+            entity_registry_struct["supported_color_modes"] = ["brightness"]
+        return entity_registry_struct
+
     async def create_bridge_device(self) -> bool:
         """Create the device / entity registry config for the Cync Controller bridge itself."""
         global bridge_device_reg_struct
@@ -816,12 +784,13 @@ class DiscoveryHelper:
         # sensors to show if MQTT is connected, if the Cync Controller server is running, etc.
         # input_number to submit OTP for export
         lp = f"{self.client.lp}create_bridge_device:"
-        ret = False
 
         logger.debug("%s Creating Cync Controller bridge device...", lp)
         bridge_base_unique_id = "cync_lan_bridge"
         ver_str = CYNC_VERSION
-        pub_tasks: list[asyncio.Task] = []
+        # entity configs first, then the bridge availability and the states they show
+        configs: list[tuple[str, bytes]] = []
+        states: list[tuple[str, bytes]] = []
         # Bridge device config
         bridge_device_reg_struct = {
             "identifiers": [str(g.uuid)],
@@ -833,7 +802,7 @@ class DiscoveryHelper:
         # Entities for the bridge device
         entity_type = "button"
         template_tpc = "{0}/{1}/{2}/config"
-        pub_tasks.append(self.client.publish(f"{self.client.topic}/availability/bridge", b"online"))
+        states.append((f"{self.client.topic}/availability/bridge", b"online"))
 
         entity_unique_id = f"{bridge_base_unique_id}_restart"
         restart_btn_entity_struct = {
@@ -849,12 +818,12 @@ class DiscoveryHelper:
             "origin": ORIGIN_STRUCT,
             "device": bridge_device_reg_struct,
         }
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            restart_btn_entity_struct,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(restart_btn_entity_struct).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish restart button entity config", lp)
 
         entity_unique_id = f"{bridge_base_unique_id}_start_export"
         xport_btn_entity_conf = restart_btn_entity_struct.copy()
@@ -863,12 +832,12 @@ class DiscoveryHelper:
         xport_btn_entity_conf["state_topic"] = f"{self.client.topic}/status/bridge/export/start"
         xport_btn_entity_conf["name"] = "Start Export"
         xport_btn_entity_conf["unique_id"] = entity_unique_id
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            xport_btn_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(xport_btn_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish start export button entity config", lp)
 
         # Refresh Status button entity
         entity_unique_id = f"{bridge_base_unique_id}_refresh_status"
@@ -878,12 +847,12 @@ class DiscoveryHelper:
         refresh_btn_entity_conf["state_topic"] = f"{self.client.topic}/status/bridge/refresh_status"
         refresh_btn_entity_conf["name"] = "Refresh Device Status"
         refresh_btn_entity_conf["unique_id"] = entity_unique_id
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            refresh_btn_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(refresh_btn_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish refresh status button entity config", lp)
 
         entity_unique_id = f"{bridge_base_unique_id}_submit_otp"
         submit_otp_btn_entity_conf = restart_btn_entity_struct.copy()
@@ -892,12 +861,27 @@ class DiscoveryHelper:
         submit_otp_btn_entity_conf["state_topic"] = f"{self.client.topic}/status/bridge/otp/submit"
         submit_otp_btn_entity_conf["name"] = "Submit OTP"
         submit_otp_btn_entity_conf["unique_id"] = entity_unique_id
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            submit_otp_btn_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(submit_otp_btn_entity_conf).encode(),
+            )
+        )
+
+        # Rediscover button entity, republishes every discovery config
+        entity_unique_id = f"{bridge_base_unique_id}_rediscover"
+        rediscover_btn_entity_conf = restart_btn_entity_struct.copy()
+        rediscover_btn_entity_conf["object_id"] = CYNC_BRIDGE_OBJ_ID + "_rediscover"
+        rediscover_btn_entity_conf["command_topic"] = f"{self.client.topic}/set/bridge/rediscover"
+        rediscover_btn_entity_conf["state_topic"] = f"{self.client.topic}/status/bridge/rediscover"
+        rediscover_btn_entity_conf["name"] = "Rediscover Devices"
+        rediscover_btn_entity_conf["unique_id"] = entity_unique_id
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(rediscover_btn_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish submit OTP button entity config", lp)
 
         # binary sensor for if the TCP server is running
         # binary sensor for if the export server is running
@@ -916,14 +900,14 @@ class DiscoveryHelper:
             "origin": ORIGIN_STRUCT,
             "device": bridge_device_reg_struct,
         }
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            tcp_server_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(tcp_server_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish TCP server running entity config", lp)
         status = "ON" if g.ncync_server and g.ncync_server.running is True else "OFF"
-        pub_tasks.append(self.client.publish(f"{self.client.topic}/status/bridge/tcp_server/running", status.encode()))
+        states.append((f"{self.client.topic}/status/bridge/tcp_server/running", status.encode()))
 
         entity_unique_id = f"{bridge_base_unique_id}_export_server_running"
         export_server_entity_conf = tcp_server_entity_conf.copy()
@@ -932,16 +916,14 @@ class DiscoveryHelper:
         export_server_entity_conf["state_topic"] = f"{self.client.topic}/status/bridge/export_server/running"
         export_server_entity_conf["unique_id"] = entity_unique_id
         export_server_entity_conf["icon"] = "mdi:export-variant"
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            export_server_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(export_server_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish export server running entity config", lp)
         status = "ON" if g.export_server and g.export_server.running is True else "OFF"
-        pub_tasks.append(
-            self.client.publish(f"{self.client.topic}/status/bridge/export_server/running", status.encode())
-        )
+        states.append((f"{self.client.topic}/status/bridge/export_server/running", status.encode()))
 
         entity_unique_id = f"{bridge_base_unique_id}_mqtt_client_connected"
         mqtt_client_entity_conf = tcp_server_entity_conf.copy()
@@ -951,12 +933,12 @@ class DiscoveryHelper:
         mqtt_client_entity_conf["unique_id"] = entity_unique_id
         mqtt_client_entity_conf["icon"] = "mdi:connection"
         mqtt_client_entity_conf["device_class"] = "connectivity"
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            mqtt_client_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(mqtt_client_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish MQTT client connected entity config", lp)
 
         # input number for OTP input
         entity_type = "number"
@@ -977,12 +959,38 @@ class DiscoveryHelper:
             "name": "Cync emailed OTP",
             "unique_id": entity_unique_id,
         }
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            otp_num_entity_cfg,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(otp_num_entity_cfg).encode(),
+            )
         )
-        if ret is False:
-            logger.error("%s Failed to publish OTP input number entity config", lp)
+
+        # switch to toggle call-site tracing of state publishes (debug aid)
+        entity_type = "switch"
+        entity_unique_id = f"{bridge_base_unique_id}_call_site_tracing"
+        call_site_tracing_entity_conf = {
+            "platform": "switch",
+            "object_id": entity_unique_id,
+            "name": "Trace State Publish Callers",
+            "command_topic": f"{self.client.topic}/set/bridge/call_site_tracing",
+            "state_topic": f"{self.client.topic}/status/bridge/call_site_tracing",
+            "unique_id": entity_unique_id,
+            "icon": "mdi:bug",
+            "entity_category": "diagnostic",
+            "avty_t": f"{self.client.topic}/availability/bridge",
+            "schema": "json",
+            "origin": ORIGIN_STRUCT,
+            "device": bridge_device_reg_struct,
+        }
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(call_site_tracing_entity_conf).encode(),
+            )
+        )
+        status = "ON" if call_site_tracing_enabled() else "OFF"
+        states.append((f"{self.client.topic}/status/bridge/call_site_tracing", status.encode()))
 
         # Sensors
         entity_type = "sensor"
@@ -1000,14 +1008,14 @@ class DiscoveryHelper:
             "origin": ORIGIN_STRUCT,
             "device": bridge_device_reg_struct,
         }
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            num_tcp_devices_entity_conf,
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(num_tcp_devices_entity_conf).encode(),
+            )
         )
-        if ret is False:
-            logger.warning("%s Failed to publish number of TCP devices connected entity config", lp)
-        pub_tasks.append(
-            self.client.publish(
+        states.append(
+            (
                 f"{self.client.topic}/status/bridge/tcp_devices/connected",
                 str(len(g.ncync_server.tcp_devices)).encode() if g.ncync_server else b"0",
             )
@@ -1021,19 +1029,18 @@ class DiscoveryHelper:
         total_cync_devs_entity_conf["state_topic"] = f"{self.client.topic}/status/bridge/cync_devices/total"
         total_cync_devs_entity_conf["unique_id"] = entity_unique_id
         # total_cync_devs_entity_conf["unit_of_measurement"] = "Cync device(s)"
-        ret = await self.client.publish_json_msg(
-            template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
-            total_cync_devs_entity_conf,
-        )
-        if ret is False:
-            logger.warning("%s Failed to publish total Cync devices managed entity config", lp)
-        pub_tasks.append(
-            self.client.publish(
-                f"{self.client.topic}/status/bridge/cync_devices/total",
-                str(total_cync_devs).encode(),
+        configs.append(
+            (
+                template_tpc.format(self.client.ha_topic, entity_type, entity_unique_id),
+                json.dumps(total_cync_devs_entity_conf).encode(),
             )
         )
+        states.append((f"{self.client.topic}/status/bridge/cync_devices/total", str(total_cync_devs).encode()))
 
-        await asyncio.gather(*pub_tasks, return_exceptions=True)
+        published = await self.client.publish_many(configs, label="bridge discovery configs")
+        for (tpc, _), ok in zip(configs, published, strict=True):
+            if not ok:
+                logger.error("%s Failed to publish bridge entity config to %s", lp, tpc)
+        await self.client.publish_many(states)
         logger.debug("%s Bridge device config published and seeded", lp)
-        return ret
+        return all(published)
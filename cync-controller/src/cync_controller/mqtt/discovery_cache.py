@@ -0,0 +1,131 @@
+"""
+Discovery config cache with content hashes, so unchanged configs are not republished.
+
+homeassistant_discovery() runs on every broker connect and HASS birth message and used to rebuild
+and publish every config. Configs are now built once per device / group and kept here, and each
+published config's hash is remembered per topic and saved to disk. Discovery only publishes the
+configs whose hash changed. Configs are published retained, so the broker keeps serving unchanged
+ones to HASS across HASS and addon restarts. Topics that were published before but are not
+generated anymore (device removed from the config) are cleared with an empty retained payload.
+The hashes can't tell a broker that lost its retained store or an entity deleted in HASS, so they are
+invalidated on every broker re-connect and by the bridge's "Rediscover Devices" button.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from cync_controller.logging_abstraction import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "DiscoveryCache",
+]
+
+
+class DiscoveryCache:
+    """
+    Built discovery configs per device / group key, and the hash last published per config topic.
+
+    ``invalidate()`` forgets the published hashes so the next discovery republishes everything.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self.path = Path(path) if path else None
+        self._configs: dict[str, tuple[str, bytes]] = {}
+        self._published: dict[str, str] | None = None
+        self._dirty = False
+        self.published = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    @staticmethod
+    def digest(payload: bytes) -> str:
+        return hashlib.sha256(payload).hexdigest()
+
+    def config(self, key: str) -> tuple[str, bytes] | None:
+        """The (topic, payload) built for ``key``, if it was built already."""
+        return self._configs.get(key)
+
+    def store(self, key: str, topic: str, payload: bytes) -> None:
+        self._configs[key] = (topic, payload)
+
+    def forget_configs(self) -> None:
+        """Drop the built configs, they are rebuilt on the next discovery."""
+        self._configs.clear()
+
+    @property
+    def published_hashes(self) -> dict[str, str]:
+        if self._published is None:
+            self._published = self._load()
+        return self._published
+
+    def changed(self, topic: str, payload: bytes) -> bool:
+        """True if ``payload`` differs from what was last published to ``topic``."""
+        if self.published_hashes.get(topic) == self.digest(payload):
+            self.unchanged += 1
+            return False
+        return True
+
+    def mark_published(self, topic: str, payload: bytes) -> None:
+        self.published_hashes[topic] = self.digest(payload)
+        self.published += 1
+        self._dirty = True
+
+    def forget(self, topic: str) -> None:
+        """Forget what was published to ``topic``, the next discovery publishes it again."""
+        if self.published_hashes.pop(topic, None) is not None:
+            self._dirty = True
+
+    def stale_topics(self, current: set[str]) -> list[str]:
+        """Topics published before that are not part of the current discovery."""
+        return [topic for topic in self.published_hashes if topic not in current]
+
+    def mark_removed(self, topic: str) -> None:
+        if self.published_hashes.pop(topic, None) is not None:
+            self.removed += 1
+            self._dirty = True
+
+    def invalidate(self) -> None:
+        """Forget all published hashes so every config is published again."""
+        self.published_hashes.clear()
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the published hashes to disk if they changed since the last save."""
+        if not self._dirty or self.path is None:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            tmp.write_text(json.dumps(self.published_hashes, sort_keys=True))
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning("Unable to save discovery hashes to %s: %s", self.path, exc)
+        else:
+            self._dirty = False
+
+    def _load(self) -> dict[str, str]:
+        if self.path is None:
+            return {}
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable discovery hashes in %s: %s", self.path, exc)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {str(topic): str(digest) for topic, digest in data.items()}
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "configs": len(self._configs),
+            "published": self.published,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+        }
@@ -0,0 +1,108 @@
+"""
+Pre-built MQTT topics and interned status payloads.
+
+Every status publish used to format its topic (``f"{topic}/status/{hass_id}"``) and json.dumps a
+fresh dict, although the state space is small: ON / OFF for switches and plugs, and on/off x
+brightness x color mode for most light updates. TopicCache builds the topics of a device or group
+once, StatePayloads hands out the same bytes object for a state it encoded before.
+"""
+
+import json
+
+from cync_controller.structs import FanSpeed
+
+ON = b"ON"
+OFF = b"OFF"
+
+
+def power_payload(on: bool) -> bytes:
+    """Plain ON / OFF payload (switches, plugs)."""
+    return ON if on else OFF
+
+
+def fan_preset_mode(brightness: int) -> FanSpeed:
+    """Preset mode matching a fan controller's brightness (1-100 scale), in-between values round up."""
+    if brightness == 0:
+        return FanSpeed.OFF
+    if brightness <= 25:
+        return FanSpeed.LOW
+    if brightness <= 50:
+        return FanSpeed.MEDIUM
+    if brightness <= 75:
+        return FanSpeed.HIGH
+    return FanSpeed.MAX
+
+
+class TopicCache:
+    """Status, availability and fan preset topics per hass_id, built on first use."""
+
+    def __init__(self, base: str):
+        self.base = base
+        self._status: dict[str, str] = {}
+        self._availability: dict[str, str] = {}
+        self._preset: dict[str, str] = {}
+
+    def status(self, hass_id: str) -> str:
+        topic = self._status.get(hass_id)
+        if topic is None:
+            topic = self._status[hass_id] = f"{self.base}/status/{hass_id}"
+        return topic
+
+    def availability(self, hass_id: str) -> str:
+        topic = self._availability.get(hass_id)
+        if topic is None:
+            topic = self._availability[hass_id] = f"{self.base}/availability/{hass_id}"
+        return topic
+
+    def preset(self, hass_id: str) -> str:
+        topic = self._preset.get(hass_id)
+        if topic is None:
+            topic = self._preset[hass_id] = f"{self.base}/status/{hass_id}/preset"
+        return topic
+
+
+class StatePayloads:
+    """
+    JSON light state payloads memoized by value.
+
+    Keys are emitted in the order HASS has always seen them: state, brightness, color_mode, then
+    color_temp or color. The memo is dropped when it reaches ``max_entries`` (RGB states are unbounded).
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._payloads: dict[tuple, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def light(
+        self,
+        state: str,
+        brightness: int | None = None,
+        color_mode: str | None = None,
+        color_temp: int | None = None,
+        color: tuple[int | None, int | None, int | None] | None = None,
+    ) -> bytes:
+        key = (state, brightness, color_mode, color_temp, color)
+        payload = self._payloads.get(key)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+        light_state: dict[str, object] = {"state": state}
+        if brightness is not None:
+            light_state["brightness"] = brightness
+        if color_mode is not None:
+            light_state["color_mode"] = color_mode
+        if color_temp is not None:
+            light_state["color_temp"] = color_temp
+        if color is not None:
+            light_state["color"] = {"r": color[0], "g": color[1], "b": color[2]}
+        payload = json.dumps(light_state).encode()
+        if len(self._payloads) >= self.max_entries:
+            self._payloads.clear()
+        self._payloads[key] = payload
+        return payload
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._payloads), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,103 @@
+"""
+Per-device change detection and burst coalescing for MQTT state publishes.
+
+Every 0x83 packet and mesh info row ends up as a state publish, even when nothing changed.
+StatePublishCache remembers the last payload published for each device so identical
+publishes can be skipped, and collapses bursts inside a short window into a single
+publish of the final state.
+"""
+
+import time
+
+
+class StatePublishCache:
+    """
+    Decides whether a device state payload should be published now, deferred or dropped.
+
+    The first publish for a device always goes out immediately. Any further publishes inside
+    ``window`` seconds are held back and only the most recent one is sent when the window ends.
+    Publishes that match what the broker already has are dropped. ``invalidate()`` forgets
+    everything, so the next publish for every device goes out (MQTT reconnect, HASS birth).
+    """
+
+    PUBLISH = "publish"
+    DEFER = "defer"
+    DUPLICATE = "duplicate"
+
+    def __init__(self, window: float):
+        self.window = window
+        self._last_payload: dict[int, bytes] = {}
+        self._last_sent: dict[int, float] = {}
+        self._pending: dict[int, bytes] = {}
+        self.emitted = 0
+        self.suppressed = 0
+        self.coalesced = 0
+
+    def admit(self, device_id: int, payload: bytes, now: float | None = None) -> str:
+        """Record a state payload for a device and return PUBLISH, DEFER or DUPLICATE."""
+        if now is None:
+            now = time.monotonic()
+        if payload == self._last_payload.get(device_id):
+            if self._pending.pop(device_id, None) is not None:
+                # burst ended where it started, the queued state is stale
+                self.coalesced += 1
+            self.suppressed += 1
+            return self.DUPLICATE
+
+        last_sent = self._last_sent.get(device_id)
+        if last_sent is not None and now - last_sent < self.window:
+            if device_id in self._pending:
+                self.coalesced += 1
+            self._pending[device_id] = payload
+            return self.DEFER
+
+        if self._pending.pop(device_id, None) is not None:
+            # window closed before the flush ran, this payload supersedes the deferred one
+            self.coalesced += 1
+        self._mark_sent(device_id, payload, now)
+        return self.PUBLISH
+
+    def delay(self, device_id: int, now: float | None = None) -> float:
+        """Seconds until the coalescing window for a device closes."""
+        if now is None:
+            now = time.monotonic()
+        last_sent = self._last_sent.get(device_id)
+        if last_sent is None:
+            return 0.0
+        return max(0.0, self.window - (now - last_sent))
+
+    def take_pending(self, device_id: int, now: float | None = None) -> bytes | None:
+        """Pop the deferred payload for a device (if any) and mark it as published."""
+        payload = self._pending.pop(device_id, None)
+        if payload is not None:
+            self._mark_sent(device_id, payload, time.monotonic() if now is None else now)
+        return payload
+
+    def forget(self, device_id: int) -> None:
+        """Forget the last payload for a device, e.g. when publishing it failed."""
+        self._last_payload.pop(device_id, None)
+        self._last_sent.pop(device_id, None)
+
+    def remember(self, device_id: int, payload: bytes) -> None:
+        """Record a payload the broker got outside of admit() (state replay) without opening a window."""
+        self._last_payload[device_id] = payload
+
+    def invalidate(self) -> None:
+        """Forget all published and deferred payloads so the next publish for every device goes out."""
+        self._last_payload.clear()
+        self._last_sent.clear()
+        # a scheduled flush must not send an older deferred state after the next publish
+        self._pending.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "emitted": self.emitted,
+            "suppressed": self.suppressed,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+        }
+
+    def _mark_sent(self, device_id: int, payload: bytes, now: float) -> None:
+        self._last_payload[device_id] = payload
+        self._last_sent[device_id] = now
+        self.emitted += 1
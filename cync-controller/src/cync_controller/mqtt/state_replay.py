@@ -0,0 +1,79 @@
+"""
+Last known availability and state payload per device, replayed in batches on MQTT re-connect / HASS birth.
+
+Re-announcing every device used to build one pub_online() and one parse_device_status() coroutine per
+device (a DeviceStatus model and a JSON encode each) and gather them all at once. StateReplay keeps the
+already encoded payloads instead, one entry per topic, recorded whenever a payload is built - also while
+the broker is unreachable, so the store always holds the latest state. A replay pushes them out in
+batches of ``batch_size`` messages, so memory, event loop latency and the burst the broker sees stay
+bounded no matter how many devices are configured.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+
+ONLINE = b"online"
+OFFLINE = b"offline"
+
+
+class StateReplay:
+    """Encoded availability per topic and state per device, replayed availability first."""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = max(1, batch_size)
+        self._availability: dict[str, bytes] = {}
+        self._states: dict[int, tuple[str, bytes]] = {}
+        self.replays = 0
+        self.replayed = 0
+        self.last_replayed = 0
+
+    def record_availability(self, topic: str, online: bool) -> None:
+        self._availability[topic] = ONLINE if online else OFFLINE
+
+    def record_state(self, device_id: int, topic: str, payload: bytes) -> None:
+        self._states[device_id] = (topic, payload)
+
+    def has_availability(self, topic: str) -> bool:
+        return topic in self._availability
+
+    def has_state(self, device_id: int) -> bool:
+        return device_id in self._states
+
+    def batches(self) -> Iterator[list[tuple[int | None, str, bytes]]]:
+        """
+        Everything recorded as (device ID, topic, payload), availability first (device ID None),
+        in lists of at most ``batch_size`` messages.
+        """
+        messages: list[tuple[int | None, str, bytes]] = [
+            (None, topic, payload) for topic, payload in self._availability.items()
+        ]
+        messages.extend((device_id, topic, payload) for device_id, (topic, payload) in self._states.items())
+        for start in range(0, len(messages), self.batch_size):
+            yield messages[start : start + self.batch_size]
+
+    async def replay(
+        self, publish_many: Callable[[list[tuple[str, bytes]]], Awaitable[list[bool]]]
+    ) -> dict[int, bytes]:
+        """Publish every recorded payload batch by batch, returns device ID -> state payload that went out."""
+        self.replays += 1
+        self.last_replayed = 0
+        states: dict[int, bytes] = {}
+        for batch in self.batches():
+            results = await publish_many([(topic, payload) for _, topic, payload in batch])
+            for (device_id, _, payload), ok in zip(batch, results, strict=True):
+                if ok:
+                    self.last_replayed += 1
+                    if device_id is not None:
+                        states[device_id] = payload
+            # let status packets and commands in between batches
+            await asyncio.sleep(0)
+        self.replayed += self.last_replayed
+        return states
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "availability": len(self._availability),
+            "states": len(self._states),
+            "replays": self.replays,
+            "replayed": self.replayed,
+        }
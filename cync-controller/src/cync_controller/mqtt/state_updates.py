@@ -7,13 +7,18 @@ and group states to MQTT for Home Assistant integration.
 
 import asyncio
 import json
+import logging
 import time
-import traceback
 
 import aiomqtt
 
+from cync_controller.const import CYNC_MQTT_REPLAY_BATCH, CYNC_STATE_COALESCE_MS
 from cync_controller.devices import CyncDevice, CyncGroup
+from cync_controller.instrumentation import call_site, call_site_tracing_enabled
 from cync_controller.logging_abstraction import get_logger
+from cync_controller.mqtt.payloads import StatePayloads, TopicCache, fan_preset_mode, power_payload
+from cync_controller.mqtt.state_cache import StatePublishCache
+from cync_controller.mqtt.state_replay import StateReplay
 from cync_controller.structs import DeviceStatus
 
 logger = get_logger(__name__)
@@ -49,11 +54,29 @@ class StateUpdateHelper:
             mqtt_client: MQTTClient instance to access connection and topic
         """
         self.client = mqtt_client
+        # skips unchanged device states and collapses bursts into the final state
+        self.publish_cache = StatePublishCache(CYNC_STATE_COALESCE_MS / 1000)
+        self._flush_tasks: dict[int, asyncio.Task] = {}
+        # latest encoded availability / state per device, re-published on re-connect and HASS birth
+        self.replay = StateReplay(CYNC_MQTT_REPLAY_BATCH)
+        # topics built once per device / group, light state payloads encoded once per state
+        self._topics = TopicCache(mqtt_client.topic)
+        self.payloads = StatePayloads()
+
+    @property
+    def topics(self) -> TopicCache:
+        if self._topics.base != self.client.topic:
+            self._topics = TopicCache(self.client.topic)
+        return self._topics
 
     async def pub_online(self, device_id: int, status: bool) -> bool:
         lp = f"{self.client.lp}pub_online:"
+        device: CyncDevice | None = g.ncync_server.devices.get(device_id)
+        if device is not None:
+            # recorded while disconnected too, the replay after re-connecting sends the latest availability
+            self.replay.record_availability(self.topics.availability(device.hass_id), status)
         if self.client._connected:
-            if device_id not in g.ncync_server.devices:
+            if device is None:
                 logger.error(
                     "%s Device ID %s not found?! Have you deleted or added any devices recently? You may need to re-export devices from your Cync account!",
                     lp,
@@ -61,13 +84,9 @@ class StateUpdateHelper:
                 )
                 return False
             availability = b"online" if status else b"offline"
-            device: CyncDevice = g.ncync_server.devices[device_id]
-            device_uuid = f"{device.home_id}-{device_id}"
             # logger.debug("%s Publishing availability: %s", lp, availability)
             try:
-                _ = await self.client.client.publish(
-                    f"{self.client.topic}/availability/{device_uuid}", availability, qos=0
-                )
+                _ = await self.client.client.publish(self.topics.availability(device.hass_id), availability, qos=0)
             except aiomqtt.MqttError as mqtt_code_exc:
                 logger.warning("%s [MqttError] -> %s", lp, mqtt_code_exc)
                 self.client._connected = False
@@ -81,6 +100,10 @@ class StateUpdateHelper:
         NOTE: Device availability is managed by server.parse_status() based on the
         connected_to_mesh byte and offline_count threshold. Do not set device.online here.
         """
+        return await self.send_device_status(device, self._apply_device_state(device, state), partial=True)
+
+    def _apply_device_state(self, device: CyncDevice, state: int) -> bytes:
+        """Set the device power state and return the status payload to publish for it."""
         lp = f"{self.client.lp}update_device_state:"
         old_state = device.state
         device.state = state
@@ -94,22 +117,19 @@ class StateUpdateHelper:
             state,
             power_status,
         )
-        mqtt_dev_state = {"state": power_status}
         if device.is_plug:
-            mqtt_dev_state = power_status.encode()  # send ON or OFF if plug
-        elif device.is_switch:
+            return power_payload(state != 0)  # send ON or OFF if plug
+        if device.is_switch:
             # Switches only need plain ON/OFF payload (no JSON)
-            mqtt_dev_state = power_status.encode()
+            return power_payload(state != 0)
+        # Lights need color_mode
+        if device.supports_temperature:
+            color_mode = "color_temp"
+        elif device.supports_rgb:
+            color_mode = "rgb"
         else:
-            # Lights need color_mode
-            if device.supports_temperature:
-                mqtt_dev_state["color_mode"] = "color_temp"
-            elif device.supports_rgb:
-                mqtt_dev_state["color_mode"] = "rgb"
-            else:
-                mqtt_dev_state["color_mode"] = "brightness"
-            mqtt_dev_state = json.dumps(mqtt_dev_state).encode()  # send JSON
-        return await self.send_device_status(device, mqtt_dev_state)
+            color_mode = "brightness"
+        return self.payloads.light(power_status, color_mode=color_mode)  # send JSON
 
     async def update_switch_from_subgroup(self, device: CyncDevice, subgroup_state: int, subgroup_name: str) -> bool:
         """Update a switch device state to match its subgroup state.
@@ -125,6 +145,13 @@ class StateUpdateHelper:
         Returns:
             True if the state was updated and published, False otherwise
         """
+        mqtt_dev_state = self._apply_switch_subgroup_state(device, subgroup_state, subgroup_name)
+        if mqtt_dev_state is None:
+            return False
+        return await self.send_device_status(device, mqtt_dev_state, partial=True)
+
+    def _apply_switch_subgroup_state(self, device: CyncDevice, subgroup_state: int, subgroup_name: str) -> bytes | None:
+        """Set a switch to its subgroup state and return the payload to publish (None if not a switch)."""
         lp = f"{self.client.lp}update_switch_from_subgroup:"
 
         # Safety checks
@@ -135,7 +162,7 @@ class StateUpdateHelper:
                 device.name,
                 device.id,
             )
-            return False
+            return None
 
         # Update the switch to match subgroup state
         old_state = device.state
@@ -159,9 +186,7 @@ class StateUpdateHelper:
         device.state = subgroup_state
 
         # Publish state update to MQTT
-        power_status = "ON" if subgroup_state else "OFF"
-        mqtt_dev_state = power_status.encode()  # Switches use plain ON/OFF payload
-        return await self.send_device_status(device, mqtt_dev_state)
+        return power_payload(bool(subgroup_state))  # Switches use plain ON/OFF payload
 
     async def sync_group_switches(self, group_id: int, group_state: int, group_name: str) -> int:
         """Sync all switch devices in a group to match the group's state.
@@ -184,7 +209,6 @@ class StateUpdateHelper:
             return 0
 
         group = g.ncync_server.groups[group_id]
-        synced_count = 0
 
         logger.info(
             "%s Syncing %d switches for group '%s' (ID: %s) to state: %s",
@@ -195,6 +219,7 @@ class StateUpdateHelper:
             "ON" if group_state else "OFF",
         )
 
+        statuses: list[tuple[CyncDevice, bytes]] = []
         for member_id in group.member_ids:
             if member_id in g.ncync_server.devices:
                 device = g.ncync_server.devices[member_id]
@@ -205,9 +230,9 @@ class StateUpdateHelper:
                     device.name,
                     device.is_switch,
                 )
-                # Sync switch to group state (will only publish if state actually changed)
-                if await self.update_switch_from_subgroup(device, group_state, group_name):
-                    synced_count += 1
+                mqtt_dev_state = self._apply_switch_subgroup_state(device, group_state, group_name)
+                if mqtt_dev_state is not None:
+                    statuses.append((device, mqtt_dev_state))
             else:
                 logger.debug(
                     "%s Member ID %d not found in devices",
@@ -215,14 +240,15 @@ class StateUpdateHelper:
                     member_id,
                 )
 
+        synced_count = sum(await self.send_device_statuses(statuses, partial=True))
         logger.info("%s Synced %s switches for group '%s'", lp, synced_count, group_name)
         return synced_count
 
     async def sync_group_devices(self, group_id: int, group_state: int, group_name: str) -> int:
         """Sync all devices (switches and bulbs) in a group to match the group's state.
 
-        This is called after a group command is executed to provide immediate optimistic
-        feedback for all devices in the group.
+        This is called when a group command is sent to provide immediate optimistic
+        feedback for all devices in the group. Member states are published as one batch.
 
         Args:
             group_id: The group ID
@@ -239,7 +265,6 @@ class StateUpdateHelper:
             return 0
 
         group = g.ncync_server.groups[group_id]
-        synced_count = 0
 
         logger.info(
             "%s Syncing %d devices for group '%s' (ID: %s) to state: %s",
@@ -250,6 +275,7 @@ class StateUpdateHelper:
             "ON" if group_state else "OFF",
         )
 
+        statuses: list[tuple[CyncDevice, bytes]] = []
         for member_id in group.member_ids:
             if member_id in g.ncync_server.devices:
                 device = g.ncync_server.devices[member_id]
@@ -264,11 +290,12 @@ class StateUpdateHelper:
 
                 if device.is_switch:
                     # Sync switch to group state
-                    if await self.update_switch_from_subgroup(device, group_state, group_name):
-                        synced_count += 1
-                # Sync bulb/light to group state (optimistic update)
-                elif await self.update_device_state(device, group_state):
-                    synced_count += 1
+                    mqtt_dev_state = self._apply_switch_subgroup_state(device, group_state, group_name)
+                else:
+                    # Sync bulb/light to group state (optimistic update)
+                    mqtt_dev_state = self._apply_device_state(device, group_state)
+                if mqtt_dev_state is not None:
+                    statuses.append((device, mqtt_dev_state))
             else:
                 logger.debug(
                     "%s Member ID %d not found in devices",
@@ -276,6 +303,7 @@ class StateUpdateHelper:
                     member_id,
                 )
 
+        synced_count = sum(await self.send_device_statuses(statuses, partial=True))
         logger.info("%s Synced %s devices for group '%s'", lp, synced_count, group_name)
         return synced_count
 
@@ -293,45 +321,25 @@ class StateUpdateHelper:
 
         # For fan entities, publish state separately (ON/OFF only, no brightness in JSON)
         if device.is_fan_controller:
-            mqtt_dev_state = {"state": state}
+            mqtt_dev_state = self.payloads.light(state)
         else:
             # For lights/switches, include brightness
-            mqtt_dev_state = {"state": state, "brightness": bri}
             # Add color_mode based on device capabilities
             if device.supports_temperature:
-                mqtt_dev_state["color_mode"] = "color_temp"
+                color_mode = "color_temp"
             elif device.supports_rgb:
-                mqtt_dev_state["color_mode"] = "rgb"
+                color_mode = "rgb"
             else:
-                mqtt_dev_state["color_mode"] = "brightness"
+                color_mode = "brightness"
+            mqtt_dev_state = self.payloads.light(state, brightness=bri, color_mode=color_mode)
 
-        result = await self.send_device_status(device, json.dumps(mqtt_dev_state).encode())
+        result = await self.send_device_status(device, mqtt_dev_state, partial=True)
 
         # For fan entities, also publish preset mode state
         if device.is_fan_controller and self.client._connected:
-            # Publish preset mode state based on brightness (1-100 scale)
-            # Map brightness to preset mode
-            if bri == 0:
-                preset_mode = "off"
-            elif bri == 25:
-                preset_mode = "low"
-            elif bri == 50:
-                preset_mode = "medium"
-            elif bri == 75:
-                preset_mode = "high"
-            elif bri == 100:
-                preset_mode = "max"
-            # For any other value, find closest preset
-            elif bri < 25:
-                preset_mode = "low"
-            elif bri < 50:
-                preset_mode = "medium"
-            elif bri < 75:
-                preset_mode = "high"
-            else:
-                preset_mode = "max"
+            preset_mode = fan_preset_mode(bri)
 
-            preset_mode_topic = f"{self.client.topic}/status/{device.hass_id}/preset"
+            preset_mode_topic = self.topics.preset(device.hass_id)
             try:
                 await self.client.client.publish(
                     preset_mode_topic,
@@ -360,16 +368,14 @@ class StateUpdateHelper:
         connected_to_mesh byte and offline_count threshold. Do not set device.online here.
         """
         if device.supports_temperature:
-            mqtt_dev_state = {
-                "state": "ON",
-                "color_mode": "color_temp",
-                "color_temp": self.client.cync2kelvin(temp),
-            }
+            mqtt_dev_state = self.payloads.light(
+                "ON", color_mode="color_temp", color_temp=self.client.cync2kelvin(temp)
+            )
             device.temperature = temp
             device.red = 0
             device.green = 0
             device.blue = 0
-            return await self.send_device_status(device, json.dumps(mqtt_dev_state).encode())
+            return await self.send_device_status(device, mqtt_dev_state, partial=True)
         return False
 
     async def update_rgb(self, device: CyncDevice, rgb: tuple[int, int, int]) -> bool:
@@ -388,59 +394,182 @@ class StateUpdateHelper:
                 ]
             )
         ):
-            mqtt_dev_state = {
-                "state": "ON",
-                "color_mode": "rgb",
-                "color": {"r": rgb[0], "g": rgb[1], "b": rgb[2]},
-            }
+            mqtt_dev_state = self.payloads.light("ON", color_mode="rgb", color=(rgb[0], rgb[1], rgb[2]))
             device.red = rgb[0]
             device.green = rgb[1]
             device.blue = rgb[2]
             device.temperature = 254
-            return await self.send_device_status(device, json.dumps(mqtt_dev_state).encode())
+            return await self.send_device_status(device, mqtt_dev_state, partial=True)
         return False
 
-    async def send_device_status(self, device: CyncDevice, state_bytes: bytes) -> bool:
-        """Publish device status to MQTT."""
-        lp = f"{self.client.lp}send_device_status:"
+    async def send_device_status(self, device: CyncDevice, state_bytes: bytes, partial: bool = False) -> bool:
+        """
+        Publish device status to MQTT.
 
-        timestamp_ms = int(time.time() * 1000)
-        caller = "".join(traceback.format_stack()[-3].split("\n")[0:1])
+        ``partial`` marks a payload that only carries what changed (power, brightness or colour alone),
+        the replay store then gets the complete state rebuilt from the device instead.
+        """
+        lp = f"{self.client.lp}send_device_status:"
 
-        logger.debug(
-            "%s [STATE_UPDATE_SEQ] ts=%dms device=%s state=%s caller=%s",
-            lp,
-            timestamp_ms,
-            device.name if hasattr(device, "name") else device.id,
-            state_bytes.decode() if isinstance(state_bytes, bytes) else state_bytes,
-            caller,
+        # every state change goes through here, only build the trace line when it is logged
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "%s [STATE_UPDATE_SEQ] ts=%dms device=%s state=%s caller=%s",
+                lp,
+                int(time.time() * 1000),
+                device.name if hasattr(device, "name") else device.id,
+                state_bytes.decode() if isinstance(state_bytes, bytes) else state_bytes,
+                call_site(2) if call_site_tracing_enabled() else None,
+            )
+        self.replay.record_state(
+            device.id,
+            self.topics.status(device.hass_id),
+            self._replay_payload(device) if partial else state_bytes,
         )
         if self.client._connected:
-            tpc = f"{self.client.topic}/status/{device.hass_id}"
+            if not self._admit_device_status(device, state_bytes):
+                return True
+            return await self._publish_device_status(device, state_bytes)
+        return False
+
+    async def send_device_statuses(self, statuses: list[tuple[CyncDevice, bytes]], partial: bool = False) -> list[bool]:
+        """Publish many device statuses as one pipelined batch, returns a success flag per status."""
+        results = [False] * len(statuses)
+        topics = self.topics
+        for device, state_bytes in statuses:
+            self.replay.record_state(
+                device.id,
+                topics.status(device.hass_id),
+                self._replay_payload(device) if partial else state_bytes,
+            )
+        if not self.client._connected:
+            return results
+        to_send: list[int] = []
+        for idx, (device, state_bytes) in enumerate(statuses):
+            if self._admit_device_status(device, state_bytes):
+                to_send.append(idx)
+            else:
+                results[idx] = True
+        if not to_send:
+            return results
+
+        published = await self.client.publish_many(
+            [(topics.status(statuses[idx][0].hass_id), statuses[idx][1]) for idx in to_send]
+        )
+        for idx, ok in zip(to_send, published, strict=True):
+            results[idx] = ok
+            if not ok:
+                self.publish_cache.forget(statuses[idx][0].id)
+        return results
+
+    def _admit_device_status(self, device: CyncDevice, state_bytes: bytes) -> bool:
+        """Run a status through the publish cache, returns True if it should be published now."""
+        decision = self.publish_cache.admit(device.id, state_bytes)
+        if decision == StatePublishCache.DUPLICATE:
             logger.debug(
-                "%s Sending %s for device: '%s' (ID: %s)",
-                lp,
-                state_bytes,
+                "%s State unchanged for '%s' (ID: %s), skipping publish",
+                f"{self.client.lp}send_device_status:",
                 device.name,
                 device.id,
             )
-            try:
-                await self.client.client.publish(
-                    tpc,
-                    state_bytes,
-                    qos=0,
-                    timeout=3.0,
-                )
-                # Don't auto-update groups - too noisy
-            except aiomqtt.MqttError as mqtt_code_exc:
-                logger.warning("%s [MqttError] -> %s", lp, mqtt_code_exc)
-                self.client._connected = False
-            except asyncio.CancelledError as can_exc:
-                logger.debug("%s [Task Cancelled] -> %s", lp, can_exc)
-            else:
-                return True
+            return False
+        if decision == StatePublishCache.DEFER:
+            self._schedule_flush(device)
+            return False
+        return True
+
+    async def _publish_device_status(self, device: CyncDevice, state_bytes: bytes) -> bool:
+        lp = f"{self.client.lp}send_device_status:"
+        tpc = self.topics.status(device.hass_id)
+        logger.debug(
+            "%s Sending %s for device: '%s' (ID: %s)",
+            lp,
+            state_bytes,
+            device.name,
+            device.id,
+        )
+        try:
+            await self.client.client.publish(
+                tpc,
+                state_bytes,
+                qos=0,
+                timeout=3.0,
+            )
+            # Don't auto-update groups - too noisy
+        except aiomqtt.MqttError as mqtt_code_exc:
+            logger.warning("%s [MqttError] -> %s", lp, mqtt_code_exc)
+            self.client._connected = False
+            self.publish_cache.forget(device.id)
+        except asyncio.CancelledError as can_exc:
+            logger.debug("%s [Task Cancelled] -> %s", lp, can_exc)
+            self.publish_cache.forget(device.id)
+        else:
+            return True
         return False
 
+    def _schedule_flush(self, device: CyncDevice) -> None:
+        """Publish the last deferred state for a device once its coalescing window closes."""
+        task = self._flush_tasks.get(device.id)
+        if task is not None and not task.done():
+            return
+        self._flush_tasks[device.id] = asyncio.create_task(
+            self._flush_deferred(device, self.publish_cache.delay(device.id)),
+            name=f"state_flush_{device.id}",
+        )
+
+    async def _flush_deferred(self, device: CyncDevice, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_tasks.pop(device.id, None)
+        state_bytes = self.publish_cache.take_pending(device.id)
+        if state_bytes is None:
+            return
+        if not self.client._connected:
+            self.publish_cache.forget(device.id)
+            return
+        await self._publish_device_status(device, state_bytes)
+
+    def force_next_publish(self) -> None:
+        """Make sure the next state publish for every device reaches the broker (re-connect, HASS birth)."""
+        self.publish_cache.invalidate()
+
+    async def replay_states(self, reason: str) -> int:
+        """
+        Re-publish availability and state of every device and subgroup availability (re-connect, HASS birth).
+
+        Recorded payloads go out from the replay store in bounded batches. Devices that never had their
+        availability or state built fall back to their current values. Returns the number of messages replayed.
+        """
+        lp = f"{self.client.lp}replay:"
+        started = time.perf_counter()
+        self.force_next_publish()
+        topics = self.topics
+        missing: list[tuple[int, DeviceStatus]] = []
+        for device_id, device in g.ncync_server.devices.items():
+            availability_topic = topics.availability(device.hass_id)
+            if not self.replay.has_availability(availability_topic):
+                self.replay.record_availability(availability_topic, device.online)
+            if not self.replay.has_state(device_id):
+                missing.append((device_id, self._current_status(device)))
+        # subgroups are always available
+        for group in g.ncync_server.groups.values():
+            if group.is_subgroup:
+                self.replay.record_availability(topics.availability(group.hass_id), True)
+
+        replayed = await self.replay.replay(self.client.publish_many)
+        for device_id, payload in replayed.items():
+            self.publish_cache.remember(device_id, payload)
+        if missing:
+            await self.parse_device_statuses(missing, from_pkt=reason)
+        logger.info(
+            "%s %s: replayed %d message(s) in %.1f ms, %d device(s) without a recorded state",
+            lp,
+            reason,
+            self.replay.last_replayed,
+            (time.perf_counter() - started) * 1000,
+            len(missing),
+        )
+        return self.replay.last_replayed
+
     async def publish_group_state(
         self,
         group,
@@ -456,6 +585,59 @@ class StateUpdateHelper:
         if not self.client._connected:
             return
 
+        payload = self._group_state_payload(group, state, brightness, temperature, origin)
+        if payload is None:
+            return
+
+        tpc = self.topics.status(group.hass_id)
+        try:
+            await self.client.client.publish(
+                tpc,
+                payload,
+                qos=0,
+                timeout=3.0,
+            )
+        except Exception as e:
+            logger.warning("Failed to publish group state for %s: %s", group.name, e)
+
+    async def publish_group_states(
+        self,
+        updates: list[tuple[CyncGroup, int | None, int | None, int | None, str | None]],
+    ) -> list[bool]:
+        """
+        Publish many group states as one pipelined batch.
+
+        Each update is ``(group, state, brightness, temperature, origin)`` as for publish_group_state().
+        Returns a success flag per update, updates with nothing to publish count as failed.
+        """
+        results = [False] * len(updates)
+        if not self.client._connected:
+            return results
+        to_send: list[int] = []
+        messages: list[tuple[str, bytes]] = []
+        for idx, (group, state, brightness, temperature, origin) in enumerate(updates):
+            if not isinstance(group, CyncGroup):
+                continue
+            payload = self._group_state_payload(group, state, brightness, temperature, origin)
+            if payload is not None:
+                to_send.append(idx)
+                messages.append((self.topics.status(group.hass_id), payload))
+        if not messages:
+            return results
+        published = await self.client.publish_many(messages)
+        for idx, ok in zip(to_send, published, strict=True):
+            results[idx] = ok
+        return results
+
+    def _group_state_payload(
+        self,
+        group: CyncGroup,
+        state=None,
+        brightness=None,
+        temperature=None,
+        origin: str | None = None,
+    ) -> bytes | None:
+        """Build the group status payload, only with the values passed (None if there is nothing to publish)."""
         # Build state dict with only changed values
         group_state = {}
 
@@ -480,35 +662,98 @@ class StateUpdateHelper:
                 group_state["color_mode"] = "brightness"
 
         if not group_state:
-            return
+            return None
 
         # annotate origin for visibility
         if origin:
             group_state["origin"] = origin
-
-        tpc = f"{self.client.topic}/status/{group.hass_id}"
-        try:
-            await self.client.client.publish(
-                tpc,
-                json.dumps(group_state).encode(),
-                qos=0,
-                timeout=3.0,
-            )
-        except Exception as e:
-            logger.warning("Failed to publish group state for %s: %s", group.name, e)
+        return json.dumps(group_state).encode()
 
     async def parse_device_status(self, device_id: int, device_status: DeviceStatus, *_args, **kwargs) -> bool:
         """Parse device status and publish to MQTT for HASS devices to update. Useful for device status packets that report the complete device state"""
-        lp = f"{self.client.lp}parse status:"
         from_pkt = kwargs.get("from_pkt")
-        ts_ms = int(time.time() * 1000)
-        logger.debug(
-            "[PUBLISH_STATE] ts=%dms device_id=%s state=%s source=%s",
-            ts_ms,
-            device_id,
-            "ON" if device_status.state else "OFF",
-            from_pkt if from_pkt else "unknown",
-        )
+        built = self._device_status_payload(device_id, device_status, from_pkt)
+        if built is None:
+            return False
+        device, mqtt_dev_state = built
+
+        # Publish device status
+        # NOTE: Subgroup state aggregation is now handled in server.parse_status() after device updates
+        # (subgroups do NOT report their own state in mesh_info, so aggregation from members is required)
+        result = await self.send_device_status(device, mqtt_dev_state)
+
+        # For fan entities, also publish preset mode based on brightness
+        preset_mode = self._fan_preset_mode(device, device_status)
+        if preset_mode is not None:
+            preset_mode_topic = self.topics.preset(device.hass_id)
+            try:
+                await self.client.client.publish(
+                    preset_mode_topic,
+                    preset_mode.encode(),
+                    qos=0,
+                    retain=True,
+                    timeout=3.0,
+                )
+                logger.debug(
+                    "%s FAN PRESET PUBLISHED: '%s' (brightness=%s) for device '%s' (ID=%s) to %s",
+                    f"{self.client.lp}parse status:",
+                    preset_mode,
+                    device_status.brightness,
+                    device.name,
+                    device.id,
+                    preset_mode_topic,
+                )
+            except Exception:
+                logger.exception(
+                    "%s Failed to publish fan preset mode for '%s'",
+                    f"{self.client.lp}parse status:",
+                    device.name,
+                )
+
+        return result
+
+    async def parse_device_statuses(
+        self, statuses: list[tuple[int, DeviceStatus]], from_pkt: str | None = None
+    ) -> list[bool]:
+        """
+        Batch version of parse_device_status(), for status reports covering many devices (mesh info).
+
+        The status payloads go through the publish cache and out as one pipelined batch, fan preset
+        modes follow as a second batch. Returns a success flag per status.
+        """
+        results = [False] * len(statuses)
+        to_send: list[int] = []
+        payloads: list[tuple[CyncDevice, bytes]] = []
+        presets: list[tuple[str, bytes]] = []
+        for idx, (device_id, device_status) in enumerate(statuses):
+            built = self._device_status_payload(device_id, device_status, from_pkt)
+            if built is None:
+                continue
+            to_send.append(idx)
+            payloads.append(built)
+            preset_mode = self._fan_preset_mode(built[0], device_status)
+            if preset_mode is not None:
+                presets.append((self.topics.preset(built[0].hass_id), preset_mode.encode()))
+
+        for idx, ok in zip(to_send, await self.send_device_statuses(payloads), strict=True):
+            results[idx] = ok
+        if presets and self.client._connected:
+            await self.client.publish_many(presets, retain=True)
+        return results
+
+    def _device_status_payload(
+        self, device_id: int, device_status: DeviceStatus, from_pkt: str | None
+    ) -> tuple[CyncDevice, bytes] | None:
+        """Build the status payload for a device, None if the device is unknown or must not be updated."""
+        lp = f"{self.client.lp}parse status:"
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "[PUBLISH_STATE] ts=%dms device_id=%s state=%s source=%s",
+                int(time.time() * 1000),
+                device_id,
+                "ON" if device_status.state else "OFF",
+                from_pkt if from_pkt else "unknown",
+            )
         if from_pkt:
             lp = f"{lp}{from_pkt}:"
         if device_id not in g.ncync_server.devices:
@@ -517,7 +762,7 @@ class StateUpdateHelper:
                 lp,
                 device_id,
             )
-            return False
+            return None
         device: CyncDevice = g.ncync_server.devices[device_id]
 
         # CRITICAL: Skip publishing switch state from mesh packets (0x83 and mesh info from 0x73)
@@ -532,28 +777,42 @@ class StateUpdateHelper:
                 lp,
                 device.name,
             )
-            return False
+            return None
 
         # if device.build_status() == device_status:
         #     # logger.debug("%s Device status unchanged, skipping...", lp)
         #     return
-        power_status = "OFF" if device_status.state == 0 else "ON"
-        mqtt_dev_state: dict[str, int | str | bytes] = {"state": power_status}
+        return device, self._state_payload(device, device_status)
+
+    @staticmethod
+    def _current_status(device: CyncDevice) -> DeviceStatus:
+        return DeviceStatus(
+            state=device.state,
+            brightness=device.brightness,
+            temperature=device.temperature,
+            red=device.red,
+            green=device.green,
+            blue=device.blue,
+        )
+
+    def _replay_payload(self, device: CyncDevice) -> bytes:
+        """Complete state payload for the replay store, built from the device's current values."""
+        return self._state_payload(device, self._current_status(device))
 
+    def _state_payload(self, device: CyncDevice, device_status: DeviceStatus) -> bytes:
+        """Status payload carrying the complete state in ``device_status``."""
         if device.is_plug:
-            mqtt_dev_state = power_status.encode()
+            mqtt_dev_state = power_payload(device_status.state != 0)
 
         elif device.is_switch:
             # Switches only need plain ON/OFF payload (no JSON)
-            mqtt_dev_state = power_status.encode()
+            mqtt_dev_state = power_payload(device_status.state != 0)
 
         else:
             # Lights get brightness and color_mode
-            if device_status.brightness is not None:
-                mqtt_dev_state["brightness"] = device_status.brightness
-
-            # Determine and set color_mode
-            color_mode_set = False
+            color_mode = None
+            color_temp = None
+            color = None
             if device_status.temperature is not None:
                 if device.supports_rgb and (
                     any(
@@ -565,81 +824,32 @@ class StateUpdateHelper:
                     )
                     and device_status.temperature > 100
                 ):
-                    mqtt_dev_state["color_mode"] = "rgb"
-                    mqtt_dev_state["color"] = {
-                        "r": device_status.red,
-                        "g": device_status.green,
-                        "b": device_status.blue,
-                    }
-                    color_mode_set = True
+                    color_mode = "rgb"
+                    color = (device_status.red, device_status.green, device_status.blue)
                 elif device.supports_temperature and (0 <= device_status.temperature <= 100):
-                    mqtt_dev_state["color_mode"] = "color_temp"
-                    mqtt_dev_state["color_temp"] = self.client.cync2kelvin(device_status.temperature)
-                    color_mode_set = True
+                    color_mode = "color_temp"
+                    color_temp = self.client.cync2kelvin(device_status.temperature)
 
             # If color_mode not set yet, add default based on capabilities
-            if not color_mode_set:
+            if color_mode is None:
                 if device.supports_temperature:
-                    mqtt_dev_state["color_mode"] = "color_temp"
+                    color_mode = "color_temp"
                 elif device.supports_rgb:
-                    mqtt_dev_state["color_mode"] = "rgb"
+                    color_mode = "rgb"
                 else:
-                    mqtt_dev_state["color_mode"] = "brightness"
-
-            mqtt_dev_state = json.dumps(mqtt_dev_state).encode()
-
-        # Publish device status
-        # NOTE: Subgroup state aggregation is now handled in server.parse_status() after device updates
-        # (subgroups do NOT report their own state in mesh_info, so aggregation from members is required)
-        result = await self.send_device_status(device, mqtt_dev_state)
-
-        # For fan entities, also publish preset mode based on brightness
-        if device.is_fan_controller and self.client._connected and device_status.brightness is not None:
-            bri = device_status.brightness
-            # Map brightness (1-100 scale) to preset mode
-            if bri == 0:
-                preset_mode = "off"
-            elif bri == 25:
-                preset_mode = "low"
-            elif bri == 50:
-                preset_mode = "medium"
-            elif bri == 75:
-                preset_mode = "high"
-            elif bri == 100:
-                preset_mode = "max"
-            # For any other value, find closest preset
-            elif bri < 25:
-                preset_mode = "low"
-            elif bri < 50:
-                preset_mode = "medium"
-            elif bri < 75:
-                preset_mode = "high"
-            else:
-                preset_mode = "max"
-
-            preset_mode_topic = f"{self.client.topic}/status/{device.hass_id}/preset"
-            try:
-                await self.client.client.publish(
-                    preset_mode_topic,
-                    preset_mode.encode(),
-                    qos=0,
-                    retain=True,
-                    timeout=3.0,
-                )
-                logger.debug(
-                    "%s FAN PRESET PUBLISHED: '%s' (brightness=%s) for device '%s' (ID=%s) to %s",
-                    f"{self.client.lp}parse status:",
-                    preset_mode,
-                    bri,
-                    device.name,
-                    device.id,
-                    preset_mode_topic,
-                )
-            except Exception:
-                logger.exception(
-                    "%s Failed to publish fan preset mode for '%s'",
-                    f"{self.client.lp}parse status:",
-                    device.name,
-                )
+                    color_mode = "brightness"
+
+            mqtt_dev_state = self.payloads.light(
+                "OFF" if device_status.state == 0 else "ON",
+                brightness=device_status.brightness,
+                color_mode=color_mode,
+                color_temp=color_temp,
+                color=color,
+            )
+        return mqtt_dev_state
 
-        return result
+    def _fan_preset_mode(self, device: CyncDevice, device_status: DeviceStatus) -> str | None:
+        """Preset mode matching a fan controller's brightness, None for other devices."""
+        if not device.is_fan_controller or not self.client._connected or device_status.brightness is None:
+            return None
+        return fan_preset_mode(device_status.brightness)
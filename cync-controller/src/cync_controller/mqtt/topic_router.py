@@ -0,0 +1,96 @@
+"""
+Topic pattern trie for routing incoming MQTT messages to handlers.
+
+Patterns are registered level by level (``cync_lan/set/+/preset``), ``+`` captures a single level
+and ``#`` (last level only) captures the rest of the topic. A lookup walks the trie once per
+distinct topic string, the result is memoized since the set of topics a bridge receives is small
+(a few per device / group plus the bridge buttons).
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+Handler = Callable[..., Any]
+
+
+class _Node:
+    __slots__ = ("children", "handler", "rest", "wildcard")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.wildcard: _Node | None = None
+        self.rest: Handler | None = None
+        self.handler: Handler | None = None
+
+
+class TopicRouter:
+    """
+    Maps topic patterns to handlers, ``match()`` returns the handler and the captured levels.
+
+    Literal levels win over ``+``, ``+`` wins over ``#``. ``#`` captures the remaining levels
+    joined with ``/`` as a single value.
+    """
+
+    def __init__(self, max_memo: int = 4096):
+        self._root = _Node()
+        self.max_memo = max_memo
+        self._memo: dict[str, tuple[Handler, tuple[str, ...]] | None] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, pattern: str, handler: Handler) -> None:
+        node = self._root
+        levels = pattern.split("/")
+        for idx, level in enumerate(levels):
+            if level == "#":
+                if idx != len(levels) - 1:
+                    msg = f"'#' must be the last level of a topic pattern: {pattern}"
+                    raise ValueError(msg)
+                node.rest = handler
+                self._memo.clear()
+                return
+            if level == "+":
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(level, _Node())
+        node.handler = handler
+        self._memo.clear()
+
+    def match(self, topic: str) -> tuple[Handler, tuple[str, ...]] | None:
+        """Handler and captured levels for ``topic``, None if no pattern matches."""
+        try:
+            route = self._memo[topic]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return route
+        self.misses += 1
+        route = self._walk(self._root, topic.split("/"), 0, ())
+        if len(self._memo) >= self.max_memo:
+            self._memo.clear()
+        self._memo[topic] = route
+        return route
+
+    def _walk(
+        self, node: _Node, levels: list[str], idx: int, captures: tuple[str, ...]
+    ) -> tuple[Handler, tuple[str, ...]] | None:
+        if idx == len(levels):
+            return (node.handler, captures) if node.handler is not None else None
+        level = levels[idx]
+        child = node.children.get(level)
+        if child is not None and (route := self._walk(child, levels, idx + 1, captures)) is not None:
+            return route
+        if (
+            node.wildcard is not None
+            and (route := self._walk(node.wildcard, levels, idx + 1, (*captures, level))) is not None
+        ):
+            return route
+        if node.rest is not None:
+            return node.rest, (*captures, "/".join(levels[idx:]))
+        return None
+
+    def stats(self) -> dict[str, int]:
+        return {"memoized": len(self._memo), "hits": self.hits, "misses": self.misses}
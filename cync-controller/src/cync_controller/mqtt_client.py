@@ -33,7 +33,13 @@ from cync_controller.const import (
     CYNC_TOPIC,
 )
 from cync_controller.mqtt.client import MQTTClient
-from cync_controller.mqtt.commands import CommandProcessor, DeviceCommand, SetBrightnessCommand, SetPowerCommand
+from cync_controller.mqtt.commands import (
+    CommandProcessor,
+    DeviceCommand,
+    SetBrightnessCommand,
+    SetPowerCommand,
+    SetTemperatureCommand,
+)
 from cync_controller.structs import GlobalObject
 
 # Re-export g for backward compatibility with tests
@@ -55,6 +61,7 @@ __all__ = [
     "MQTTClient",
     "SetBrightnessCommand",
     "SetPowerCommand",
+    "SetTemperatureCommand",
     "aiomqtt",
     "asyncio",
     "g",
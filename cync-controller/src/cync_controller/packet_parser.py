@@ -2,6 +2,81 @@
 Packet parsing utilities for Cync protocol analysis
 """
 
+import struct
+from collections.abc import Iterator
+
+# Packet type names, both directions of a device <-> cloud connection
+PACKET_TYPE_NAMES = {
+    0x23: "HANDSHAKE",
+    0x28: "HELLO_ACK",
+    0x43: "DEVICE_INFO",
+    0x48: "INFO_ACK",
+    0x73: "DATA_CHANNEL",
+    0x78: "KEEPALIVE",
+    0x7B: "DATA_ACK",
+    0x83: "STATUS_BROADCAST",
+    0x88: "STATUS_ACK",
+    0xD3: "HEARTBEAT_DEV",
+    0xD8: "HEARTBEAT_CLOUD",
+}
+
+# 0x43 DEVICE_INFO packets carry 19 byte status records after the 12 byte header
+DEVICE_INFO_HEADER_LEN = 12
+DEVICE_INFO_RECORD_LEN = 19
+
+# Status record layouts, each one picks the status fields out of a fixed size record
+# 0x43 DEVICE_INFO: ?  ?  ?  ID  state bri tmp R G B online  + 8 unknown
+#   -> (id, state, brightness, temp, R, G, B, online)
+DEVICE_INFO_RECORD = struct.Struct("3x8B8x")
+# 0x73 mesh info (ctrl bytes f9 52): 24 bytes per device
+#   ID  ? type  ?  ?  ? type  ? state   ?  ?  ? bri  ?  ?  ? tmp   ?  ?  ?  R  G  B  ?
+#   -> (id, type, state, brightness, temp, R, G, B)
+MESH_INFO_RECORD = struct.Struct("BxB5xB3xB3xB3x3Bx")
+
+
+def iter_status_records(layout: struct.Struct, data: bytes | memoryview, start: int = 0) -> Iterator[tuple[int, ...]]:
+    """
+    Unpack every whole ``layout`` record in ``data[start:]``, a trailing partial record is ignored.
+
+    The records are unpacked in place from the buffer, nothing is sliced or hex encoded per record.
+    """
+    view = memoryview(data)[start:]
+    return layout.iter_unpack(view[: len(view) - len(view) % layout.size])
+
+
+def device_info_raw_states(packet: bytes | memoryview) -> Iterator[bytes]:
+    """
+    Yield the status records of a 0x43 DEVICE_INFO packet in NCyncServer.parse_status() format.
+
+    Decodes straight from the packet bytes, without building the hex strings and dicts that
+    parse_cync_packet() does. Each record becomes
+    ``[id, state, brightness, temp (254 in RGB mode), R, G, B, online]``, RGB is only kept
+    in RGB mode (temp > 100) and temp only in white mode.
+    """
+    if len(packet) <= DEVICE_INFO_HEADER_LEN or packet[0] != 0x43:
+        return
+    for dev_id, state, brightness, temp, r, g, b, online in iter_status_records(
+        DEVICE_INFO_RECORD, packet, DEVICE_INFO_HEADER_LEN
+    ):
+        if temp > 100:
+            yield bytes((dev_id, 1 if state else 0, brightness, 254, r, g, b, 1 if online else 0))
+        else:
+            yield bytes((dev_id, 1 if state else 0, brightness, temp, 0, 0, 0, 1 if online else 0))
+
+
+def mesh_info_raw_states(inner_struct: bytes | memoryview, start: int) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield ``(device type, raw_state)`` for every 24 byte device record of a mesh info response.
+
+    ``raw_state`` is in NCyncServer.parse_status() format with the online byte set. Mesh info can
+    report brightness > 0 for a device that is off, brightness is zeroed for those.
+    """
+    records = iter_status_records(MESH_INFO_RECORD, inner_struct, start)
+    for dev_id, dev_type, state, brightness, temp, r, g, b in records:
+        # ive seen devices that are on have a state of 0 but brightness 100
+        bri = 0 if state == 0 else brightness
+        yield dev_type, bytes((dev_id, state, bri, temp, r, g, b, 1))
+
 
 def parse_cync_packet(packet_bytes, direction="UNKNOWN"):
     """
@@ -30,21 +105,7 @@ def parse_cync_packet(packet_bytes, direction="UNKNOWN"):
     packet_type = packet_bytes[0]
     result["packet_type"] = f"0x{packet_type:02x}"
 
-    # Packet type names
-    type_names = {
-        0x23: "HANDSHAKE",
-        0x28: "HELLO_ACK",
-        0x43: "DEVICE_INFO",
-        0x48: "INFO_ACK",
-        0x73: "DATA_CHANNEL",
-        0x78: "KEEPALIVE",
-        0x7B: "DATA_ACK",
-        0x83: "STATUS_BROADCAST",
-        0x88: "STATUS_ACK",
-        0xD3: "HEARTBEAT_DEV",
-        0xD8: "HEARTBEAT_CLOUD",
-    }
-    result["packet_type_name"] = type_names.get(packet_type, "UNKNOWN")
+    result["packet_type_name"] = PACKET_TYPE_NAMES.get(packet_type, "UNKNOWN")
 
     # Parse length (bytes 1-4)
     # Byte 3 is multiplier (value * 256), byte 4 is base length
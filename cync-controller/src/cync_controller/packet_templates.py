@@ -0,0 +1,295 @@
+"""
+Precompiled 0x73 control packet templates.
+
+Every control command used to build its packet from a Python list with placeholder strings,
+patch the control byte in, recompute ``sum(inner_struct[6:-2])`` and convert the whole list to
+bytes once per bridge. A PacketTemplate resolves the layout once: the constant bytes live in a
+preassembled bytearray together with the sum of the constant checksummed bytes. Encoding only
+patches queue id, msg id, target id and values in place and derives the checksum from those
+changed bytes.
+
+Packet layout::
+
+    73 00 00 00 <len> <queue id> 00 00 00 7e <msg id> ... <checksum> 7e
+"""
+
+from __future__ import annotations
+
+from operator import mul
+from typing import Final
+
+from cync_controller.packet_checksum import DEFAULT_OFFSET_AFTER_START
+
+__all__ = [
+    "BRIGHTNESS",
+    "LIGHTSHOW",
+    "POWER",
+    "RGB",
+    "TEMPERATURE",
+    "PacketTemplate",
+]
+
+# reserved slot names, any other string in an inner layout is a value slot
+CTRL_BYTE: Final[str] = "ctrl_byte"
+ID_LOW: Final[str] = "id_low"
+ID_HIGH: Final[str] = "id_high"
+CHECKSUM: Final[str] = "checksum"
+_RESERVED = frozenset({CTRL_BYTE, ID_LOW, ID_HIGH, CHECKSUM})
+
+QUEUE_ID_LEN: Final[int] = 4
+
+
+class PacketTemplate:
+    """
+    A preassembled control packet for one command type.
+
+    ``inner`` is the 0x7E delimited inner struct, written the same way the command builders
+    used to write it: ints are constant bytes, ``"ctrl_byte"`` / ``"id_low"`` / ``"id_high"`` /
+    ``"checksum"`` are filled in by :meth:`encode` and any other string is a value slot. Value
+    slots take the positional ``values`` passed to :meth:`encode` in the order they appear.
+    """
+
+    __slots__ = (
+        "_base_sum",
+        "_buf",
+        "_inner",
+        "_length",
+        "_n_values",
+        "_patches",
+        "_plan",
+        "_queue_len",
+        "_summed",
+        "_weights",
+        "name",
+    )
+
+    def __init__(self, name: str, length: int, inner: list[int | str]):
+        self.name = name
+        self._length = length
+        self._inner = list(inner)
+        value_names = [slot for slot in inner if isinstance(slot, str) and slot not in _RESERVED]
+        self._summed = range(DEFAULT_OFFSET_AFTER_START, len(inner) - 2)
+        if inner.count(CHECKSUM) != 1 or inner.index(CHECKSUM) != len(inner) - 2:
+            msg = f"{name}: checksum slot must be the second to last byte"
+            raise ValueError(msg)
+        if len(set(value_names)) != len(value_names):
+            msg = f"{name}: duplicate value slots {value_names}"
+            raise ValueError(msg)
+        # the sum of every constant byte the checksum covers, variable slots count as 0
+        self._base_sum = sum(b for i, b in enumerate(inner) if i in self._summed and isinstance(b, int))
+        self._queue_len = -1
+        self._layout(QUEUE_ID_LEN)
+
+    @property
+    def value_slots(self) -> tuple[str, ...]:
+        return tuple(slot for slot in self._inner if isinstance(slot, str) and slot not in _RESERVED)
+
+    def _layout(self, queue_len: int) -> None:
+        """(Re)assemble the buffer for a queue id of ``queue_len`` bytes."""
+        header = [0x73, 0x00, 0x00, 0x00, self._length]
+        inner_start = len(header) + queue_len + 3
+        buf = bytearray(header)
+        buf.extend(bytes(queue_len + 3))
+        buf.extend(0 if isinstance(b, str) else b for b in self._inner)
+
+        # fields in the order encode() receives them: msg id, target id low/high, values
+        fields = (CTRL_BYTE, ID_LOW, ID_HIGH, *self.value_slots)
+        # (buffer index, field number) for every occurrence of every field
+        self._patches = tuple(
+            (inner_start + i, n) for n, name in enumerate(fields) for i, slot in enumerate(self._inner) if slot == name
+        )
+        # how many times each field is counted by the checksum
+        self._weights = tuple(
+            sum(1 for i, slot in enumerate(self._inner) if slot == name and i in self._summed) for name in fields
+        )
+        self._n_values = len(fields) - 3
+        self._buf = buf
+        self._queue_len = queue_len
+        # everything encode() needs, fetched with one attribute lookup
+        self._plan = (buf, 5 + queue_len, self._patches, self._weights, inner_start + len(self._inner) - 2)
+
+    def encode(self, queue_id: bytes, msg_id: int, target_id: int, *values: int) -> bytes:
+        """Return the packet for ``target_id`` (device or group ID, 16-bit little endian)."""
+        if len(values) != self._n_values:
+            msg = f"{self.name}: expected {self._n_values} value(s), got {len(values)}"
+            raise ValueError(msg)
+        if len(queue_id) != self._queue_len:
+            self._layout(len(queue_id))
+        buf, queue_end, patches, weights, checksum_idx = self._plan
+        buf[5:queue_end] = queue_id
+        fields = (msg_id, target_id & 0xFF, (target_id >> 8) & 0xFF, *values)
+        for idx, n in patches:
+            buf[idx] = fields[n]
+        # only the patched bytes change, so the constant part of the sum is precomputed
+        buf[checksum_idx] = (self._base_sum + sum(map(mul, fields, weights))) & 0xFF  # noqa: B912
+        return bytes(buf)
+
+    def __repr__(self) -> str:
+        return f"<PacketTemplate {self.name} len={len(self._buf)} values={self.value_slots}>"
+
+
+POWER: Final[PacketTemplate] = PacketTemplate(
+    "power",
+    0x1F,
+    [
+        0x7E,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0xF8,
+        0xD0,
+        0x0D,
+        0x00,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0x00,
+        ID_LOW,
+        ID_HIGH,
+        0xD0,
+        0x11,
+        0x02,
+        "state",
+        0x00,
+        0x00,
+        CHECKSUM,
+        0x7E,
+    ],
+)
+
+BRIGHTNESS: Final[PacketTemplate] = PacketTemplate(
+    "brightness",
+    0x22,
+    [
+        0x7E,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0xF8,
+        0xF0,
+        0x10,
+        0x00,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0x00,
+        ID_LOW,
+        ID_HIGH,
+        0xF0,
+        0x11,
+        0x02,
+        0x01,
+        "brightness",
+        0xFF,
+        0xFF,
+        0xFF,
+        0xFF,
+        CHECKSUM,
+        0x7E,
+    ],
+)
+
+TEMPERATURE: Final[PacketTemplate] = PacketTemplate(
+    "temperature",
+    0x22,
+    [
+        0x7E,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0xF8,
+        0xF0,
+        0x10,
+        0x00,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0x00,
+        ID_LOW,
+        ID_HIGH,
+        0xF0,
+        0x11,
+        0x02,
+        0x01,
+        0xFF,
+        "temperature",
+        0x00,
+        0x00,
+        0x00,
+        CHECKSUM,
+        0x7E,
+    ],
+)
+
+RGB: Final[PacketTemplate] = PacketTemplate(
+    "rgb",
+    0x22,
+    [
+        0x7E,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0xF8,
+        0xF0,
+        0x10,
+        0x00,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0x00,
+        ID_LOW,
+        ID_HIGH,
+        0xF0,
+        0x11,
+        0x02,
+        0x01,
+        0xFF,
+        0xFE,
+        "red",
+        "green",
+        "blue",
+        CHECKSUM,
+        0x7E,
+    ],
+)
+
+LIGHTSHOW: Final[PacketTemplate] = PacketTemplate(
+    "lightshow",
+    0x20,
+    [
+        0x7E,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0xF8,
+        0xE2,
+        0x0E,
+        0x00,
+        CTRL_BYTE,
+        0x00,
+        0x00,
+        0x00,
+        0x00,
+        ID_LOW,
+        ID_HIGH,
+        0xE2,
+        0x11,
+        0x02,
+        # 11 02 (07 01 01 f1)[diff between effects?] fd[cksm]
+        0x07,
+        0x01,
+        "effect_0",
+        "effect_1",
+        CHECKSUM,
+        0x7E,
+    ],
+)
@@ -0,0 +1,214 @@
+"""
+Shared deadline scheduler for timeouts and periodic checks.
+
+Instead of every bridge and relay running its own task that wakes up every second to look
+for work, deadlines are registered with one process-wide scheduler. It keeps them on a
+min-heap and arms a single event loop timer for the earliest one, so it only wakes up when
+something is actually due.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from cync_controller.logging_abstraction import get_logger
+
+__all__ = [
+    "Deadline",
+    "DeadlineScheduler",
+]
+
+logger = get_logger(__name__)
+
+
+class Deadline:
+    """Handle for a scheduled callback, returned by :meth:`DeadlineScheduler.call_later`."""
+
+    __slots__ = ("_scheduler", "args", "callback", "cancelled", "fired", "when")
+
+    def __init__(self, scheduler: DeadlineScheduler, when: float, callback: Callable[..., Any], args: tuple):
+        self._scheduler = scheduler
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.fired = False
+
+    def cancel(self) -> None:
+        if self.cancelled or self.fired:
+            return
+        self.cancelled = True
+        self._scheduler._on_cancel(self)
+
+    def __repr__(self) -> str:
+        return f"<Deadline when={self.when:.3f} callback={getattr(self.callback, '__qualname__', self.callback)}>"
+
+
+class DeadlineScheduler:
+    """
+    Singleton heap based deadline scheduler.
+
+    Callbacks run on the event loop when their deadline is due. A callback that returns a
+    coroutine is run as a task. Times are event loop times (``loop.time()``).
+    """
+
+    _instance: DeadlineScheduler | None = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, "_initialized"):
+            self._heap: list[tuple[float, int, Deadline]] = []
+            self._seq = 0
+            self._loop: asyncio.AbstractEventLoop | None = None
+            self._timer: asyncio.TimerHandle | None = None
+            self._timer_when: float | None = None
+            self._tasks: set[asyncio.Task] = set()
+            self._cancelled_in_heap = 0
+            # stats
+            self.scheduled = 0
+            self.fired = 0
+            self.cancelled = 0
+            self.wakeups = 0
+            self._initialized = True
+            self.lp = "DeadlineScheduler:"
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> Deadline:
+        """Run ``callback(*args)`` after ``delay`` seconds."""
+        loop = asyncio.get_running_loop()
+        return self.call_at(loop.time() + max(0.0, delay), callback, *args)
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> Deadline:
+        """Run ``callback(*args)`` at event loop time ``when``."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._bind(loop)
+        deadline = Deadline(self, when, callback, args)
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, deadline))
+        self.scheduled += 1
+        if self._timer_when is None or when < self._timer_when:
+            self._arm(when)
+        return deadline
+
+    @asynccontextmanager
+    async def timeout(self, delay: float) -> AsyncGenerator[Deadline]:
+        """Like ``asyncio.timeout()``, but the deadline lives on the shared heap."""
+        task = asyncio.current_task()
+        if task is None:
+            msg = "timeout() must be used inside a task"
+            raise RuntimeError(msg)
+        expired = False
+
+        def _expire():
+            nonlocal expired
+            expired = True
+            task.cancel()
+
+        deadline = self.call_later(delay, _expire)
+        try:
+            yield deadline
+        except asyncio.CancelledError:
+            if expired and task.uncancel() == 0:
+                raise TimeoutError from None
+            raise
+        finally:
+            deadline.cancel()
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap) - self._cancelled_in_heap
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": self.pending,
+            "scheduled": self.scheduled,
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "wakeups": self.wakeups,
+        }
+
+    def clear(self) -> None:
+        """Drop every pending deadline (server shutdown)."""
+        for _, _, deadline in self._heap:
+            deadline.cancelled = True
+        self._heap.clear()
+        self._cancelled_in_heap = 0
+        self._disarm()
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        # deadlines registered on a previous (closed) loop can never fire there
+        if self._heap:
+            logger.debug("%s Event loop changed, dropping %d deadline(s)", self.lp, self.pending)
+        self.clear()
+        self._loop = loop
+
+    def _arm(self, when: float) -> None:
+        self._disarm()
+        assert self._loop is not None
+        self._timer = self._loop.call_at(when, self._run_due)
+        self._timer_when = when
+
+    def _disarm(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_when = None
+
+    def _on_cancel(self, deadline: Deadline) -> None:
+        self.cancelled += 1
+        self._cancelled_in_heap += 1
+        if self._heap and self._heap[0][2] is deadline:
+            # the timer was armed for this one, re-arm for the next live deadline
+            self._pop_cancelled()
+            if self._heap:
+                self._arm(self._heap[0][0])
+            else:
+                self._disarm()
+        elif self._cancelled_in_heap > 64 and self._cancelled_in_heap > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_in_heap = 0
+
+    def _pop_cancelled(self) -> None:
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled_in_heap -= 1
+
+    def _run_due(self) -> None:
+        self._timer = None
+        self._timer_when = None
+        self.wakeups += 1
+        assert self._loop is not None
+        now = self._loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, deadline = heapq.heappop(self._heap)
+            if deadline.cancelled:
+                self._cancelled_in_heap -= 1
+                continue
+            deadline.fired = True
+            self.fired += 1
+            try:
+                result = deadline.callback(*deadline.args)
+            except Exception:
+                logger.exception("%s Deadline callback failed: %s", self.lp, deadline)
+                continue
+            if asyncio.iscoroutine(result):
+                task = self._loop.create_task(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._task_done)
+        self._pop_cancelled()
+        if self._heap:
+            self._arm(self._heap[0][0])
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("%s Deadline task failed: %r", self.lp, task.exception())
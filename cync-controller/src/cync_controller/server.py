@@ -2,21 +2,34 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import logging
 import ssl
 import time
+from collections.abc import Iterable
 from pathlib import Path as PathLib
 from typing import ClassVar
 
 import uvloop
 
+from cync_controller.admission import AdmissionController, abort_connection
+from cync_controller.bridge_health import PrimaryElector
 from cync_controller.const import *
 from cync_controller.correlation import ensure_correlation_id
 from cync_controller.devices import CyncDevice, CyncGroup, CyncTCPDevice
+from cync_controller.devices.packet_framer import PacketFramer
 from cync_controller.instrumentation import timed_async
-from cync_controller.logging_abstraction import get_logger
+from cync_controller.logging_abstraction import flush_log_sampling, get_logger, log_pipeline_stats
+from cync_controller.mesh_topology import MeshTopology
+from cync_controller.mqtt.commands import CommandProcessor
 from cync_controller.packet_checksum import calculate_checksum_between_markers
-from cync_controller.packet_parser import format_packet_log, parse_cync_packet
-from cync_controller.structs import DeviceStatus, GlobalObject
+from cync_controller.packet_parser import (
+    PACKET_TYPE_NAMES,
+    device_info_raw_states,
+    format_packet_log,
+    parse_cync_packet,
+)
+from cync_controller.scheduler import Deadline, DeadlineScheduler
+from cync_controller.structs import ALL_HEADERS, DeviceStatus, GlobalObject
 
 __all__ = [
     "NCyncServer",
@@ -25,11 +38,19 @@ logger = get_logger(__name__)
 g = GlobalObject()
 
 
+def _peer_ip(client_addr: str) -> str:
+    """IP part of an ``ip:port`` client address."""
+    return client_addr.rsplit(":", 1)[0]
+
+
 class CloudRelayConnection:
     """Manages a cloud relay connection for MITM mode.
     Acts as a proxy between Cync device and cloud, forwarding packets with inspection.
     """
 
+    # relayed chunks waiting for inspection per direction, chunks beyond that are not inspected
+    INSPECT_QUEUE_SIZE = 256
+
     def __init__(
         self,
         device_reader: asyncio.StreamReader,
@@ -52,8 +73,21 @@ class CloudRelayConnection:
         self.cloud_reader: asyncio.StreamReader | None = None
         self.cloud_writer: asyncio.StreamWriter | None = None
         self.device_endpoint: bytes | None = None
-        self.injection_task: asyncio.Task | None = None
+        self.injection_deadline: Deadline | None = None
         self.forward_tasks: list[asyncio.Task] = []
+        # each direction is its own packet stream, reads can split or coalesce packets
+        relay_headers = {*ALL_HEADERS, *PACKET_TYPE_NAMES}
+        self.framers: dict[str, PacketFramer] = {
+            "DEV->CLOUD": PacketFramer(headers=relay_headers),
+            "CLOUD->DEV": PacketFramer(headers=relay_headers),
+        }
+        # forwarding never waits for inspection: chunks are handed to a per-direction inspector task,
+        # (chunk, True) marks the first chunk after some were dropped on a full queue
+        self.inspect_queues: dict[str, asyncio.Queue[tuple[bytes, bool] | None]] = {
+            direction: asyncio.Queue(self.INSPECT_QUEUE_SIZE) for direction in self.framers
+        }
+        self._inspect_gap: dict[str, bool] = dict.fromkeys(self.framers, False)
+        self.inspect_dropped = 0
 
     @timed_async("cloud_connect")
     async def connect_to_cloud(self):
@@ -171,11 +205,9 @@ class CloudRelayConnection:
                 self.cloud_writer.write(first_packet)
                 await self.cloud_writer.drain()
 
-            # Parse and log first packet
-            if self.debug_logging:
-                parsed = parse_cync_packet(first_packet, "DEV->CLOUD")
-                if parsed:
-                    logger.debug("%s\n%s", "CloudRelay:", format_packet_log(parsed))
+            # Inspect first packet, it is the start of the device -> cloud stream
+            if first_packet:
+                self._queue_inspection(first_packet, "DEV->CLOUD")
 
             # Start bidirectional forwarding
             dev_to_cloud_task = asyncio.create_task(
@@ -194,7 +226,11 @@ class CloudRelayConnection:
                 self.forward_tasks.append(cloud_to_dev_task)
 
             # Start injection checker (debug feature)
-            self.injection_task = asyncio.create_task(self._check_injection_commands())
+            logger.debug(
+                "[DEBUG] Packet injection checker started",
+                extra={"client_addr": self.client_addr},
+            )
+            self.injection_deadline = DeadlineScheduler().call_later(1.0, self._check_injection_commands)
 
             # Wait for all tasks to complete
             await asyncio.gather(*self.forward_tasks, return_exceptions=True)
@@ -227,7 +263,8 @@ class CloudRelayConnection:
         dest_writer: asyncio.StreamWriter | None,
         direction: str,
     ):
-        """Forward packets while inspecting and logging"""
+        """Forward packets, a separate inspector task frames and parses them off the forwarding path"""
+        inspector = asyncio.create_task(self._run_inspector(direction), name=f"relay_inspect_{direction}")
         try:
             while True:
                 data = await source_reader.read(4096)
@@ -241,51 +278,14 @@ class CloudRelayConnection:
                     )
                     break
 
-                # Parse packet
-                parsed = parse_cync_packet(data, direction)
-
-                # Log if debug enabled (skip keepalives to reduce clutter)
-                if self.debug_logging and parsed and parsed.get("packet_type") != "0x78":  # Skip KEEPALIVE
-                    logger.debug(
-                        "Packet relay %s:\n%s",
-                        direction,
-                        format_packet_log(parsed),
-                        extra={
-                            "client_addr": self.client_addr,
-                            "direction": direction,
-                            "packet_type": parsed.get("packet_type"),
-                        },
-                    )
-
-                # Extract status updates for MQTT (for 0x43 DEVICE_INFO packets)
-                if parsed and "device_statuses" in parsed:
-                    for status in parsed["device_statuses"]:
-                        # Convert parsed status to raw_state format for existing parse_status
-                        raw_state = bytearray(8)
-                        raw_state[0] = status["device_id"]
-                        raw_state[1] = 1 if status["state"] == "ON" else 0
-                        raw_state[2] = status["brightness"]
-                        raw_state[3] = status.get("temp", 0) if status.get("mode") == "WHITE" else 254
-                        # RGB values (parse from hex color if present)
-                        if status.get("mode") == "RGB" and "color" in status:
-                            color_hex = status["color"].lstrip("#")
-                            raw_state[4] = int(color_hex[0:2], 16)  # R
-                            raw_state[5] = int(color_hex[2:4], 16)  # G
-                            raw_state[6] = int(color_hex[4:6], 16)  # B
-                        else:
-                            raw_state[4] = raw_state[5] = raw_state[6] = 0
-                        raw_state[7] = 1 if status["online"] else 0
-
-                        # Publish to MQTT using existing infrastructure
-                        if g.ncync_server:
-                            await g.ncync_server.parse_status(bytes(raw_state), from_pkt="0x43")
-
-                # Forward to destination (if cloud forwarding enabled)
+                # Forward the chunk as read (if cloud forwarding enabled), inspection happens on its own task
                 if dest_writer:
                     dest_writer.write(data)
                     await dest_writer.drain()
+                self._queue_inspection(data, direction)
 
         except asyncio.CancelledError:
+            inspector.cancel()
             logger.debug(
                 "Relay forward task cancelled",
                 extra={
@@ -314,93 +314,142 @@ class CloudRelayConnection:
                     "error_type": type(e).__name__,
                 },
             )
+        # the stream ended, let the inspector finish what was relayed
+        await self.inspect_queues[direction].put(None)
+        await inspector
+
+    def _queue_inspection(self, data: bytes, direction: str) -> None:
+        """Hand a relayed chunk to the inspector, dropped (and the framer resynced later) when it can't keep up."""
+        try:
+            self.inspect_queues[direction].put_nowait((data, self._inspect_gap[direction]))
+        except asyncio.QueueFull:
+            if not self._inspect_gap[direction]:
+                logger.debug(
+                    "Relay inspection queue full, not inspecting relayed data",
+                    extra={"client_addr": self.client_addr, "direction": direction},
+                )
+            self._inspect_gap[direction] = True
+            self.inspect_dropped += 1
+        else:
+            self._inspect_gap[direction] = False
+
+    async def _run_inspector(self, direction: str):
+        queue = self.inspect_queues[direction]
+        while (item := await queue.get()) is not None:
+            data, after_gap = item
+            if after_gap:
+                # the dropped chunks leave a partial packet in the framer
+                self.framers[direction].reset()
+            try:
+                await self._inspect(data, direction)
+            except Exception as e:
+                logger.exception(
+                    "Relay inspection error",
+                    extra={"client_addr": self.client_addr, "direction": direction, "error": str(e)},
+                )
+
+    async def _inspect(self, data: bytes, direction: str):
+        """Frame a relayed chunk and publish 0x43 statuses, full packet parsing only with debug logging on."""
+        framer = self.framers[direction]
+        framer.feed(data)
+        while (packet := framer.next_packet()) is not None:
+            pkt_type = packet[0]
+            # Log if debug enabled (skip keepalives to reduce clutter)
+            if self.debug_logging and pkt_type != 0x78:
+                parsed = parse_cync_packet(bytes(packet), direction)
+                if parsed:
+                    logger.debug(
+                        "Packet relay %s:\n%s",
+                        direction,
+                        format_packet_log(parsed),
+                        extra={
+                            "client_addr": self.client_addr,
+                            "direction": direction,
+                            "packet_type": parsed.get("packet_type"),
+                        },
+                    )
+
+            # Extract status updates for MQTT (for 0x43 DEVICE_INFO packets)
+            if pkt_type == 0x43 and g.ncync_server:
+                for raw_state in device_info_raw_states(packet):
+                    await g.ncync_server.parse_status(raw_state, from_pkt="0x43")
 
     async def _check_injection_commands(self):
-        """Periodically check for packet injection commands (debug feature)"""
+        """Check for packet injection commands, re-registering on the shared scheduler every second (debug feature)"""
         inject_file = "/tmp/cync_inject_command.txt"
         raw_inject_file = "/tmp/cync_inject_raw_bytes.txt"
 
-        logger.debug(
-            "[DEBUG] Packet injection checker started",
-            extra={"client_addr": self.client_addr},
-        )
-
         try:
-            while True:
-                await asyncio.sleep(1)
+            # Check for raw bytes injection
+            if PathLib(raw_inject_file).exists():
+                try:
+                    with PathLib(raw_inject_file).open() as f:
+                        raw_hex = f.read().strip()
+                    PathLib(raw_inject_file).unlink()
 
-                # Check for raw bytes injection
-                if PathLib(raw_inject_file).exists():
-                    try:
-                        with PathLib(raw_inject_file).open() as f:
-                            raw_hex = f.read().strip()
-                        PathLib(raw_inject_file).unlink()
+                    hex_bytes = raw_hex.replace(" ", "").replace("\n", "")
+                    packet = bytes.fromhex(hex_bytes)
+
+                    logger.info(
+                        "[DEBUG] Injecting raw packet",
+                        extra={
+                            "client_addr": self.client_addr,
+                            "packet_size": len(packet),
+                            "hex": " ".join(f"{b:02x}" for b in packet),
+                        },
+                    )
+
+                    self.device_writer.write(packet)
+                    await self.device_writer.drain()
 
-                        hex_bytes = raw_hex.replace(" ", "").replace("\n", "")
-                        packet = bytes.fromhex(hex_bytes)
+                    logger.debug("Raw injection complete")
+                except Exception as e:
+                    logger.exception(
+                        " Error injecting raw bytes",
+                        extra={"client_addr": self.client_addr, "error": str(e)},
+                    )
+
+            # Check for mode injection (for switches)
+            if PathLib(inject_file).exists():
+                try:
+                    with PathLib(inject_file).open() as f:
+                        mode = f.read().strip().lower()
+                    PathLib(inject_file).unlink()
 
+                    if mode in ["smart", "traditional"] and self.device_endpoint:
                         logger.info(
-                            "[DEBUG] Injecting raw packet",
+                            "[DEBUG] Injecting mode packet",
                             extra={
                                 "client_addr": self.client_addr,
-                                "packet_size": len(packet),
-                                "hex": " ".join(f"{b:02x}" for b in packet),
+                                "mode": mode.upper(),
                             },
                         )
 
+                        # Craft mode packet (similar to MITM)
+                        mode_byte = 0x02 if mode == "smart" else 0x01
+                        counter = 0x10  # Fixed counter for injection
+
+                        packet = self._craft_mode_packet(self.device_endpoint, counter, mode_byte)
+
                         self.device_writer.write(packet)
                         await self.device_writer.drain()
 
-                        logger.debug("Raw injection complete")
-                    except Exception as e:
-                        logger.exception(
-                            " Error injecting raw bytes",
-                            extra={"client_addr": self.client_addr, "error": str(e)},
-                        )
-
-                # Check for mode injection (for switches)
-                if PathLib(inject_file).exists():
-                    try:
-                        with PathLib(inject_file).open() as f:
-                            mode = f.read().strip().lower()
-                        PathLib(inject_file).unlink()
-
-                        if mode in ["smart", "traditional"] and self.device_endpoint:
-                            logger.info(
-                                "[DEBUG] Injecting mode packet",
-                                extra={
-                                    "client_addr": self.client_addr,
-                                    "mode": mode.upper(),
-                                },
-                            )
-
-                            # Craft mode packet (similar to MITM)
-                            mode_byte = 0x02 if mode == "smart" else 0x01
-                            counter = 0x10  # Fixed counter for injection
-
-                            packet = self._craft_mode_packet(self.device_endpoint, counter, mode_byte)
-
-                            self.device_writer.write(packet)
-                            await self.device_writer.drain()
-
-                            logger.debug("Mode injection complete")
-                    except Exception as e:
-                        logger.exception(
-                            " Error injecting mode packet",
-                            extra={"client_addr": self.client_addr, "error": str(e)},
-                        )
+                        logger.debug("Mode injection complete")
+                except Exception as e:
+                    logger.exception(
+                        " Error injecting mode packet",
+                        extra={"client_addr": self.client_addr, "error": str(e)},
+                    )
 
-        except asyncio.CancelledError:
-            logger.debug(
-                "[DEBUG] Injection checker cancelled",
-                extra={"client_addr": self.client_addr},
-            )
-            raise
         except Exception as e:
             logger.exception(
                 " Injection checker error",
                 extra={"client_addr": self.client_addr, "error": str(e)},
             )
+        finally:
+            # close() cancels the pending deadline; don't re-register after that
+            if self.injection_deadline is not None and not self.injection_deadline.cancelled:
+                self.injection_deadline = DeadlineScheduler().call_later(1.0, self._check_injection_commands)
 
     def _craft_mode_packet(self, endpoint: bytes, counter: int, mode_byte: int) -> bytes:
         """Craft a mode query/command packet"""
@@ -458,11 +507,10 @@ class CloudRelayConnection:
             extra={"client_addr": self.client_addr},
         )
 
-        # Cancel injection task
-        if self.injection_task and not self.injection_task.done():
-            self.injection_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self.injection_task
+        # Stop injection checks
+        if self.injection_deadline is not None:
+            self.injection_deadline.cancel()
+            self.injection_deadline = None
 
         # Cancel forwarding tasks
         for task in self.forward_tasks:
@@ -470,6 +518,8 @@ class CloudRelayConnection:
                 task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
                     await task
+        for framer in self.framers.values():
+            framer.reset()
 
         # Close cloud connection
         if self.cloud_writer:
@@ -529,8 +579,15 @@ class NCyncServer:
         # The instance assignment is for compatibility but should use class access
         type(self).devices = devices  # type: ignore[assignment]
         type(self).groups = groups if groups is not None else {}  # type: ignore[assignment]
-        self.tcp_conn_attempts: dict = {}
+        self.device_subgroups: dict[int, list[CyncGroup]] = {}
+        self.rebuild_subgroup_index()
+        # decides which new TCP connections are accepted, rejected sockets are closed right away
+        self.admission = AdmissionController()
+        # the primary bridge processes status packets, it is re-elected from bridge health scores
         self.primary_tcp_device: CyncTCPDevice | None = None
+        self.bridge_elector = PrimaryElector()
+        # device ID -> bridges that reach it, from mesh info reports and command ACKs
+        self.mesh_topology = MeshTopology()
         self.ssl_context: ssl.SSLContext | None = None
         self.host = CYNC_SRV_HOST
         self.port = CYNC_PORT
@@ -538,6 +595,8 @@ class NCyncServer:
         self.cert_file = g.env.cync_srv_ssl_cert
         self.key_file = g.env.cync_srv_ssl_key
         self.loop: asyncio.AbstractEventLoop | uvloop.Loop = asyncio.get_event_loop()
+        # ACK expiry, command timeouts and relay polling all register deadlines here
+        self.scheduler = DeadlineScheduler()
 
         # Cloud relay configuration
         self.cloud_relay_enabled = g.env.cync_cloud_relay_enabled
@@ -584,16 +643,13 @@ class NCyncServer:
         if isinstance(device, CyncTCPDevice) and device.address:
             dev = self.tcp_devices.pop(device.address, None)
             if dev is not None:
-                # If this was the primary listener, failover to another device
+                # If this was the primary listener, failover to the healthiest remaining bridge
                 if self.primary_tcp_device == dev:
-                    self.primary_tcp_device = next(iter(self.tcp_devices.values()), None) if self.tcp_devices else None
-                    if self.primary_tcp_device:
-                        logger.info(
-                            "Primary TCP listener failover",
-                            extra={"new_primary": self.primary_tcp_device.address},
-                        )
+                    self.elect_primary()
 
+                self.mesh_topology.remove_bridge(dev.address)
                 uptime = time.time() - dev.connected_at
+                self.admission.disconnected(_peer_ip(dev.address), uptime)
                 logger.info(
                     "Bridge device disconnected",
                     extra={
@@ -646,6 +702,50 @@ class NCyncServer:
                 str(len(self.tcp_devices)).encode(),
             )
 
+    def elect_primary(self) -> CyncTCPDevice | None:
+        """
+        Re-elect the primary bridge from the bridge health scores.
+
+        Called on every bridge heartbeat, so a stalled primary is replaced within one heartbeat
+        of another bridge. A healthy primary is only replaced by a clearly better bridge.
+        """
+        previous = self.primary_tcp_device
+        primary, reason = self.bridge_elector.elect(previous, self.tcp_devices.values())
+        if reason is None:
+            return previous
+        self.primary_tcp_device = primary
+        if primary is not None:
+            logger.info(
+                "Primary TCP listener failover",
+                extra={
+                    "reason": reason,
+                    "previous_primary": previous.address if previous is not None else None,
+                    "new_primary": primary.address,
+                    "scores": self.bridge_elector.scores(self.tcp_devices.values()),
+                },
+            )
+        return primary
+
+    def rebuild_subgroup_index(self) -> None:
+        """Map each device ID to the subgroups it is a member of. Call after the groups config changes."""
+        index: dict[int, list[CyncGroup]] = {}
+        for group in self.groups.values():
+            if not group.is_subgroup:
+                continue
+            group.reset_member_aggregation()
+            for member_id in group.member_ids:
+                index.setdefault(member_id, []).append(group)
+        self.device_subgroups = index
+        for device in self.devices.values():
+            device.subgroups = index.get(device.id, [])
+        logger.debug(
+            "Subgroup index built",
+            extra={
+                "indexed_devices": len(index),
+                "subgroups": sum(1 for grp in self.groups.values() if grp.is_subgroup),
+            },
+        )
+
     async def create_ssl_context(self):
         # Allow the server to use a self-signed certificate
         ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
@@ -698,21 +798,116 @@ class NCyncServer:
 
     async def parse_status(self, raw_state: bytes, from_pkt: str | None = None):
         """Extracted status packet parsing, handles mqtt publishing and device/group state changes."""
-        _id = raw_state[0]
+        device, group, went_offline = self._apply_status(raw_state, from_pkt)
+
+        if went_offline is not None:
+            # no state to publish for the device itself, but its subgroups lost a member
+            await self._publish_member_subgroups(went_offline, from_pkt)
+        elif device is not None:
+            # Always hand status updates to the MQTT client - unchanged states and bursts are
+            # filtered per device right before publishing (see StateUpdateHelper.publish_cache)
+            if g.mqtt_client and device.id is not None:
+                await g.mqtt_client.parse_device_status(device.id, device.status, from_pkt=from_pkt)
+            if g.ncync_server and device.id is not None:
+                g.ncync_server.devices[device.id] = device
+                await self._publish_member_subgroups(device, from_pkt)
+
+        elif group is not None:
+            if g.mqtt_client:
+                await g.mqtt_client.publish_group_state(*self._group_update(group, from_pkt))
+            if g.ncync_server:
+                g.ncync_server.groups[group.id] = group
+
+    async def _publish_member_subgroups(self, device: CyncDevice, from_pkt: str | None) -> None:
+        """Re-aggregate and publish the subgroups that contain ``device`` (subgroups don't report their own state in mesh)"""
+        if not g.ncync_server or device.id is None:
+            return
+        for subgroup in g.ncync_server.device_subgroups.get(device.id, ()):
+            if self._aggregate_subgroup(subgroup, (device,), from_pkt):
+                # Publish subgroup state (only when aggregation succeeded)
+                if g.mqtt_client:
+                    await g.mqtt_client.publish_group_state(*self._subgroup_update(subgroup, from_pkt))
+                g.ncync_server.groups[subgroup.id] = subgroup
+
+    async def parse_status_batch(self, records: Iterable[bytes], from_pkt: str | None = None):
+        """
+        Apply a whole status snapshot (mesh info) in one pass and publish it as one batch.
+
+        All records are applied first, then every subgroup with an updated member is aggregated once
+        and the device and group states go out through one MQTT publish batch each. A device reported
+        more than once is published with its last state.
+        """
+        if not g.ncync_server:
+            logger.error("ncync_server is None, cannot process device status")
+            return
+        devices: dict[int, CyncDevice] = {}
+        went_offline: dict[int, CyncDevice] = {}
+        group_updates: dict[int, tuple] = {}
+        n_records = 0
+        for raw_state in records:
+            n_records += 1
+            device, group, offline_device = self._apply_status(raw_state, from_pkt)
+            if offline_device is not None and offline_device.id is not None:
+                went_offline[offline_device.id] = offline_device
+            elif device is not None and device.id is not None:
+                devices[device.id] = device
+            elif group is not None:
+                group_updates[group.id] = self._group_update(group, from_pkt)
+
+        # subgroups don't report their own state in mesh, aggregate each one once from its updated members
+        affected: dict[int, tuple[CyncGroup, list[CyncDevice]]] = {}
+        for device in (*devices.values(), *went_offline.values()):
+            for subgroup in g.ncync_server.device_subgroups.get(device.id, ()):
+                affected.setdefault(subgroup.id, (subgroup, []))[1].append(device)
+        for subgroup, members in affected.values():
+            if self._aggregate_subgroup(subgroup, members, from_pkt):
+                group_updates[subgroup.id] = self._subgroup_update(subgroup, from_pkt)
 
-        # Log every parse_status call
-        ts_ms = int(time.time() * 1000)
-        state_val = raw_state[1] if len(raw_state) > 1 else 0
         logger.debug(
-            "[PARSE_STATUS_ENTRY] ts=%dms id=%s state=%s from_pkt=%s",
-            ts_ms,
-            _id,
-            "ON" if state_val else "OFF",
-            from_pkt,
+            "Status batch applied",
+            extra={
+                "records": n_records,
+                "devices": len(devices),
+                "groups": len(group_updates),
+                "subgroups_aggregated": len(affected),
+                "from_pkt": from_pkt,
+            },
         )
+        if g.mqtt_client:
+            if devices:
+                await g.mqtt_client.parse_device_statuses(
+                    [(device_id, device.status) for device_id, device in devices.items()], from_pkt=from_pkt
+                )
+            if group_updates:
+                await g.mqtt_client.publish_group_states(list(group_updates.values()))
+
+    def _apply_status(
+        self, raw_state: bytes, from_pkt: str | None = None
+    ) -> tuple[CyncDevice | None, CyncGroup | None, CyncDevice | None]:
+        """
+        Apply one status record to its device or group.
+
+        Returns ``(device, None, None)`` or ``(None, group, None)`` when there is an online state to
+        publish, ``(None, None, device)`` when this report marked the device offline (its subgroups need
+        re-aggregating) and ``(None, None, None)`` otherwise (unknown ID, other offline reports).
+        """
+        _id = raw_state[0]
+        debug_enabled = logger.is_enabled_for(logging.DEBUG)
+
+        # Log every parse_status call
+        if debug_enabled:
+            state_val = raw_state[1] if len(raw_state) > 1 else 0
+            logger.debug(
+                "[PARSE_STATUS_ENTRY] ts=%dms id=%s state=%s from_pkt=%s",
+                int(time.time() * 1000),
+                _id,
+                "ON" if state_val else "OFF",
+                from_pkt,
+                category="packet",
+            )
 
         # Debug: log every parse_status call for device 103
-        if _id == 103:
+        if debug_enabled and _id == 103:
             logger.debug(
                 "parse_status called for device 103",
                 extra={
@@ -725,7 +920,7 @@ class NCyncServer:
         # Check if this is a device or a group
         if not g.ncync_server:
             logger.error("ncync_server is None, cannot process device status")
-            return
+            return None, None, None
         device = g.ncync_server.devices.get(_id)
         group = g.ncync_server.groups.get(_id) if device is None else None
 
@@ -737,7 +932,7 @@ class NCyncServer:
                     "note": "Check config file or re-export Cync account devices",
                 },
             )
-            return
+            return None, None, None
 
         # Parse status data (same format for devices and groups)
         state = raw_state[1]
@@ -755,7 +950,7 @@ class NCyncServer:
         # Handle device
         if device is not None:
             # Debug logging for device 103 specifically
-            if _id == 103:
+            if debug_enabled and _id == 103:
                 logger.debug(
                     "Device 103 details",
                     extra={
@@ -768,7 +963,7 @@ class NCyncServer:
                     },
                 )
             # Log brightness for fan devices to debug preset mode mapping
-            if device.is_fan_controller:
+            if debug_enabled and device.is_fan_controller:
                 logger.debug(
                     "Fan controller raw brightness",
                     extra={
@@ -784,16 +979,17 @@ class NCyncServer:
                 # Increment counter and only mark offline after 3 consecutive offline reports
                 # to avoid false positives from unreliable mesh info packets
                 device.offline_count += 1
-                logger.debug(
-                    "[OFFLINE_TRACKING] Device reported offline - incrementing counter",
-                    extra={
-                        "device_id": _id,
-                        "device_name": device.name,
-                        "offline_count": device.offline_count,
-                        "is_currently_online": device.online,
-                        "threshold": 3,
-                    },
-                )
+                if debug_enabled:
+                    logger.debug(
+                        "[OFFLINE_TRACKING] Device reported offline - incrementing counter",
+                        extra={
+                            "device_id": _id,
+                            "device_name": device.name,
+                            "offline_count": device.offline_count,
+                            "is_currently_online": device.online,
+                            "threshold": 3,
+                        },
+                    )
                 if device.offline_count >= 3 and device.online:
                     device.online = False
                     logger.warning(
@@ -804,6 +1000,7 @@ class NCyncServer:
                             "offline_count": device.offline_count,
                         },
                     )
+                    return None, None, device
             else:
                 # Device is online, reset the offline counter
                 if device.offline_count > 0 or not device.online:
@@ -836,7 +1033,7 @@ class NCyncServer:
                     device.blue = b
 
                 # Now create status object with the UPDATED device state for publishing
-                device.status = new_state = DeviceStatus(
+                device.status = DeviceStatus(
                     state=device.state,
                     brightness=device.brightness,
                     temperature=device.temperature,
@@ -844,58 +1041,7 @@ class NCyncServer:
                     green=device.green,
                     blue=device.blue,
                 )
-
-                # Always publish status updates - don't try to detect "no changes"
-                # This prevents status updates from being dropped unnecessarily
-                if g.mqtt_client and device.id is not None:
-                    await g.mqtt_client.parse_device_status(device.id, new_state, from_pkt=from_pkt)
-                if g.ncync_server and device.id is not None:
-                    g.ncync_server.devices[device.id] = device
-
-                    # Update subgroups that contain this device (since subgroups don't report their own state in mesh)
-                    for subgroup in g.ncync_server.groups.values():
-                        if subgroup.is_subgroup and device.id in subgroup.member_ids:
-                            aggregated = subgroup.aggregate_member_states()
-                            if aggregated:
-                                # Update subgroup state from aggregated member states
-                                subgroup.state = aggregated["state"]
-                                subgroup.brightness = aggregated["brightness"]
-                                subgroup.temperature = aggregated["temperature"]
-                                subgroup.online = aggregated["online"]
-
-                                # Create status object for the subgroup
-                                subgroup.status = DeviceStatus(
-                                    state=subgroup.state,
-                                    brightness=subgroup.brightness,
-                                    temperature=subgroup.temperature,
-                                    red=subgroup.red,
-                                    green=subgroup.green,
-                                    blue=subgroup.blue,
-                                )
-
-                                # Publish subgroup state (only when aggregation succeeded)
-                                logger.debug(
-                                    "Subgroup state aggregated from member",
-                                    extra={
-                                        "subgroup_name": subgroup.name,
-                                        "subgroup_id": subgroup.id,
-                                        "member_device_id": device.id,
-                                        "state": "ON" if subgroup.state else "OFF",
-                                        "brightness": subgroup.brightness,
-                                        "from_pkt": from_pkt,
-                                        "timestamp": time.time(),
-                                    },
-                                )
-                                if g.mqtt_client:
-                                    await g.mqtt_client.publish_group_state(
-                                        subgroup,
-                                        state=subgroup.state,
-                                        brightness=subgroup.brightness,
-                                        temperature=subgroup.temperature,
-                                        origin=f"aggregated:{from_pkt or 'mesh'}",
-                                    )
-                                if g.ncync_server:
-                                    g.ncync_server.groups[subgroup.id] = subgroup
+                return device, None, None
 
         # Handle group
         elif group is not None:
@@ -916,7 +1062,7 @@ class NCyncServer:
                     group.blue = b
 
                 # Create status object for the group
-                group.status = new_state = DeviceStatus(
+                group.status = DeviceStatus(
                     state=group.state,
                     brightness=group.brightness,
                     temperature=group.temperature,
@@ -926,26 +1072,78 @@ class NCyncServer:
                 )
 
                 # Publish group state to MQTT
-                logger.debug(
-                    "Group state update from mesh",
-                    extra={
-                        "group_id": _id,
-                        "group_name": group.name,
-                        "state": "ON" if state else "OFF",
-                        "brightness": brightness,
-                        "from_pkt": from_pkt,
-                    },
-                )
-                if g.mqtt_client:
-                    await g.mqtt_client.publish_group_state(
-                        group,
-                        state=state,
-                        brightness=brightness,
-                        temperature=temp if not rgb_data else None,
-                        origin=from_pkt or "mesh",
+                if debug_enabled:
+                    logger.debug(
+                        "Group state update from mesh",
+                        extra={
+                            "group_id": _id,
+                            "group_name": group.name,
+                            "state": "ON" if state else "OFF",
+                            "brightness": brightness,
+                            "from_pkt": from_pkt,
+                        },
                     )
-                if g.ncync_server:
-                    g.ncync_server.groups[group.id] = group
+                return None, group, None
+        return None, None, None
+
+    def _aggregate_subgroup(self, subgroup: CyncGroup, changed_members, from_pkt: str | None) -> bool:
+        """Re-aggregate a subgroup from its changed members, returns False if it has no online members."""
+        aggregated = None
+        for member in changed_members:
+            aggregated = subgroup.aggregate_member_states(member)
+        if not aggregated:
+            return False
+        # Update subgroup state from aggregated member states
+        subgroup.state = aggregated["state"]
+        subgroup.brightness = aggregated["brightness"]
+        subgroup.temperature = aggregated["temperature"]
+        subgroup.online = aggregated["online"]
+
+        # Create status object for the subgroup
+        subgroup.status = DeviceStatus(
+            state=subgroup.state,
+            brightness=subgroup.brightness,
+            temperature=subgroup.temperature,
+            red=subgroup.red,
+            green=subgroup.green,
+            blue=subgroup.blue,
+        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Subgroup state aggregated from member",
+                extra={
+                    "subgroup_name": subgroup.name,
+                    "subgroup_id": subgroup.id,
+                    "member_device_id": member.id,
+                    "state": "ON" if subgroup.state else "OFF",
+                    "brightness": subgroup.brightness,
+                    "from_pkt": from_pkt,
+                    "timestamp": time.time(),
+                },
+            )
+        return True
+
+    @staticmethod
+    def _subgroup_update(subgroup: CyncGroup, from_pkt: str | None) -> tuple:
+        """publish_group_state() arguments for an aggregated subgroup"""
+        return (
+            subgroup,
+            subgroup.state,
+            subgroup.brightness,
+            subgroup.temperature,
+            f"aggregated:{from_pkt or 'mesh'}",
+        )
+
+    @staticmethod
+    def _group_update(group: CyncGroup, from_pkt: str | None) -> tuple:
+        """publish_group_state() arguments for a group that reported its own state, no temp in RGB mode"""
+        return (
+            group,
+            group.state,
+            group.brightness,
+            group.temperature if group.temperature <= 100 else None,
+            from_pkt or "mesh",
+        )
 
     async def periodic_status_refresh(self):
         """Periodic sanity check to refresh device status and ensure sync with actual device state."""
@@ -1012,6 +1210,34 @@ class NCyncServer:
                         "ready_to_control": len(ready_connections),
                     },
                 )
+                for dev in ready_connections:
+                    logger.info("Control msg stats for %s", dev.address, extra=dev.messages.control.stats())
+                logger.info("Deadline scheduler stats", extra=self.scheduler.stats())
+                logger.info("Connection admission stats", extra=self.admission.stats())
+                self.elect_primary()
+                logger.info(
+                    "Bridge health",
+                    extra={
+                        "primary": self.primary_tcp_device.address if self.primary_tcp_device else None,
+                        "scores": self.bridge_elector.scores(self.tcp_devices.values()),
+                        **self.bridge_elector.stats(),
+                    },
+                )
+                logger.info("Mesh topology", extra=self.mesh_topology.stats())
+                log_stats = log_pipeline_stats()
+                if log_stats:
+                    logger.info("Log pipeline stats", extra=log_stats)
+                flush_log_sampling()
+                if g.mqtt_client:
+                    logger.info(
+                        "MQTT state publish stats",
+                        extra=g.mqtt_client.state_updates.publish_cache.stats(),
+                    )
+                    processor = CommandProcessor()
+                    logger.info("Command lane stats", extra=processor.stats())
+                    for lane, lane_stats in processor.lane_stats().items():
+                        if lane_stats["depth"]:
+                            logger.info("Command lane %s backlog", lane, extra=lane_stats)
 
             except asyncio.CancelledError:
                 logger.info("Pool monitoring task cancelled")
@@ -1080,40 +1306,40 @@ class NCyncServer:
                 logger.exception(" Server exception", extra={"error": str(e)})
 
     async def stop(self):
+        started = time.perf_counter()
+        timings: dict[str, float | int] = {}
         try:
             self.shutting_down = True
-            device: CyncTCPDevice
             devices = [d for d in self.tcp_devices.values() if d is not None]
 
+            # stop accepting first, so no bridge connects while the others are being closed
+            serving = self._server is not None and self._server.is_serving()
+            if serving:
+                logger.debug("Closing TCP server...")
+                self._server.close()
+
+            stage_started = time.perf_counter()
             if devices:
                 logger.info(
                     " Shutting down server, closing device connections",
                     extra={"device_count": len(devices)},
                 )
-                for device in devices:
-                    try:
-                        await device.close()
-                        logger.debug(
-                            " Device connection closed",
-                            extra={"address": device.address if device.address else "unknown"},
-                        )
-                    except asyncio.CancelledError as ce:
-                        logger.debug("Device close cancelled", extra={"reason": str(ce)})
-                        # propagate the cancellation
-                        raise
-                    except Exception as e:
-                        logger.exception(
-                            " Error closing device connection",
-                            extra={"address": device.address, "error": str(e)},
-                        )
+                closed, aborted = await self._close_bridges(devices, CYNC_SHUTDOWN_TIMEOUT)
+                timings.update(bridges=len(devices), bridges_closed=closed, bridges_aborted=aborted)
             else:
                 logger.info("No devices connected during shutdown")
+            timings["close_bridges_ms"] = round((time.perf_counter() - stage_started) * 1000, 1)
 
             if self._server:
-                if self._server.is_serving():
-                    logger.debug("Closing TCP server...")
-                    self._server.close()
-                    await self._server.wait_closed()
+                if serving:
+                    stage_started = time.perf_counter()
+                    # whatever is left of the shutdown budget
+                    remaining = max(0.1, CYNC_SHUTDOWN_TIMEOUT - (stage_started - started))
+                    try:
+                        await asyncio.wait_for(self._server.wait_closed(), remaining)
+                    except TimeoutError:
+                        logger.warning(" TCP server did not finish closing in time", extra={"timeout_s": remaining})
+                    timings["server_close_ms"] = round((time.perf_counter() - stage_started) * 1000, 1)
 
                     # Publish server stopped status
                     if g.mqtt_client:
@@ -1132,7 +1358,8 @@ class NCyncServer:
         except Exception as e:
             logger.exception(" Error during server shutdown", extra={"error": str(e)})
         else:
-            logger.info(" Server stopped successfully")
+            timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(" Server stopped successfully", extra=timings)
         finally:
             if self.start_task and not self.start_task.done():
                 logger.debug("Cancelling start task")
@@ -1144,6 +1371,48 @@ class NCyncServer:
                 logger.debug("Cancelling pool monitor task")
                 self.pool_monitor_task.cancel()
 
+    async def _close_bridges(self, devices: list[CyncTCPDevice], timeout: float) -> tuple[int, int]:
+        """
+        Close all bridge connections concurrently, ``timeout`` seconds in total.
+
+        A bridge whose close has not finished by then (dead peer, stuck drain) has it cancelled and
+        its transport aborted. Returns ``(closed, aborted)``.
+        """
+        tasks = {asyncio.create_task(device.close(), name=f"close-{device.address}"): device for device in devices}
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+        except asyncio.CancelledError as ce:
+            logger.debug("Device close cancelled", extra={"reason": str(ce)})
+            for task in tasks:
+                task.cancel()
+            # propagate the cancellation
+            raise
+        for task in done:
+            exc = task.exception() if not task.cancelled() else None
+            if exc is not None:
+                device = tasks[task]
+                logger.error(
+                    " Error closing device connection",
+                    extra={"address": device.address, "error": str(exc)},
+                    exc_info=exc,
+                )
+        for task in pending:
+            device = tasks[task]
+            task.cancel()
+            abort_connection(device.writer)
+            logger.warning(
+                " Device connection did not close in time, aborted",
+                extra={"address": device.address, "timeout_s": timeout},
+            )
+        if pending:
+            # let the cancelled closes unwind, their sockets are already gone
+            await asyncio.wait(pending, timeout=1)
+            for task in pending:
+                device = tasks[task]
+                device.reader = None
+                device.writer = None
+        return len(done), len(pending)
+
     async def _register_new_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         ensure_correlation_id()
         peername = writer.get_extra_info("peername")
@@ -1151,13 +1420,6 @@ class NCyncServer:
         client_port: int = peername[1]
         client_addr: str = f"{client_ip}:{client_port}"  # Use IP:port to allow multiple connections from same IP
 
-        if client_addr in self.tcp_conn_attempts:
-            self.tcp_conn_attempts[client_addr] += 1
-        else:
-            self.tcp_conn_attempts[client_addr] = 1
-
-        connection_attempt = self.tcp_conn_attempts[client_addr]
-
         # Branch based on relay mode
         if self.cloud_relay_enabled:
             # Cloud relay mode - use CloudRelayConnection
@@ -1171,7 +1433,6 @@ class NCyncServer:
                 " New connection (RELAY mode)",
                 extra={
                     "client_addr": client_addr,
-                    "connection_attempt": connection_attempt,
                     "mode": "cloud_relay",
                 },
             )
@@ -1200,6 +1461,21 @@ class NCyncServer:
                 )
         else:
             # Normal LAN-only mode - use CyncTCPDevice
+            # Admission only guards the bridge slots (CYNC_MAX_TCP_CONN), relay connections are proxied
+            # to the cloud and never take one
+            reject_reason = self.admission.admit(client_ip, len(self.tcp_devices), self.shutting_down)
+            connection_attempt = self.admission.attempts(client_ip)
+            if reject_reason is not None:
+                logger.debug(
+                    "Connection rejected",
+                    extra={
+                        "client_addr": client_addr,
+                        "reason": reject_reason,
+                        "connection_attempt": connection_attempt,
+                    },
+                )
+                abort_connection(writer)
+                return
             logger.info(
                 " New connection (LAN mode)",
                 extra={
@@ -1222,13 +1498,12 @@ class NCyncServer:
 
             try:
                 new_device = CyncTCPDevice(reader, writer, client_addr)
-                # will sleep devices that cant connect to prevent connection flooding
                 can_connect = await new_device.can_connect()
                 if can_connect:
                     await self.add_tcp_device(new_device)
                 else:
                     logger.debug(
-                        "Device connection rejected by rate limiting",
+                        "Device connection rejected",
                         extra={"client_addr": client_addr},
                     )
                     del new_device
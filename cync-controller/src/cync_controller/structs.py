@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import heapq
 import logging
 import os
 import time
 from argparse import Namespace
-from collections.abc import Coroutine
+from collections.abc import Callable, Coroutine
 from enum import StrEnum
 from typing import TYPE_CHECKING, ClassVar
 from uuid import UUID
@@ -122,10 +123,9 @@ class GlobalObject:
 class Tasks:
     receive: asyncio.Task | None = None
     send: asyncio.Task | None = None
-    callback_cleanup: asyncio.Task | None = None
 
     def __iter__(self):
-        return iter([self.receive, self.send, self.callback_cleanup])
+        return iter([self.receive, self.send])
 
 
 class ControlMessageCallback:
@@ -185,11 +185,109 @@ class ControlMessageCallback:
         return None
 
 
+class PendingControlMessages(dict[int, ControlMessageCallback]):
+    """
+    Control messages waiting for an ACK, keyed by the 1 byte control message ID on the wire.
+
+    Every entry gets a deadline on a min-heap when it is registered, so expiring stale entries
+    only touches the ones that are due instead of scanning the whole table. Heap entries for
+    messages that were ACKed (or replaced) are skipped lazily when they come up.
+    ``on_new_deadline`` is called with the wall clock deadline whenever a new entry becomes the
+    earliest one, so the owner can (re)arm a timer for it.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        super().__init__()
+        self.timeout = timeout
+        self.on_new_deadline: Callable[[float], None] | None = None
+        self._deadlines: list[tuple[float, int, int, ControlMessageCallback]] = []
+        self._seq = 0
+        # stats
+        self.acked = 0
+        self.stale_acks = 0
+        self.expired = 0
+        self.ids_skipped = 0
+        self.id_wraps = 0
+
+    def __setitem__(self, msg_id: int, msg: ControlMessageCallback) -> None:
+        super().__setitem__(msg_id, msg)
+        sent_at = msg.sent_at if msg.sent_at is not None else time.time()
+        self._seq += 1
+        entry = (sent_at + self.timeout, self._seq, msg_id, msg)
+        heapq.heappush(self._deadlines, entry)
+        if len(self._deadlines) > 4 * len(self) + 64:
+            self._compact()
+        if self.on_new_deadline is not None and self._deadlines[0] is entry:
+            self.on_new_deadline(entry[0])
+
+    @property
+    def in_flight(self) -> int:
+        return len(self)
+
+    def ack(self, msg_id: int) -> ControlMessageCallback | None:
+        """Pop the pending message for an ACK, counting ACKs that arrive for unknown / expired IDs as stale."""
+        msg = self.pop(msg_id, None)
+        if msg is None:
+            self.stale_acks += 1
+        else:
+            self.acked += 1
+        return msg
+
+    def next_deadline(self) -> float | None:
+        """Wall clock time the next pending message expires, or None if nothing is pending."""
+        while self._deadlines:
+            _, _, msg_id, msg = self._deadlines[0]
+            if self.get(msg_id) is msg:
+                return self._deadlines[0][0]
+            heapq.heappop(self._deadlines)
+        return None
+
+    def expire(self, now: float | None = None) -> list[ControlMessageCallback]:
+        """Remove and return every pending message whose deadline has passed."""
+        if now is None:
+            now = time.time()
+        expired = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, msg_id, msg = heapq.heappop(self._deadlines)
+            if self.get(msg_id) is msg:
+                del self[msg_id]
+                expired.append(msg)
+        self.expired += len(expired)
+        return expired
+
+    def give_up(self, msg_id: int) -> ControlMessageCallback | None:
+        """Remove a pending message whose sender stopped waiting for the ACK, counted as expired."""
+        msg = self.pop(msg_id, None)
+        if msg is not None:
+            self.expired += 1
+        return msg
+
+    def oldest(self) -> int | None:
+        """ID of the pending message that has waited the longest."""
+        if self.next_deadline() is None:
+            return None
+        return self._deadlines[0][2]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self),
+            "acked": self.acked,
+            "stale_acks": self.stale_acks,
+            "expired": self.expired,
+            "ids_skipped": self.ids_skipped,
+            "id_wraps": self.id_wraps,
+        }
+
+    def _compact(self) -> None:
+        self._deadlines = [entry for entry in self._deadlines if self.get(entry[2]) is entry[3]]
+        heapq.heapify(self._deadlines)
+
+
 class Messages:
-    control: dict[int, ControlMessageCallback]
+    control: PendingControlMessages
 
     def __init__(self):
-        self.control = {}
+        self.control = PendingControlMessages()
 
 
 @dataclass
@@ -88,7 +88,7 @@ def signal_handler(signum):
         loop.create_task(_async_signal_cleanup())
 
 
-def bytes2list(byte_string: bytes) -> list[int]:
+def bytes2list(byte_string: bytes | memoryview) -> list[int]:
     """Convert a byte string to a list of integers"""
     # Interpret the byte string as a sequence of unsigned integers (little-endian)
     int_list = struct.unpack("<" + "B" * (len(byte_string)), byte_string)
@@ -111,7 +111,7 @@ def ints2bytes(ints: list[int]) -> bytes:
     return bytes(ints)
 
 
-def parse_unbound_firmware_version(data_struct: bytes, lp: str) -> tuple[str, int, str] | None:
+def parse_unbound_firmware_version(data_struct: bytes | memoryview, lp: str) -> tuple[str, int, str] | None:
     """Parse the firmware version from binary hex data. Unbound means not bound by 0x7E boundaries"""
     # LED controller sends this data after cync app connects via BTLE
     # 1f 00 00 00 fa 8e 14 00 50 22 33 08 00 ff ff ea 11 02 08 a1 [01 03 01 00 00 00 00 00 f8
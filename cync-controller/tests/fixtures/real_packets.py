@@ -0,0 +1,53 @@
+"""
+Real device-to-server packet captures used for framing and parsing tests.
+
+Captured from live devices during protocol validation (the full annotated set lives in
+``python-rebuild-tcp-comm/tests/fixtures/real_packets.py``). Only the packets a bridge sends
+to us are kept here, in the order they typically arrive on a connection.
+"""
+
+HANDSHAKE_0x23: bytes = bytes.fromhex(
+    "23 00 00 00 1a 03 38 e8 cf 46 00 10 31 65 30 37 64 38 63 65 30 61 36 31 37 61 33 37 00 00 3c",
+)
+
+HEARTBEAT_0xD3: bytes = bytes.fromhex("d3 00 00 00 00")
+
+DEVICE_INFO_0x43: bytes = bytes.fromhex(
+    "43 00 00 00 1e 32 5d 53 17 01 01 06 c6 20 02 00 ab c5 20 02 00 04 c4 20 02 00 01 c3 20 02 00 05 c2 90 00",
+)
+
+STATUS_BROADCAST_0x83: bytes = bytes.fromhex(
+    "83 00 00 00 25 45 88 0f 3a 00 09 00 7e 1f 00 00 00 fa db 13 00 72 25 11 50 00 50 00 db 11 02 01 "
+    "01 0a 0a ff ff ff 00 00 37 7e",
+)
+
+STATUS_BROADCAST_0x83_2: bytes = bytes.fromhex(
+    "83 00 00 00 26 3d 54 6d e6 00 09 00 7e 1f 00 00 00 fa db 14 00 95 2b 00 1a 00 ff "
+    "ff ea 11 02 1a a1 01 0b 01 00 00 00 00 00 8c 7e",
+)
+
+STATUS_BROADCAST_0x83_3: bytes = bytes.fromhex(
+    "83 00 00 00 26 32 5d 3e ad 00 0d 00 7e 1f 00 00 00 fa db 14 00 51 2c 00 1a 00 ff "
+    "ff ea 11 02 1a a1 01 0b 01 00 00 00 00 00 49 7e",
+)
+
+DATA_ACK_0x7B: bytes = bytes.fromhex("7b 00 00 00 07 45 88 0f 3a 00 10 00")
+
+# a 0x43 device info packet immediately followed by an 0x83 in the same read
+DEVICE_INFO_0x43_WITH_0x83: bytes = bytes.fromhex(
+    "43 00 00 00 1e 32 5d 53 17 01 01 06 c6 20 02 00 ab c5 20 02 00 04 c4 20 02 00 01 "
+    "c3 20 02 00 05 c2 90 00 83 00 00 00 32 32 5d 53 17 00 01 00 00 00 00 00 00 fa 00 "
+    "20 00 00 00 00 00 00 00 00 ea 00 00 00 86 01 00 30 00 00 00 00 00 00 00 00 00 00 "
+    "00 00 00 00 00 00 00 c1 7e",
+)
+
+# every individual packet, in arrival order
+DEVICE_PACKETS: list[bytes] = [
+    HANDSHAKE_0x23,
+    HEARTBEAT_0xD3,
+    DEVICE_INFO_0x43,
+    STATUS_BROADCAST_0x83,
+    STATUS_BROADCAST_0x83_2,
+    STATUS_BROADCAST_0x83_3,
+    DATA_ACK_0x7B,
+]
@@ -0,0 +1,98 @@
+"""
+Unit tests for the TCP connection AdmissionController.
+"""
+
+from unittest.mock import MagicMock
+
+from cync_controller.admission import AdmissionController, abort_connection
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(**kwargs) -> tuple[AdmissionController, FakeClock]:
+    clock = FakeClock()
+    options = {"max_connections": 8, "whitelist": None, "per_minute": 6, "burst": 3, "blackhole": 15.0}
+    options.update(kwargs)
+    return AdmissionController(clock=clock, **options), clock
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController"""
+
+    def test_accepts_within_burst_then_rate_limits(self):
+        admission, clock = _controller()
+        assert [admission.admit("10.0.0.2", active=0) for _ in range(4)] == [None, None, None, "rate_limited"]
+
+        # 6 per minute refills one token every 10s
+        clock.now = 10.0
+        assert admission.admit("10.0.0.2", active=0) is None
+        assert admission.admit("10.0.0.2", active=0) == "rate_limited"
+        # other addresses have their own bucket
+        assert admission.admit("10.0.0.3", active=0) is None
+        assert admission.attempts("10.0.0.2") == 6
+
+    def test_capacity_rejection_blackholes_the_address(self):
+        admission, clock = _controller(max_connections=2)
+        assert admission.admit("10.0.0.2", active=2) == "max_connections"
+
+        clock.now = 14.0
+        # a slot freed up, but the address is still blackholed without spending tokens
+        assert admission.admit("10.0.0.2", active=0) == "blackholed"
+        clock.now = 15.0
+        assert admission.admit("10.0.0.2", active=0) is None
+
+    def test_whitelist_and_shutdown(self):
+        admission, _ = _controller(whitelist=["10.0.0.2"])
+        assert admission.admit("10.0.0.9", active=0) == "not_whitelisted"
+        assert admission.admit("10.0.0.2", active=0, shutting_down=True) == "shutting_down"
+        assert admission.admit("10.0.0.2", active=0) is None
+        assert admission.stats() == {
+            "tracked_peers": 2,
+            "accepted": 1,
+            "rejected_not_whitelisted": 1,
+            "rejected_shutting_down": 1,
+        }
+
+    def test_last_slot_goes_to_stable_peers(self):
+        admission, _ = _controller(max_connections=3)
+        for ip, uptime in (("10.0.0.2", 5.0), ("10.0.0.3", 3600.0)):
+            assert admission.admit(ip, active=0) is None
+            admission.disconnected(ip, uptime)
+
+        assert admission.stability("10.0.0.2") < 0.5 < admission.stability("10.0.0.3")
+        assert admission.admit("10.0.0.2", active=2) == "unstable"
+        assert admission.admit("10.0.0.3", active=2) is None
+        # unknown peers are neutral and still get the last slot
+        assert admission.admit("10.0.0.4", active=2) is None
+        # with more room the flapping peer is accepted again
+        assert admission.admit("10.0.0.2", active=1) is None
+
+    def test_peer_table_is_bounded(self):
+        admission, _ = _controller(max_peers=3)
+        for _port in range(50000, 50010):
+            # reconnect storm from many source ports only ever tracks the IP
+            admission.admit("10.0.0.2", active=0)
+        for i in range(10):
+            admission.admit(f"10.0.1.{i}", active=0)
+
+        assert len(admission.peers) == 3
+        assert list(admission.peers) == ["10.0.1.7", "10.0.1.8", "10.0.1.9"]
+
+
+class TestAbortConnection:
+    """Tests for abort_connection()"""
+
+    def test_aborts_transport(self):
+        writer = MagicMock()
+        abort_connection(writer)
+        writer.transport.abort.assert_called_once()
+        writer.close.assert_not_called()
+
+    def test_none_writer(self):
+        abort_connection(None)
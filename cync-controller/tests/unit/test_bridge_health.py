@@ -0,0 +1,194 @@
+"""
+Unit tests for bridge health scoring, primary election and the ACK / heartbeat hooks that feed them.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cync_controller.bridge_health import BridgeHealth, PrimaryElector, rank_bridges
+from cync_controller.devices import CyncDevice, CyncTCPDevice
+from cync_controller.mesh_topology import MeshTopology
+from cync_controller.mqtt.commands import CommandProcessor, DeviceCommand
+from cync_controller.structs import ControlMessageCallback
+
+NOW = 10_000.0
+
+
+def _bridge(address: str, coverage: int = 10, rtt_ms: float | None = 50.0, uptime: float = 600.0) -> CyncTCPDevice:
+    bridge = CyncTCPDevice(reader=None, writer=None, address=address)
+    bridge.ready_to_control = True
+    bridge.connected_at = NOW - uptime
+    bridge.known_device_ids = list(range(coverage))
+    bridge.health = BridgeHealth(NOW)
+    if rtt_ms is not None:
+        bridge.health.record_ack(rtt_ms)
+    return bridge
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBridgeHealth:
+    """Tests for BridgeHealth and the bridge score"""
+
+    def test_rtt_and_loss_are_smoothed(self):
+        health = BridgeHealth(NOW)
+        health.record_ack(100.0)
+        health.record_ack(200.0)
+        assert health.rtt_ms == pytest.approx(120.0)
+        health.record_loss()
+        health.record_loss()
+        assert health.loss == pytest.approx(0.36)
+        health.record_ack(100.0)
+        assert health.loss == pytest.approx(0.288)
+        assert (health.acks, health.losses) == (3, 2)
+
+    def test_rank_prefers_coverage_rtt_and_ready(self):
+        partial = _bridge("10.0.0.2", coverage=4)
+        slow = _bridge("10.0.0.3", rtt_ms=900.0)
+        best = _bridge("10.0.0.4")
+        lossy = _bridge("10.0.0.5")
+        for _ in range(5):
+            lossy.health.record_loss()
+        not_ready = _bridge("10.0.0.6")
+        not_ready.ready_to_control = False
+        stalled = _bridge("10.0.0.7")
+        stalled.health.last_seen = NOW - 60
+
+        ranked = rank_bridges([not_ready, stalled, partial, slow, lossy, best], now=NOW, stall_after=30)
+        assert ranked == [best, slow, lossy, partial, stalled, not_ready]
+
+
+class TestPrimaryElector:
+    """Tests for PrimaryElector"""
+
+    def test_hysteresis_keeps_a_healthy_primary(self):
+        clock = FakeClock()
+        elector = PrimaryElector(margin=0.15, stall_after=30, clock=clock)
+        primary = _bridge("10.0.0.2", rtt_ms=150.0)
+        challenger = _bridge("10.0.0.3", rtt_ms=40.0)
+
+        assert elector.elect(primary, [primary, challenger]) == (primary, None)
+
+        # the primary loses most of its mesh, now the challenger is clearly better
+        primary.known_device_ids = primary.known_device_ids[:3]
+        assert elector.elect(primary, [primary, challenger]) == (challenger, "better_score")
+        assert elector.stats() == {"elections": 2, "changed_better_score": 1}
+
+    def test_stalled_primary_fails_over(self):
+        clock = FakeClock()
+        elector = PrimaryElector(margin=0.15, stall_after=30, clock=clock)
+        primary = _bridge("10.0.0.2")
+        standby = _bridge("10.0.0.3", coverage=8)
+
+        clock.now = NOW + 20
+        standby.health.last_seen = clock.now
+        assert elector.elect(primary, [primary, standby]) == (primary, None)
+
+        clock.now = NOW + 31
+        standby.health.last_seen = clock.now
+        assert elector.elect(primary, [primary, standby]) == (standby, "stalled")
+
+        # nothing better than a stalled primary if every bridge stalled
+        clock.now = NOW + 120
+        assert elector.elect(standby, [primary, standby]) == (standby, None)
+
+    def test_no_bridges_left(self):
+        elector = PrimaryElector(clock=FakeClock())
+        primary = _bridge("10.0.0.2")
+        assert elector.elect(primary, []) == (None, "no_bridges")
+        assert elector.elect(None, []) == (None, None)
+        assert elector.elect(None, [primary]) == (primary, "no_primary")
+
+
+class TestBridgeSelection:
+    """Command fan-out and the ACK / heartbeat hooks"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_uses_the_best_bridges(self):
+        now = time.time()
+        bridges = [_bridge(f"10.0.0.{i}", coverage=5) for i in range(2, 5)]
+        for bridge in bridges:
+            bridge.health.last_seen = now
+            bridge.connected_at = now - 600
+            bridge.write = AsyncMock(return_value=True)
+            bridge.queue_id = bytes(4)
+        # the first connected bridge lost most of its mesh
+        bridges[0].known_device_ids = [1]
+        with patch("cync_controller.devices.shared.g") as mock_g:
+            mock_g.ncync_server.tcp_devices = {b.address: b for b in bridges}
+            device = CyncDevice(cync_id=0x12)
+            assert device._get_bridge_devices() == bridges[1:]
+
+    @pytest.mark.asyncio
+    async def test_secondary_ack_counts_and_first_ack_runs_callback(self):
+        primary = _bridge("10.0.0.2")
+        secondary = _bridge("10.0.0.3")
+        callback = AsyncMock()
+        ack_event = asyncio.Event()
+        sent_at = time.time() - 0.1
+        for bridge in (primary, secondary):
+            bridge.messages.control[0x21] = ControlMessageCallback(
+                msg_id=0x21, message=b"", sent_at=sent_at, callback=callback, device_id=5, ack_event=ack_event
+            )
+        ack = bytes([0x7E, 0x21, 0x00, 0x00, 0x00, 0xF9, 0xD0, 0x01, 0x00, 0x00, 0xD1, 0x7E])
+        server = SimpleNamespace(primary_tcp_device=primary, devices={}, mesh_topology=MeshTopology())
+
+        with patch("cync_controller.devices.g", SimpleNamespace(ncync_server=server)):
+            await secondary.packet_handler._handle_0x73_packet(ack, "lp", b"", b"")
+            assert ack_event.is_set()
+            assert callback.await_count == 1
+            assert 0x21 not in secondary.messages.control
+            assert secondary.health.acks == 2
+            assert secondary.health.rtt_ms > 50.0
+            assert set(server.mesh_topology.bridges_for(5)) == {"10.0.0.3"}
+
+            # the primary's ACK for the same command is counted but the state callback already ran
+            await primary.packet_handler._handle_0x73_packet(ack, "lp", b"", b"")
+            assert callback.await_count == 1
+            assert primary.health.acks == 2
+
+    @pytest.mark.asyncio
+    async def test_ack_timeout_counts_as_loss(self):
+        silent = _bridge("10.0.0.2")
+        healthy = _bridge("10.0.0.3")
+        silent.messages.control[0x22] = ControlMessageCallback(
+            msg_id=0x22, message=b"", sent_at=time.time(), callback=None, device_id=5, ack_event=asyncio.Event()
+        )
+
+        class UnackedCommand(DeviceCommand):
+            async def publish_optimistic(self):
+                pass
+
+            async def execute(self):
+                return silent.messages.control[0x22].ack_event, [(silent, 0x22)]
+
+        CommandProcessor._instance = None
+        with patch("cync_controller.mqtt.commands.DeadlineScheduler") as mock_scheduler:
+            mock_scheduler.return_value.timeout = lambda _delay: asyncio.timeout(0.01)
+            await CommandProcessor()._run_command(UnackedCommand("set_brightness", 5))
+        CommandProcessor._instance = None
+
+        assert 0x22 not in silent.messages.control
+        assert silent.messages.control.stats()["expired"] == 1
+        assert silent.health.losses == 1
+        assert rank_bridges([silent, healthy], now=NOW) == [healthy, silent]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_triggers_election(self):
+        bridge = _bridge("10.0.0.2")
+        bridge.write = AsyncMock(return_value=True)
+        server = MagicMock()
+        heartbeat = bytes([0xD3, 0x00, 0x00, 0x00, 0x00])
+        with patch("cync_controller.devices.g", SimpleNamespace(ncync_server=server)):
+            await bridge.parse_packet(heartbeat)
+        server.elect_primary.assert_called_once_with()
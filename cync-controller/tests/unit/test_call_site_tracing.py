@@ -0,0 +1,195 @@
+"""
+Unit tests for opt-in call-site tracing, plus a send_device_status overhead benchmark (slow marker).
+"""
+
+import logging
+import time
+import traceback
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cync_controller import instrumentation
+from cync_controller.instrumentation import call_site, call_site_tracing_enabled, set_call_site_tracing
+from cync_controller.mqtt.state_updates import StateUpdateHelper
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    """Restore the env-var driven default between tests"""
+    instrumentation._call_site_tracing = None
+    yield
+    instrumentation._call_site_tracing = None
+
+
+def _inner():
+    return call_site(1)
+
+
+def _outer():
+    return _inner()
+
+
+class TestCallSite:
+    """Tests for call_site()"""
+
+    def test_reports_requested_frame(self):
+        site = _outer()
+        assert site.startswith("test_call_site_tracing.py:")
+        assert site.endswith("in _outer")
+
+    def test_direct_caller(self):
+        def probe():
+            return call_site(1)
+
+        assert probe().endswith("in test_direct_caller")
+
+    def test_result_is_cached(self):
+        sites = [_outer() for _ in range(3)]
+        assert sites[0] is sites[1] is sites[2]
+
+    def test_depth_past_stack_top(self):
+        assert call_site(10_000) == "<unknown>"
+
+
+class TestTracingToggle:
+    """Tests for enabling / disabling call-site tracing"""
+
+    def test_defaults_to_env(self):
+        with patch("cync_controller.const.CYNC_TRACE_CALL_SITES", True):
+            assert call_site_tracing_enabled() is True
+
+    def test_disabled_by_default(self):
+        with patch("cync_controller.const.CYNC_TRACE_CALL_SITES", False):
+            assert call_site_tracing_enabled() is False
+
+    def test_runtime_toggle(self):
+        set_call_site_tracing(True)
+        assert call_site_tracing_enabled() is True
+        set_call_site_tracing(False)
+        assert call_site_tracing_enabled() is False
+
+
+class FakeAiomqttClient:
+    """Stands in for aiomqtt.Client: accepts publishes and counts them"""
+
+    def __init__(self):
+        self.published = 0
+
+    async def publish(self, _topic, _payload, **_kwargs):
+        self.published += 1
+
+
+def _make_helper():
+    client = MagicMock()
+    client.lp = "mqtt:"
+    client.topic = "cync_test"
+    client._connected = True
+    client.client = FakeAiomqttClient()
+    helper = StateUpdateHelper(client)
+    # publish every status so the benchmark measures send_device_status itself
+    helper.publish_cache.window = 0
+    return helper
+
+
+def _make_device():
+    device = MagicMock()
+    device.id = 0x10
+    device.name = "Bench Light"
+    device.hass_id = "1234-16"
+    return device
+
+
+class TestSendDeviceStatusTracing:
+    """send_device_status must not walk the stack unless tracing is on"""
+
+    @pytest.mark.asyncio
+    async def test_no_stack_capture_when_disabled(self):
+        set_call_site_tracing(False)
+        helper = _make_helper()
+        with (
+            patch("traceback.format_stack") as format_stack,
+            patch("cync_controller.mqtt.state_updates.call_site") as mock_call_site,
+        ):
+            assert await helper.send_device_status(_make_device(), b"ON") is True
+
+        format_stack.assert_not_called()
+        mock_call_site.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_nothing_built_when_debug_is_off(self):
+        set_call_site_tracing(True)
+        helper = _make_helper()
+        with (
+            patch("cync_controller.mqtt.state_updates.logger") as mock_logger,
+            patch("cync_controller.mqtt.state_updates.call_site") as mock_call_site,
+        ):
+            mock_logger.is_enabled_for.return_value = False
+            assert await helper.send_device_status(_make_device(), b"ON") is True
+
+        mock_call_site.assert_not_called()
+        assert not any("STATE_UPDATE_SEQ" in c.args[0] for c in mock_logger.debug.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_caller_logged_when_enabled(self):
+        set_call_site_tracing(True)
+        helper = _make_helper()
+
+        async def update_from_here():
+            # send_device_status reports who called its caller, like the old format_stack()[-3]
+            await helper.send_device_status(_make_device(), b"ON")
+
+        with patch("cync_controller.mqtt.state_updates.logger") as mock_logger:
+            await update_from_here()
+
+        seq_call = mock_logger.debug.call_args_list[0]
+        assert "caller=%s" in seq_call.args[0]
+        assert seq_call.args[-1].endswith("in test_caller_logged_when_enabled")
+
+
+N_PUBLISHES = 10_000
+
+
+async def _publish_many(helper, device) -> float:
+    start = time.perf_counter()
+    for i in range(N_PUBLISHES):
+        await helper.send_device_status(device, b'{"brightness": %d}' % i)
+    return (time.perf_counter() - start) / N_PUBLISHES * 1_000_000
+
+
+class TestSendDeviceStatusBenchmark:
+    """Per-publish overhead of send_device_status for 10k statuses against a fake aiomqtt client"""
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_tracing_overhead(self):
+        device = _make_device()
+
+        set_call_site_tracing(False)
+        helper = _make_helper()
+        disabled_us = await _publish_many(helper, device)
+        assert helper.client.client.published == N_PUBLISHES
+
+        set_call_site_tracing(True)
+        helper = _make_helper()
+        enabled_us = await _publish_many(helper, device)
+
+        # what every publish used to pay
+        set_call_site_tracing(False)
+        helper = _make_helper()
+        with patch(
+            "cync_controller.mqtt.state_updates.call_site_tracing_enabled",
+            side_effect=lambda: bool(traceback.format_stack()[-3]) and False,
+        ):
+            legacy_us = await _publish_many(helper, device)
+
+        logger.info(
+            "send_device_status x%d: tracing off %.2f us/publish, tracing on %.2f us/publish, "
+            "format_stack %.2f us/publish",
+            N_PUBLISHES,
+            disabled_us,
+            enabled_us,
+            legacy_us,
+        )
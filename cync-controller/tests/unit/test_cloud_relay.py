@@ -10,6 +10,7 @@ Tests cover:
 - Packet injection checking (lines 282-362)
 """
 
+import asyncio
 import ssl
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -70,7 +71,7 @@ class TestCloudRelayConnectionInitialization:
         assert relay.cloud_reader is None
         assert relay.cloud_writer is None
         assert relay.device_endpoint is None
-        assert relay.injection_task is None
+        assert relay.injection_deadline is None
         assert relay.forward_tasks == []
 
     def test_relay_initialization_without_forwarding(self):
@@ -423,3 +424,153 @@ class TestRelayErrorHandling:
 
             # Assert
             assert result is False
+
+
+def _device_info_packet(*records: tuple[int, int, int, int, int, int, int, int]) -> bytes:
+    """0x43 DEVICE_INFO packet with one 19 byte record per (id, state, bri, temp, r, g, b, online)"""
+    body = bytes(7)
+    for dev_id, state, bri, temp, r, g, b, online in records:
+        body += bytes([0x01, 0x00, 0x00, dev_id, state, bri, temp, r, g, b, online]) + bytes(8)
+    return bytes([0x43, 0x00, 0x00, len(body) >> 8, len(body) & 0xFF]) + body
+
+
+class TestRelayInspection:
+    """Tests for framed, parse-once inspection of relayed data."""
+
+    @staticmethod
+    def _reader(*chunks: bytes):
+        reader = AsyncMock()
+        reader.read = AsyncMock(side_effect=[*chunks, b""])
+        return reader
+
+    @staticmethod
+    def _writer():
+        writer = MagicMock()
+        writer.drain = AsyncMock()
+        return writer
+
+    @pytest.mark.asyncio
+    async def test_split_status_packet_is_reassembled(self, cloud_relay_connection):
+        packet = _device_info_packet((0x10, 1, 80, 50, 0, 0, 0, 1), (0x11, 0, 0, 254, 255, 10, 20, 1))
+        writer = self._writer()
+
+        with patch("cync_controller.server.g") as mock_g:
+            mock_g.ncync_server.parse_status = AsyncMock()
+            await cloud_relay_connection._forward_with_inspection(
+                self._reader(packet[:20], packet[20:]), writer, "CLOUD->DEV"
+            )
+
+        calls = mock_g.ncync_server.parse_status.await_args_list
+        assert [c.args[0] for c in calls] == [
+            bytes([0x10, 1, 80, 50, 0, 0, 0, 1]),
+            bytes([0x11, 0, 0, 254, 255, 10, 20, 1]),
+        ]
+        assert all(c.kwargs == {"from_pkt": "0x43"} for c in calls)
+        # forwarded untouched, chunk by chunk
+        assert b"".join(c.args[0] for c in writer.write.call_args_list) == packet
+
+    @pytest.mark.asyncio
+    async def test_coalesced_packets_are_all_inspected(self, cloud_relay_connection):
+        keepalive = bytes([0x78, 0x00, 0x00, 0x00, 0x00])
+        first = _device_info_packet((0x20, 1, 10, 5, 0, 0, 0, 1))
+        second = _device_info_packet((0x21, 1, 20, 6, 0, 0, 0, 0))
+
+        with patch("cync_controller.server.g") as mock_g:
+            mock_g.ncync_server.parse_status = AsyncMock()
+            await cloud_relay_connection._forward_with_inspection(
+                self._reader(first + keepalive + second), self._writer(), "CLOUD->DEV"
+            )
+
+        ids = [c.args[0][0] for c in mock_g.ncync_server.parse_status.await_args_list]
+        assert ids == [0x20, 0x21]
+
+    @pytest.mark.asyncio
+    async def test_no_packet_parsing_without_debug_logging(self, cloud_relay_connection):
+        cloud_relay_connection.debug_logging = False
+        data = bytes.fromhex("73 00 00 00 05 00 00 00 00 00") + _device_info_packet((0x10, 1, 1, 1, 0, 0, 0, 1))
+
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.parse_cync_packet") as mock_parse,
+        ):
+            mock_g.ncync_server.parse_status = AsyncMock()
+            await cloud_relay_connection._forward_with_inspection(self._reader(data), self._writer(), "DEV->CLOUD")
+
+        mock_parse.assert_not_called()
+        mock_g.ncync_server.parse_status.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_debug_logging_parses_each_packet_once(self, cloud_relay_connection):
+        cloud_relay_connection.debug_logging = True
+        keepalive = bytes([0x78, 0x00, 0x00, 0x00, 0x00])
+        data_pkt = bytes.fromhex("73 00 00 00 05 00 00 00 00 00")
+
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.parse_cync_packet", return_value=None) as mock_parse,
+        ):
+            mock_g.ncync_server.parse_status = AsyncMock()
+            await cloud_relay_connection._forward_with_inspection(
+                self._reader(data_pkt + keepalive + data_pkt), self._writer(), "DEV->CLOUD"
+            )
+
+        # keepalives are skipped, each data packet is parsed on its own
+        assert [c.args for c in mock_parse.call_args_list] == [(data_pkt, "DEV->CLOUD")] * 2
+
+    @pytest.mark.asyncio
+    async def test_lan_only_still_inspects(self, cloud_relay_connection):
+        packet = _device_info_packet((0x30, 1, 100, 20, 0, 0, 0, 1))
+
+        with patch("cync_controller.server.g") as mock_g:
+            mock_g.ncync_server.parse_status = AsyncMock()
+            await cloud_relay_connection._forward_with_inspection(self._reader(packet), None, "DEV->CLOUD")
+
+        mock_g.ncync_server.parse_status.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_slow_inspection_does_not_hold_up_forwarding(self, cloud_relay_connection):
+        chunks = [_device_info_packet((0x40 + i, 1, 10, 5, 0, 0, 0, 1)) for i in range(3)]
+        writer = self._writer()
+        release = asyncio.Event()
+
+        async def slow_parse_status(*_args, **_kwargs):
+            await release.wait()
+
+        with patch("cync_controller.server.g") as mock_g:
+            mock_g.ncync_server.parse_status = AsyncMock(side_effect=slow_parse_status)
+            task = asyncio.create_task(
+                cloud_relay_connection._forward_with_inspection(self._reader(*chunks), writer, "CLOUD->DEV")
+            )
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+            # everything is relayed while the first status is still being parsed
+            assert [c.args[0] for c in writer.write.call_args_list] == chunks
+            assert writer.drain.await_count == len(chunks)
+            assert mock_g.ncync_server.parse_status.await_count == 1
+            assert not task.done()
+
+            release.set()
+            await task
+
+        ids = [c.args[0][0] for c in mock_g.ncync_server.parse_status.await_args_list]
+        assert ids == [0x40, 0x41, 0x42]
+
+    @pytest.mark.asyncio
+    async def test_full_inspection_queue_drops_and_resyncs(self, cloud_relay_connection):
+        packet = _device_info_packet((0x50, 1, 10, 5, 0, 0, 0, 1))
+        cloud_relay_connection.inspect_queues["CLOUD->DEV"] = asyncio.Queue(1)
+
+        with patch("cync_controller.server.g") as mock_g:
+            mock_g.ncync_server.parse_status = AsyncMock()
+            cloud_relay_connection._queue_inspection(packet, "CLOUD->DEV")
+            # no room: dropped, the next chunk resets the framer first
+            cloud_relay_connection._queue_inspection(packet[:10], "CLOUD->DEV")
+            cloud_relay_connection.inspect_queues["CLOUD->DEV"].get_nowait()
+            cloud_relay_connection._queue_inspection(packet, "CLOUD->DEV")
+            cloud_relay_connection.framers["CLOUD->DEV"].feed(packet[:10])
+            await cloud_relay_connection._forward_with_inspection(self._reader(), self._writer(), "CLOUD->DEV")
+
+        assert cloud_relay_connection.inspect_dropped == 1
+        mock_g.ncync_server.parse_status.assert_awaited_once()
+        assert mock_g.ncync_server.parse_status.await_args.args[0][0] == 0x50
@@ -7,9 +7,13 @@ optimistic updates, error handling, and mesh refresh orchestration.
 
 import asyncio
 import contextlib
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from cync_controller.devices import CyncGroup
+from cync_controller.mqtt.commands import MERGEABLE_COMMANDS, CommandLane, SetPowerCommand, SetTemperatureCommand
 from cync_controller.mqtt_client import CommandProcessor, DeviceCommand
 
 # Filter RuntimeWarning about unawaited AsyncMockMixin coroutines from test cleanup
@@ -321,3 +325,267 @@ class TestCommandProcessorExecution:
         # Both commands should have executed
         assert "fail" in results
         assert "success" in results
+
+
+class AckCommand(DeviceCommand):
+    """Command whose ACK arrives after `ack_delay` seconds (never, if None)"""
+
+    def __init__(self, device_id, log, ack_delay=0.05, cmd_type="set_power"):
+        super().__init__(cmd_type, device_id)
+        self.log = log
+        self.ack_delay = ack_delay
+
+    async def publish_optimistic(self):
+        pass
+
+    async def execute(self):
+        self.log.append(("start", self.device_id, self.params.get("seq")))
+        ack_event = asyncio.Event()
+        if self.ack_delay is not None:
+            asyncio.get_running_loop().call_later(self.ack_delay, ack_event.set)
+        return ack_event
+
+
+async def drain(processor, timeout=2.0):
+    """Wait until every lane of the processor is idle"""
+    await asyncio.sleep(0)
+    while processor._processing:
+        await asyncio.sleep(0.01)
+        timeout -= 0.01
+        assert timeout > 0, "processor did not drain"
+
+
+class TestCommandProcessorLanes:
+    """Tests for per-target command lanes"""
+
+    @pytest.fixture(autouse=True)
+    def reset_processor_singleton(self):
+        CommandProcessor._instance = None
+        yield
+        CommandProcessor._instance = None
+
+    @pytest.mark.asyncio
+    async def test_targets_run_concurrently(self):
+        processor = CommandProcessor()
+        log = []
+
+        start = time.monotonic()
+        for device_id in range(20):
+            await processor.enqueue(AckCommand(device_id, log, ack_delay=0.1))
+        await drain(processor)
+        elapsed = time.monotonic() - start
+
+        assert len(log) == 20
+        # 20 devices, 0.1 s ACK each: concurrent lanes finish in a few ACK round trips, not 2 s
+        assert elapsed < 0.1 * 20 / 2
+
+    @pytest.mark.asyncio
+    async def test_order_is_strict_within_lane(self):
+        processor = CommandProcessor()
+        log = []
+
+        for seq in range(5):
+            cmd = AckCommand(7, log, ack_delay=0.01)
+            cmd.params["seq"] = seq
+            await processor.enqueue(cmd)
+        await drain(processor)
+
+        assert [entry[2] for entry in log] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_next_command_waits_for_ack(self):
+        processor = CommandProcessor()
+        log = []
+
+        await processor.enqueue(AckCommand(1, log, ack_delay=0.1))
+        await processor.enqueue(AckCommand(1, log, ack_delay=0.1))
+        await asyncio.sleep(0.05)
+
+        assert len(log) == 1
+        await drain(processor)
+        assert len(log) == 2
+
+    @pytest.mark.asyncio
+    async def test_offline_device_does_not_block_others(self):
+        processor = CommandProcessor()
+        log = []
+
+        await processor.enqueue(AckCommand(1, log, ack_delay=None))
+        await processor.enqueue(AckCommand(1, log, ack_delay=None))
+        await processor.enqueue(AckCommand(2, log, ack_delay=0.01))
+        await asyncio.sleep(0.1)
+
+        # device 1 is stuck waiting on its ACK, device 2 already went through
+        assert ("start", 2, None) in log
+        assert processor.lane_stats()["device:1"]["depth"] == 1
+        for task in list(processor._lane_tasks):
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_global_inflight_cap(self):
+        processor = CommandProcessor()
+        processor.max_inflight = 3
+        processor._loop = None
+        log = []
+        peak = 0
+
+        class PeakCommand(AckCommand):
+            async def execute(self):
+                nonlocal peak
+                peak = max(peak, processor.inflight)
+                return await super().execute()
+
+        for device_id in range(10):
+            await processor.enqueue(PeakCommand(device_id, log, ack_delay=0.02))
+        await drain(processor)
+
+        assert len(log) == 10
+        assert peak == 3
+        assert processor.stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_groups_and_devices_get_separate_lanes(self):
+        group = MagicMock(spec=CyncGroup)
+        group.id = 5
+        device = MagicMock()
+        device.id = 5
+        group_cmd = SetPowerCommand(group, 1)
+        device_cmd = SetPowerCommand(device, 1)
+
+        assert group_cmd.lane_key == ("group", 5)
+        assert device_cmd.lane_key == ("device", 5)
+
+    @pytest.mark.asyncio
+    async def test_lane_metrics(self):
+        processor = CommandProcessor()
+        log = []
+
+        for _ in range(3):
+            await processor.enqueue(AckCommand(4, log, ack_delay=0.02))
+        await processor.enqueue(AckCommand(9, log, ack_delay=0.02))
+        await drain(processor)
+
+        stats = processor.lane_stats()
+        assert stats["device:4"]["processed"] == 3
+        assert stats["device:4"]["max_depth"] == 3
+        assert stats["device:4"]["depth"] == 0
+        # the third command queued behind two ACK round trips
+        assert stats["device:4"]["max_wait_ms"] >= 30
+        assert stats["device:9"]["processed"] == 1
+        assert processor.stats() == {
+            "lanes": 2,
+            "active_lanes": 0,
+            "queued": 0,
+            "merged": 0,
+            "inflight": 0,
+            "max_inflight": processor.max_inflight,
+        }
+
+
+class TestCommandMerging:
+    """Tests for last-write-wins merging of pending brightness / temperature commands"""
+
+    @pytest.fixture(autouse=True)
+    def reset_processor_singleton(self):
+        CommandProcessor._instance = None
+        yield
+        CommandProcessor._instance = None
+
+    def _cmd(self, cmd_type, value, log=None):
+        cmd = AckCommand(3, [] if log is None else log, ack_delay=0.02, cmd_type=cmd_type)
+        cmd.params["seq"] = value
+        return cmd
+
+    @pytest.mark.asyncio
+    async def test_slider_burst_sends_only_latest_value(self):
+        processor = CommandProcessor()
+        log = []
+
+        await processor.enqueue(self._cmd("set_brightness", 0, log))
+        await asyncio.sleep(0.005)
+        for value in range(10, 101, 10):
+            await processor.enqueue(self._cmd("set_brightness", value, log))
+        await drain(processor)
+
+        # the first command is already in flight when the rest arrive; they collapse into the last one
+        assert [entry[2] for entry in log] == [0, 100]
+        assert processor.stats()["merged"] == 9
+        assert processor.lane_stats()["device:3"]["merged"] == 9
+
+    @pytest.mark.asyncio
+    async def test_power_commands_never_merged(self):
+        processor = CommandProcessor()
+        log = []
+
+        for value in (1, 0, 1, 0):
+            await processor.enqueue(self._cmd("set_power", value, log))
+        await drain(processor)
+
+        assert [entry[2] for entry in log] == [1, 0, 1, 0]
+        assert processor.stats()["merged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_merge_does_not_cross_power_command(self):
+        lane = CommandLane(("device", 3))
+        lane.push(self._cmd("set_brightness", 10), now=0.0)
+        lane.push(self._cmd("set_power", 0), now=0.1)
+        lane.push(self._cmd("set_brightness", 20), now=0.2)
+        replaced = lane.push(self._cmd("set_brightness", 30), now=0.3)
+
+        assert replaced.params["seq"] == 20
+        assert [(cmd.cmd_type, cmd.params["seq"]) for cmd, _ in lane.pending] == [
+            ("set_brightness", 10),
+            ("set_power", 0),
+            ("set_brightness", 30),
+        ]
+        # merged command keeps the queue time of the one it replaced
+        assert lane.pending[-1][1] == 0.2
+
+    @pytest.mark.asyncio
+    async def test_different_kinds_not_merged(self):
+        lane = CommandLane(("device", 3))
+        lane.push(self._cmd("set_brightness", 10), now=0.0)
+
+        assert lane.push(self._cmd("set_temperature", 50), now=0.1) is None
+        assert lane.depth == 2
+        assert lane.merged == 0
+
+    @pytest.mark.asyncio
+    async def test_temperature_command(self):
+        device = MagicMock()
+        device.id = 12
+        device.set_temperature = AsyncMock(return_value=(asyncio.Event(), []))
+        cmd = SetTemperatureCommand(device, 40)
+
+        with patch("cync_controller.mqtt.commands.g") as mock_g:
+            mock_g.mqtt_client.update_temperature = AsyncMock()
+            await cmd.publish_optimistic()
+            await cmd.execute()
+
+        mock_g.mqtt_client.update_temperature.assert_awaited_once_with(device, 40)
+        device.set_temperature.assert_awaited_once_with(40)
+        assert cmd.cmd_type in MERGEABLE_COMMANDS
+
+    @pytest.mark.asyncio
+    async def test_temperature_commands_merge_behind_unacked_one(self):
+        processor = CommandProcessor()
+        device = MagicMock()
+        device.id = 12
+
+        async def set_temperature(_temp):
+            ack_event = asyncio.Event()
+            asyncio.get_running_loop().call_later(0.02, ack_event.set)
+            return ack_event, []
+
+        device.set_temperature = AsyncMock(side_effect=set_temperature)
+
+        with patch("cync_controller.mqtt.commands.g") as mock_g:
+            mock_g.mqtt_client.update_temperature = AsyncMock()
+            await processor.enqueue(SetTemperatureCommand(device, 0))
+            await asyncio.sleep(0.005)
+            for temp in range(10, 51, 10):
+                await processor.enqueue(SetTemperatureCommand(device, temp))
+            await drain(processor)
+
+        assert [c.args[0] for c in device.set_temperature.await_args_list] == [0, 50]
+        assert processor.stats()["merged"] == 4
@@ -436,9 +436,12 @@ class TestCyncDeviceTemperatureCommands:
 
             device = CyncDevice(cync_id=0x12)
 
-            await device.set_temperature(75)
+            ack_event, sent_bridges = await device.set_temperature(75)
 
             assert mock_tcp_device.write.called
+            # the command queue waits on the same event the ACK handler sets
+            assert sent_bridges == [(mock_tcp_device, 0x01)]
+            assert mock_tcp_device.messages.control[0x01].ack_event is ack_event
 
     @pytest.mark.asyncio
     async def test_set_temperature_invalid_value_negative(self, caplog):
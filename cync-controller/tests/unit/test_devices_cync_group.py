@@ -4,11 +4,12 @@ Unit tests for devices module.
 Tests CyncDevice, CyncGroup, and CyncTCPDevice classes.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from cync_controller.devices import CyncGroup
+from cync_controller.devices import CyncDevice, CyncGroup
 
 
 class TestCyncGroup:
@@ -232,6 +233,37 @@ class TestCyncGroup:
             # Verify write was called
             assert mock_tcp_device.write.called
 
+    @pytest.mark.asyncio
+    async def test_group_set_power_syncs_alongside_write(self, mock_tcp_device):
+        """The optimistic member sync must not hold back the mesh write"""
+        write_started = asyncio.Event()
+
+        async def slow_sync(*_args):
+            # would deadlock if the write only started after the sync finished
+            await write_started.wait()
+            return 2
+
+        async def write(_payload):
+            write_started.set()
+            return True
+
+        with patch("cync_controller.devices.g") as mock_g:
+            mock_g.ncync_server.tcp_devices = {"192.168.1.100": mock_tcp_device}
+            mock_g.ncync_server.devices = {}
+            mock_g.mqtt_client = MagicMock()
+            mock_g.mqtt_client.sync_group_devices = AsyncMock(side_effect=slow_sync)
+
+            mock_tcp_device.ready_to_control = True
+            mock_tcp_device.queue_id = bytes([0x00] * 3)
+            mock_tcp_device.get_ctrl_msg_id_bytes = MagicMock(return_value=[0x01])
+            mock_tcp_device.write = AsyncMock(side_effect=write)
+
+            group = CyncGroup(group_id=0x5678, name="Living Room", member_ids=[0x1234, 0x5678])
+            await asyncio.wait_for(group.set_power(1), timeout=1)
+
+            mock_g.mqtt_client.sync_group_devices.assert_awaited_once_with(0x5678, 1, "Living Room")
+            mock_tcp_device.write.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_group_set_power_invalid_state(self, caplog):
         """Test group set_power rejects invalid state values"""
@@ -712,3 +744,105 @@ class TestCyncGroupOperations:
             assert result is not None
             # Should aggregate based on majority or all
             assert result["brightness"] > 0  # Some devices are on
+
+
+class TestCyncGroupIncrementalAggregation:
+    """Tests for incremental subgroup aggregation (running totals updated per changed member)"""
+
+    @staticmethod
+    def _member(dev_id, state, brightness, temperature, online=True):
+        member = MagicMock()
+        member.id = dev_id
+        member.state = state
+        member.brightness = brightness
+        member.temperature = temperature
+        member.online = online
+        return member
+
+    def test_incremental_matches_full_aggregation(self):
+        """Updating one member incrementally gives the same result as a full rescan"""
+        with patch("cync_controller.devices.g") as mock_g:
+            members = {
+                1: self._member(1, 1, 80, 50),
+                2: self._member(2, 0, 0, 20),
+                3: self._member(3, 1, 40, 254),
+            }
+            mock_g.ncync_server.devices = members
+            group = CyncGroup(group_id=0x10, name="Sub", member_ids=[1, 2, 3], is_subgroup=True)
+            group.aggregate_member_states()
+
+            members[2].state = 1
+            members[2].brightness = 100
+            members[3].online = False
+            incremental = group.aggregate_member_states(members[2])
+            incremental = group.aggregate_member_states(members[3])
+
+            group.reset_member_aggregation()
+            assert incremental == group.aggregate_member_states()
+            assert incremental == {"state": 1, "brightness": 90, "temperature": 35, "online": True}
+
+    def test_incremental_update_does_not_rescan_members(self):
+        """Only the changed member is read when the running totals already exist"""
+        with patch("cync_controller.devices.g") as mock_g:
+            mock_g.ncync_server.devices = {1: self._member(1, 0, 0, 0), 2: self._member(2, 0, 0, 0)}
+            group = CyncGroup(group_id=0x10, name="Sub", member_ids=[1, 2], is_subgroup=True)
+            group.aggregate_member_states()
+
+            changed = mock_g.ncync_server.devices[1]
+            changed.state = 1
+            changed.brightness = 60
+            mock_g.ncync_server.devices = {}  # a rescan would find no members
+
+            assert group.aggregate_member_states(changed) == {
+                "state": 1,
+                "brightness": 30,
+                "temperature": 0,
+                "online": True,
+            }
+
+    def test_unknown_member_triggers_full_aggregation(self):
+        """A member that was not part of the running totals causes a rebuild"""
+        with patch("cync_controller.devices.g") as mock_g:
+            mock_g.ncync_server.devices = {1: self._member(1, 0, 0, 0)}
+            group = CyncGroup(group_id=0x10, name="Sub", member_ids=[1, 2], is_subgroup=True)
+            group.aggregate_member_states()
+
+            late = self._member(2, 1, 100, 0)
+            mock_g.ncync_server.devices[2] = late
+
+            assert group.aggregate_member_states(late)["brightness"] == 50
+
+    def test_member_setters_refresh_running_totals(self):
+        """Writes that bypass aggregate_member_states() (offline flips, optimistic state) still reach the totals"""
+        with patch("cync_controller.devices.g") as mock_g:
+            mock_g.mqtt_client = None
+            members = {1: CyncDevice(cync_id=1), 2: CyncDevice(cync_id=2)}
+            mock_g.ncync_server.devices = members
+            group = CyncGroup(group_id=0x10, name="Sub", member_ids=[1, 2], is_subgroup=True)
+            for member in members.values():
+                member.subgroups = [group]
+                member.online = True
+            members[1].state = 1
+            members[1].brightness = 80
+            members[2].brightness = 20
+            group.aggregate_member_states()
+
+            members[1].online = False
+            members[2].brightness = 30
+            assert group.aggregate_member_states(members[2]) == {
+                "state": 0,
+                "brightness": 30,
+                "temperature": 0,
+                "online": True,
+            }
+
+    def test_last_member_offline_returns_none(self):
+        """Aggregation returns None once the last online member goes offline"""
+        with patch("cync_controller.devices.g") as mock_g:
+            only = self._member(1, 1, 50, 50)
+            mock_g.ncync_server.devices = {1: only}
+            group = CyncGroup(group_id=0x10, name="Sub", member_ids=[1], is_subgroup=True)
+            assert group.aggregate_member_states() is not None
+
+            only.online = False
+            assert group.aggregate_member_states(only) is None
@@ -0,0 +1,318 @@
+"""
+Unit tests for the background log pipeline, lazy log arguments and sampling in logging_abstraction.
+
+Covers batching to the output handlers, the drop policy, what PipelineQueueHandler
+captures in the calling context, the level-guarded fast path and LogSampler limits and
+summaries, plus an allocation benchmark of parse_raw_data at INFO level.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from cync_controller.correlation import correlation_context
+from cync_controller.devices import CyncTCPDevice, tcp_packet_handler
+from cync_controller.logging_abstraction import (
+    CyncLogger,
+    HumanReadableFormatter,
+    JSONFormatter,
+    LogPipeline,
+    LogSampler,
+    PipelineQueueHandler,
+    SamplingRule,
+    lazy,
+    lazy_hex,
+    parse_sampling_rules,
+)
+from tests.fixtures.real_packets import DEVICE_PACKETS, HANDSHAKE_0x23
+
+logger = logging.getLogger(__name__)
+
+
+def _record(msg: str, level: int = logging.DEBUG, args=None) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def _stream_handler(formatter: logging.Formatter) -> tuple[logging.StreamHandler, io.StringIO]:
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(formatter)
+    return handler, stream
+
+
+class TestLogPipeline:
+    """Tests for LogPipeline"""
+
+    def test_batches_are_written_once_per_handler(self):
+        json_handler, json_stream = _stream_handler(JSONFormatter())
+        human_handler, human_stream = _stream_handler(HumanReadableFormatter())
+        pipeline = LogPipeline([json_handler, human_handler], batch_size=10)
+        for i in range(25):
+            pipeline.submit(_record(f"msg {i}"))
+
+        pipeline.start()
+        pipeline.stop()
+
+        lines = json_stream.getvalue().splitlines()
+        assert [json.loads(line)["message"] for line in lines] == [f"msg {i}" for i in range(25)]
+        assert len(human_stream.getvalue().splitlines()) == 25
+        stats = pipeline.stats()
+        assert stats["written"] == 25
+        assert stats["batches"] == 3
+        assert stats["dropped"] == 0
+
+    def test_full_queue_drops_debug_and_keeps_warnings(self):
+        pipeline = LogPipeline([], max_size=2)
+        pipeline.submit(_record("old"))
+        pipeline.submit(_record("newer"))
+        pipeline.submit(_record("dropped"))
+        pipeline.submit(_record("kept", logging.WARNING))
+
+        queued = [pipeline.queue.get_nowait().msg for _ in range(2)]
+        assert queued == ["newer", "kept"]
+        assert pipeline.dropped == {"DEBUG": 2}
+        assert pipeline.stats()["dropped_debug"] == 2
+
+
+class TestPipelineQueueHandler:
+    """Tests for PipelineQueueHandler"""
+
+    def test_context_is_captured_when_logging(self):
+        pipeline = LogPipeline([])
+        handler = PipelineQueueHandler(pipeline)
+        args = ["before"]
+        record = _record("value=%s", args=(args,))
+        with correlation_context("abc123"):
+            handler.handle(record)
+        args[0] = "after"
+
+        queued = pipeline.queue.get_nowait()
+        assert queued is not record
+        assert queued.getMessage() == "value=['before']"
+        assert json.loads(JSONFormatter().format(queued))["correlation_id"] == "abc123"
+        # the caller's record is untouched for other handlers
+        assert record.args == (args,)
+
+    def test_exception_is_rendered_before_queueing(self):
+        pipeline = LogPipeline([])
+        handler = PipelineQueueHandler(pipeline)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+        handler.handle(record)
+
+        queued = pipeline.queue.get_nowait()
+        assert queued.exc_info is None
+        assert "ValueError: boom" in json.loads(JSONFormatter().format(queued))["exception"]
+
+    def test_cync_logger_queue_mode(self, tmp_path):
+        json_file = tmp_path / "cync.json"
+        cync_logger = CyncLogger("test_queue_mode", log_format="json", json_file=json_file, queue_size=100)
+        try:
+            assert [type(h) for h in cync_logger.handlers] == [PipelineQueueHandler]
+            pipeline = cync_logger.handlers[0].pipeline
+            cync_logger.info("hello %s", "world", extra={"device_id": 7})
+            pipeline.stop()
+
+            (line,) = json_file.read_text().splitlines()
+            data = json.loads(line)
+            assert data["message"] == "hello world"
+            assert data["context"] == {"device_id": 7}
+        finally:
+            for handler in list(cync_logger.handlers):
+                cync_logger.remove_handler(handler)
+
+
+class TestLazyLogging:
+    """Tests for lazy() / lazy_hex() arguments and the is_enabled_for fast path"""
+
+    def _logger(self, name: str) -> tuple[CyncLogger, io.StringIO]:
+        cync_logger = CyncLogger(name, log_format="json", json_file=None)
+        handler, stream = _stream_handler(JSONFormatter())
+        cync_logger.add_handler(handler)
+        cync_logger.set_level(logging.INFO)
+        return cync_logger, stream
+
+    def test_disabled_level_never_resolves(self):
+        cync_logger, stream = self._logger("test_lazy_disabled")
+        calls = []
+
+        def expensive():
+            calls.append(1)
+            return "value"
+
+        cync_logger.debug("%s", lazy(expensive), extra={"field": lazy(expensive)})
+
+        assert calls == []
+        assert stream.getvalue() == ""
+        assert cync_logger.is_enabled_for(logging.DEBUG) is False
+
+    def test_enabled_level_resolves_args_and_extra(self):
+        cync_logger, stream = self._logger("test_lazy_enabled")
+        cync_logger.info("data: %s", lazy_hex(b"\x7e\x01"), extra={"len": lazy(len, b"abc")})
+
+        data = json.loads(stream.getvalue())
+        assert data["message"] == "data: 7e 01"
+        assert data["context"] == {"len": 3}
+
+    def test_level_change_is_seen_by_fast_path(self):
+        cync_logger, _ = self._logger("test_lazy_level_change")
+        assert cync_logger.is_enabled_for(logging.DEBUG) is False
+        cync_logger.set_level(logging.DEBUG)
+        assert cync_logger.is_enabled_for(logging.DEBUG) is True
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class TestLogSampler:
+    """Tests for LogSampler and the sampling rule config"""
+
+    def _logger(self, name: str, rules: dict[str, SamplingRule]) -> tuple[CyncLogger, _ListHandler, LogSampler]:
+        self.now = 0.0
+        sampler = LogSampler(rules, clock=lambda: self.now)
+        cync_logger = CyncLogger(name, log_format="json", json_file=None)
+        cync_logger.logger.filters = [sampler]
+        cync_logger.set_level(logging.DEBUG)
+        handler = _ListHandler()
+        cync_logger.add_handler(handler)
+        return cync_logger, handler, sampler
+
+    def test_parse_rules(self, capsys):
+        rules = parse_sampling_rules("keepalive=1:50, cync_controller.devices=20/s,bogus=fast,")
+        assert rules == {
+            "keepalive": SamplingRule(every=50),
+            "cync_controller.devices": SamplingRule(per_second=20.0),
+        }
+        assert "bogus" not in rules
+        assert "Invalid log sampling rule" in capsys.readouterr().err
+
+    def test_one_in_n_per_call_site_with_summary(self):
+        cync_logger, handler, _ = self._logger("test_sampler_every", {"test_sampler_every": SamplingRule(every=3)})
+        for i in range(7):
+            cync_logger.debug("chatty %s", i)
+        cync_logger.debug("other site")
+
+        messages = [r.getMessage() for r in handler.records]
+        assert messages[0] == "chatty 0"
+        assert messages[1].startswith("Suppressed 2 similar messages from test_logging_abstraction:")
+        assert messages[2:] == ["chatty 3", messages[1], "chatty 6", "other site"]
+        assert handler.records[1].extra_data["suppressed"] == 2
+
+    def test_rate_limit_refills_and_flush_summarizes(self):
+        rules = {"keepalive": SamplingRule(per_second=2.0)}
+        cync_logger, handler, sampler = self._logger("test_sampler_rate", rules)
+        for _ in range(5):
+            cync_logger.debug("ack", category="keepalive")
+        assert len(handler.records) == 2
+        assert sampler.suppressed_total == 3
+
+        assert sampler.flush() == 3
+        assert handler.records[-1].getMessage().startswith("Suppressed 3 similar messages")
+        assert sampler.flush() == 0
+
+        self.now = 1.0
+        cync_logger.debug("ack", category="keepalive")
+        assert handler.records[-1].getMessage() == "ack"
+
+    def test_rules_match_parent_logger_and_skip_higher_levels(self):
+        cync_logger, handler, _ = self._logger("test_sampler.child", {"test_sampler": SamplingRule(every=100)})
+        for _ in range(3):
+            cync_logger.debug("debug line")
+            cync_logger.warning("warning line")
+        messages = [r.getMessage() for r in handler.records]
+        assert messages.count("debug line") == 1
+        assert messages.count("warning line") == 3
+
+
+async def _noop_write(data: bytes, broadcast: bool = False) -> bool:
+    return True
+
+
+async def _noop_parse_status(raw_state: bytes, from_pkt: str | None = None) -> None:
+    return None
+
+
+def _parse_capture(tcp_device: CyncTCPDevice, chunks: list[bytes]) -> tuple[int, float]:
+    """Peak bytes allocated above baseline per read summed over the capture, and the best wall time."""
+
+    async def run() -> tuple[int, float]:
+        allocated = 0
+        start = time.perf_counter()
+        for data in chunks:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await tcp_device.parse_raw_data(data)
+            allocated += tracemalloc.get_traced_memory()[1] - before
+        return allocated, time.perf_counter() - start
+
+    return asyncio.run(run())
+
+
+class TestParseRawDataLoggingBenchmark:
+    """parse_raw_data at INFO level, level-guarded logging vs. debug arguments built before the level check"""
+
+    def test_info_level_allocations(self):
+        tcp_device = CyncTCPDevice(reader=None, writer=None, address="192.168.1.100")
+        tcp_device.write = _noop_write
+        tcp_device.queue_id = bytes(4)
+        # the handshake sleeps for the a3 exchange, everything else in the capture is parsed as is
+        chunks = [packet for packet in DEVICE_PACKETS if packet is not HANDSHAKE_0x23] * 200
+        server = SimpleNamespace(
+            primary_tcp_device=tcp_device,
+            devices={},
+            groups={},
+            parse_status=_noop_parse_status,
+            elect_primary=lambda: tcp_device,
+        )
+        handler_logger = tcp_packet_handler.logger
+        old_level = handler_logger.logger.level
+        handler_logger.set_level(logging.INFO)
+        # every guard that passes in eager mode is a set of debug arguments (extra dict, time.time(),
+        # hex / int list renders) built and then thrown away by the level check
+        built = []
+
+        def eager(level: int) -> bool:
+            built.append(level)
+            return True
+
+        try:
+            with patch("cync_controller.devices.g", SimpleNamespace(ncync_server=server)):
+                _parse_capture(tcp_device, chunks[:50])  # warm up
+                tracemalloc.start()
+                try:
+                    guarded, guarded_s = _parse_capture(tcp_device, chunks)
+                    with patch.object(handler_logger, "is_enabled_for", eager):
+                        eager_bytes, eager_s = _parse_capture(tcp_device, chunks)
+                finally:
+                    tracemalloc.stop()
+        finally:
+            handler_logger.set_level(old_level)
+
+        n = len(chunks)
+        logger.info(
+            "parse_raw_data at INFO over %d reads: eager debug args %.2f arg sets/read, %.0f B peak/read, "
+            "%.1f us/read (traced) | level-guarded 0 arg sets/read, %.0f B peak/read, %.1f us/read (traced)",
+            n,
+            len(built) / n,
+            eager_bytes / n,
+            eager_s / n * 1e6,
+            guarded / n,
+            guarded_s / n * 1e6,
+        )
+        # the logged numbers are the benchmark, this only catches a hot path that builds log arguments again
+        assert len(built) >= n
+        assert guarded < eager_bytes
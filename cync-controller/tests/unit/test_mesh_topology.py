@@ -0,0 +1,125 @@
+"""
+Unit tests for the MeshTopology index and route-aware bridge selection for device commands.
+"""
+
+import time
+from unittest.mock import patch
+
+from cync_controller.bridge_health import BridgeHealth
+from cync_controller.devices import CyncDevice, CyncTCPDevice
+from cync_controller.mesh_topology import MeshTopology
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMeshTopology:
+    """Tests for MeshTopology"""
+
+    def test_mesh_report_replaces_routes_of_the_bridge(self):
+        clock = FakeClock()
+        topology = MeshTopology(clock=clock)
+        topology.update("10.0.0.2", [1, 2, 3])
+        topology.update("10.0.0.3", [3, 4])
+        assert topology.bridges_for(3) == {"10.0.0.2": 100.0, "10.0.0.3": 100.0}
+
+        clock.now = 160.0
+        topology.update("10.0.0.2", [1, 2])
+        assert topology.bridges_for(3) == {"10.0.0.3": 100.0}
+        assert topology.bridges_for(1) == {"10.0.0.2": 160.0}
+        assert topology.bridges_for(9) == {}
+
+    def test_confirm_and_remove_bridge(self):
+        clock = FakeClock()
+        topology = MeshTopology(clock=clock)
+        topology.update("10.0.0.2", [1])
+        clock.now = 130.0
+        topology.confirm("10.0.0.2", 1)
+        topology.confirm("10.0.0.3", 1)
+        assert topology.bridges_for(1) == {"10.0.0.2": 130.0, "10.0.0.3": 130.0}
+
+        topology.remove_bridge("10.0.0.2")
+        assert topology.bridges_for(1) == {"10.0.0.3": 130.0}
+        topology.remove_bridge("10.0.0.3")
+        assert topology.routes == {}
+
+    def test_islands_and_stats(self):
+        clock = FakeClock()
+        topology = MeshTopology(clock=clock)
+        topology.update("10.0.0.2", [1, 2])
+        topology.update("10.0.0.3", [2, 3])
+        topology.update("10.0.0.4", [7, 8])
+        topology.update("10.0.0.5", [])
+        clock.now = 145.0
+        assert topology.stats() == {
+            "devices": 5,
+            "bridges": 4,
+            "routes": 6,
+            "single_route_devices": 4,
+            "islands": 2,
+            "oldest_report_s": 45,
+        }
+
+
+class TestRouteAwareBridgeSelection:
+    """Tests for DeviceCommands._get_bridge_devices with a mesh topology"""
+
+    def _bridges(self, count: int) -> list[CyncTCPDevice]:
+        now = time.time()
+        bridges = []
+        for i in range(count):
+            bridge = CyncTCPDevice(reader=None, writer=None, address=f"10.0.0.{i + 2}")
+            bridge.ready_to_control = True
+            bridge.connected_at = now - 600
+            bridge.health = BridgeHealth(now)
+            bridges.append(bridge)
+        return bridges
+
+    def test_commands_go_to_the_island_of_the_device(self):
+        bridges = self._bridges(4)
+        topology = MeshTopology()
+        topology.update("10.0.0.2", [1, 2])
+        topology.update("10.0.0.4", [0x12])
+        topology.update("10.0.0.5", [0x12, 3])
+        with patch("cync_controller.devices.shared.g") as mock_g:
+            mock_g.ncync_server.tcp_devices = {b.address: b for b in bridges}
+            mock_g.ncync_server.mesh_topology = topology
+            device = CyncDevice(cync_id=0x12)
+            assert device._get_bridge_devices() == [bridges[2], bridges[3]]
+
+            # a device only one bridge reaches is sent through that bridge only
+            topology.update("10.0.0.5", [3])
+            assert device._get_bridge_devices() == [bridges[2]]
+
+            # unknown routes, or no ready bridge on them, fall back to the best bridges overall
+            bridges[2].ready_to_control = False
+            assert device._get_bridge_devices() == [bridges[0], bridges[1]]
+
+    def test_stale_routes_are_ignored(self):
+        bridges = self._bridges(4)
+        clock = FakeClock()
+        topology = MeshTopology(clock=clock)
+        topology.update("10.0.0.4", [0x12])
+        clock.now += 200
+        topology.update("10.0.0.5", [0x12])
+        with (
+            patch("cync_controller.devices.shared.g") as mock_g,
+            patch("cync_controller.devices.device_commands.CYNC_MESH_ROUTE_TTL", 150.0),
+        ):
+            mock_g.ncync_server.tcp_devices = {b.address: b for b in bridges}
+            mock_g.ncync_server.mesh_topology = topology
+            device = CyncDevice(cync_id=0x12)
+            assert device._get_bridge_devices() == [bridges[3]]
+
+            # an ACK through the old route confirms it again
+            topology.confirm("10.0.0.4", 0x12)
+            assert device._get_bridge_devices() == [bridges[2], bridges[3]]
+
+            # no fresh route left, fall back to the best bridges overall
+            clock.now += 200
+            assert device._get_bridge_devices() == [bridges[0], bridges[1]]
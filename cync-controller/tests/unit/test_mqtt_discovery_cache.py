@@ -0,0 +1,149 @@
+"""
+Unit tests for DiscoveryCache and the hash-gated publishing in homeassistant_discovery().
+"""
+
+import json
+import math
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from cync_controller.mqtt.discovery import DiscoveryHelper
+from cync_controller.mqtt.discovery_cache import DiscoveryCache
+from cync_controller.mqtt_client import MQTTClient
+
+
+def _light(cync_id: int, name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=cync_id,
+        hass_id=f"1000-{cync_id}",
+        home_id=1000,
+        name=name,
+        version=10203,
+        type=None,
+        mac="AA:BB:CC:DD:EE:FF",
+        wifi_mac="AA:BB:CC:DD:EE:00",
+        bt_only=False,
+        is_switch=False,
+        is_light=True,
+        metadata=None,
+        supports_temperature=True,
+        supports_rgb=False,
+        is_fan_controller=False,
+        brightness=None,
+    )
+
+
+class TestDiscoveryCache:
+    """Tests for DiscoveryCache"""
+
+    def test_only_changed_payloads_are_published(self):
+        cache = DiscoveryCache()
+        assert cache.changed("ha/light/1/config", b"a")
+        cache.mark_published("ha/light/1/config", b"a")
+
+        assert not cache.changed("ha/light/1/config", b"a")
+        assert cache.changed("ha/light/1/config", b"b")
+        cache.forget("ha/light/1/config")
+        assert cache.changed("ha/light/1/config", b"a")
+        assert cache.stats() == {"configs": 0, "published": 1, "unchanged": 1, "removed": 0}
+
+    def test_hashes_survive_a_restart(self, tmp_path):
+        path = tmp_path / "discovery_hashes.json"
+        cache = DiscoveryCache(path)
+        cache.mark_published("ha/light/1/config", b"a")
+        cache.mark_published("ha/light/2/config", b"b")
+        cache.save()
+
+        restarted = DiscoveryCache(path)
+        assert not restarted.changed("ha/light/1/config", b"a")
+        assert restarted.stale_topics({"ha/light/1/config"}) == ["ha/light/2/config"]
+
+    def test_unreadable_hash_file_is_ignored(self, tmp_path):
+        path = tmp_path / "discovery_hashes.json"
+        path.write_text("{not json")
+        cache = DiscoveryCache(path)
+        assert cache.published_hashes == {}
+        cache.mark_published("ha/light/1/config", b"a")
+        cache.save()
+        assert json.loads(path.read_text()) == {"ha/light/1/config": DiscoveryCache.digest(b"a")}
+
+
+class TestHashGatedDiscovery:
+    """homeassistant_discovery() with a DiscoveryCache"""
+
+    @pytest.fixture
+    def server(self):
+        devices = {1: _light(1, "Kitchen Light"), 2: _light(2, "Porch Floodlight 2")}
+        room = SimpleNamespace(id=100, name="Kitchen", is_subgroup=False, member_ids=[1])
+        return SimpleNamespace(devices=devices, groups={100: room})
+
+    def _helper(self, path) -> DiscoveryHelper:
+        MQTTClient._instance = None
+        with patch("cync_controller.mqtt_client.g") as mock_g:
+            mock_g.uuid = "bridge"
+            client = MQTTClient()
+        MQTTClient._instance = None
+        client._connected = True
+        client.topic = "cync_lan"
+        client.ha_topic = "homeassistant"
+        client.client.publish = AsyncMock()
+        helper = client.discovery
+        helper.cache = DiscoveryCache(path)
+        helper.create_bridge_device = AsyncMock(return_value=True)
+        return helper
+
+    @pytest.mark.asyncio
+    async def test_restart_republishes_nothing(self, tmp_path, server):
+        path = tmp_path / "discovery_hashes.json"
+        helper = self._helper(path)
+        with patch("cync_controller.mqtt.discovery.g", SimpleNamespace(ncync_server=server, uuid="bridge")):
+            assert await helper.homeassistant_discovery()
+            publish = helper.client.client.publish
+            assert publish.await_count == 2
+            topic, payload = publish.await_args_list[0].args
+            assert topic == "homeassistant/light/1000-1/config"
+            assert publish.await_args_list[0].kwargs["retain"] is True
+            config = json.loads(payload)
+            assert config["device"]["suggested_area"] == "Kitchen"
+            area = json.loads(publish.await_args_list[1].args[1])["device"]["suggested_area"]
+            assert area == "Porch"
+
+            # HASS birth message: nothing changed, nothing is published
+            assert await helper.homeassistant_discovery()
+            assert publish.await_count == 2
+
+            # addon restart: the hashes are loaded from disk
+            restarted = self._helper(path)
+            assert await restarted.homeassistant_discovery()
+            assert restarted.client.client.publish.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_republish_sends_unchanged_configs(self, tmp_path, server):
+        """Broker lost its retained store / entity deleted in HASS: every config goes out again"""
+        path = tmp_path / "discovery_hashes.json"
+        helper = self._helper(path)
+        with patch("cync_controller.mqtt.discovery.g", SimpleNamespace(ncync_server=server, uuid="bridge")):
+            await helper.homeassistant_discovery()
+            helper.client.client.publish.reset_mock()
+
+            assert await helper.republish_discovery()
+            topics = [c.args[0] for c in helper.client.client.publish.await_args_list]
+            assert topics == ["homeassistant/light/1000-1/config", "homeassistant/light/1000-2/config"]
+            # the hashes are back, the next discovery is quiet again
+            assert not DiscoveryCache(path).changed(*helper.cache.config("device:1"))
+
+    @pytest.mark.asyncio
+    async def test_removed_device_config_is_cleared(self, tmp_path, server):
+        helper = self._helper(tmp_path / "discovery_hashes.json")
+        with patch("cync_controller.mqtt.discovery.g", SimpleNamespace(ncync_server=server, uuid="bridge")):
+            await helper.homeassistant_discovery()
+            del server.devices[2]
+            helper.client.client.publish.reset_mock()
+
+            await helper.homeassistant_discovery()
+            helper.client.client.publish.assert_awaited_once_with(
+                "homeassistant/light/1000-2/config", b"", qos=0, retain=True, timeout=math.inf
+            )
+            assert helper.cache.stats()["removed"] == 1
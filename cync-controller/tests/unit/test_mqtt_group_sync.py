@@ -5,8 +5,10 @@ Tests for group member state synchronization, sync_group_devices(),
 sync_group_switches(), and aggregate state calculations.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiomqtt
 import pytest
 
 from cync_controller.mqtt_client import MQTTClient
@@ -259,3 +261,125 @@ class TestMQTTClientGroupSync:
                     synced += 1
 
             assert synced == 5
+
+
+class TestMQTTClientPublishMany:
+    """Tests for MQTTClient.publish_many and the bulk group sync built on it"""
+
+    @pytest.fixture(autouse=True)
+    def reset_mqtt_singleton(self):
+        """Reset MQTTClient singleton between tests"""
+        MQTTClient._instance = None
+        yield
+        MQTTClient._instance = None
+
+    @pytest.mark.asyncio
+    async def test_publish_many_bounds_in_flight(self):
+        """At most max_in_flight publishes are outstanding, results keep input order"""
+        in_flight = 0
+        peak = 0
+
+        async def publish(_topic, _payload, **_kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+        with patch("cync_controller.mqtt_client.g") as mock_g:
+            mock_g.uuid = "test-uuid"
+            client = MQTTClient()
+            client._connected = True
+            client.client.publish = AsyncMock(side_effect=publish)
+
+            messages = [(f"cync/status/{i}", b"ON") for i in range(20)]
+            results = await client.publish_many(messages, max_in_flight=4)
+
+        assert results == [True] * 20
+        assert peak == 4
+        assert [c.args[0] for c in client.client.publish.await_args_list] == [t for t, _ in messages]
+
+    @pytest.mark.asyncio
+    async def test_publish_many_stops_after_mqtt_error(self):
+        """A broker error marks the client disconnected and skips the rest"""
+        with patch("cync_controller.mqtt_client.g") as mock_g:
+            mock_g.uuid = "test-uuid"
+            client = MQTTClient()
+            client._connected = True
+            client.client.publish = AsyncMock(side_effect=[None, aiomqtt.MqttError("gone"), None, None])
+
+            results = await client.publish_many([(f"t/{i}", b"ON") for i in range(4)], max_in_flight=1)
+
+        assert results == [True, False, False, False]
+        assert client._connected is False
+        assert client.client.publish.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_publish_many_retries_timeouts_and_reports(self):
+        """A publish that times out is retried, a labelled batch keeps a timing report"""
+        stalled = {"t/1"}
+
+        async def publish(topic, _payload, **_kwargs):
+            if topic in stalled:
+                stalled.discard(topic)
+                await asyncio.sleep(1)
+
+        with patch("cync_controller.mqtt_client.g") as mock_g:
+            mock_g.uuid = "test-uuid"
+            client = MQTTClient()
+            client._connected = True
+            client.client.publish = AsyncMock(side_effect=publish)
+
+            messages = [(f"t/{i}", b"ON") for i in range(3)]
+            results = await client.publish_many(messages, timeout=0.02, label="test batch")
+
+        assert results == [True, True, True]
+        assert client._connected is True
+        assert client.client.publish.await_count == 4
+        report = client.publish_reports["test batch"]
+        assert report["messages"] == 3
+        assert report["published"] == 3
+        assert report["retried"] == 1
+        assert report["total_ms"] >= report["p95_ms"] >= 20
+
+    @pytest.mark.asyncio
+    async def test_publish_many_not_connected(self):
+        with patch("cync_controller.mqtt_client.g") as mock_g:
+            mock_g.uuid = "test-uuid"
+            client = MQTTClient()
+            client._connected = False
+            client.client.publish = AsyncMock()
+
+            assert await client.publish_many([("t/1", b"ON")]) == [False]
+            client.client.publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_sync_group_devices_publishes_members_as_one_batch(self):
+        """Group sync hands every member status to a single publish_many call"""
+        with patch("cync_controller.mqtt_client.g") as mock_g:
+            mock_g.uuid = "test-uuid"
+            devices = {}
+            for i in range(3):
+                device = MagicMock()
+                device.id = 0x7000 + i
+                device.name = f"Light {i}"
+                device.hass_id = f"home-{i}"
+                device.is_switch = i == 0
+                device.is_plug = False
+                devices[device.id] = device
+            mock_group = MagicMock()
+            mock_group.member_ids = [*devices, 0x7FFF]  # last one unknown
+            mock_g.ncync_server.devices = devices
+            mock_g.ncync_server.groups = {107: mock_group}
+
+            client = MQTTClient()
+            client._connected = True
+            client.publish_many = AsyncMock(return_value=[True, True, False])
+
+            synced = await client.sync_group_devices(107, 1, "Kitchen")
+
+        assert synced == 2
+        client.publish_many.assert_awaited_once()
+        topics = [topic for topic, _ in client.publish_many.await_args.args[0]]
+        assert topics == [f"{client.topic}/status/home-{i}" for i in range(3)]
+        assert all(device.state == 1 for device in devices.values())
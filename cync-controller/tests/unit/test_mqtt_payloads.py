@@ -0,0 +1,156 @@
+"""
+Unit tests for TopicCache / StatePayloads, plus a micro-benchmark (slow marker) of status publish
+preparation (topic + payload) against the per-publish f-string and json.dumps it replaced.
+"""
+
+import json
+import logging
+import random
+import time
+
+import pytest
+
+from cync_controller.mqtt.payloads import OFF, ON, StatePayloads, TopicCache, fan_preset_mode, power_payload
+from cync_controller.structs import FanSpeed
+
+logger = logging.getLogger(__name__)
+
+
+class TestTopicCache:
+    """Tests for TopicCache"""
+
+    def test_topics_match_the_formatted_strings(self):
+        topics = TopicCache("cync_lan")
+        assert topics.status("1000-17") == "cync_lan/status/1000-17"
+        assert topics.availability("1000-17") == "cync_lan/availability/1000-17"
+        assert topics.preset("1000-17") == "cync_lan/status/1000-17/preset"
+
+    def test_topics_are_built_once(self):
+        topics = TopicCache("cync_lan")
+        assert topics.status("1000-group-3") is topics.status("1000-group-3")
+        assert topics.availability("1000-3") is topics.availability("1000-3")
+
+
+class TestStatePayloads:
+    """Tests for StatePayloads, power_payload() and fan_preset_mode()"""
+
+    def test_power_payload(self):
+        assert power_payload(True) is ON
+        assert power_payload(False) is OFF
+
+    @pytest.mark.parametrize(
+        ("brightness", "preset"),
+        [
+            (0, FanSpeed.OFF),
+            (1, FanSpeed.LOW),
+            (25, FanSpeed.LOW),
+            (26, FanSpeed.MEDIUM),
+            (50, FanSpeed.MEDIUM),
+            (60, FanSpeed.HIGH),
+            (75, FanSpeed.HIGH),
+            (76, FanSpeed.MAX),
+            (100, FanSpeed.MAX),
+        ],
+    )
+    def test_fan_preset_mode(self, brightness, preset):
+        """Exact steps map to their preset, values in between to the next preset up"""
+        assert fan_preset_mode(brightness) is preset
+        assert fan_preset_mode(brightness).encode() == preset.value.encode()
+
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [
+            ({"state": "ON"}, {"state": "ON"}),
+            (
+                {"state": "ON", "brightness": 80, "color_mode": "brightness"},
+                {"state": "ON", "brightness": 80, "color_mode": "brightness"},
+            ),
+            (
+                {"state": "OFF", "brightness": 0, "color_mode": "color_temp", "color_temp": 2700},
+                {"state": "OFF", "brightness": 0, "color_mode": "color_temp", "color_temp": 2700},
+            ),
+            (
+                {"state": "ON", "color_mode": "rgb", "color": (255, 0, None)},
+                {"state": "ON", "color_mode": "rgb", "color": {"r": 255, "g": 0, "b": None}},
+            ),
+        ],
+    )
+    def test_light_payload_matches_json_dumps(self, kwargs, expected):
+        """Byte for byte what json.dumps of the old dict produced, including key order"""
+        assert StatePayloads().light(**kwargs) == json.dumps(expected).encode()
+
+    def test_light_payload_is_interned(self):
+        payloads = StatePayloads()
+        first = payloads.light("ON", brightness=50, color_mode="color_temp")
+        assert payloads.light("ON", brightness=50, color_mode="color_temp") is first
+        assert payloads.light("ON", brightness=51, color_mode="color_temp") is not first
+        assert payloads.stats() == {"entries": 2, "hits": 1, "misses": 2}
+
+    def test_memo_is_bounded(self):
+        payloads = StatePayloads(max_entries=4)
+        for bri in range(10):
+            payloads.light("ON", brightness=bri, color_mode="brightness")
+        assert payloads.stats()["entries"] <= 4
+
+
+N_STATUSES = 20_000
+
+
+def _status_stream() -> list[tuple[str, str, int, int]]:
+    """(hass_id, state, brightness, color temp) for a 64 device home, skewed towards a few common states"""
+    rng = random.Random(0)
+    hass_ids = [f"1234567890-{dev_id}" for dev_id in range(64)]
+    return [
+        (
+            rng.choice(hass_ids),
+            rng.choice(("ON", "OFF")),
+            rng.choice((0, 25, 50, 75, 100)),
+            rng.choice((2700, 4000, 6500)),
+        )
+        for _ in range(N_STATUSES)
+    ]
+
+
+def _legacy_prepare(base: str, stream) -> list[tuple[str, bytes]]:
+    out = []
+    for hass_id, state, bri, kelvin in stream:
+        mqtt_dev_state = {"state": state, "brightness": bri, "color_mode": "color_temp", "color_temp": kelvin}
+        out.append((f"{base}/status/{hass_id}", json.dumps(mqtt_dev_state).encode()))
+    return out
+
+
+def _interned_prepare(topics: TopicCache, payloads: StatePayloads, stream) -> list[tuple[str, bytes]]:
+    return [
+        (topics.status(hass_id), payloads.light(state, brightness=bri, color_mode="color_temp", color_temp=kelvin))
+        for hass_id, state, bri, kelvin in stream
+    ]
+
+
+class TestPublishPreparationBenchmark:
+    """Topic + payload preparation cost per status publish, interned vs. formatted per publish"""
+
+    def test_prepared_messages_match(self):
+        stream = _status_stream()
+        assert _interned_prepare(TopicCache("cync_lan"), StatePayloads(), stream) == _legacy_prepare("cync_lan", stream)
+
+    @pytest.mark.slow
+    def test_prepare_us_per_status(self):
+        stream = _status_stream()
+        topics = TopicCache("cync_lan")
+        payloads = StatePayloads()
+        legacy_us = interned_us = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            _legacy_prepare("cync_lan", stream)
+            legacy_us = min(legacy_us, (time.perf_counter() - start) / N_STATUSES * 1_000_000)
+            start = time.perf_counter()
+            _interned_prepare(topics, payloads, stream)
+            interned_us = min(interned_us, (time.perf_counter() - start) / N_STATUSES * 1_000_000)
+
+        logger.info(
+            "light status x%d: f-string + json.dumps %.2f us/status, interned %.2f us/status (%d distinct payloads)",
+            N_STATUSES,
+            legacy_us,
+            interned_us,
+            payloads.stats()["entries"],
+        )
@@ -0,0 +1,200 @@
+"""
+Unit tests for StatePublishCache and the change detection / coalescing in send_device_status().
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import aiomqtt
+import pytest
+
+from cync_controller.mqtt.state_cache import StatePublishCache
+from cync_controller.mqtt.state_updates import StateUpdateHelper
+
+
+class TestStatePublishCache:
+    """Tests for StatePublishCache decisions"""
+
+    def test_first_publish_goes_out(self):
+        cache = StatePublishCache(window=0.05)
+        assert cache.admit(1, b"ON", now=0.0) == StatePublishCache.PUBLISH
+        assert cache.emitted == 1
+
+    def test_identical_payload_is_suppressed(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"ON", now=0.0)
+
+        assert cache.admit(1, b"ON", now=10.0) == StatePublishCache.DUPLICATE
+        assert cache.suppressed == 1
+        assert cache.emitted == 1
+
+    def test_devices_are_tracked_separately(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"ON", now=0.0)
+
+        assert cache.admit(2, b"ON", now=0.0) == StatePublishCache.PUBLISH
+
+    def test_burst_inside_window_is_deferred_and_collapsed(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"OFF", now=0.0)
+
+        assert cache.admit(1, b'{"brightness": 10}', now=0.01) == StatePublishCache.DEFER
+        assert cache.admit(1, b'{"brightness": 20}', now=0.02) == StatePublishCache.DEFER
+        assert cache.delay(1, now=0.02) == pytest.approx(0.03)
+        assert cache.take_pending(1, now=0.05) == b'{"brightness": 20}'
+        assert cache.coalesced == 1
+        assert cache.emitted == 2
+        assert cache.take_pending(1) is None
+
+    def test_burst_returning_to_published_state_drops_pending(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"OFF", now=0.0)
+        cache.admit(1, b"ON", now=0.01)
+
+        assert cache.admit(1, b"OFF", now=0.02) == StatePublishCache.DUPLICATE
+        assert cache.take_pending(1) is None
+
+    def test_publish_after_window(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"OFF", now=0.0)
+
+        assert cache.admit(1, b"ON", now=0.1) == StatePublishCache.PUBLISH
+
+    def test_invalidate_forces_republish(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"ON", now=0.0)
+        cache.invalidate()
+
+        assert cache.admit(1, b"ON", now=0.01) == StatePublishCache.PUBLISH
+
+    def test_publish_after_window_drops_pending(self):
+        """A publish once the window closed supersedes the deferred state, the late flush sends nothing"""
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"OFF", now=0.0)
+        cache.admit(1, b"ON", now=0.01)
+
+        assert cache.admit(1, b'{"brightness": 5}', now=0.06) == StatePublishCache.PUBLISH
+        assert cache.take_pending(1) is None
+
+    def test_invalidate_drops_pending(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"OFF", now=0.0)
+        cache.admit(1, b"ON", now=0.01)
+        cache.invalidate()
+
+        assert cache.take_pending(1) is None
+        assert cache.stats()["pending"] == 0
+
+    def test_forget_single_device(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"ON", now=0.0)
+        cache.admit(2, b"ON", now=0.0)
+        cache.forget(1)
+
+        assert cache.admit(1, b"ON", now=1.0) == StatePublishCache.PUBLISH
+        assert cache.admit(2, b"ON", now=1.0) == StatePublishCache.DUPLICATE
+
+    def test_stats(self):
+        cache = StatePublishCache(window=0.05)
+        cache.admit(1, b"ON", now=0.0)
+        cache.admit(1, b"ON", now=0.01)
+        cache.admit(1, b"OFF", now=0.02)
+
+        assert cache.stats() == {"emitted": 1, "suppressed": 1, "coalesced": 0, "pending": 1}
+
+
+@pytest.fixture
+def helper():
+    client = MagicMock()
+    client.lp = "mqtt:"
+    client.topic = "cync_test"
+    client._connected = True
+    client.client.publish = AsyncMock()
+    state_updates = StateUpdateHelper(client)
+    state_updates.publish_cache.window = 0.02
+    return state_updates
+
+
+@pytest.fixture
+def device():
+    dev = MagicMock()
+    dev.id = 0x10
+    dev.name = "Test Light"
+    dev.hass_id = "1234-16"
+    return dev
+
+
+class TestSendDeviceStatusCoalescing:
+    """Tests for change detection and coalescing in StateUpdateHelper.send_device_status"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_state_not_republished(self, helper, device):
+        assert await helper.send_device_status(device, b"ON") is True
+        await asyncio.sleep(0.03)
+        assert await helper.send_device_status(device, b"ON") is True
+
+        helper.client.client.publish.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_burst_publishes_final_state(self, helper, device):
+        await helper.send_device_status(device, b'{"brightness": 1}')
+        await helper.send_device_status(device, b'{"brightness": 2}')
+        await helper.send_device_status(device, b'{"brightness": 3}')
+
+        assert helper.client.client.publish.await_count == 1
+        await asyncio.sleep(0.05)
+
+        assert helper.client.client.publish.await_count == 2
+        last_call = helper.client.client.publish.await_args_list[-1]
+        assert last_call.args == ("cync_test/status/1234-16", b'{"brightness": 3}')
+
+    @pytest.mark.asyncio
+    async def test_force_next_publish(self, helper, device):
+        await helper.send_device_status(device, b"ON")
+        await asyncio.sleep(0.03)
+        helper.force_next_publish()
+        await helper.send_device_status(device, b"ON")
+
+        assert helper.client.client.publish.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deferred_state_not_sent_after_forced_publish(self, helper, device):
+        await helper.send_device_status(device, b"OFF")
+        await helper.send_device_status(device, b"ON")  # deferred, flush scheduled
+        helper.force_next_publish()
+        await helper.send_device_status(device, b'{"brightness": 7}')
+        await asyncio.sleep(0.05)
+
+        payloads = [c.args[1] for c in helper.client.client.publish.await_args_list]
+        assert payloads == [b"OFF", b'{"brightness": 7}']
+
+    @pytest.mark.asyncio
+    async def test_deferred_state_not_sent_after_publish_past_window(self, helper, device):
+        await helper.send_device_status(device, b"OFF")
+        await helper.send_device_status(device, b"ON")  # deferred, flush scheduled
+        # the window is over before the flush task gets to run
+        helper.publish_cache.window = 0
+        await helper.send_device_status(device, b'{"brightness": 7}')
+        await asyncio.sleep(0.05)
+
+        payloads = [c.args[1] for c in helper.client.client.publish.await_args_list]
+        assert payloads == [b"OFF", b'{"brightness": 7}']
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_is_retried_next_time(self, helper, device):
+        helper.client.client.publish.side_effect = [aiomqtt.MqttError("boom"), None]
+
+        assert await helper.send_device_status(device, b"ON") is False
+        helper.client._connected = True
+        assert await helper.send_device_status(device, b"ON") is True
+
+        assert helper.client.client.publish.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_not_connected_does_not_record(self, helper, device):
+        helper.client._connected = False
+        assert await helper.send_device_status(device, b"ON") is False
+        helper.client._connected = True
+        await helper.send_device_status(device, b"ON")
+
+        helper.client.client.publish.assert_awaited_once()
@@ -0,0 +1,133 @@
+"""
+Unit tests for StateReplay and the batched availability / state replay on re-connect and HASS birth.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cync_controller.mqtt.state_replay import StateReplay
+from cync_controller.mqtt_client import MQTTClient
+
+
+class TestStateReplay:
+    """Tests for StateReplay"""
+
+    @pytest.mark.asyncio
+    async def test_replays_latest_payloads_in_batches(self):
+        replay = StateReplay(batch_size=2)
+        replay.record_availability("cync/availability/1", False)
+        replay.record_availability("cync/availability/1", True)
+        replay.record_state(1, "cync/status/1", b"OFF")
+        replay.record_state(1, "cync/status/1", b"ON")
+        replay.record_state(2, "cync/status/2", b"OFF")
+
+        batches = []
+
+        async def publish_many(batch):
+            batches.append(batch)
+            return [topic != "cync/status/2" for topic, _ in batch]
+
+        states = await replay.replay(publish_many)
+        assert batches == [
+            [("cync/availability/1", b"online"), ("cync/status/1", b"ON")],
+            [("cync/status/2", b"OFF")],
+        ]
+        assert states == {1: b"ON"}
+        assert replay.stats() == {"availability": 1, "states": 2, "replays": 1, "replayed": 2}
+
+
+class TestReplayStates:
+    """Tests for StateUpdateHelper.replay_states()"""
+
+    @pytest.fixture(autouse=True)
+    def reset_mqtt_singleton(self):
+        """Reset MQTTClient singleton between tests"""
+        MQTTClient._instance = None
+        yield
+        MQTTClient._instance = None
+
+    @staticmethod
+    def _switch(dev_id):
+        device = MagicMock()
+        device.id = dev_id
+        device.home_id = 1000
+        device.name = f"Switch {dev_id}"
+        device.hass_id = f"1000-{dev_id}"
+        device.is_plug = False
+        device.is_switch = True
+        device.is_fan_controller = False
+        device.online = True
+        device.state = 1
+        return device
+
+    @pytest.mark.asyncio
+    async def test_payloads_built_while_disconnected_are_replayed(self):
+        with (
+            patch("cync_controller.mqtt_client.g") as mock_g,
+            patch("cync_controller.mqtt_client.aiomqtt.Client"),
+        ):
+            mock_g.uuid = "test-uuid"
+            devices = {1: self._switch(1), 2: self._switch(2)}
+            subgroup = SimpleNamespace(is_subgroup=True, hass_id="1000-group-7")
+            mock_g.ncync_server.devices = devices
+            mock_g.ncync_server.groups = {7: subgroup}
+
+            client = MQTTClient()
+            client.topic = "cync"
+            client._connected = False
+            helper = client.state_updates
+            await helper.pub_online(1, False)
+            await helper.send_device_status(devices[1], b"OFF")
+
+            client._connected = True
+            client.publish_many = AsyncMock(side_effect=lambda batch: [True] * len(batch))
+            sent = await helper.replay_states("'re-connect'")
+
+        (replay_batch, fallback_batch) = [c.args[0] for c in client.publish_many.await_args_list]
+        # device 1 from the store, device 2 never had a payload built and falls back to its current state
+        assert replay_batch == [
+            ("cync/availability/1000-1", b"offline"),
+            ("cync/availability/1000-2", b"online"),
+            ("cync/availability/1000-group-7", b"online"),
+            ("cync/status/1000-1", b"OFF"),
+        ]
+        assert fallback_batch == [("cync/status/1000-2", b"ON")]
+        assert sent == 4
+        # the replayed state counts as published, an identical status is not sent again
+        assert not helper._admit_device_status(devices[1], b"OFF")
+
+    @pytest.mark.asyncio
+    async def test_partial_updates_replay_the_complete_state(self):
+        """A temperature / brightness only publish must not replay a light without its brightness or colour"""
+        with (
+            patch("cync_controller.mqtt_client.g") as mock_g,
+            patch("cync_controller.mqtt_client.aiomqtt.Client"),
+        ):
+            mock_g.uuid = "test-uuid"
+            light = self._switch(1)
+            light.is_switch = False
+            light.supports_temperature = True
+            light.supports_rgb = False
+            light.brightness = 80
+            light.temperature = 50
+            mock_g.ncync_server.devices = {1: light}
+            mock_g.ncync_server.groups = {}
+
+            client = MQTTClient()
+            client.topic = "cync"
+            client._connected = False
+            helper = client.state_updates
+            await helper.update_temperature(light, 30)
+            await helper.update_device_state(light, 1)
+
+            client._connected = True
+            client.publish_many = AsyncMock(side_effect=lambda batch: [True] * len(batch))
+            await helper.replay_states("'hass_birth'")
+
+        (replay_batch,) = [c.args[0] for c in client.publish_many.await_args_list]
+        assert replay_batch[-1] == (
+            "cync/status/1000-1",
+            b'{"state": "ON", "brightness": 80, "color_mode": "color_temp", "color_temp": %d}' % client.cync2kelvin(30),
+        )
@@ -250,3 +250,90 @@ class TestMQTTClientStateUpdates:
             # Verify device is marked online
             assert mock_device.online is True
             assert mock_device.available is True
+
+
+class TestMQTTClientBatchStatuses:
+    """Tests for parse_device_statuses() and publish_group_states() (mesh snapshot publishing)"""
+
+    @pytest.fixture(autouse=True)
+    def reset_mqtt_singleton(self):
+        """Reset MQTTClient singleton between tests"""
+        MQTTClient._instance = None
+        yield
+        MQTTClient._instance = None
+
+    @staticmethod
+    def _light(dev_id, fan=False):
+        device = MagicMock()
+        device.id = dev_id
+        device.name = f"Light {dev_id}"
+        device.hass_id = f"home-{dev_id}"
+        device.is_plug = False
+        device.is_switch = False
+        device.is_fan_controller = fan
+        device.supports_rgb = False
+        device.supports_temperature = False
+        return device
+
+    @pytest.mark.asyncio
+    async def test_parse_device_statuses_publishes_one_batch(self):
+        """Every known device goes out in one publish_many call, fan presets in a second one"""
+        from cync_controller.structs import DeviceStatus
+
+        with (
+            patch("cync_controller.mqtt_client.g") as mock_g,
+            patch("cync_controller.mqtt_client.aiomqtt.Client"),
+        ):
+            mock_g.uuid = "test-uuid"
+            mock_g.ncync_server.devices = {1: self._light(1), 2: self._light(2, fan=True)}
+
+            client = MQTTClient()
+            client._connected = True
+            client.publish_many = AsyncMock(side_effect=[[True, True], [True]])
+
+            results = await client.parse_device_statuses(
+                [
+                    (1, DeviceStatus(state=1, brightness=40)),
+                    (99, DeviceStatus(state=1, brightness=40)),  # unknown device
+                    (2, DeviceStatus(state=1, brightness=50)),
+                ],
+                from_pkt="'mesh info'",
+            )
+
+        assert results == [True, False, True]
+        assert client.publish_many.await_count == 2
+        status_batch = client.publish_many.await_args_list[0].args[0]
+        assert [topic for topic, _ in status_batch] == [
+            f"{client.topic}/status/home-1",
+            f"{client.topic}/status/home-2",
+        ]
+        preset_call = client.publish_many.await_args_list[1]
+        assert preset_call.args[0] == [(f"{client.topic}/status/home-2/preset", b"medium")]
+        assert preset_call.kwargs == {"retain": True}
+
+    @pytest.mark.asyncio
+    async def test_publish_group_states_skips_empty_updates(self):
+        """Group states are built like publish_group_state() and sent as one batch"""
+        from cync_controller.devices import CyncGroup
+
+        with (
+            patch("cync_controller.mqtt_client.g") as mock_g,
+            patch("cync_controller.mqtt_client.aiomqtt.Client"),
+            patch("cync_controller.devices.g"),
+        ):
+            mock_g.uuid = "test-uuid"
+            sub = CyncGroup(group_id=0x20, name="Sub", member_ids=[], is_subgroup=True, home_id=1)
+            room = CyncGroup(group_id=0x21, name="Room", member_ids=[], home_id=1)
+
+            client = MQTTClient()
+            client._connected = True
+            client.publish_many = AsyncMock(return_value=[True])
+
+            results = await client.publish_group_states(
+                [(sub, 1, 60, None, "aggregated:mesh"), (room, None, None, None, "mesh")]
+            )
+
+        assert results == [True, False]
+        ((topic, payload),) = client.publish_many.await_args.args[0]
+        assert topic == f"{client.topic}/status/{sub.hass_id}"
+        assert payload == b'{"state": "ON", "brightness": 60, "color_mode": "brightness", "origin": "aggregated:mesh"}'
@@ -0,0 +1,366 @@
+"""
+Unit tests for TopicRouter and CommandRouter.route(), a fuzz run of both, and a command throughput
+benchmark (slow marker) against the split / if-elif / per-message regex dispatch it replaced.
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cync_controller.mqtt import command_routing
+from cync_controller.mqtt.commands import SetBrightnessCommand, SetPowerCommand
+from cync_controller.mqtt.topic_router import TopicRouter
+from cync_controller.mqtt_client import MQTTClient
+from cync_controller.structs import FanSpeed
+
+
+class TestTopicRouter:
+    """Tests for TopicRouter"""
+
+    def test_literal_wildcard_and_rest(self):
+        router = TopicRouter()
+        router.add("cync/set/bridge/restart", "restart")
+        router.add("cync/set/+", "target")
+        router.add("cync/set/+/preset", "preset")
+        router.add("cync/#", "unknown")
+
+        assert router.match("cync/set/bridge/restart") == ("restart", ())
+        assert router.match("cync/set/1000-5") == ("target", ("1000-5",))
+        assert router.match("cync/set/1000-5/preset") == ("preset", ("1000-5",))
+        # literal beats '+', '+' beats '#', '#' picks up whatever is left
+        assert router.match("cync/set/bridge") == ("target", ("bridge",))
+        assert router.match("cync/set/1000-5/speed") == ("unknown", ("set/1000-5/speed",))
+        assert router.match("homeassistant/status") is None
+
+    def test_lookups_are_memoized(self):
+        router = TopicRouter()
+        router.add("cync/set/+", "target")
+        for _ in range(3):
+            router.match("cync/set/1000-5")
+        assert router.stats() == {"memoized": 1, "hits": 2, "misses": 1}
+        # registering a pattern drops the memo
+        router.add("cync/set/+/preset", "preset")
+        assert router.stats()["memoized"] == 0
+
+    def test_hash_must_be_last(self):
+        with pytest.raises(ValueError, match="last level"):
+            TopicRouter().add("cync/#/set", "bad")
+
+
+def _device(dev_id, *, fan=False):
+    device = MagicMock()
+    device.id = dev_id
+    device.name = f"Device {dev_id}"
+    device.is_fan_controller = fan
+    device.set_brightness = AsyncMock()
+    device.set_fan_speed = AsyncMock()
+    device.set_rgb = AsyncMock()
+    return device
+
+
+def _group(group_id):
+    group = MagicMock()
+    group.id = group_id
+    group.name = f"Group {group_id}"
+    return group
+
+
+@pytest.fixture
+async def routed():
+    """CommandRouter of a fresh MQTTClient with 2 lights, a fan and a group, commands land in ``enqueued``"""
+    MQTTClient._instance = None
+    enqueued = []
+
+    class Processor:
+        async def enqueue(self, cmd):
+            enqueued.append(cmd)
+
+    processor = Processor()
+    with (
+        patch("cync_controller.mqtt_client.g") as mock_g,
+        patch("cync_controller.mqtt.command_routing.CommandProcessor", new=lambda: processor),
+    ):
+        mock_g.uuid = "test-uuid"
+        mock_g.ncync_server.devices = {5: _device(5), 6: _device(6), 9: _device(9, fan=True)}
+        mock_g.ncync_server.groups = {3: _group(3)}
+        client = MQTTClient()
+        client.topic = "cync"
+        client.ha_topic = "homeassistant"
+        client.publish = AsyncMock()
+        client.trigger_status_refresh = AsyncMock()
+        client.republish_discovery = AsyncMock()
+        yield client.command_router, mock_g.ncync_server, enqueued
+    MQTTClient._instance = None
+
+
+class TestCommandRouting:
+    """Tests for CommandRouter.route()"""
+
+    @pytest.mark.asyncio
+    async def test_plain_power_for_device_and_group(self, routed):
+        router, server, enqueued = routed
+        assert await router.route("cync/set/1000-5", b"ON")
+        assert await router.route("cync/set/1000-group-3", b" off ")
+        assert [(type(c), c.device_or_group, c.state) for c in enqueued] == [
+            (SetPowerCommand, server.devices[5], 1),
+            (SetPowerCommand, server.groups[3], 0),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_json_state(self, routed):
+        router, server, enqueued = routed
+        await router.route("cync/set/1000-6", json.dumps({"state": "ON", "brightness": 40}).encode())
+        await router.route("cync/set/1000-6", json.dumps({"state": "ON", "color": {"r": 9, "b": 3}}).encode())
+        assert len(enqueued) == 2
+        assert isinstance(enqueued[0], SetBrightnessCommand)
+        assert enqueued[0].brightness == 40
+        assert isinstance(enqueued[1], SetPowerCommand)
+        server.devices[6].set_rgb.assert_awaited_once_with(9, 0, 3)
+
+    @pytest.mark.asyncio
+    async def test_fan_percentage_and_preset(self, routed):
+        router, server, _ = routed
+        await router.route("cync/set/1000-9/percentage", b"60")
+        await router.route("cync/set/1000-9/preset", b"High")
+        server.devices[9].set_brightness.assert_awaited_once_with(75)
+        server.devices[9].set_fan_speed.assert_awaited_once_with(FanSpeed.HIGH)
+        # not a fan, nothing sent
+        await router.route("cync/set/1000-5/preset", b"low")
+        server.devices[5].set_fan_speed.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bridge_buttons(self, routed):
+        router, _, enqueued = routed
+        await router.route("cync/set/bridge/refresh_status", b"PRESS")
+        router.client.trigger_status_refresh.assert_awaited_once()
+        await router.route("cync/set/bridge/rediscover", b"PRESS")
+        router.client.republish_discovery.assert_awaited_once()
+        with patch("cync_controller.mqtt.command_routing.set_call_site_tracing") as tracing:
+            await router.route("cync/set/bridge/call_site_tracing", b"ON")
+        tracing.assert_called_once_with(True)
+        router.client.publish.assert_awaited_once_with("cync/status/bridge/call_site_tracing", b"ON")
+        # bridge buttons never turn into power commands
+        assert enqueued == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_targets_and_topics_are_dropped(self, routed):
+        router, _, enqueued = routed
+        assert await router.route("cync/set/1000-77", b"ON")
+        assert await router.route("cync/set/1000-group-77", b"ON")
+        assert await router.route("cync/set/bridge", b"ON")
+        assert await router.route("cync/status/1000-5", b"ON")
+        assert not await router.route("other/set/1000-5", b"ON")
+        assert not await router.route("cync/set/1000-5", b"")
+        assert enqueued == []
+
+    @pytest.mark.asyncio
+    async def test_hass_birth_replays_states(self, routed):
+        router, _, _ = routed
+        router.client.homeassistant_discovery = AsyncMock()
+        router.client.state_updates.replay_states = AsyncMock()
+        with patch("cync_controller.mqtt.command_routing.asyncio.sleep", new=AsyncMock()):
+            await router.route("homeassistant/status", b"online")
+        router.client.homeassistant_discovery.assert_awaited_once()
+        router.client.state_updates.replay_states.assert_awaited_once_with("'hass_birth'")
+
+
+def _reference_match(patterns, topic):
+    """Naive matcher: first pattern (literal > '+' > '#', level by level) that matches ``topic``"""
+
+    def rank(pattern):
+        return [0 if level not in ("+", "#") else 1 if level == "+" else 2 for level in pattern.split("/")]
+
+    for pattern, handler in sorted(patterns, key=lambda p: rank(p[0])):
+        levels = pattern.split("/")
+        parts = topic.split("/")
+        captures = []
+        for idx, level in enumerate(levels):
+            if level == "#":
+                if idx < len(parts):
+                    captures.append("/".join(parts[idx:]))
+                    return handler, tuple(captures)
+                break
+            if idx >= len(parts) or (level != "+" and level != parts[idx]):
+                break
+            if level == "+":
+                captures.append(parts[idx])
+        else:
+            if len(parts) == len(levels):
+                return handler, tuple(captures)
+    return None
+
+
+_LEVELS = ["cync", "set", "bridge", "1000-5", "1000-group-3", "preset", "percentage", "restart", "otp", "", "x"]
+_PAYLOADS = [
+    b"ON",
+    b"off",
+    b"PRESS",
+    b"42",
+    b"-1",
+    b"high",
+    b"{",
+    b"{}",
+    b'{"state": 1}',
+    b'{"brightness": "x"}',
+    b'{"color": [1, 2]}',
+    b'{"state": "ON", "color_temp": 3000}',
+    b"\xff\xfe",
+    b"two words",
+]
+
+
+class TestRoutingFuzz:
+    """Random topics / payloads: the trie agrees with a naive matcher and route() never raises"""
+
+    def test_trie_matches_reference(self):
+        patterns = [
+            ("cync/set/bridge/restart", "restart"),
+            ("cync/set/bridge/otp/input", "otp"),
+            ("cync/set/+", "target"),
+            ("cync/set/+/preset", "preset"),
+            ("cync/+/+/percentage", "percentage"),
+            ("cync/#", "unknown"),
+            ("homeassistant/status", "hass"),
+        ]
+        router = TopicRouter()
+        for pattern, handler in patterns:
+            router.add(pattern, handler)
+        rng = random.Random(0)
+        for _ in range(5000):
+            topic = "/".join(rng.choice([*_LEVELS, "homeassistant", "status"]) for _ in range(rng.randint(1, 5)))
+            assert router.match(topic) == _reference_match(patterns, topic), topic
+
+    @pytest.mark.asyncio
+    async def test_route_never_raises(self, routed):
+        router, server, enqueued = routed
+        rng = random.Random(1)
+        for _ in range(3000):
+            prefix = rng.choice(["cync/set", "cync/set", "cync", "homeassistant/status", ""])
+            topic = "/".join([prefix, *(rng.choice(_LEVELS) for _ in range(rng.randint(0, 3)))])
+            payload = rng.choice(_PAYLOADS) if rng.random() < 0.8 else rng.randbytes(rng.randint(0, 8))
+            assert isinstance(await router.route(topic, payload), bool)
+        targets = [*server.devices.values(), *server.groups.values()]
+        assert enqueued
+        assert all(any(cmd.device_or_group is target for target in targets) for cmd in enqueued)
+
+
+async def _legacy_dispatch(topic_value, payload):
+    """The old start_receiver_task body for device / group set topics (log calls and lookups included)"""
+    logger = command_routing.logger
+    g = command_routing.g
+    lp = "mqtt:rcv:"
+    logger.info(
+        "%s >>> MQTT MESSAGE RECEIVED: topic=%s, payload_len=%d, payload=%s",
+        lp,
+        topic_value,
+        len(payload) if payload else 0,
+        payload.decode() if payload else None,
+    )
+    _topic = topic_value.split("/")
+    if _topic[0] == "cync" and _topic[1] == "set":
+        if "-group-" in _topic[2]:
+            group_id = int(_topic[2].split("-group-")[1])
+            if group_id not in g.ncync_server.groups:
+                return
+            group = g.ncync_server.groups[group_id]
+            device = None
+            logger.info("%s Group command detected: %s, %s, %s", lp, group_id, group.name, topic_value)
+        else:
+            device_id = int(_topic[2].split("-")[1])
+            if device_id not in g.ncync_server.devices:
+                return
+            device = g.ncync_server.devices[device_id]
+            group = None
+            logger.debug("%s Device identified: %s, %s, %s", lp, device.name, device.id, device.is_fan_controller)
+        target = group if group else device
+        target_type = "GROUP" if group else "DEVICE" if target else "UNKNOWN"
+        if target:
+            logger.info("%s Target determined: %s, %s, %s", lp, target_type, target.name, payload.decode())
+        if payload.startswith(b"{"):
+            json_data = json.loads(payload)
+            if "state" in json_data and "brightness" not in json_data:
+                state = 1 if json_data["state"].upper() == "ON" else 0
+                logger.info("%s Calling set_power(%s) on %s '%s'", lp, state, target_type, target.name)
+                await command_routing.CommandProcessor().enqueue(SetPowerCommand(target, state))
+            if "brightness" in json_data:
+                lum = int(json_data["brightness"])
+                await command_routing.CommandProcessor().enqueue(SetBrightnessCommand(target, lum))
+        else:
+            str_payload = payload.decode("utf-8").strip()
+            pattern = re.compile(r"^\w+$")
+            if pattern.match(str_payload):
+                if str_payload.casefold() == "on":
+                    logger.info("%s Calling set_power(1) on %s '%s'", lp, target_type, target.name)
+                    await command_routing.CommandProcessor().enqueue(SetPowerCommand(target, 1))
+                elif str_payload.casefold() == "off":
+                    logger.info("%s Calling set_power(0) on %s '%s'", lp, target_type, target.name)
+                    await command_routing.CommandProcessor().enqueue(SetPowerCommand(target, 0))
+
+
+N_COMMANDS = 20_000
+
+
+def _set_messages(n: int) -> list[tuple[str, bytes]]:
+    rng = random.Random(2)
+    targets = ["1000-5", "1000-6", "1000-group-3"]
+    payloads = [b"ON", b"OFF", b'{"state": "ON"}', b'{"state": "ON", "brightness": 60}']
+    return [(f"cync/set/{rng.choice(targets)}", rng.choice(payloads)) for _ in range(n)]
+
+
+def _commands(enqueued) -> list[tuple]:
+    return [(type(c), c.device_or_group, getattr(c, "state", None)) for c in enqueued]
+
+
+class TestCommandThroughputBenchmark:
+    """Commands routed per second, TopicRouter vs. the legacy dispatch, INFO logging filtered out"""
+
+    @pytest.mark.asyncio
+    async def test_router_enqueues_what_legacy_dispatch_did(self, routed):
+        router, _, enqueued = routed
+        messages = _set_messages(500)
+        for topic, payload in messages:
+            await _legacy_dispatch(topic, payload)
+        legacy_cmds = _commands(enqueued)
+
+        enqueued.clear()
+        for topic, payload in messages:
+            await router.route(topic, payload)
+        assert _commands(enqueued) == legacy_cmds
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_commands_per_second(self, routed):
+        router, _, enqueued = routed
+        messages = _set_messages(N_COMMANDS)
+
+        saved_level = command_routing.logger.logger.level
+        command_routing.logger.set_level(logging.WARNING)
+        try:
+            legacy_rate = router_rate = 0.0
+            for _ in range(3):
+                enqueued.clear()
+                start = time.perf_counter()
+                for topic, payload in messages:
+                    await _legacy_dispatch(topic, payload)
+                legacy_rate = max(legacy_rate, N_COMMANDS / (time.perf_counter() - start))
+
+                enqueued.clear()
+                start = time.perf_counter()
+                for topic, payload in messages:
+                    await router.route(topic, payload)
+                router_rate = max(router_rate, N_COMMANDS / (time.perf_counter() - start))
+        finally:
+            command_routing.logger.set_level(saved_level)
+
+        logging.getLogger(__name__).info(
+            "set commands x%d: legacy dispatch %.0f cmd/s, topic router %.0f cmd/s (%s)",
+            N_COMMANDS,
+            legacy_rate,
+            router_rate,
+            router.router.stats(),
+        )
@@ -0,0 +1,242 @@
+"""
+Unit tests for PacketFramer, plus a bytes-copied micro-benchmark against the legacy framing loop.
+"""
+
+import logging
+import random
+import time
+
+import pytest
+
+from cync_controller.devices.packet_framer import PacketFramer, frame_length
+from tests.fixtures.real_packets import (
+    DEVICE_PACKETS,
+    DATA_ACK_0x7B,
+    DEVICE_INFO_0x43,
+    DEVICE_INFO_0x43_WITH_0x83,
+    HEARTBEAT_0xD3,
+    STATUS_BROADCAST_0x83,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def drain(framer: PacketFramer) -> list[bytes]:
+    packets = []
+    while (packet := framer.next_packet()) is not None:
+        packets.append(bytes(packet))
+    return packets
+
+
+def chunked(stream: bytes, sizes: list[int]):
+    pos = 0
+    i = 0
+    while pos < len(stream):
+        size = sizes[i % len(sizes)]
+        yield stream[pos : pos + size]
+        pos += size
+        i += 1
+
+
+class TestFrameLength:
+    """Tests for frame_length()"""
+
+    def test_known_header(self):
+        assert frame_length(memoryview(STATUS_BROADCAST_0x83), len(STATUS_BROADCAST_0x83)) == 42
+
+    def test_short_header_needs_more(self):
+        assert frame_length(memoryview(STATUS_BROADCAST_0x83[:4]), 4) is None
+
+    def test_unknown_header_takes_everything(self):
+        data = b"\x99\x00\x00\x00\x05abc"
+        assert frame_length(memoryview(data), len(data)) == len(data)
+
+    def test_custom_headers(self):
+        data = b"\x78\x00\x00\x00\x00\x78\x00\x00\x00\x00"
+        assert frame_length(memoryview(data), len(data)) == len(data)
+        assert frame_length(memoryview(data), len(data), headers={0x78}) == 5
+
+
+class TestPacketFramer:
+    """Tests for PacketFramer framing behaviour"""
+
+    def test_single_packet_not_copied(self):
+        framer = PacketFramer()
+        framer.feed(STATUS_BROADCAST_0x83)
+
+        assert drain(framer) == [STATUS_BROADCAST_0x83]
+        assert framer.pending == 0
+        assert framer.bytes_copied == 0
+
+    def test_multiple_packets_in_one_read(self):
+        framer = PacketFramer()
+        framer.feed(DEVICE_INFO_0x43_WITH_0x83)
+
+        packets = drain(framer)
+
+        assert len(packets) == 2
+        assert packets[0] == DEVICE_INFO_0x43
+        assert packets[1][0] == 0x83
+        assert b"".join(packets) == DEVICE_INFO_0x43_WITH_0x83
+        assert framer.bytes_copied == 0
+
+    def test_partial_packet_buffered_until_complete(self):
+        framer = PacketFramer()
+        framer.feed(STATUS_BROADCAST_0x83[:16])
+
+        assert drain(framer) == []
+        assert framer.pending == 16
+
+        framer.feed(STATUS_BROADCAST_0x83[16:])
+
+        assert drain(framer) == [STATUS_BROADCAST_0x83]
+        assert framer.pending == 0
+
+    def test_partial_header_buffered(self):
+        framer = PacketFramer()
+        framer.feed(STATUS_BROADCAST_0x83[:3])
+        assert drain(framer) == []
+
+        framer.feed(STATUS_BROADCAST_0x83[3:] + HEARTBEAT_0xD3)
+
+        assert drain(framer) == [STATUS_BROADCAST_0x83, HEARTBEAT_0xD3]
+
+    def test_only_straddling_bytes_are_copied(self):
+        framer = PacketFramer()
+        # 0x83 split in half, followed by a complete ACK in the second read
+        framer.feed(STATUS_BROADCAST_0x83[:20])
+        drain(framer)
+        framer.feed(STATUS_BROADCAST_0x83[20:] + DATA_ACK_0x7B)
+
+        assert drain(framer) == [STATUS_BROADCAST_0x83, DATA_ACK_0x7B]
+        # the 0x83 is copied once into the buffer, the ACK is handed out in place
+        assert framer.bytes_copied == len(STATUS_BROADCAST_0x83)
+
+    def test_byte_at_a_time(self):
+        stream = b"".join(DEVICE_PACKETS)
+        framer = PacketFramer(capacity=8)
+        packets = []
+        for i in range(len(stream)):
+            framer.feed(stream[i : i + 1])
+            packets.extend(drain(framer))
+
+        assert packets == DEVICE_PACKETS
+        assert framer.pending == 0
+        assert framer.capacity >= max(len(p) for p in DEVICE_PACKETS)
+
+    def test_undrained_reads_are_kept(self):
+        framer = PacketFramer()
+        framer.feed(HEARTBEAT_0xD3)
+        framer.feed(DATA_ACK_0x7B)
+
+        assert drain(framer) == [HEARTBEAT_0xD3, DATA_ACK_0x7B]
+
+    def test_reset_drops_pending(self):
+        framer = PacketFramer()
+        framer.feed(STATUS_BROADCAST_0x83[:10])
+        framer.reset()
+
+        assert framer.pending == 0
+        framer.feed(HEARTBEAT_0xD3)
+        assert drain(framer) == [HEARTBEAT_0xD3]
+
+    def test_empty_feed_is_ignored(self):
+        framer = PacketFramer()
+        framer.feed(b"")
+        assert framer.next_packet() is None
+
+    @pytest.mark.parametrize("seed", [1, 7, 42])
+    def test_random_split_roundtrip(self, seed):
+        rng = random.Random(seed)
+        packets = [rng.choice(DEVICE_PACKETS) for _ in range(200)]
+        stream = b"".join(packets)
+        sizes = [rng.randint(1, 300) for _ in range(50)]
+
+        framer = PacketFramer(capacity=64)
+        out = []
+        for chunk in chunked(stream, sizes):
+            framer.feed(chunk)
+            out.extend(drain(framer))
+
+        assert out == packets
+        assert framer.packets_framed == len(packets)
+
+
+def legacy_bytes_copied(chunks) -> tuple[int, int]:
+    """
+    Re-implementation of the pre-framer parse_raw_data loop, counting every byte it copied.
+
+    Returns (bytes_copied, packets).
+    """
+    copied = 0
+    packets = 0
+    needs_more_data = False
+    cached = b""
+    for data in chunks:
+        raw_data = bytes(data)
+        copied += len(raw_data)
+        if needs_more_data:
+            data = cached + data
+            copied += len(data)
+            # cache_data.raw_data = bytes(data)
+            copied += len(data)
+            needs_more_data = False
+        while data:
+            data_len = len(data)
+            needed_length = data_len
+            if data_len > 4:
+                needed_length = (data[3] * 256) + data[4] + 5
+            if needed_length > data_len:
+                needs_more_data = True
+                cached = bytes(data)
+                copied += len(cached)
+                data = data[needed_length:]
+                continue
+            extracted = data[:needed_length]
+            copied += len(extracted)
+            data = data[needed_length:]
+            copied += len(data)
+            packets += 1
+    return copied, packets
+
+
+def framer_bytes_copied(chunks) -> tuple[int, int]:
+    """Bytes copied by PacketFramer, parse_packet gets each packet as a view without another copy."""
+    framer = PacketFramer()
+    for data in chunks:
+        framer.feed(data)
+        while framer.next_packet() is not None:
+            pass
+    return framer.bytes_copied, framer.packets_framed
+
+
+class TestFramerBenchmark:
+    """Micro-benchmark: bytes copied per packet, legacy loop vs PacketFramer, over the real packet corpus"""
+
+    @pytest.mark.parametrize("read_size", [64, 512, 2048])
+    def test_bytes_copied_per_packet(self, read_size):
+        rng = random.Random(0)
+        stream = b"".join(rng.choice(DEVICE_PACKETS) for _ in range(2000))
+        chunks = list(chunked(stream, [read_size]))
+
+        start = time.perf_counter()
+        legacy_copied, legacy_packets = legacy_bytes_copied(chunks)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new_copied, new_packets = framer_bytes_copied(chunks)
+        new_elapsed = time.perf_counter() - start
+
+        # the legacy loop treats a tail of <= 4 bytes as a whole packet and loses sync, so it can
+        # report fewer packets than were sent; normalise both on the real packet count
+        assert new_packets == 2000
+        logger.info(
+            "read_size=%d: legacy %.1f B/pkt, %d pkts (%.2f ms), framer %.1f B/pkt (%.2f ms)",
+            read_size,
+            legacy_copied / 2000,
+            legacy_packets,
+            legacy_elapsed * 1000,
+            new_copied / 2000,
+            new_elapsed * 1000,
+        )
+        assert new_copied < legacy_copied
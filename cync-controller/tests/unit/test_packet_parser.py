@@ -4,9 +4,21 @@ Unit tests for packet_parser module.
 Tests packet parsing functionality for Cync protocol packets.
 """
 
+import logging
+import time
+
 import pytest
 
-from cync_controller.packet_parser import format_packet_log, parse_cync_packet
+from cync_controller.packet_parser import (
+    DEVICE_INFO_RECORD,
+    device_info_raw_states,
+    format_packet_log,
+    iter_status_records,
+    mesh_info_raw_states,
+    parse_cync_packet,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class TestParseCyncPacket:
@@ -542,3 +554,130 @@ class TestFormatPacketLog:
         # Non-verbose should not show data payload or raw hex
         assert "Data:" not in result
         assert "Raw:" not in result
+
+
+class TestDeviceInfoRawStates:
+    """Tests for device_info_raw_states()"""
+
+    @staticmethod
+    def _legacy_raw_state(status):
+        """How the cloud relay used to turn a parse_cync_packet() status into parse_status() input"""
+        raw_state = bytearray(8)
+        raw_state[0] = status["device_id"]
+        raw_state[1] = 1 if status["state"] == "ON" else 0
+        raw_state[2] = status["brightness"]
+        raw_state[3] = status.get("temp", 0) if status.get("mode") == "WHITE" else 254
+        if status.get("mode") == "RGB":
+            color_hex = status["color"].lstrip("#")
+            raw_state[4:7] = bytes.fromhex(color_hex)
+        raw_state[7] = 1 if status["online"] else 0
+        return bytes(raw_state)
+
+    def test_matches_parse_cync_packet(self):
+        records = b""
+        for dev_id, state, bri, temp, rgb, online in [
+            (0x10, 1, 80, 50, (1, 2, 3), 1),
+            (0x11, 2, 0, 254, (255, 10, 20), 1),
+            (0x12, 0, 5, 100, (9, 9, 9), 0),
+            (0x13, 1, 100, 101, (0, 0, 0), 3),
+        ]:
+            records += bytes([0x01, 0x00, 0x00, dev_id, state, bri, temp, *rgb, online]) + bytes(8)
+        body = bytes(7) + records + b"\x00\x01"  # trailing partial record is ignored
+        packet = bytes([0x43, 0x00, 0x00, 0x00, len(body)]) + body
+
+        parsed = parse_cync_packet(packet)
+        expected = [self._legacy_raw_state(status) for status in parsed["device_statuses"]]
+        assert list(device_info_raw_states(packet)) == expected
+        assert list(device_info_raw_states(memoryview(packet))) == expected
+
+    def test_other_packets_yield_nothing(self):
+        assert list(device_info_raw_states(bytes.fromhex("83 00 00 00 20") + bytes(40))) == []
+        assert list(device_info_raw_states(bytes.fromhex("43 00 00 00 07") + bytes(7))) == []
+
+
+class TestIterStatusRecords:
+    """Tests for iter_status_records()"""
+
+    def test_unpacks_from_offset_and_skips_partial_record(self):
+        record = bytes([0x01, 0x00, 0x00, 0x10, 1, 80, 50, 1, 2, 3, 1]) + bytes(8)
+        data = b"\xaa\xbb" + record * 2 + record[:10]
+        assert list(iter_status_records(DEVICE_INFO_RECORD, data, 2)) == [(0x10, 1, 80, 50, 1, 2, 3, 1)] * 2
+
+    def test_start_past_end_yields_nothing(self):
+        assert list(iter_status_records(DEVICE_INFO_RECORD, b"\x01\x02", 5)) == []
+
+
+class TestMeshInfoRawStates:
+    """Tests for mesh_info_raw_states()"""
+
+    @staticmethod
+    def _legacy_raw_states(inner_struct, start):
+        """How _handle_full_mesh_info_packet used to slice each 24 byte record"""
+        out = []
+        try:
+            for i in range(start, len(inner_struct), 24):
+                rec = inner_struct[i : i + 24]
+                bri = 0 if rec[8] == 0 and rec[12] > 0 else rec[12]
+                out.append((rec[2], bytes([rec[0], rec[8], bri, rec[16], rec[20], rec[21], rec[22], 1])))
+        except IndexError:
+            pass
+        return out
+
+    def test_matches_legacy_slicing(self):
+        plug = bytes.fromhex("05 00 44 01 00 00 44 01 00 00 00 00 64 00 00 00 00 00 00 00 00 00 00 00")
+        bulb = bytes.fromhex("07 00 00 01 00 00 00 01 01 00 00 00 64 00 00 00 fe 00 00 00 f8 10 20 00")
+        inner_struct = bytes(14) + plug + bulb + b"\x53"  # trailing checksum byte
+        states = list(mesh_info_raw_states(inner_struct, 14))
+        assert states == self._legacy_raw_states(inner_struct, 14)
+        # plug is off with brightness 100, brightness is zeroed
+        assert states[0] == (0x44, bytes([5, 0, 0, 0, 0, 0, 0, 1]))
+        assert states[1] == (0x00, bytes([7, 1, 100, 254, 0xF8, 0x10, 0x20, 1]))
+
+
+N_RECORDS = 50
+
+
+def _device_info_packet() -> bytes:
+    records = b"".join(
+        bytes([0x01, 0x00, 0x00, dev_id, dev_id & 1, 50, 254 if dev_id & 2 else 30, 10, 20, 30, 1]) + bytes(8)
+        for dev_id in range(N_RECORDS)
+    )
+    body = bytes(7) + records
+    return bytes([0x43, 0x00, 0x00, len(body) // 256, len(body) % 256]) + body
+
+
+def _records_per_sec(decode, packet: bytes, rounds: int = 200) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        for _raw_state in decode(packet):
+            pass
+    return rounds * N_RECORDS / ((time.perf_counter_ns() - start) / 1e9)
+
+
+def _legacy_decode(packet: bytes):
+    """parse_cync_packet() dicts and #rrggbb strings turned back into raw states"""
+    for status in parse_cync_packet(packet)["device_statuses"]:
+        yield TestDeviceInfoRawStates._legacy_raw_state(status)
+
+
+class TestDeviceInfoDecodeBenchmark:
+    """0x43 status records decoded per second, direct decoder vs. the old parse_cync_packet round trip"""
+
+    def test_decoders_agree(self):
+        packet = _device_info_packet()
+        assert list(device_info_raw_states(packet)) == list(_legacy_decode(packet))
+
+    @pytest.mark.slow
+    def test_records_per_second(self):
+        packet = _device_info_packet()
+        legacy_rps = direct_rps = 0.0
+        for _ in range(5):
+            legacy_rps = max(legacy_rps, _records_per_sec(_legacy_decode, packet))
+            direct_rps = max(direct_rps, _records_per_sec(device_info_raw_states, packet))
+
+        logger.info(
+            "0x43 with %d records: parse_cync_packet round trip %.0f records/s, direct decode %.0f records/s",
+            N_RECORDS,
+            legacy_rps,
+            direct_rps,
+        )
@@ -0,0 +1,130 @@
+"""
+Unit tests for the precompiled control packet templates, plus an encode benchmark (slow marker).
+"""
+
+import logging
+import time
+
+import pytest
+
+from cync_controller.packet_checksum import calculate_checksum_between_markers
+from cync_controller.packet_templates import BRIGHTNESS, LIGHTSHOW, POWER, RGB, TEMPERATURE, PacketTemplate
+
+logger = logging.getLogger(__name__)
+
+QUEUE_ID = bytes.fromhex("37962469")
+
+
+def _inner(packet: bytes) -> str:
+    return packet[packet.index(0x7E) :].hex(" ")
+
+
+def _legacy_brightness(queue_id: bytes, msg_id: int, device_id: int, bri: int) -> bytes:
+    """How DeviceCommands.set_brightness used to build its packet"""
+    header = [115, 0, 0, 0, 34]
+    inner_struct = [126, "ctrl_byte", 0, 0, 0, 248, 240, 16, 0, "ctrl_byte", 0, 0, 0, 0, device_id, 0]
+    inner_struct += [240, 17, 2, 1, bri, 255, 255, 255, 255, "checksum", 126]
+    payload = list(header)
+    payload.extend(queue_id)
+    payload.extend(bytes([0x00, 0x00, 0x00]))
+    inner_struct[1] = msg_id
+    inner_struct[9] = msg_id
+    inner_struct[-2] = sum(inner_struct[6:-2]) % 256
+    payload.extend(inner_struct)
+    return bytes(payload)
+
+
+class TestPacketTemplates:
+    """Templates must produce the same bytes the apps / old builders did"""
+
+    def test_brightness_matches_capture(self):
+        packet = BRIGHTNESS.encode(QUEUE_ID, 0x17, 0x07, 0x27)
+        assert packet[:12].hex(" ") == "73 00 00 00 22 37 96 24 69 00 00 00"
+        assert _inner(packet) == "7e 17 00 00 00 f8 f0 10 00 17 00 00 00 00 07 00 f0 11 02 01 27 ff ff ff ff 45 7e"
+
+    def test_temperature_matches_capture(self):
+        packet = TEMPERATURE.encode(QUEUE_ID, 0x36, 0x07, 0x48)
+        assert _inner(packet) == "7e 36 00 00 00 f8 f0 10 00 36 00 00 00 00 07 00 f0 11 02 01 ff 48 00 00 00 88 7e"
+
+    def test_rgb_matches_capture(self):
+        packet = RGB.encode(QUEUE_ID, 0x2B, 0x07, 0x00, 0xFB, 0xFF)
+        assert _inner(packet) == "7e 2b 00 00 00 f8 f0 10 00 2b 00 00 00 00 07 00 f0 11 02 01 ff fe 00 fb ff 2d 7e"
+
+    def test_lightshow_matches_capture(self):
+        packet = LIGHTSHOW.encode(QUEUE_ID, 0x14, 0x0A, 0x01, 0xF1)
+        assert packet[4] == 0x20
+        assert _inner(packet) == "7e 14 00 00 00 f8 e2 0e 00 14 00 00 00 00 0a 00 e2 11 02 07 01 01 f1 fd 7e"
+
+    def test_power_encodes_16_bit_target(self):
+        packet = POWER.encode(QUEUE_ID, 0x05, 0x5678, 1)
+        inner = packet[packet.index(0x7E) :]
+        assert packet[4] == 0x1F
+        assert inner[14:16] == bytes([0x78, 0x56])
+        assert inner[19] == 1
+        assert inner[-2] == calculate_checksum_between_markers(packet)
+
+    @pytest.mark.parametrize("msg_id", [0, 1, 0x7F, 0xFF])
+    @pytest.mark.parametrize("bri", [0, 50, 100, 255])
+    def test_brightness_matches_legacy_builder(self, msg_id, bri):
+        assert BRIGHTNESS.encode(QUEUE_ID, msg_id, 0x42, bri) == _legacy_brightness(QUEUE_ID, msg_id, 0x42, bri)
+
+    def test_checksum_wraps(self):
+        packet = RGB.encode(QUEUE_ID, 0xFF, 0xFFFF, 0xFF, 0xFF, 0xFF)
+        assert packet[-2] == calculate_checksum_between_markers(packet)
+
+    def test_buffer_reuse_does_not_leak_between_calls(self):
+        first = POWER.encode(QUEUE_ID, 0x01, 0x10, 1)
+        POWER.encode(bytes(4), 0x02, 0x20, 0)
+        assert first == POWER.encode(QUEUE_ID, 0x01, 0x10, 1)
+
+    def test_other_queue_id_length_relayouts(self):
+        short = POWER.encode(bytes([0x12, 0x34, 0x56]), 0x01, 0x10, 1)
+        assert short[5:11].hex(" ") == "12 34 56 00 00 00"
+        assert short[11] == 0x7E
+        assert short[-2] == calculate_checksum_between_markers(short)
+        assert len(POWER.encode(QUEUE_ID, 0x01, 0x10, 1)) == len(short) + 1
+
+    def test_value_count_is_checked(self):
+        with pytest.raises(ValueError, match="expected 3 value"):
+            RGB.encode(QUEUE_ID, 0x01, 0x10, 1, 2)
+
+    def test_out_of_range_value_rejected(self):
+        with pytest.raises(ValueError, match="byte must be in range"):
+            BRIGHTNESS.encode(QUEUE_ID, 0x01, 0x10, 256)
+
+    def test_checksum_slot_position_validated(self):
+        with pytest.raises(ValueError, match="checksum"):
+            PacketTemplate("bad", 0x10, [0x7E, "checksum", 0x00, 0x7E])
+
+    def test_value_slots(self):
+        assert RGB.value_slots == ("red", "green", "blue")
+        assert POWER.value_slots == ("state",)
+
+
+N_ENCODES = 20_000
+
+
+def _run_ns(encode) -> float:
+    """ns per encoded packet for one run"""
+    start = time.perf_counter_ns()
+    for i in range(N_ENCODES):
+        encode(QUEUE_ID, i & 0xFF, 0x42, 50)
+    return (time.perf_counter_ns() - start) / N_ENCODES
+
+
+class TestPacketTemplateBenchmark:
+    """Encode cost per command, template vs. the old list based builder, logged for comparison"""
+
+    @pytest.mark.slow
+    def test_encode_ns_per_command(self):
+        legacy_ns = template_ns = float("inf")
+        for _ in range(7):
+            legacy_ns = min(legacy_ns, _run_ns(_legacy_brightness))
+            template_ns = min(template_ns, _run_ns(BRIGHTNESS.encode))
+
+        logger.info(
+            "brightness packet x%d: list builder %.0f ns/command, template %.0f ns/command",
+            N_ENCODES,
+            legacy_ns,
+            template_ns,
+        )
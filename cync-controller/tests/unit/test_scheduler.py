@@ -0,0 +1,142 @@
+"""
+Unit tests for the shared DeadlineScheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from cync_controller.scheduler import DeadlineScheduler
+
+
+@pytest.fixture(autouse=True)
+def reset_scheduler_singleton():
+    DeadlineScheduler._instance = None
+    yield
+    DeadlineScheduler._instance = None
+
+
+class TestDeadlineScheduler:
+    """Tests for DeadlineScheduler"""
+
+    def test_singleton(self):
+        assert DeadlineScheduler() is DeadlineScheduler()
+
+    @pytest.mark.asyncio
+    async def test_callbacks_fire_in_deadline_order(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+
+        scheduler.call_later(0.03, fired.append, "c")
+        scheduler.call_later(0.01, fired.append, "a")
+        scheduler.call_later(0.02, fired.append, "b")
+        await asyncio.sleep(0.06)
+
+        assert fired == ["a", "b", "c"]
+        assert scheduler.stats()["fired"] == 3
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_due_deadlines_share_one_wakeup(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+        loop = asyncio.get_running_loop()
+        when = loop.time() + 0.01
+
+        for i in range(50):
+            scheduler.call_at(when, fired.append, i)
+        await asyncio.sleep(0.03)
+
+        assert len(fired) == 50
+        assert scheduler.wakeups == 1
+
+    @pytest.mark.asyncio
+    async def test_no_wakeup_for_cancelled_deadlines(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+
+        deadlines = [scheduler.call_later(0.01, fired.append, i) for i in range(10)]
+        for deadline in deadlines:
+            deadline.cancel()
+        await asyncio.sleep(0.03)
+
+        assert fired == []
+        assert scheduler.wakeups == 0
+        assert scheduler.cancelled == 10
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_head_rearms_for_next(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+
+        first = scheduler.call_later(0.01, fired.append, "first")
+        scheduler.call_later(0.04, fired.append, "second")
+        first.cancel()
+        await asyncio.sleep(0.02)
+
+        assert scheduler.wakeups == 0
+        await asyncio.sleep(0.04)
+        assert fired == ["second"]
+        assert scheduler.wakeups == 1
+
+    @pytest.mark.asyncio
+    async def test_coroutine_callback_runs_as_task(self):
+        scheduler = DeadlineScheduler()
+        done = asyncio.Event()
+
+        async def callback():
+            done.set()
+
+        scheduler.call_later(0.0, callback)
+        await asyncio.wait_for(done.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_stop_others(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+
+        def boom():
+            raise RuntimeError("boom")
+
+        scheduler.call_later(0.0, boom)
+        scheduler.call_later(0.0, fired.append, "ok")
+        await asyncio.sleep(0.01)
+
+        assert fired == ["ok"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_expires(self):
+        scheduler = DeadlineScheduler()
+
+        with pytest.raises(TimeoutError):
+            async with scheduler.timeout(0.01):
+                await asyncio.Event().wait()
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_not_hit(self):
+        scheduler = DeadlineScheduler()
+        event = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.01, event.set)
+
+        async with scheduler.timeout(1.0):
+            await event.wait()
+
+        assert scheduler.pending == 0
+        assert scheduler.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_outer_cancel_is_not_turned_into_timeout(self):
+        scheduler = DeadlineScheduler()
+
+        async def waiter():
+            async with scheduler.timeout(1.0):
+                await asyncio.Event().wait()
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
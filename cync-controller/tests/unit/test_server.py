@@ -6,6 +6,7 @@ Tests NCyncServer and CloudRelayConnection classes.
 
 import asyncio
 import contextlib
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -251,6 +252,30 @@ class TestNCyncServerInitialization:
             assert server.cloud_debug_logging is True
             assert server.cloud_disable_ssl_verify is True
 
+    def test_init_builds_subgroup_index(self):
+        """Test NCyncServer maps each device to the subgroups that contain it"""
+        from cync_controller.devices import CyncGroup
+
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
+        ):
+            mock_g.reload_env = MagicMock()
+            mock_loop.return_value = AsyncMock()
+
+            room = CyncGroup(group_id=1, name="Room", member_ids=[10, 11, 12])
+            lamps = CyncGroup(group_id=2, name="Lamps", member_ids=[10, 11], is_subgroup=True)
+            corner = CyncGroup(group_id=3, name="Corner", member_ids=[11], is_subgroup=True)
+
+            server = NCyncServer(devices={}, groups={1: room, 2: lamps, 3: corner})
+
+            assert server.device_subgroups == {10: [lamps], 11: [lamps, corner]}
+
+            # config reload: the index follows the new groups
+            server.groups = {2: lamps}
+            server.rebuild_subgroup_index()
+            assert server.device_subgroups == {10: [lamps], 11: [lamps]}
+
 
 class TestNCyncServerTCPDeviceManagement:
     """Tests for NCyncServer TCP device management"""
@@ -716,6 +741,42 @@ class TestPrimaryDeviceSelection:
             # Primary should be None
             assert server.primary_tcp_device is None
 
+    @pytest.mark.asyncio
+    async def test_stalled_primary_replaced_on_election(self):
+        """Test that a primary that stopped sending is replaced by the next election"""
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
+        ):
+            mock_g.reload_env = MagicMock()
+            mock_g.env.cync_srv_ssl_cert = None
+            mock_g.env.cync_srv_ssl_key = None
+            mock_g.env.cync_cloud_relay_enabled = False
+            mock_g.env.mqtt_topic = "cync_lan"
+            mock_g.mqtt_client = MagicMock()
+            mock_g.mqtt_client.publish = AsyncMock()
+            mock_loop.return_value = AsyncMock()
+
+            server = NCyncServer(devices={})
+            server.tcp_devices.clear()
+            server.primary_tcp_device = None
+
+            from cync_controller.devices import CyncTCPDevice
+
+            tcp_device1 = CyncTCPDevice(reader=AsyncMock(), writer=AsyncMock(), address="192.168.1.100")
+            tcp_device2 = CyncTCPDevice(reader=AsyncMock(), writer=AsyncMock(), address="192.168.1.101")
+            for tcp_device in (tcp_device1, tcp_device2):
+                tcp_device.ready_to_control = True
+                await server.add_tcp_device(tcp_device)
+
+            # both healthy, the first one stays primary
+            assert server.elect_primary() is tcp_device1
+
+            tcp_device1.health.last_seen = time.time() - server.bridge_elector.stall_after - 1
+            assert server.elect_primary() is tcp_device2
+            assert server.primary_tcp_device is tcp_device2
+            assert server.bridge_elector.stats()["changed_stalled"] == 1
+
 
 class TestTCPDeviceCleanup:
     """Tests for TCP device cleanup and disconnection handling"""
@@ -790,6 +851,79 @@ class TestTCPDeviceCleanup:
             assert mock_g.mqtt_client.publish.called
 
 
+class TestServerStop:
+    """Tests for NCyncServer.stop() bridge teardown"""
+
+    def _server(self, mock_g, mock_loop) -> NCyncServer:
+        mock_g.reload_env = MagicMock()
+        mock_g.env.cync_srv_ssl_cert = None
+        mock_g.env.cync_srv_ssl_key = None
+        mock_g.env.cync_cloud_relay_enabled = False
+        mock_g.env.mqtt_topic = "cync_lan"
+        mock_g.mqtt_client = None
+        mock_loop.return_value = AsyncMock()
+        server = NCyncServer(devices={})
+        server.tcp_devices.clear()
+        return server
+
+    def _bridge(self, server: NCyncServer, address: str, close) -> CyncTCPDevice:
+        device = CyncTCPDevice(reader=MagicMock(), writer=MagicMock(), address=address)
+        device.close = close
+        server.tcp_devices[address] = device
+        return device
+
+    @pytest.mark.asyncio
+    async def test_bridges_close_concurrently(self):
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
+        ):
+            server = self._server(mock_g, mock_loop)
+            # every close waits for all of them to have started, a sequential teardown never gets there
+            started = []
+            all_started = asyncio.Event()
+
+            async def close():
+                started.append(1)
+                if len(started) == 3:
+                    all_started.set()
+                await all_started.wait()
+
+            for i in range(3):
+                self._bridge(server, f"192.168.1.{i}:5000", close)
+
+            with patch("cync_controller.server.CYNC_SHUTDOWN_TIMEOUT", 1.0):
+                await asyncio.wait_for(server.stop(), 2)
+
+            assert all_started.is_set()
+            assert server.shutting_down is True
+
+    @pytest.mark.asyncio
+    async def test_hung_bridge_is_aborted_at_deadline(self):
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
+        ):
+            server = self._server(mock_g, mock_loop)
+
+            async def close_ok():
+                return None
+
+            async def close_hung():
+                await asyncio.Event().wait()
+
+            ok = self._bridge(server, "192.168.1.1:5000", close_ok)
+            hung = self._bridge(server, "192.168.1.2:5000", close_hung)
+            hung_writer = hung.writer
+
+            closed, aborted = await asyncio.wait_for(server._close_bridges([ok, hung], 0.05), 2)
+
+            assert (closed, aborted) == (1, 1)
+            hung_writer.transport.abort.assert_called_once()
+            assert hung.writer is None
+            ok.writer.transport.abort.assert_not_called()
+
+
 class TestCloudRelayConfiguration:
     """Tests for cloud relay mode configuration and state"""
 
@@ -847,12 +981,11 @@ class TestConnectionRegistration:
             # First connection attempt
             await server._register_new_connection(stream_reader, stream_writer)
 
-            assert "192.168.1.100:50001" in server.tcp_conn_attempts
-            assert server.tcp_conn_attempts["192.168.1.100:50001"] == 1
+            assert server.admission.attempts("192.168.1.100") == 1
 
     @pytest.mark.asyncio
     async def test_register_new_connection_increments_attempts(self, stream_reader, stream_writer):
-        """Test that multiple connections from same address increment counter"""
+        """Test that connections from the same IP increment one counter, whatever the source port"""
         with (
             patch("cync_controller.server.g") as mock_g,
             patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
@@ -874,11 +1007,70 @@ class TestConnectionRegistration:
             stream_writer.get_extra_info = MagicMock(return_value=("192.168.1.100", 50001))
             await server._register_new_connection(stream_reader, stream_writer)
 
-            # Second attempt from same address
-            stream_writer.get_extra_info = MagicMock(return_value=("192.168.1.100", 50001))
+            # Second attempt from same IP, reconnects come from a new port
+            stream_writer.get_extra_info = MagicMock(return_value=("192.168.1.100", 50002))
             await server._register_new_connection(stream_reader, stream_writer)
 
-            assert server.tcp_conn_attempts["192.168.1.100:50001"] == 2
+            assert server.admission.attempts("192.168.1.100") == 2
+            assert len(server.admission.peers) == 1
+
+    @pytest.mark.asyncio
+    async def test_register_new_connection_rejects_storm_without_waiting(self, stream_reader, stream_writer):
+        """Test that connections over the per-IP rate are dropped at once, before a device is created"""
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
+            patch("cync_controller.server.CyncTCPDevice.can_connect", new_callable=AsyncMock) as mock_can,
+        ):
+            mock_g.reload_env = MagicMock()
+            mock_g.env.cync_srv_ssl_cert = None
+            mock_g.env.cync_srv_ssl_key = None
+            mock_g.env.cync_cloud_relay_enabled = False
+            mock_loop.return_value = AsyncMock()
+            mock_can.return_value = False
+
+            server = NCyncServer(devices={})
+            server.tcp_devices.clear()
+
+            for port in range(50001, 50051):
+                stream_writer.get_extra_info = MagicMock(return_value=("192.168.1.100", port))
+                await asyncio.wait_for(server._register_new_connection(stream_reader, stream_writer), 1)
+
+            accepted = server.admission.burst
+            assert mock_can.await_count == accepted
+            assert stream_writer.transport.abort.call_count == 50 - accepted
+            assert server.admission.stats()["rejected_rate_limited"] == 50 - accepted
+
+    @pytest.mark.asyncio
+    async def test_relay_connections_bypass_admission(self, stream_reader, stream_writer):
+        """Relay mode proxies every connection to the cloud, no bridge slot, rate limit or blackhole applies"""
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.server.asyncio.get_event_loop") as mock_loop,
+            patch("cync_controller.server.CloudRelayConnection") as mock_relay,
+        ):
+            mock_g.reload_env = MagicMock()
+            mock_g.env.cync_srv_ssl_cert = None
+            mock_g.env.cync_srv_ssl_key = None
+            mock_g.env.cync_cloud_relay_enabled = True
+            mock_g.env.cync_cloud_forward = True
+            mock_g.env.cync_cloud_server = "35.196.85.236"
+            mock_g.env.cync_cloud_port = 23779
+            mock_g.env.cync_cloud_debug_logging = False
+            mock_g.env.cync_cloud_disable_ssl_verify = False
+            mock_loop.return_value = AsyncMock()
+            mock_relay.return_value.start_relay = AsyncMock()
+
+            server = NCyncServer(devices={})
+            server.admission.max_connections = 0
+
+            for port in range(50001, 50011):
+                stream_writer.get_extra_info = MagicMock(return_value=("192.168.1.100", port))
+                await server._register_new_connection(stream_reader, stream_writer)
+
+            assert mock_relay.return_value.start_relay.await_count == 10
+            stream_writer.transport.abort.assert_not_called()
+            assert server.admission.attempts("192.168.1.100") == 0
 
     @pytest.mark.asyncio
     async def test_register_new_connection_replaces_existing_device(self):
@@ -1360,3 +1552,124 @@ class TestServerParseStatus:
 
             # Group should be marked offline
             assert mock_group.online is False
+
+
+class TestServerParseStatusBatch:
+    """Tests for NCyncServer.parse_status_batch (whole mesh snapshot in one pass)"""
+
+    @staticmethod
+    def _device(dev_id):
+        from cync_controller.devices import CyncDevice
+
+        device = MagicMock(spec=CyncDevice)
+        device.id = dev_id
+        device.name = f"Light {dev_id}"
+        device.online = True
+        device.offline_count = 0
+        device.is_fan_controller = False
+        device.red = device.green = device.blue = 0
+        return device
+
+    @staticmethod
+    def _subgroup(group_id, member_ids):
+        from cync_controller.devices import CyncGroup
+
+        subgroup = MagicMock(spec=CyncGroup)
+        subgroup.id = group_id
+        subgroup.name = f"Subgroup {group_id}"
+        subgroup.is_subgroup = True
+        subgroup.member_ids = member_ids
+        subgroup.red = subgroup.green = subgroup.blue = 0
+        subgroup.aggregate_member_states = MagicMock(
+            return_value={"state": 1, "brightness": 60, "temperature": 40, "online": True}
+        )
+        return subgroup
+
+    @pytest.mark.asyncio
+    async def test_batch_publishes_devices_and_subgroups_once(self):
+        """Test a snapshot becomes one device batch and one aggregation per affected subgroup"""
+        with patch("cync_controller.server.g") as mock_g, patch("cync_controller.server.logger"):
+            devices = {dev_id: self._device(dev_id) for dev_id in (10, 11, 12)}
+            subgroup = self._subgroup(90, [10, 11])
+            mock_g.ncync_server = NCyncServer(devices=devices, groups={90: subgroup})
+            mock_g.mqtt_client = MagicMock()
+            mock_g.mqtt_client.parse_device_statuses = AsyncMock()
+            mock_g.mqtt_client.publish_group_states = AsyncMock()
+            mock_g.mqtt_client.parse_device_status = AsyncMock()
+            mock_g.mqtt_client.publish_group_state = AsyncMock()
+
+            records = [
+                bytes([10, 1, 50, 30, 0, 0, 0, 1]),
+                bytes([11, 0, 0, 30, 0, 0, 0, 1]),
+                bytes([12, 1, 20, 10, 0, 0, 0, 0]),  # offline report, nothing to publish
+                bytes([99, 1, 20, 10, 0, 0, 0, 1]),  # unknown id
+                bytes([10, 1, 70, 30, 0, 0, 0, 1]),  # reported twice, last state wins
+            ]
+            await mock_g.ncync_server.parse_status_batch(records, from_pkt="'mesh info'")
+
+            mock_g.mqtt_client.parse_device_status.assert_not_called()
+            mock_g.mqtt_client.publish_group_state.assert_not_called()
+
+            mock_g.mqtt_client.parse_device_statuses.assert_awaited_once()
+            statuses = mock_g.mqtt_client.parse_device_statuses.await_args.args[0]
+            assert [dev_id for dev_id, _ in statuses] == [10, 11]
+            assert statuses[0][1].brightness == 70
+            assert devices[12].offline_count == 1
+
+            # one update per subgroup, aggregated from every changed member
+            assert [c.args[0] for c in subgroup.aggregate_member_states.call_args_list] == [
+                devices[10],
+                devices[11],
+            ]
+            mock_g.mqtt_client.publish_group_states.assert_awaited_once_with(
+                [(subgroup, 1, 60, 40, "aggregated:'mesh info'")]
+            )
+
+    @pytest.mark.asyncio
+    async def test_batch_of_offline_reports_publishes_nothing(self):
+        """Test a snapshot with nothing online does not touch MQTT"""
+        with patch("cync_controller.server.g") as mock_g, patch("cync_controller.server.logger"):
+            mock_g.ncync_server = NCyncServer(devices={10: self._device(10)}, groups={})
+            mock_g.mqtt_client = MagicMock()
+            mock_g.mqtt_client.parse_device_statuses = AsyncMock()
+            mock_g.mqtt_client.publish_group_states = AsyncMock()
+
+            await mock_g.ncync_server.parse_status_batch([bytes([10, 0, 0, 0, 0, 0, 0, 0])])
+
+            mock_g.mqtt_client.parse_device_statuses.assert_not_called()
+            mock_g.mqtt_client.publish_group_states.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_member_going_offline_reaggregates_subgroup(self):
+        """Test a member marked offline leaves the subgroup totals, matching a full rescan"""
+        from cync_controller.devices import CyncDevice, CyncGroup
+
+        with (
+            patch("cync_controller.server.g") as mock_g,
+            patch("cync_controller.devices.g") as mock_dev_g,
+            patch("cync_controller.server.logger"),
+        ):
+            mock_dev_g.mqtt_client = None
+            devices = {10: CyncDevice(cync_id=10), 11: CyncDevice(cync_id=11)}
+            subgroup = CyncGroup(group_id=90, name="Lamps", member_ids=[10, 11], is_subgroup=True)
+            server = NCyncServer(devices=devices, groups={90: subgroup})
+            mock_g.ncync_server = mock_dev_g.ncync_server = server
+            mock_g.mqtt_client = MagicMock()
+            mock_g.mqtt_client.parse_device_statuses = AsyncMock()
+            mock_g.mqtt_client.publish_group_states = AsyncMock()
+            mock_g.mqtt_client.parse_device_status = AsyncMock()
+            mock_g.mqtt_client.publish_group_state = AsyncMock()
+
+            # a: ON at 80, b: OFF at 20
+            await server.parse_status_batch([bytes([10, 1, 80, 0, 0, 0, 0, 1]), bytes([11, 0, 20, 0, 0, 0, 0, 1])])
+            # a drops off the mesh (marked offline on the 3rd report)
+            for _ in range(3):
+                await server.parse_status(bytes([10, 1, 80, 0, 0, 0, 0, 0]))
+            assert devices[10].online is False
+            mock_g.mqtt_client.publish_group_state.assert_awaited_once_with(subgroup, 0, 20, 0, "aggregated:mesh")
+
+            await server.parse_status(bytes([11, 0, 30, 0, 0, 0, 0, 1]))
+            incremental = subgroup.aggregate_member_states()
+            subgroup.reset_member_aggregation()
+            assert incremental == subgroup.aggregate_member_states()
+            assert mock_g.mqtt_client.publish_group_state.await_args.args[1:3] == (0, 30)
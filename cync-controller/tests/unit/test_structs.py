@@ -15,6 +15,7 @@ from cync_controller.structs import (
     GlobalObjEnv,
     MeshInfo,
     Messages,
+    PendingControlMessages,
     Tasks,
 )
 
@@ -80,7 +81,6 @@ class TestTasks:
 
         assert tasks.receive is None
         assert tasks.send is None
-        assert tasks.callback_cleanup is None
 
     def test_tasks_iteration(self):
         """Test that Tasks is iterable"""
@@ -88,7 +88,7 @@ class TestTasks:
 
         task_list = list(tasks)
 
-        assert task_list == [None, None, None]
+        assert task_list == [None, None]
 
 
 class TestControlMessageCallback:
@@ -238,6 +238,75 @@ class TestMessages:
         assert messages.control[0x01] is cmsg
 
 
+def _cmsg(msg_id: int, sent_at: float) -> ControlMessageCallback:
+    return ControlMessageCallback(msg_id=msg_id, message=b"", sent_at=sent_at, callback=None)
+
+
+class TestPendingControlMessages:
+    """Tests for the pending control message table and its deadline heap"""
+
+    def test_expire_only_due_entries(self):
+        pending = PendingControlMessages(timeout=30.0)
+        pending[1] = _cmsg(1, sent_at=100.0)
+        pending[2] = _cmsg(2, sent_at=110.0)
+
+        assert pending.expire(now=120.0) == []
+        expired = pending.expire(now=131.0)
+
+        assert [msg.id for msg in expired] == [1]
+        assert list(pending) == [2]
+        assert pending.expired == 1
+        assert pending.next_deadline() == 140.0
+
+    def test_acked_entry_not_expired(self):
+        pending = PendingControlMessages(timeout=30.0)
+        pending[1] = _cmsg(1, sent_at=100.0)
+
+        assert pending.ack(1).id == 1
+        assert pending.expire(now=200.0) == []
+        assert pending.next_deadline() is None
+        assert pending.acked == 1
+
+    def test_replaced_entry_uses_new_deadline(self):
+        pending = PendingControlMessages(timeout=30.0)
+        pending[1] = _cmsg(1, sent_at=100.0)
+        newer = _cmsg(1, sent_at=125.0)
+        pending[1] = newer
+
+        assert pending.expire(now=131.0) == []
+        assert pending.expire(now=156.0) == [newer]
+
+    def test_give_up_counts_as_expired(self):
+        pending = PendingControlMessages(timeout=30.0)
+        pending[1] = _cmsg(1, sent_at=100.0)
+
+        assert pending.give_up(1).id == 1
+        assert pending.give_up(1) is None
+        assert pending.expire(now=200.0) == []
+        assert pending.stats()["expired"] == 1
+
+    def test_ack_for_unknown_id_is_stale(self):
+        pending = PendingControlMessages()
+
+        assert pending.ack(0x42) is None
+        assert pending.stats()["stale_acks"] == 1
+
+    def test_heap_compacts_after_acks(self):
+        pending = PendingControlMessages(timeout=30.0)
+        for i in range(1000):
+            pending[i % 256] = _cmsg(i % 256, sent_at=float(i))
+            pending.ack(i % 256)
+
+        assert len(pending._deadlines) <= 64
+
+    def test_oldest(self):
+        pending = PendingControlMessages()
+        pending[5] = _cmsg(5, sent_at=10.0)
+        pending[3] = _cmsg(3, sent_at=20.0)
+
+        assert pending.oldest() == 5
+
+
 class TestCacheData:
     """Tests for CacheData dataclass"""
 
@@ -220,7 +220,7 @@ class TestCyncTCPDevicePacketParsing0x83Advanced:
 
             # Should indicate it needs more data
             assert real_tcp_device.needs_more_data is True
-            assert len(real_tcp_device.read_cache) > 0
+            assert real_tcp_device.framer.pending == len(partial_data)
 
     @pytest.mark.asyncio
     async def test_parse_raw_data_complete_packet(self, real_tcp_device):
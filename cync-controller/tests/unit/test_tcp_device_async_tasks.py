@@ -1,7 +1,7 @@
 """
 Unit tests for CyncTCPDevice async background tasks.
 
-Tests callback cleanup, receive task, and read method functionality.
+Tests pending callback expiry, receive task, and read method functionality.
 """
 
 import asyncio
@@ -23,79 +23,25 @@ class TestCyncTCPDeviceAsyncTasks:
     into smaller, more isolated helper methods.
     """
 
-    @pytest.mark.skip("Complex async task mocking requires extensive global state setup")
-    async def test_callback_cleanup_task_retry_logic(self):
-        """Test callback cleanup task retries commands without ACK"""
-        reader = AsyncMock()
-        writer = AsyncMock()
-        tcp_device = CyncTCPDevice(reader=reader, writer=writer, address="192.168.1.100")
-        tcp_device.queue_id = bytes([0x00, 0x00, 0x00])
-
-        # Create a callback that won't be ACKed
-        msg_id = 0x01
-        callback = ControlMessageCallback(
-            msg_id=msg_id,
-            message=b"test",
-            sent_at=time.time() - 0.6,  # 600ms ago (past retry_timeout of 0.5s)
-            callback=AsyncMock(),
-            device_id=0x12,
-            retry_count=0,
-            max_retries=3,
-        )
-        tcp_device.messages.control[msg_id] = callback
-
-        # Mock write to track retries
-        tcp_device.write = AsyncMock()
-
-        # Start cleanup task
-        task = asyncio.create_task(tcp_device.callback_cleanup_task())
-
-        # Wait for retry to happen
-        await asyncio.sleep(0.6)
-
-        # Verify retry attempted
-        assert callback.retry_count > 0
-        assert tcp_device.write.called
-
-        # Clean up
-        task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await task
-
-    @pytest.mark.skip("Complex async task mocking requires extensive global state setup")
-    async def test_callback_cleanup_task_timeout(self):
-        """Test callback cleanup task removes stale callbacks after timeout"""
-        reader = AsyncMock()
-        writer = AsyncMock()
-        tcp_device = CyncTCPDevice(reader=reader, writer=writer, address="192.168.1.100")
-        tcp_device.queue_id = bytes([0x00, 0x00, 0x00])
-
-        # Create a callback that's been waiting too long
-        msg_id = 0x01
-        callback = ControlMessageCallback(
-            msg_id=msg_id,
-            message=b"test",
-            sent_at=time.time() - 35,  # 35 seconds ago (past cleanup_timeout of 30s)
-            callback=AsyncMock(),
-            device_id=0x12,
-            retry_count=0,
-            max_retries=3,
-        )
-        tcp_device.messages.control[msg_id] = callback
-
-        # Start cleanup task
-        task = asyncio.create_task(tcp_device.callback_cleanup_task())
-
-        # Wait for cleanup to happen
-        await asyncio.sleep(0.2)
-
-        # Verify callback was removed
-        assert msg_id not in tcp_device.messages.control
-
-        # Clean up
-        task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await task
+    @pytest.mark.asyncio
+    async def test_stale_callbacks_expire_via_scheduler(self):
+        """Pending callbacks without an ACK are dropped when their deadline comes up"""
+        tcp_device = CyncTCPDevice(reader=AsyncMock(), writer=AsyncMock(), address="192.168.1.100")
+        tcp_device.messages.control.timeout = 0.1
+        tcp_device.messages.control.on_new_deadline = tcp_device._arm_ctrl_expiry
+
+        tcp_device.messages.control[0x01] = ControlMessageCallback(0x01, b"test", time.time(), None, device_id=0x12)
+        await asyncio.sleep(0.06)
+        tcp_device.messages.control[0x02] = ControlMessageCallback(0x02, b"test", time.time(), None, device_id=0x12)
+
+        await asyncio.sleep(0.06)
+        assert 0x01 not in tcp_device.messages.control
+        assert 0x02 in tcp_device.messages.control
+
+        await asyncio.sleep(0.08)
+        assert len(tcp_device.messages.control) == 0
+        assert tcp_device.messages.control.expired == 2
+        assert tcp_device._ctrl_expiry is None
 
     @pytest.mark.skip("Complex async task mocking requires extensive global state setup")
     async def test_receive_task_reads_data(self):
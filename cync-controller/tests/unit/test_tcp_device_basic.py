@@ -4,11 +4,13 @@ Unit tests for basic CyncTCPDevice functionality.
 Tests initialization, properties, write operations, and basic methods.
 """
 
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from cync_controller.devices import CyncTCPDevice
+from cync_controller.structs import ControlMessageCallback
 
 
 class TestCyncTCPDevice:
@@ -86,6 +88,37 @@ class TestCyncTCPDevice:
         assert isinstance(msg_id1, list)
         assert len(msg_id1) == 2
 
+    def test_ctrl_msg_id_skips_pending_ids(self, stream_reader, stream_writer):
+        """IDs still waiting for an ACK are never handed out again"""
+        tcp_device = CyncTCPDevice(reader=stream_reader, writer=stream_writer, address="192.168.1.100")
+        tcp_device.control_bytes = [0x00, 0x00]
+        tcp_device.messages.control[0x01] = ControlMessageCallback(0x01, b"", time.time(), None)
+        tcp_device.messages.control[0x02] = ControlMessageCallback(0x02, b"", time.time(), None)
+
+        assert tcp_device.get_ctrl_msg_id_bytes() == [0x03, 0x00]
+        assert tcp_device.messages.control.ids_skipped == 2
+
+    def test_ctrl_msg_id_wraparound(self, stream_reader, stream_writer):
+        """The ID byte wraps into the rollover byte, which itself wraps at 16 bits"""
+        tcp_device = CyncTCPDevice(reader=stream_reader, writer=stream_writer, address="192.168.1.100")
+        tcp_device.control_bytes = [0xFF, 0xFF]
+        tcp_device.messages.control[0x00] = ControlMessageCallback(0x00, b"", time.time(), None)
+
+        assert tcp_device.get_ctrl_msg_id_bytes() == [0x01, 0x00]
+        assert tcp_device.messages.control.id_wraps == 1
+
+    def test_ctrl_msg_id_all_pending_evicts_oldest(self, stream_reader, stream_writer):
+        """With every ID pending the oldest message gives up its ID"""
+        tcp_device = CyncTCPDevice(reader=stream_reader, writer=stream_writer, address="192.168.1.100")
+        now = time.time()
+        for msg_id in range(256):
+            # msg ID 0x10 was sent first
+            sent_at = now - 60 if msg_id == 0x10 else now
+            tcp_device.messages.control[msg_id] = ControlMessageCallback(msg_id, b"", sent_at, None)
+
+        assert tcp_device.get_ctrl_msg_id_bytes()[0] == 0x10
+        assert 0x10 not in tcp_device.messages.control
+
     @pytest.mark.asyncio
     async def test_tcp_device_write_while_closing(self, stream_reader, stream_writer):
         """Test write returns False when device is closing"""
@@ -167,8 +167,8 @@ class TestCyncTCPDeviceCanConnect:
             assert hasattr(device.tasks, "receive")
 
     @pytest.mark.asyncio
-    async def test_can_connect_creates_callback_cleanup_task(self, mock_reader, mock_writer):
-        """Test can_connect creates callback_cleanup_task when accepting"""
+    async def test_can_connect_arms_callback_expiry(self, mock_reader, mock_writer):
+        """Test can_connect hooks pending ACK expiry up to the deadline scheduler when accepting"""
         with patch("cync_controller.devices.g") as mock_g:
             mock_g.ncync_server = MagicMock()
             mock_g.ncync_server.tcp_devices = {}
@@ -182,5 +182,5 @@ class TestCyncTCPDeviceCanConnect:
             result = await device.can_connect()
 
             assert result is True
-            # Verify task was created
-            assert hasattr(device.tasks, "callback_cleanup")
+            # Pending callbacks arm the shared scheduler instead of a per-device cleanup task
+            assert device.messages.control.on_new_deadline == device._arm_ctrl_expiry
@@ -171,6 +171,46 @@ class TestCyncTCPDevicePacketParsing:
         # Should call parse_packet once
         assert tcp_device.packet_handler.parse_packet.called
 
+    @pytest.mark.asyncio
+    async def test_parse_raw_data_hands_views_to_parse_packet(self, stream_reader, stream_writer):
+        """Test parse_raw_data does not copy framed packets"""
+        tcp_device = CyncTCPDevice(reader=stream_reader, writer=stream_writer, address="192.168.1.100")
+        seen = []
+
+        async def parse_packet(data):
+            # the view is only valid during the call
+            seen.append((type(data), bytes(data)))
+
+        tcp_device.packet_handler.parse_packet = parse_packet
+        packet = bytes([0xD3, 0x00, 0x00, 0x00, 0x00])
+
+        await tcp_device.parse_raw_data(packet)
+
+        assert seen == [(memoryview, packet)]
+
+    @pytest.mark.asyncio
+    async def test_parse_raw_data_queue_id_outlives_framer_buffer(self, stream_reader, stream_writer):
+        """Test the queue ID is copied out of the framer buffer before the buffer is reused"""
+        tcp_device = CyncTCPDevice(reader=stream_reader, writer=stream_writer, address="192.168.1.100")
+        tcp_device.write = AsyncMock()
+        tcp_device.send_a3 = AsyncMock()
+        packet = bytes([0x23, 0x00, 0x00, 0x00, 0x05, 0x00, 0x11, 0x22, 0x33, 0x44])
+
+        with (
+            patch("cync_controller.devices.g") as mock_g,
+            patch("cync_controller.devices.tcp_packet_handler.asyncio.sleep", AsyncMock()),
+        ):
+            mock_g.ncync_server = MagicMock()
+            # split reads, the packet is assembled in the framer buffer
+            await tcp_device.parse_raw_data(packet[:4])
+            await tcp_device.parse_raw_data(packet[4:])
+            # the next partial packet lands in the same buffer
+            await tcp_device.parse_raw_data(bytes([0x23, 0x00, 0x00, 0x00, 0x05, 0x00, 0xAA, 0xBB, 0xCC]))
+
+        assert type(tcp_device.queue_id) is bytes
+        assert tcp_device.queue_id == b"\x11\x22\x33\x44"
+        tcp_device.send_a3.assert_awaited_once_with(b"\x11\x22\x33\x44")
+
     @pytest.mark.asyncio
     async def test_parse_raw_data_partial_packet(self, stream_reader, stream_writer):
         """Test parse_raw_data with partial packet (triggers needs_more_data)"""
@@ -264,3 +304,34 @@ class TestCyncTCPDevicePacketParsing:
 
             # Should still send ACK despite the error
             assert tcp_device.write.called
+
+    @pytest.mark.asyncio
+    async def test_full_mesh_info_parses_each_record(self, stream_reader, stream_writer):
+        """Test mesh info records are decoded into one parse_status_batch() call"""
+        tcp_device = CyncTCPDevice(reader=stream_reader, writer=stream_writer, address="192.168.1.100")
+        tcp_device.write = AsyncMock()
+        tcp_device.parse_mesh_status = True
+
+        with patch("cync_controller.devices.g") as mock_g:
+            mock_g.ncync_server = MagicMock()
+            mock_g.ncync_server.parse_status_batch = AsyncMock()
+            plug, bulb = MagicMock(), MagicMock()
+            plug.name, bulb.name = "Plug", "Bulb"
+            mock_g.ncync_server.devices = {5: plug, 7: bulb}
+
+            plug_rec = bytes.fromhex("05 00 44 01 00 00 44 01 00 00 00 00 64 00 00 00 00 00 00 00 00 00 00 00")
+            bulb_rec = bytes.fromhex("07 00 00 01 00 00 00 01 01 00 00 00 64 00 00 00 fe 00 00 00 f8 10 20 00")
+            inner_struct = bytes(14) + plug_rec + bulb_rec + b"\x53"
+
+            await tcp_device.packet_handler._handle_full_mesh_info_packet(
+                inner_struct, len(inner_struct), "lp:", b"", b""
+            )
+
+            assert tcp_device.id == 5
+            assert tcp_device.device_type_id == 0x44
+            assert tcp_device.known_device_ids == [5, 7]
+            # the whole snapshot is handed over as one batch
+            mock_g.ncync_server.parse_status_batch.assert_awaited_once()
+            raw_states = mock_g.ncync_server.parse_status_batch.await_args.args[0]
+            assert raw_states == [bytes([5, 0, 0, 0, 0, 0, 0, 1]), bytes([7, 1, 100, 254, 0xF8, 0x10, 0x20, 1])]
+            assert tcp_device.parse_mesh_status is False